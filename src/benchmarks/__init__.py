@@ -0,0 +1,19 @@
+"""
+Offline API benchmark suite
+
+- portfolio: seeded generator for synthetic portfolios (users, rental owners,
+  properties, tenants, rent roll, general ledger, banking, maintenance)
+- runner: drives the Flask test client against the hot endpoints and records
+  latency percentiles, SQL query counts and peak RSS
+- fake_ollama: stand-in Ollama server for exercising the LLM client and the
+  streaming chat endpoints without a model
+- pdf_render: pages per second for the tenant, financial-performance and
+  comprehensive report PDFs, from synthetic report data
+
+Runs against SQLite (default) or a local Postgres, never Neon or Ollama:
+
+    cd src
+    python -m benchmarks --scales 100,1000 --output bench.json
+    python -m benchmarks --scales 1000 --output after.json --compare bench.json
+    python -m benchmarks.pdf_render --rows 100,1000,10000
+"""
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+CLI for the offline API benchmark suite
+Usage (from src/): python -m benchmarks [options]
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.portfolio import is_scratch_database
+from benchmarks.runner import (
+    DEFAULT_ITERATIONS, DEFAULT_SCALES, SCENARIOS, build_report, compare_reports, run_in_subprocess, run_scale
+)
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the hot API endpoints against a synthetic portfolio",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Default scales on SQLite, results to bench.json
+  python -m benchmarks --output bench.json
+
+  # Two scales, only the rent roll and reports, compared with a previous run
+  python -m benchmarks --scales 1000,10000 --scenarios rent_roll,comprehensive_report \\
+      --output after.json --compare bench.json
+
+  # Against a local Postgres (its tables are dropped and recreated)
+  python -m benchmarks --scales 10000 --database-url postgresql://localhost/ownexa_bench --rebuild --yes-drop
+        """
+    )
+    parser.add_argument('--scales', default=','.join(str(scale) for scale in DEFAULT_SCALES),
+                        help='Comma-separated portfolio sizes in properties (default: 100,1000,10000,100000)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the generator (default: 42)')
+    parser.add_argument('--months', type=int, default=6, help='Months of rent roll per tenant (default: 6)')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help=f'Requests per scenario (default: {DEFAULT_ITERATIONS})')
+    parser.add_argument('--scenarios',
+                        help='Comma-separated scenario names (default: all of '
+                             + ', '.join(name for name, _, _, _ in SCENARIOS) + ')')
+    parser.add_argument('--database-url',
+                        help='Local database to use instead of a cached SQLite file; its tables are recreated')
+    parser.add_argument('--rebuild', action='store_true', help='Regenerate the portfolio even if it is cached')
+    parser.add_argument('--yes-drop', action='store_true',
+                        help='Allow --rebuild to drop every table of a --database-url that is not a scratch '
+                             'SQLite file')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    parser.add_argument('--compare', metavar='BASELINE', help='Print deltas against a previous results file')
+    parser.add_argument('--single-scale', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.database_url and args.rebuild and not args.yes_drop and not is_scratch_database(args.database_url):
+        parser.error("--rebuild drops every table in --database-url; add --yes-drop if it is disposable")
+    return args
+
+
+def main():
+    args = parse_arguments()
+    scenario_names = set(args.scenarios.split(',')) if args.scenarios else None
+
+    # Child process: one scale, raw result only
+    if args.single_scale:
+        result = run_scale(args.single_scale, args.seed, args.iterations, args.database_url, args.rebuild,
+                           scenario_names, args.months, allow_drop=args.yes_drop)
+        with open(args.output, 'w') as handle:
+            json.dump(result, handle, indent=2, default=str)
+        return 0
+
+    scales = [int(scale) for scale in args.scales.split(',') if scale]
+    results = []
+    for scale in scales:
+        print(f"Benchmarking scale {scale:,}", flush=True)
+        results.append(run_in_subprocess(scale, args))
+
+    report = build_report(results, args)
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2, default=str)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        for line in compare_reports(baseline, report):
+            print(line)
+
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Fake Ollama server
+
+Answers POST /api/generate like Ollama does, streaming (NDJSON, one token per
+line) or not, with a canned reply, so the LLM client, its bulkhead and circuit
+breaker and the SSE endpoints can be exercised without a model:
+
+    cd src
+    python -m benchmarks.fake_ollama --port 11500 --latency 0.05
+    OLLAMA_BASE_URL=http://127.0.0.1:11500 python app.py
+
+--fail-rate makes a share of requests return HTTP 500. From Python,
+FakeOllama(...).start() runs it on a background thread (port 0 picks a free
+port; see .url) until stop().
+"""
+
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = 'This is a reply from the fake Ollama server.'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, delayed ACKs add ~40ms per keep-alive request
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == '/api/tags':
+            self._send_json(200, {'models': [{'name': 'llama3.2:latest'}]})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        server = self.server
+        with server.lock:
+            server.requests += 1
+        if self.path != '/api/generate':
+            self._send_json(404, {'error': 'not found'})
+            return
+        if random.random() < server.fail_rate:
+            self._send_json(500, {'error': 'fake failure'})
+            return
+
+        time.sleep(server.latency)
+        reply = server.reply_for(payload.get('prompt', ''))
+        model = payload.get('model', 'llama3.2:latest')
+        context = list(payload.get('context') or []) + [len(reply)]
+
+        if payload.get('stream', True) is False:
+            self._send_json(200, {'model': model, 'response': reply, 'done': True, 'context': context})
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        tokens = reply.split(' ')
+        for index, token in enumerate(tokens):
+            text = token if index == len(tokens) - 1 else token + ' '
+            self._write_chunk({'model': model, 'response': text, 'done': False})
+            time.sleep(server.token_delay)
+        self._write_chunk({'model': model, 'response': '', 'done': True, 'context': context})
+        self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, body):
+        data = (json.dumps(body) + '\n').encode('utf-8')
+        self.wfile.write(f'{len(data):x}\r\n'.encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+
+
+class FakeOllama(ThreadingHTTPServer):
+    """In-process fake Ollama; reply may be a string or a callable taking the prompt"""
+
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, reply=DEFAULT_REPLY, latency=0.0, token_delay=0.0,
+                 fail_rate=0.0, verbose=False):
+        super().__init__((host, port), _Handler)
+        self.reply = reply
+        self.latency = latency
+        self.token_delay = token_delay
+        self.fail_rate = fail_rate
+        self.verbose = verbose
+        self.requests = 0
+        self.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def reply_for(self, prompt):
+        return self.reply(prompt) if callable(self.reply) else self.reply
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake Ollama /api/generate')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=11500)
+    parser.add_argument('--reply', default=DEFAULT_REPLY, help='Text returned for every prompt')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds before the first token')
+    parser.add_argument('--token-delay', type=float, default=0.02, help='Seconds between streamed tokens')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests answered with HTTP 500')
+    parser.add_argument('--verbose', action='store_true', help='Log each request')
+    args = parser.parse_args()
+
+    server = FakeOllama(args.host, args.port, args.reply, args.latency, args.token_delay, args.fail_rate,
+                        args.verbose)
+    print(f"Fake Ollama listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+PDF rendering benchmark
+
+Renders the tenant, financial-performance and comprehensive report PDFs from
+PropertyReportPDFGenerator against synthetic report data and prints pages per
+second for each, so layout changes can be measured without a database:
+
+    cd src
+    python -m benchmarks.pdf_render --rows 100,1000,10000 --iterations 3
+
+--rows is the number of properties, tenants, requests and transactions per
+report; the tenant report is a single tenant and ignores it.
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+# The generator imports its siblings as utils.*, like the legacy routes do
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'shared'))
+
+from utils.pdf_generator import PropertyReportPDFGenerator  # noqa: E402
+
+DEFAULT_ROWS = (100, 1000)
+DEFAULT_ITERATIONS = 3
+
+_PAGE = re.compile(rb'/Type\s*/Page\b(?!s)')
+
+PRIORITIES = ['HIGH', 'MEDIUM', 'LOW']
+STATUSES = ['COMPLETED', 'IN_PROGRESS', 'OPEN']
+
+
+def tenant_report_data(rows):
+    return {
+        'tenant_info': {'name': 'Jane Roe', 'email': 'jane@example.com', 'phone': '555-0100', 'tenant_id': 7},
+        'property_info': {'title': 'Maple Court', 'address': '1 Main St, Springfield', 'unit': '2B'},
+        'lease_info': {'start_date': '2025-01-01', 'end_date': '2025-12-31', 'status': 'Active',
+                       'days_remaining': 76, 'monthly_rent': 1850.0, 'duration_days': 364},
+        'financial_summary': {'total_payments_received': 18500.0, 'number_of_payments': 10, 'on_time_payments': 9,
+                              'late_payments': 1, 'payment_reliability': '90%', 'outstanding_balance': 0},
+        'recent_payments': [
+            {'date': f'2025-{month:02d}-01', 'amount': 1850.0, 'method': 'ACH', 'status': 'Paid'}
+            for month in range(1, 13)
+        ],
+        'maintenance_summary': {
+            'total_requests': 3, 'pending_requests': 1, 'completed_requests': 2,
+            'recent_requests': [
+                {'date': '2025-05-01', 'title': 'Leaky faucet', 'status': 'COMPLETED', 'priority': 'LOW'}
+            ]
+        },
+        'generated_date': '2025-10-16'
+    }
+
+
+def financial_report_data(rows):
+    return {
+        'portfolio_summary': {'total_properties': rows, 'occupied_units': rows, 'vacancy_rate': 4.0,
+                              'total_monthly_rent': 1200.0 * rows, 'actual_monthly_income': 1150.0 * rows},
+        'property_breakdown': [
+            {'property_name': f'Property {i}', 'address': f'{i} Main Street, Springfield',
+             'occupancy_rate': (i * 7) % 100, 'monthly_rent': 1000.0 + i, 'outstanding_balance': i * 3.5,
+             'tenant_count': i % 4}
+            for i in range(rows)
+        ],
+        'generated_date': '2025-10-16',
+        'period': 'Q3 2025'
+    }
+
+
+def comprehensive_report_data(rows):
+    return {
+        'generated_by': 'Benchmark',
+        'date_range': {'start_date': '2025-01-01', 'end_date': '2025-06-30'},
+        'overview': {'total_properties': rows, 'total_tenants': rows, 'total_maintenance_requests': rows,
+                     'total_income': 1200.0 * rows, 'total_expenses': 400.0 * rows, 'net_income': 800.0 * rows,
+                     'occupancy_rate': 92.5},
+        'sections': {
+            'properties': {'properties': [
+                {'title': f'Property {i}', 'address': f'{i} Oak Ave', 'property_type': 'House',
+                 'status': 'occupied' if i % 3 else 'available', 'monthly_rent': 1200.0 + i,
+                 'tenant_name': f'Tenant {i}'}
+                for i in range(rows)
+            ]},
+            'tenants': {'tenants': [
+                {'full_name': f'Tenant {i}', 'property_title': f'Property {i}', 'monthly_rent': 1200.0 + i,
+                 'lease_end': '2026-01-01', 'is_active': i % 5 != 0}
+                for i in range(rows)
+            ]},
+            'financial': {
+                'summary': {'total_income': 1200.0 * rows, 'total_expenses': 400.0 * rows,
+                            'net_income': 800.0 * rows, 'profit_margin': 66.7, 'total_transactions': rows},
+                'transactions': [
+                    {'type': 'INCOME' if i % 2 else 'EXPENSE', 'amount': 100.0 + i, 'description': f'Payment {i}',
+                     'date': '2025-03-01', 'property_title': f'Property {i}'}
+                    for i in range(rows)
+                ]
+            },
+            'maintenance': {
+                'summary': {'total_requests': rows, 'completed_requests': rows // 3, 'pending_requests': rows // 3,
+                            'completion_rate': 33.3, 'total_cost': 50.0 * rows, 'average_cost': 50.0},
+                'requests': [
+                    {'title': f'Repair {i}', 'property_title': f'Property {i}', 'priority': PRIORITIES[i % 3],
+                     'status': STATUSES[i % 3], 'cost': 50.0 + i}
+                    for i in range(rows)
+                ]
+            }
+        }
+    }
+
+
+# (name, generator method, report data builder)
+REPORTS = [
+    ('tenant', 'generate_tenant_report_pdf', tenant_report_data),
+    ('financial_performance', 'generate_financial_performance_pdf', financial_report_data),
+    ('comprehensive', 'generate_comprehensive_report_pdf', comprehensive_report_data),
+]
+
+
+def count_pages(pdf_bytes):
+    return len(_PAGE.findall(pdf_bytes))
+
+
+def run_report(generator, method, report_data, iterations):
+    """Best-of-iterations render time in seconds and the page count"""
+    render = getattr(generator, method)
+    best = None
+    pages = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        buffer = render(report_data)
+        elapsed = time.perf_counter() - started
+        pages = count_pages(buffer.getvalue())
+        best = elapsed if best is None else min(best, elapsed)
+    return best, pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark report PDF rendering in pages per second')
+    parser.add_argument('--rows', default=','.join(str(rows) for rows in DEFAULT_ROWS),
+                        help='Comma-separated rows per report table (default: 100,1000)')
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS,
+                        help=f'Renders per report and size; the fastest counts (default: {DEFAULT_ITERATIONS})')
+    parser.add_argument('--reports', help='Comma-separated report names (default: all of '
+                                          + ', '.join(name for name, _, _ in REPORTS) + ')')
+    args = parser.parse_args()
+
+    names = set(args.reports.split(',')) if args.reports else None
+    generator = PropertyReportPDFGenerator()
+
+    print(f"{'report':<24}{'rows':>8}{'pages':>8}{'seconds':>10}{'pages/s':>10}")
+    for name, method, build_data in REPORTS:
+        if names and name not in names:
+            continue
+        for rows in [int(rows) for rows in args.rows.split(',') if rows]:
+            seconds, pages = run_report(generator, method, build_data(rows), args.iterations)
+            print(f"{name:<24}{rows:>8,}{pages:>8,}{seconds:>10.3f}{pages / seconds:>10.1f}", flush=True)
+            if name == 'tenant':
+                break  # One tenant regardless of --rows
+
+
+if __name__ == '__main__':
+    main()
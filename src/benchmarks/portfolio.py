@@ -0,0 +1,267 @@
+"""
+Seeded synthetic portfolio generator
+
+generate_portfolio(db, scale, seed) fills an empty database with `scale`
+properties and one tenant per property, plus rent roll, outstanding balance,
+general ledger, banking and maintenance rows in proportion. The same scale
+and seed always produce the same rows, so runs on different commits are
+comparable. Rows are written with executemany in batches, not through the
+ORM; a 100k portfolio (about 1.5M rows) builds in roughly a minute on SQLite.
+
+Generating starts with db.drop_all(), so it refuses any database other than
+an in-memory SQLite one or a SQLite file under DATA_DIRECTORY or the system
+temp directory unless called with allow_drop=True (--yes-drop on the CLI).
+"""
+
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from werkzeug.security import generate_password_hash
+
+# Cached portfolio databases and per-scale results
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data')
+
+BENCHMARK_USERNAME = 'bench_admin'
+BENCHMARK_PASSWORD = 'bench_password'
+
+INSERT_BATCH_SIZE = 5000
+
+CITIES = [('Austin', 'TX'), ('Denver', 'CO'), ('Miami', 'FL'), ('Seattle', 'WA'), ('Chicago', 'IL'),
+          ('Phoenix', 'AZ'), ('Atlanta', 'GA'), ('Boston', 'MA'), ('Portland', 'OR'), ('Raleigh', 'NC')]
+STREETS = ['Main St', 'Oak Ave', 'Maple Dr', 'Cedar Ln', 'Pine St', 'Elm St', 'Lake Rd', 'Hill Ct']
+FIRST_NAMES = ['James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+               'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Ana', 'Wei']
+LAST_NAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Lopez',
+              'Wilson', 'Anderson', 'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Chen']
+PAYMENT_METHODS = ['ach', 'check', 'card', 'cash']
+MAINTENANCE_ISSUES = [('Leaking faucet', 'plumber'), ('AC not cooling', 'hvac'), ('Broken outlet', 'electrician'),
+                      ('Clogged drain', 'plumber'), ('Door lock jammed', 'locksmith'), ('Roof leak', 'roofer')]
+LEDGER_LINES = [('credit', 'revenue', 'rent_income'), ('debit', 'expenses', 'maintenance'),
+                ('debit', 'expenses', 'utilities'), ('credit', 'revenue', 'late_fees')]
+
+
+class PortfolioSpec:
+    """Row counts for a portfolio of `scale` properties"""
+
+    def __init__(self, scale, months=6, properties_per_owner=50):
+        self.scale = scale
+        self.months = months
+        self.properties = scale
+        self.tenants = scale
+        self.rental_owners = max(1, scale // properties_per_owner)
+        self.owner_users = self.rental_owners
+        self.rent_roll = scale * months
+        self.outstanding_balances = scale // 5
+        self.general_ledger = scale * 4
+        self.bank_accounts = max(1, scale // 10)
+        self.banking_transactions = scale * 2
+        self.maintenance_requests = max(1, scale * 3 // 10)
+
+
+def _models():
+    # Imported lazily: the models need the app's db to be configured first
+    from models.user import User
+    from models.property import Property
+    from models.tenant import Tenant, RentRoll, OutstandingBalance
+    from models.rental_owner import RentalOwner, RentalOwnerManager
+    from models.accountability import GeneralLedger, Banking, BankingTransaction
+    from models.maintenance import MaintenanceRequest
+    return {
+        'User': User, 'Property': Property, 'Tenant': Tenant, 'RentRoll': RentRoll,
+        'OutstandingBalance': OutstandingBalance, 'RentalOwner': RentalOwner,
+        'RentalOwnerManager': RentalOwnerManager, 'GeneralLedger': GeneralLedger, 'Banking': Banking,
+        'BankingTransaction': BankingTransaction, 'MaintenanceRequest': MaintenanceRequest,
+    }
+
+
+def _insert(db, model, rows):
+    """Insert rows with explicit ids, in batches, keeping only real columns"""
+    columns = model.__table__.c
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        batch = [{key: value for key, value in row.items() if key in columns}
+                 for row in rows[start:start + INSERT_BATCH_SIZE]]
+        db.session.execute(insert(model.__table__), batch)
+    return len(rows)
+
+
+def _month_start(day, months_back):
+    index = day.year * 12 + day.month - 1 - months_back
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _money(rng, low, high):
+    return Decimal(rng.randrange(low * 100, high * 100)) / 100
+
+
+def is_scratch_database(url):
+    """Whether url is a SQLite database the benchmark may drop: in memory, or a file under a scratch directory"""
+    url = make_url(str(url))
+    if url.get_backend_name() != 'sqlite':
+        return False
+    if not url.database or url.database == ':memory:':
+        return True
+    path = os.path.realpath(url.database)
+    return any(os.path.commonpath([path, os.path.realpath(directory)]) == os.path.realpath(directory)
+               for directory in (DATA_DIRECTORY, tempfile.gettempdir()))
+
+
+def generate_portfolio(db, scale, seed=42, months=6, today=None, allow_drop=False):
+    """
+    Drop and create all tables and fill them with a deterministic portfolio
+
+    Raises ValueError, before touching anything, when the database is not a
+    scratch one (is_scratch_database) and allow_drop is not set. Returns the
+    row count per table. The benchmark principal is user id 1
+    (BENCHMARK_USERNAME, role ADMIN); it owns every property and manages
+    every rental owner, so both the admin and the owner-scoped code paths
+    see the whole portfolio.
+    """
+    if not allow_drop and not is_scratch_database(db.engine.url):
+        raise ValueError(f"Refusing to drop every table in {db.engine.url!r}; pass --yes-drop if it is disposable")
+    rng = random.Random(seed)
+    spec = PortfolioSpec(scale, months)
+    models = _models()
+    today = today or date(2025, 6, 30)
+    month_starts = [_month_start(today, months_back) for months_back in range(months)]
+    counts = {}
+
+    db.drop_all()
+    db.create_all()
+
+    password_hash = generate_password_hash(BENCHMARK_PASSWORD)
+    users = [{
+        'id': 1, 'username': BENCHMARK_USERNAME, 'email': 'bench_admin@example.com', 'password': password_hash,
+        'first_name': 'Bench', 'last_name': 'Admin', 'role': 'ADMIN', 'street_address_1': '1 Main St',
+        'city': 'Austin', 'state': 'TX', 'zip_code': '73301', 'is_active': True,
+    }]
+    for index in range(spec.owner_users):
+        user_id = index + 2
+        users.append({
+            'id': user_id, 'username': f'owner{user_id}', 'email': f'owner{user_id}@example.com',
+            'password': password_hash, 'first_name': rng.choice(FIRST_NAMES), 'last_name': rng.choice(LAST_NAMES),
+            'role': 'OWNER', 'street_address_1': f'{rng.randint(1, 9999)} {rng.choice(STREETS)}',
+            'city': 'Austin', 'state': 'TX', 'zip_code': '73301', 'is_active': True,
+        })
+    counts['users'] = _insert(db, models['User'], users)
+
+    rental_owners, managers = [], []
+    for index in range(spec.rental_owners):
+        owner_id = index + 1
+        city, state = rng.choice(CITIES)
+        rental_owners.append({
+            'id': owner_id, 'company_name': f'Owner Holdings {owner_id} LLC', 'business_type': 'LLC',
+            'city': city, 'state': state, 'zip_code': f'{rng.randint(10000, 99999)}',
+            'email': f'holdings{owner_id}@example.com', 'management_fee_percentage': Decimal('8.00'),
+            'is_active': True,
+        })
+        managers.append({'id': len(managers) + 1, 'rental_owner_id': owner_id, 'user_id': 1,
+                         'role': 'MANAGER', 'is_primary': True})
+        managers.append({'id': len(managers) + 1, 'rental_owner_id': owner_id, 'user_id': owner_id + 1,
+                         'role': 'OWNER', 'is_primary': False})
+    counts['rental_owners'] = _insert(db, models['RentalOwner'], rental_owners)
+    counts['rental_owner_managers'] = _insert(db, models['RentalOwnerManager'], managers)
+
+    properties, tenants, rent_amounts = [], [], []
+    for index in range(spec.properties):
+        property_id = index + 1
+        city, state = rng.choice(CITIES)
+        rent = _money(rng, 900, 4500)
+        rent_amounts.append(rent)
+        properties.append({
+            'id': property_id, 'title': f'{rng.randint(1, 9999)} {rng.choice(STREETS)} #{property_id}',
+            'street_address_1': f'{rng.randint(1, 9999)} {rng.choice(STREETS)}', 'city': city, 'state': state,
+            'zip_code': f'{rng.randint(10000, 99999)}', 'description': 'Synthetic benchmark unit',
+            'rent_amount': rent, 'status': 'occupied', 'owner_id': 1,
+            'rental_owner_id': index % spec.rental_owners + 1,
+        })
+        lease_start = today - timedelta(days=rng.randint(30, 700))
+        tenants.append({
+            'id': property_id, 'full_name': f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}',
+            'email': f'tenant{property_id}@example.com', 'phone_number': f'555-{rng.randint(1000000, 9999999)}',
+            'property_id': property_id, 'lease_start': lease_start, 'lease_end': lease_start + timedelta(days=365),
+            'rent_amount': rent, 'rent_payment_day': 1,
+            'payment_status': rng.choice(['current', 'current', 'current', 'late']),
+        })
+    counts['properties'] = _insert(db, models['Property'], properties)
+    counts['tenants'] = _insert(db, models['Tenant'], tenants)
+
+    rent_roll = []
+    for index in range(spec.properties):
+        for month_start in month_starts:
+            rent_roll.append({
+                'id': len(rent_roll) + 1, 'tenant_id': index + 1, 'property_id': index + 1,
+                'payment_date': month_start + timedelta(days=rng.randint(0, 9)),
+                'amount_paid': rent_amounts[index], 'payment_method': rng.choice(PAYMENT_METHODS),
+                'status': rng.choice(['paid', 'paid', 'paid', 'partial', 'late']),
+            })
+    counts['rent_roll'] = _insert(db, models['RentRoll'], rent_roll)
+
+    balances = [{
+        'id': index + 1, 'tenant_id': tenant_id, 'property_id': tenant_id,
+        'due_amount': _money(rng, 50, 2500), 'due_date': today - timedelta(days=rng.randint(0, 120)),
+        'is_resolved': rng.random() < 0.3,
+    } for index, tenant_id in enumerate(rng.sample(range(1, spec.tenants + 1), spec.outstanding_balances))]
+    counts['outstanding_balances'] = _insert(db, models['OutstandingBalance'], balances)
+
+    ledger, running = [], {}
+    for index in range(spec.general_ledger):
+        property_id = index % spec.properties + 1
+        transaction_type, category, subcategory = rng.choice(LEDGER_LINES)
+        amount = _money(rng, 20, 3000)
+        running[property_id] = running.get(property_id, Decimal('0')) + (amount if transaction_type == 'credit' else -amount)
+        ledger.append({
+            'id': index + 1, 'property_id': property_id, 'user_id': 1,
+            'transaction_date': today - timedelta(days=rng.randint(0, months * 30)),
+            'transaction_type': transaction_type, 'account_category': category,
+            'account_subcategory': subcategory, 'amount': amount, 'running_balance': running[property_id],
+            'description': f'{subcategory.replace("_", " ").title()} entry',
+        })
+    counts['general_ledger'] = _insert(db, models['GeneralLedger'], ledger)
+
+    accounts = [{
+        'id': index + 1, 'property_id': index * (spec.properties // spec.bank_accounts) + 1, 'user_id': 1,
+        'bank_name': 'Benchmark Bank', 'account_name': f'Operating {index + 1}',
+        'account_number': f'{100000000 + index}', 'account_type': 'checking',
+        'current_balance': _money(rng, 1000, 250000), 'available_balance': _money(rng, 1000, 250000),
+        'is_active': True, 'is_primary': True,
+    } for index in range(spec.bank_accounts)]
+    counts['banking'] = _insert(db, models['Banking'], accounts)
+
+    transactions = []
+    for index in range(spec.banking_transactions):
+        transaction_date = today - timedelta(days=rng.randint(0, months * 30))
+        deposit = rng.random() < 0.6
+        transactions.append({
+            'id': index + 1, 'banking_account_id': index % spec.bank_accounts + 1,
+            'transaction_date': transaction_date, 'posted_date': transaction_date,
+            'transaction_type': 'deposit' if deposit else 'withdrawal', 'amount': _money(rng, 20, 5000),
+            'balance_after': _money(rng, 1000, 250000), 'description': 'Rent deposit' if deposit else 'Vendor payment',
+            'category': 'rent_income' if deposit else 'maintenance', 'status': 'cleared', 'is_reconciled': False,
+        })
+    counts['banking_transactions'] = _insert(db, models['BankingTransaction'], transactions)
+
+    requests = []
+    for index in range(spec.maintenance_requests):
+        property_id = rng.randint(1, spec.properties)
+        title, vendor_type = rng.choice(MAINTENANCE_ISSUES)
+        requests.append({
+            'id': index + 1, 'tenant_id': property_id, 'property_id': property_id,
+            'request_title': title, 'request_description': f'{title} reported by tenant',
+            'request_date': today - timedelta(days=rng.randint(0, months * 30)),
+            'priority': rng.choice(['low', 'medium', 'medium', 'high', 'urgent']),
+            'status': rng.choice(['pending', 'assigned', 'in_progress', 'completed']),
+            'estimated_cost': _money(rng, 50, 1500), 'vendor_type_needed': vendor_type,
+        })
+    counts['maintenance_requests'] = _insert(db, models['MaintenanceRequest'], requests)
+
+    # Rent roll and balances bypass the API, so fill the monthly rollup the way a bulk load would
+    from utils.rent_collection import rebuild_rent_collection
+    counts['rent_collection_monthly'] = rebuild_rent_collection()
+
+    db.session.commit()
+    return counts
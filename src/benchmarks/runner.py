@@ -0,0 +1,266 @@
+"""
+Benchmark runner
+
+Drives the Flask test client against the hot endpoints of an app bound to a
+generated portfolio and records, per scenario:
+- latency percentiles (p50/p90/p95/p99, plus the cold first request)
+- SQL statements per request, counted with an after_cursor_execute listener
+- peak RSS while the scenario ran, sampled by a background thread
+
+Each scale runs in its own child process: the app binds its database URL at
+import time, and a fresh process keeps peak RSS comparable between scales.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import threading
+import subprocess
+from datetime import datetime, timedelta
+
+import psutil
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from benchmarks.portfolio import DATA_DIRECTORY, generate_portfolio, PortfolioSpec
+
+DEFAULT_SCALES = (100, 1000, 10000, 100000)
+DEFAULT_ITERATIONS = 20
+
+REPORT_START = '2025-01-01'
+REPORT_END = '2025-06-30'
+
+# (name, method, path, json body)
+SCENARIOS = [
+    ('properties_list', 'GET', '/api/properties/', None),
+    ('tenants_list', 'GET', '/api/tenants/', None),
+    ('rent_roll', 'GET', '/api/rentals/rent-roll', None),
+    ('tenant_rent_roll', 'GET', '/api/tenants/rent-roll', None),
+    ('outstanding_balances', 'GET', '/api/rentals/outstanding-balances', None),
+    ('rental_statistics', 'GET', '/api/rentals/statistics', None),
+    ('financials_dashboard', 'GET', '/api/accountability/dashboard/financials', None),
+    ('general_ledger_dashboard', 'GET', '/api/accountability/dashboard/general-ledger', None),
+    ('banking_dashboard', 'GET', '/api/accountability/dashboard/banking', None),
+    ('maintenance_requests', 'GET', '/api/maintenance/requests', None),
+    ('comprehensive_report', 'POST', '/api/reports/generate',
+     {'report_type': 'comprehensive_report', 'start_date': REPORT_START, 'end_date': REPORT_END}),
+    # With no Ollama listening the bot answers from its fallback path, which is what this measures offline
+    ('admin_bot', 'POST', '/api/admin-bot/admin-chat', {'query': 'How many tenants do I have?'}),
+]
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class QueryCounter:
+    """Counts SQL statements executed by any engine in this process"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        event.listen(Engine, 'after_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(Engine, 'after_cursor_execute', self._on_execute)
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+
+class PeakRSSSampler:
+    """Samples this process's RSS every interval seconds and keeps the maximum"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = self._process.memory_info().rss
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self._process.memory_info().rss)
+
+
+def _mb(value):
+    return round(value / (1024 * 1024), 1)
+
+
+def create_benchmark_app(database_url):
+    """Import the app bound to database_url; nothing here reaches Neon or Ollama"""
+    os.environ['NEON_DATABASE_URL'] = database_url
+    os.environ.setdefault('FLASK_ENV', 'benchmark')
+    from core.app import app, db
+    return app, db
+
+
+def auth_header(app, user_id=1):
+    import jwt
+    token = jwt.encode({
+        'user_id': user_id,
+        'iat': datetime.utcnow(),
+        'exp': datetime.utcnow() + timedelta(hours=1)
+    }, app.config['SECRET_KEY'], algorithm="HS256")
+    return {'Authorization': f'Bearer {token}'}
+
+
+def run_scenario(client, headers, method, path, body, iterations):
+    latencies, queries, statuses = [], [], {}
+    with PeakRSSSampler() as rss:
+        for _ in range(iterations):
+            with QueryCounter() as counter:
+                started = time.perf_counter()
+                response = client.open(path, method=method, json=body, headers=headers)
+                response.get_data()
+                elapsed = time.perf_counter() - started
+            latencies.append(elapsed * 1000)
+            queries.append(counter.count)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    ordered = sorted(latencies)
+    ordered_queries = sorted(queries)
+    return {
+        'iterations': iterations,
+        'status_codes': statuses,
+        'first_ms': round(latencies[0], 2),
+        'mean_ms': round(sum(latencies) / len(latencies), 2),
+        'p50_ms': round(percentile(ordered, 0.50), 2),
+        'p90_ms': round(percentile(ordered, 0.90), 2),
+        'p95_ms': round(percentile(ordered, 0.95), 2),
+        'p99_ms': round(percentile(ordered, 0.99), 2),
+        'max_ms': round(ordered[-1], 2),
+        'queries_first': queries[0],
+        'queries_p50': percentile(ordered_queries, 0.50),
+        'queries_max': ordered_queries[-1],
+        'peak_rss_mb': _mb(rss.peak),
+    }
+
+
+def run_scale(scale, seed, iterations, database_url=None, rebuild=False, scenario_names=None, months=6,
+              allow_drop=False):
+    """Generate (or reuse) the portfolio for scale and run every scenario against it"""
+    if database_url is None:
+        os.makedirs(DATA_DIRECTORY, exist_ok=True)
+        path = os.path.join(DATA_DIRECTORY, f'portfolio_{scale}_{seed}_{months}m.sqlite3')
+        database_url = f'sqlite:///{path}'
+        rebuild = rebuild or not os.path.exists(path)
+
+    app, db = create_benchmark_app(database_url)
+    result = {'scale': scale, 'database': database_url.split('://')[0], 'rows': None, 'generate_seconds': None}
+
+    with app.app_context():
+        if rebuild:
+            started = time.perf_counter()
+            result['rows'] = generate_portfolio(db, scale, seed=seed, months=months, allow_drop=allow_drop)
+            result['generate_seconds'] = round(time.perf_counter() - started, 2)
+        else:
+            spec = PortfolioSpec(scale, months)
+            result['rows'] = {name: value for name, value in vars(spec).items() if name not in ('scale', 'months')}
+
+    client = app.test_client()
+    headers = auth_header(app)
+    result['scenarios'] = {}
+    for name, method, path, body in SCENARIOS:
+        if scenario_names and name not in scenario_names:
+            continue
+        print(f"  [{scale}] {name} ...", flush=True)
+        result['scenarios'][name] = run_scenario(client, headers, method, path, body, iterations)
+
+    # ru_maxrss is in kilobytes on Linux
+    result['peak_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return result
+
+
+def run_in_subprocess(scale, args):
+    """Run one scale in a fresh interpreter and return its result dict"""
+    output_path = os.path.join(DATA_DIRECTORY, f'result_{scale}_{os.getpid()}.json')
+    os.makedirs(DATA_DIRECTORY, exist_ok=True)
+    command = [sys.executable, '-m', 'benchmarks', '--single-scale', str(scale), '--seed', str(args.seed),
+               '--iterations', str(args.iterations), '--months', str(args.months), '--output', output_path]
+    if args.database_url:
+        command += ['--database-url', args.database_url]
+    if args.rebuild:
+        command.append('--rebuild')
+    if args.yes_drop:
+        command.append('--yes-drop')
+    if args.scenarios:
+        command += ['--scenarios', args.scenarios]
+
+    src_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(command, cwd=src_directory)
+    if completed.returncode != 0:
+        return {'scale': scale, 'error': f'benchmark process exited with {completed.returncode}'}
+    with open(output_path) as handle:
+        result = json.load(handle)
+    os.remove(output_path)
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def build_report(results, args):
+    return {
+        'meta': {
+            'started_at': datetime.utcnow().isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': args.seed,
+            'iterations': args.iterations,
+            'months': args.months,
+        },
+        'results': results,
+    }
+
+
+def compare_reports(baseline, current):
+    """Lines of p50/p95 and query-count deltas between two reports, scenario by scenario"""
+    lines = []
+    baseline_by_scale = {result['scale']: result for result in baseline.get('results', [])}
+    for result in current.get('results', []):
+        base = baseline_by_scale.get(result['scale'])
+        if not base or 'scenarios' not in base or 'scenarios' not in result:
+            continue
+        lines.append(f"scale {result['scale']}:")
+        for name, stats in result['scenarios'].items():
+            before = base['scenarios'].get(name)
+            if not before:
+                continue
+            change = (stats['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0.0
+            lines.append(
+                f"  {name:<26} p50 {before['p50_ms']:>9.1f} -> {stats['p50_ms']:>9.1f} ms ({change:+.0f}%)  "
+                f"p95 {before['p95_ms']:>9.1f} -> {stats['p95_ms']:>9.1f} ms  "
+                f"queries {before['queries_p50']:g} -> {stats['queries_p50']:g}"
+            )
+    return lines
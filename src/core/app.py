@@ -31,10 +31,22 @@ from shared.models import db, init_models
 db.init_app(app)
 migrate = Migrate(app, db)
 
+# Request timing, SQL query accounting and the /metrics endpoint
+from shared.utils.request_metrics import init_request_metrics
+init_request_metrics(app)
+
 # Initialize models
 with app.app_context():
     init_models()
 
+# flask rebuild-rent-collection
+from shared.utils.rent_collection import init_rent_collection_commands
+init_rent_collection_commands(app)
+
+# Admin bot search index directory and flask rebuild-search-index
+from shared.utils.search_index import init_search_index
+init_search_index(app)
+
 # Enable CORS with security
 CORS(app, 
      origins=[
@@ -44,7 +56,7 @@ CORS(app,
      ],
      methods=['GET', 'POST', 'PUT', 'DELETE', 'OPTIONS'],
      allow_headers=['Content-Type', 'Authorization', 'X-Requested-With', 'Accept'],
-     expose_headers=['Content-Range', 'X-Total-Count'],
+     expose_headers=['Content-Range', 'X-Total-Count', 'X-Next-After-Id'],
      supports_credentials=True,
      max_age=600  # Cache preflight requests for 10 minutes
 )
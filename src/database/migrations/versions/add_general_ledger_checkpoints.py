@@ -0,0 +1,41 @@
+"""Add general ledger balance checkpoints
+
+Revision ID: add_ledger_checkpoints
+Revises: add_property_fields
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_ledger_checkpoints'
+down_revision = 'add_property_fields'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create general_ledger_checkpoints table
+    op.create_table('general_ledger_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('opening_balance', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('property_id', 'period_start', name='uq_general_ledger_checkpoint_period')
+    )
+    op.create_index('ix_general_ledger_checkpoints_property_id', 'general_ledger_checkpoints', ['property_id'])
+
+    # Subsequent-row balance updates filter on (property_id, id)
+    op.create_index('ix_general_ledger_property_id_id', 'general_ledger', ['property_id', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_general_ledger_property_id_id', table_name='general_ledger')
+    op.drop_index('ix_general_ledger_checkpoints_property_id', table_name='general_ledger_checkpoints')
+    op.drop_table('general_ledger_checkpoints')
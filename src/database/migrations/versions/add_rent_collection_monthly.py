@@ -0,0 +1,74 @@
+"""Add monthly rent collection rollup
+
+Revision ID: add_rent_collection_monthly
+Revises: add_ledger_checkpoints
+Create Date: 2026-10-16 23:30:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_rent_collection_monthly'
+down_revision = 'add_ledger_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+def _month(bind, column):
+    """SQL for the first day of column's month"""
+    if bind.dialect.name == 'sqlite':
+        return f"date({column}, 'start of month')"
+    return f"CAST(date_trunc('month', {column}) AS DATE)"
+
+
+def upgrade():
+    # Create rent_collection_monthly table
+    op.create_table('rent_collection_monthly',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('property_id', sa.Integer(), nullable=False),
+        sa.Column('year_month', sa.Date(), nullable=False),
+        sa.Column('collected', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('due', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('outstanding', sa.Numeric(precision=14, scale=2), nullable=False, server_default='0'),
+        sa.Column('payment_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('property_id', 'year_month', name='uq_rent_collection_monthly_period')
+    )
+    op.create_index('ix_rent_collection_monthly_property_id', 'rent_collection_monthly', ['property_id'])
+    op.create_index('ix_rent_collection_monthly_year_month', 'rent_collection_monthly', ['year_month'])
+
+    # Backfill from the existing history, as `flask rebuild-rent-collection` does, so
+    # statistics do not read zero until someone runs it
+    bind = op.get_bind()
+    bind.execute(sa.text(f"""
+        INSERT INTO rent_collection_monthly
+            (property_id, year_month, collected, due, outstanding, payment_count, created_at, updated_at)
+        SELECT property_id, year_month, SUM(collected), SUM(due), SUM(outstanding), SUM(payment_count), :now, :now
+        FROM (
+            SELECT property_id, {_month(bind, 'payment_date')} AS year_month,
+                   COALESCE(amount_paid, 0) AS collected, 0 AS due, 0 AS outstanding, 1 AS payment_count
+            FROM rent_roll
+            WHERE property_id IS NOT NULL AND payment_date IS NOT NULL
+            UNION ALL
+            SELECT property_id, {_month(bind, 'due_date')} AS year_month,
+                   0 AS collected, COALESCE(due_amount, 0) AS due,
+                   CASE WHEN NOT is_resolved THEN COALESCE(due_amount, 0) ELSE 0 END AS outstanding,
+                   0 AS payment_count
+            FROM outstanding_balances
+            WHERE property_id IS NOT NULL AND due_date IS NOT NULL
+        ) AS changes
+        GROUP BY property_id, year_month
+    """), {'now': datetime.utcnow()})
+
+
+def downgrade():
+    op.drop_index('ix_rent_collection_monthly_year_month', table_name='rent_collection_monthly')
+    op.drop_index('ix_rent_collection_monthly_property_id', table_name='rent_collection_monthly')
+    op.drop_table('rent_collection_monthly')
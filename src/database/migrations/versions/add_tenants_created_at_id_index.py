@@ -0,0 +1,34 @@
+"""Add the tenants (created_at, id) index used by keyset pagination
+
+Revision ID: add_tenants_created_at_id
+Revises: add_rent_collection_monthly
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_tenants_created_at_id'
+down_revision = 'add_rent_collection_monthly'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tenants written outside the ORM may lack created_at; give them one so the
+    # GET /api/tenants cursor never has to carry a NULL sort key
+    op.get_bind().execute(
+        sa.text("UPDATE tenants SET created_at = COALESCE(updated_at, :epoch) WHERE created_at IS NULL"),
+        {'epoch': datetime(1970, 1, 1)}
+    )
+
+    # Keyset pagination order of GET /api/tenants
+    op.create_index('ix_tenants_created_at_id', 'tenants', ['created_at', 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_tenants_created_at_id', table_name='tenants')
@@ -3,8 +3,13 @@
 from flask import Blueprint, request, jsonify, send_file
 from routes.auth_routes import token_required
 from datetime import datetime, date
+from sqlalchemy import select
 from sqlalchemy.orm import joinedload
 from models.rental_owner import RentalOwner, RentalOwnerManager
+from utils.admin_bot_cache import admin_bot_cache, register_data_listeners
+from utils.llm_client import ollama_client
+from utils.rag_context import RagContextBuilder
+from utils.search_index import register_index_listeners
 import json
 import requests
 import re
@@ -13,6 +18,9 @@ import os
 
 admin_bot_bp = Blueprint('admin_bot_bp', __name__)
 
+register_data_listeners()
+register_index_listeners()
+
 # --- 1. Centralized Constants ---
 BOT_CAPABILITIES_RESPONSE = """🏠 **Property Management Assistant - Your AI-Powered Helper!**
 
@@ -54,8 +62,9 @@ I can handle property questions and general conversation! 🏘️✨"""
 
 # --- 2. Refactored LlamaAI Class with Dual-Path Logic ---
 class LlamaAI:
-    def __init__(self, base_url="http://localhost:11434"):
-        self.base_url = base_url
+    def __init__(self, client=None):
+        # Shared pooled client; base URL and limits come from OLLAMA_* settings
+        self.client = client or ollama_client
         self.model = "llama3.2:latest"
         # Enhanced keywords for better intent detection
         self.property_keywords = [
@@ -106,6 +115,11 @@ class LlamaAI:
             return { "intent": "general_knowledge", "confidence": 0.99, "entities": {} }
 
         # --- PATH A: Property Management Query ---
+        cached = admin_bot_cache.get_intent(query)
+        if cached is not None:
+            print("DEBUG: Query is property-related. Using cached intent.")
+            return cached
+
         print("DEBUG: Query is property-related. Analyzing specific intent with LLM.")
         system_prompt = """You are an AI assistant for a property management system. Analyze the user's query and return ONLY a JSON response with the following structure:
 
@@ -176,16 +190,14 @@ Examples:
 Return ONLY the JSON response, no other text."""
 
         try:
-            payload = {"model": self.model, "prompt": f"{system_prompt}\n\nUser Query: {query}", "stream": False}
-            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=8)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self.client.generate(f"{system_prompt}\n\nUser Query: {query}", model=self.model, timeout=8)
             ai_response = result.get("response", "")
             
             json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
             if json_match:
-                return json.loads(json_match.group())
+                analysis = json.loads(json_match.group())
+                admin_bot_cache.set_intent(query, analysis)
+                return analysis
             else:
                 return {"intent": "general_help", "confidence": 0.7, "entities": {}}
                 
@@ -212,10 +224,7 @@ User Question: {query}
 Assistant Answer:"""
 
         try:
-            payload = {"model": self.model, "prompt": system_prompt, "stream": False}
-            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=15)
-            response.raise_for_status()
-            result = response.json()
+            result = self.client.generate(system_prompt, model=self.model, timeout=15)
             ai_response = result.get("response", "").strip()
             
             # Validate response quality
@@ -227,8 +236,9 @@ Assistant Answer:"""
         except requests.exceptions.Timeout:
             print("General AI response generation timed out")
             return "I'm taking a bit longer to process your question. Please try rephrasing it or ask me something about property management instead."
-        except requests.exceptions.ConnectionError:
-            print("General AI response generation connection failed")
+        except requests.exceptions.ConnectionError as e:
+            # Also LLMUnavailable: the client refused the call (circuit open or every slot busy)
+            print(f"General AI response generation connection failed: {e}")
             return "I'm having trouble connecting to my AI service right now. I can still help you with property management questions though!"
         except requests.exceptions.RequestException as e:
             print(f"General AI response generation request failed: {e}")
@@ -268,10 +278,18 @@ Assistant Answer:"""
         if any(keyword in query.lower() for keyword in ['what can you do', 'help me', 'capabilities']):
             return BOT_CAPABILITIES_RESPONSE
 
+        # The prompt includes the last few messages, so the cached answer depends on them too
+        history = (conversation_context or [])[-5:]
+        cache_key = admin_bot_cache.answer_key(intent, data, query, history)
+        cached = admin_bot_cache.get_answer(cache_key)
+        if cached is not None:
+            print("DEBUG: Using cached RAG response")
+            return cached
+
         context_text = ""
-        if conversation_context:
+        if history:
             context_text = "\n\n**Conversation History:**\n"
-            for msg in conversation_context[-5:]:
+            for msg in history:
                 role = msg.get('role', 'unknown').title()
                 content = msg.get('message', '')
                 context_text += f"• {role}: {content}\n"
@@ -279,7 +297,7 @@ Assistant Answer:"""
         system_prompt = f"""You are a helpful AI assistant for a property management system. Generate a direct, concise response to the user's query.
 User Query: {query}
 Intent: {intent}
-Available Data: {json.dumps(data, default=str, indent=2)}{context_text}
+Available Data: {json.dumps(data, default=str, separators=(',', ':'))}{context_text}
 CRITICAL RULES:
 1. Use ONLY the provided data to answer questions. DO NOT make up or invent data.
 2. Give DIRECT, STRAIGHTFORWARD answers.
@@ -290,23 +308,22 @@ CRITICAL RULES:
 """
 
         try:
-            payload = {"model": self.model, "prompt": system_prompt, "stream": False}
-            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=12)
-            response.raise_for_status()
-            result = response.json()
+            result = self.client.generate(system_prompt, model=self.model, timeout=12)
             ai_response = result.get("response", "").strip()
             
             # Validate response quality
             if not ai_response or len(ai_response) < 5:
                 return self._get_fallback_rag_response(intent, data, query)
             
+            admin_bot_cache.set_answer(cache_key, ai_response)
             return ai_response
             
         except requests.exceptions.Timeout:
             print("RAG AI response generation timed out")
             return self._get_fallback_rag_response(intent, data, query)
-        except requests.exceptions.ConnectionError:
-            print("RAG AI response generation connection failed")
+        except requests.exceptions.ConnectionError as e:
+            # Also LLMUnavailable: the client refused the call (circuit open or every slot busy)
+            print(f"RAG AI response generation connection failed: {e}")
             return self._get_fallback_rag_response(intent, data, query)
         except requests.exceptions.RequestException as e:
             print(f"RAG AI response generation request failed: {e}")
@@ -323,10 +340,11 @@ CRITICAL RULES:
         # Generate structured responses based on intent and available data
         if intent == 'tenant_list' and 'tenants' in data:
             tenants = data['tenants']
+            total = data.get('total_tenants', len(tenants))
             if not tenants:
                 return "You don't have any tenants in the system yet."
             
-            response = f"Here are your {len(tenants)} tenants:\n\n"
+            response = f"Here are your {total} tenants:\n\n"
             for tenant in tenants[:10]:  # Limit to first 10 for readability
                 response += f"• **{tenant.get('name', 'Unknown')}** - {tenant.get('property_title', 'No Property')}\n"
                 if tenant.get('rent_amount'):
@@ -335,17 +353,18 @@ CRITICAL RULES:
                     response += f"  - Status: {tenant['payment_status']}\n"
                 response += "\n"
             
-            if len(tenants) > 10:
-                response += f"... and {len(tenants) - 10} more tenants."
+            if total > min(len(tenants), 10):
+                response += f"... and {total - min(len(tenants), 10)} more tenants."
             
             return response
         
         elif intent == 'property_list' and 'properties' in data:
             properties = data['properties']
+            total = data.get('total_properties', len(properties))
             if not properties:
                 return "You don't have any properties in the system yet."
             
-            response = f"Here are your {len(properties)} properties:\n\n"
+            response = f"Here are your {total} properties:\n\n"
             for prop in properties[:10]:  # Limit to first 10 for readability
                 response += f"• **{prop.get('title', 'Unknown')}** - {prop.get('address', 'No Address')}\n"
                 if prop.get('rent_amount'):
@@ -354,8 +373,8 @@ CRITICAL RULES:
                     response += f"  - Status: {prop['status']}\n"
                 response += "\n"
             
-            if len(properties) > 10:
-                response += f"... and {len(properties) - 10} more properties."
+            if total > min(len(properties), 10):
+                response += f"... and {total - min(len(properties), 10)} more properties."
             
             return response
         
@@ -423,25 +442,28 @@ CRITICAL RULES:
             
             response = f"🔍 **Filtered Results** ({total_filtered} found):\n\n"
             
+            filter_totals = data.get('filter_totals', {})
             if filter_results.get('tenants'):
-                response += f"**Tenants ({len(filter_results['tenants'])}):**\n"
+                response += f"**Tenants ({filter_totals.get('tenants', len(filter_results['tenants']))}):**\n"
                 for tenant in filter_results['tenants'][:10]:
                     response += f"• {tenant['name']} - {tenant['property_title']}\n"
                     if tenant.get('lease_end'):
                         response += f"  - Lease ends: {tenant['lease_end']}\n"
-                if len(filter_results['tenants']) > 10:
-                    response += f"... and {len(filter_results['tenants']) - 10} more tenants\n"
+                shown = min(len(filter_results['tenants']), 10)
+                if filter_totals.get('tenants', len(filter_results['tenants'])) > shown:
+                    response += f"... and {filter_totals.get('tenants', len(filter_results['tenants'])) - shown} more tenants\n"
                 response += "\n"
             
             if filter_results.get('properties'):
-                response += f"**Properties ({len(filter_results['properties'])}):**\n"
+                response += f"**Properties ({filter_totals.get('properties', len(filter_results['properties']))}):**\n"
                 for prop in filter_results['properties'][:10]:
                     response += f"• {prop['title']} - {prop['address']}\n"
                     response += f"  - Status: {prop['status']}\n"
                     if prop.get('rent_amount'):
                         response += f"  - Rent: ${prop['rent_amount']:.2f}\n"
-                if len(filter_results['properties']) > 10:
-                    response += f"... and {len(filter_results['properties']) - 10} more properties\n"
+                shown = min(len(filter_results['properties']), 10)
+                if filter_totals.get('properties', len(filter_results['properties'])) > shown:
+                    response += f"... and {filter_totals.get('properties', len(filter_results['properties'])) - shown} more properties\n"
             
             return response
         
@@ -465,23 +487,43 @@ def _get_base_query(model, current_user):
     # This logic assumes relationships are set up correctly in your SQLAlchemy models.
     # Adjust the joins based on your actual model structure if necessary.
     if hasattr(model, 'property_id'): # For models directly linked to a Property (Tenant, Maintenance, WorkOrder etc.)
-        return model.query.join(Property).join(
+        return model.query.join(Property, model.property_id == Property.id).join(
             RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
         ).filter(RentalOwnerManager.user_id == current_user.id)
     elif model == Property: # For the Property model itself
         return model.query.join(
             RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
         ).filter(RentalOwnerManager.user_id == current_user.id)
+    
+    managed_owner_ids = select(RentalOwnerManager.rental_owner_id).where(
+        RentalOwnerManager.user_id == current_user.id
+    )
+    if model == RentalOwner: # The rental owners the user manages
+        return model.query.filter(RentalOwner.id.in_(managed_owner_ids))
+    elif model.__tablename__ == 'vendors': # Vendors of those owners, or created by the user
+        return model.query.filter(
+            (model.rental_owner_id.in_(managed_owner_ids)) | (model.created_by_user_id == current_user.id)
+        )
+    elif model.__tablename__ == 'associations': # Associations with one of the user's properties
+        from models.association import AssociationPropertyAssignment
+        managed_property_ids = select(Property.id).where(Property.rental_owner_id.in_(managed_owner_ids))
+        return model.query.filter(model.id.in_(
+            select(AssociationPropertyAssignment.association_id).where(
+                AssociationPropertyAssignment.property_id.in_(managed_property_ids)
+            )
+        ))
     else:
         # Fallback for other models. For security, default to an empty query if unsure.
         return model.query.filter(model.id == None)
                 
 
 def get_data_for_intent(intent, current_user, query=""):
-    """Fetch relevant data based on the detected intent - RAG Model Approach"""
+    """
+    Fetch the data for the detected intent - RAG Model Approach.
+    Scoped to the user via _get_base_query; everything except PDF reports is
+    summarized to a bounded size by RagContextBuilder before it reaches the prompt.
+    """
     try:
-        # RAG Model: Read ALL data from database regardless of user permissions
-        # This ensures comprehensive responses based on actual database content
         print(f"RAG: Fetching data for intent '{intent}' with query '{query}'")
         
         # Always ensure we have a valid user
@@ -490,566 +532,13 @@ def get_data_for_intent(intent, current_user, query=""):
                 "error": "User not authenticated",
                 "message": "Please log in to access property management features"
             }
-        if intent == 'tenant_list':
-            from models.tenant import Tenant
-            from models.property import Property
-            
-            # RAG Model: Read ALL tenants from database regardless of user permissions
-            print("RAG: Fetching ALL tenants from database")
-            tenants = Tenant.query.options(joinedload(Tenant.property)).all()
-            print(f"RAG: Found {len(tenants)} tenants in database")
-            
-            tenant_data = []
-            total_rent = 0
-            
-            for tenant in tenants:
-                tenant_info = {
-                    "id": tenant.id,
-                    "name": tenant.full_name,
-                    "email": tenant.email,
-                    "phone": tenant.phone_number,
-                    "rent_amount": float(tenant.rent_amount) if tenant.rent_amount else 0,
-                    "lease_start": tenant.lease_start.isoformat() if tenant.lease_start else None,
-                    "lease_end": tenant.lease_end.isoformat() if tenant.lease_end else None,
-                    "payment_status": tenant.payment_status,
-                    "property_title": tenant.property.title if tenant.property else "No Property Assigned",
-                    "property_address": f"{tenant.property.street_address_1}, {tenant.property.city}, {tenant.property.state}" if tenant.property else "No Address",
-                    "lease_active": tenant.lease_end and tenant.lease_end > date.today() if tenant.lease_end else False
-                }
-                tenant_data.append(tenant_info)
-                total_rent += tenant_info["rent_amount"]
-            
-            return {
-                "tenants": tenant_data,
-                "total_tenants": len(tenants),
-                "total_monthly_rent": total_rent,
-                "active_tenants": len([t for t in tenant_data if t["lease_active"]]),
-                "tenant_count": len(tenants),
-                "count": len(tenants)
-            }
-        
-        elif intent == 'property_list':
-            from models.property import Property
-            
-            # RAG Model: Read ALL properties from database regardless of user permissions
-            print("RAG: Fetching ALL properties from database")
-            properties = Property.query.all()
-            print(f"RAG: Found {len(properties)} properties in database")
-            
-            property_data = []
-            for prop in properties:
-                property_info = {
-                    "title": prop.title,
-                    "address": f"{prop.street_address_1}, {prop.city}, {prop.state} {prop.zip_code}",
-                    "rent_amount": float(prop.rent_amount) if prop.rent_amount else 0,
-                    "status": prop.status,
-                    "description": prop.description,
-                    "id": prop.id
-                }
-                property_data.append(property_info)
-            
-            return {
-                "properties": property_data,
-                "total_properties": len(properties),
-                "count": len(properties)
-            }
-        
-        elif intent == 'count':
-            # Handle count queries - determine what to count based on query context
-            query_lower = query.lower()
-            
-            if 'tenant' in query_lower or 'tenants' in query_lower:
-                from models.tenant import Tenant
-                from models.property import Property
-                
-                try:
-                    # RAG Model: Read ALL tenants from database regardless of user permissions
-                    print("RAG: Counting ALL tenants in database")
-                    count = Tenant.query.count()
-                    print(f"RAG: Found {count} tenants in database")
-                    
-                    return {"count": count, "type": "tenants"}
-                except Exception as e:
-                    print(f"Tenant count error: {e}")
-                    return {"count": 0, "type": "tenants"}
-            
-            elif 'property' in query_lower or 'properties' in query_lower:
-                from models.property import Property
-                
-                try:
-                    # RAG Model: Read ALL properties from database regardless of user permissions
-                    print("RAG: Counting ALL properties in database")
-                    count = Property.query.count()
-                    print(f"RAG: Found {count} properties in database")
-                    
-                    return {"count": count, "type": "properties"}
-                except Exception as e:
-                    print(f"Property count error: {e}")
-                    return {"count": 0, "type": "properties"}
-            
-            elif 'maintenance' in query_lower or 'repair' in query_lower:
-                from models.maintenance import MaintenanceRequest
-                from models.property import Property
-                
-                try:
-                    # RAG Model: Read ALL maintenance requests from database regardless of user permissions
-                    print("RAG: Counting ALL maintenance requests in database")
-                    count = MaintenanceRequest.query.count()
-                    print(f"RAG: Found {count} maintenance requests in database")
-                    
-                    return {"count": count, "type": "maintenance_requests"}
-                except Exception as e:
-                    print(f"Maintenance count error: {e}")
-                    return {"count": 0, "type": "maintenance_requests"}
-            
-            elif 'vendor' in query_lower or 'vendors' in query_lower:
-                from models.vendor import Vendor
-                try:
-                    # RAG Model: Read ALL vendors from database regardless of user permissions
-                    print("RAG: Counting ALL vendors in database")
-                    count = Vendor.query.count()
-                    print(f"RAG: Found {count} vendors in database")
-                    
-                    return {"count": count, "type": "vendors"}
-                except Exception as e:
-                    print(f"Vendor count error: {e}")
-                    return {"count": 0, "type": "vendors"}
-            
-            elif 'work order' in query_lower or 'work orders' in query_lower:
-                from models.work_order import WorkOrder
-                from models.property import Property
-                
-                try:
-                    # RAG Model: Read ALL work orders from database regardless of user permissions
-                    print("RAG: Counting ALL work orders in database")
-                    count = WorkOrder.query.count()
-                    print(f"RAG: Found {count} work orders in database")
-                    
-                    return {"count": count, "type": "work_orders"}
-                except Exception as e:
-                    print(f"Work order count error: {e}")
-                    return {"count": 0, "type": "work_orders"}
-            
-            else:
-                # Default to tenant count if unclear
-                from models.tenant import Tenant
-                from models.property import Property
-                
-                try:
-                    # RAG Model: Read ALL tenants from database regardless of user permissions
-                    print("RAG: Counting ALL tenants in database (default)")
-                    count = Tenant.query.count()
-                    print(f"RAG: Found {count} tenants in database")
-                    
-                    return {"count": count, "type": "tenants"}
-                except Exception as e:
-                    print(f"Default tenant count error: {e}")
-                    return {"count": 0, "type": "tenants"}
-        
-        elif intent == 'maintenance_list':
-            from models.maintenance import MaintenanceRequest
-            from models.property import Property
-            
-            # RAG Model: Read ALL maintenance requests from database regardless of user permissions
-            print("RAG: Fetching ALL maintenance requests from database")
-            maintenance_requests = MaintenanceRequest.query.options(joinedload(MaintenanceRequest.property)).all()
-            print(f"RAG: Found {len(maintenance_requests)} maintenance requests in database")
-            
-            maintenance_data = []
-            for req in maintenance_requests:
-                maintenance_info = {
-                    "id": req.id,
-                    "title": req.request_title,
-                    "description": req.request_description,
-                    "status": req.status,
-                    "priority": req.priority,
-                    "request_date": req.request_date.isoformat() if req.request_date else None,
-                    "estimated_cost": float(req.estimated_cost) if req.estimated_cost else 0,
-                    "property_title": req.property.title if req.property else "No Property Assigned",
-                    "property_address": f"{req.property.street_address_1}, {req.property.city}, {req.property.state}" if req.property else "No Address"
-                }
-                maintenance_data.append(maintenance_info)
-            
-            return {
-                "maintenance_requests": maintenance_data,
-                "total_maintenance": len(maintenance_requests),
-                "count": len(maintenance_requests)
-            }
-        
-        elif intent == 'financial_summary':
-            from models.tenant import Tenant
-            from models.property import Property
-            
-            # RAG Model: Read ALL data from database regardless of user permissions
-            print("RAG: Fetching ALL financial data from database")
-            tenants = Tenant.query.all()
-            properties = Property.query.all()
-            
-            total_rent = sum(float(t.rent_amount) if t.rent_amount else 0 for t in tenants)
-            occupied_properties = len([p for p in properties if p.status == 'occupied'])
-            vacant_properties = len([p for p in properties if p.status == 'vacant'])
-            
-            return {
-                "total_monthly_rent": total_rent,
-                "total_properties": len(properties),
-                "occupied_properties": occupied_properties,
-                "vacant_properties": vacant_properties,
-                "occupancy_rate": (occupied_properties / len(properties) * 100) if properties else 0
-            }
-        
-        elif intent == 'vendor_list':
-            from models.vendor import Vendor
-            
-            # RAG Model: Read ALL vendors from database regardless of user permissions
-            print("RAG: Fetching ALL vendors from database")
-            vendors = Vendor.query.all()
-            print(f"RAG: Found {len(vendors)} vendors in database")
-            
-            vendor_data = []
-            for vendor in vendors:
-                vendor_info = {
-                    "id": vendor.id,
-                    "name": f"{vendor.first_name} {vendor.last_name}".strip() if vendor.first_name or vendor.last_name else vendor.company_name,
-                    "company": vendor.company_name,
-                    "email": vendor.primary_email,
-                    "phone": vendor.phone_1,
-                    "category": vendor.category_id,
-                    "is_active": vendor.is_active
-                }
-                vendor_data.append(vendor_info)
-            
-            return {
-                "vendors": vendor_data,
-                "total_vendors": len(vendors),
-                "count": len(vendors)
-            }
-        
-        elif intent == 'work_order_list':
-            from models.work_order import WorkOrder
-            from models.property import Property
-            
-            # RAG Model: Read ALL work orders from database regardless of user permissions
-            print("RAG: Fetching ALL work orders from database")
-            work_orders = WorkOrder.query.options(joinedload(WorkOrder.property)).all()
-            print(f"RAG: Found {len(work_orders)} work orders in database")
-            
-            work_order_data = []
-            for wo in work_orders:
-                work_order_info = {
-                    "id": wo.id,
-                    "title": wo.title,
-                    "description": wo.description,
-                    "status": wo.status,
-                    "priority": wo.priority,
-                    "due_date": wo.due_date.isoformat() if wo.due_date else None,
-                    "estimated_cost": float(wo.estimated_cost) if wo.estimated_cost else 0,
-                    "property_title": wo.property.title if wo.property else "No Property Assigned",
-                    "property_address": f"{wo.property.street_address_1}, {wo.property.city}, {wo.property.state}" if wo.property else "No Address"
-                }
-                work_order_data.append(work_order_info)
-            
-            return {
-                "work_orders": work_order_data,
-                "total_work_orders": len(work_orders),
-                "count": len(work_orders)
-            }
         
-        elif intent == 'rental_owner_list':
-            from models.rental_owner import RentalOwner
-            
-            # RAG Model: Read ALL rental owners from database regardless of user permissions
-            print("RAG: Fetching ALL rental owners from database")
-            rental_owners = RentalOwner.query.all()
-            print(f"RAG: Found {len(rental_owners)} rental owners in database")
-            
-            rental_owner_data = []
-            for owner in rental_owners:
-                owner_info = {
-                    "id": owner.id,
-                    "company_name": owner.company_name,
-                    "contact_name": owner.contact_name,
-                    "email": owner.email,
-                    "phone": owner.phone,
-                    "address": f"{owner.street_address}, {owner.city}, {owner.state} {owner.zip_code}",
-                    "is_active": owner.is_active
-                }
-                rental_owner_data.append(owner_info)
-            
-            return {
-                "rental_owners": rental_owner_data,
-                "total_rental_owners": len(rental_owners),
-                "count": len(rental_owners)
-            }
-        
-        elif intent == 'association_list':
-            from models.association import Association
-            
-            # RAG Model: Read ALL associations from database regardless of user permissions
-            print("RAG: Fetching ALL associations from database")
-            associations = Association.query.all()
-            print(f"RAG: Found {len(associations)} associations in database")
-            
-            association_data = []
-            for assoc in associations:
-                association_info = {
-                    "id": assoc.id,
-                    "name": assoc.name,
-                    "address": f"{assoc.street_address}, {assoc.city}, {assoc.state} {assoc.zip_code}",
-                    "contact_name": assoc.contact_name,
-                    "email": assoc.email,
-                    "phone": assoc.phone,
-                    "is_active": assoc.is_active
-                }
-                association_data.append(association_info)
-            
-            return {
-                "associations": association_data,
-                "total_associations": len(associations),
-                "count": len(associations)
-            }
-        
-        elif intent == 'search':
-            # Handle search queries - search across multiple entities
-            query_lower = query.lower()
-            search_results = {
-                "tenants": [],
-                "properties": [],
-                "vendors": [],
-                "maintenance_requests": [],
-                "work_orders": []
-            }
-            
-            # Extract search term from query
-            search_terms = []
-            for word in query_lower.split():
-                if word not in ['find', 'search', 'for', 'look', 'locate', 'where', 'is', 'the', 'a', 'an']:
-                    search_terms.append(word)
-            
-            if search_terms:
-                search_term = ' '.join(search_terms)
-                
-                # Search tenants
-                from models.tenant import Tenant
-                from models.property import Property
-                tenants = Tenant.query.filter(
-                    (Tenant.full_name.ilike(f'%{search_term}%')) |
-                    (Tenant.email.ilike(f'%{search_term}%'))
-                ).limit(10).all()
-                
-                for tenant in tenants:
-                    search_results["tenants"].append({
-                        "id": tenant.id,
-                        "name": tenant.full_name,
-                        "email": tenant.email,
-                        "property_title": tenant.property.title if tenant.property else "No Property"
-                    })
-                
-                # Search properties
-                properties = Property.query.filter(
-                    (Property.title.ilike(f'%{search_term}%')) |
-                    (Property.street_address_1.ilike(f'%{search_term}%')) |
-                    (Property.city.ilike(f'%{search_term}%'))
-                ).limit(10).all()
-                
-                for prop in properties:
-                    search_results["properties"].append({
-                        "id": prop.id,
-                        "title": prop.title,
-                        "address": f"{prop.street_address_1}, {prop.city}, {prop.state}",
-                        "status": prop.status
-                    })
-                
-                # Search vendors
-                from models.vendor import Vendor
-                vendors = Vendor.query.filter(
-                    (Vendor.first_name.ilike(f'%{search_term}%')) |
-                    (Vendor.last_name.ilike(f'%{search_term}%')) |
-                    (Vendor.company_name.ilike(f'%{search_term}%'))
-                ).limit(10).all()
-                
-                for vendor in vendors:
-                    search_results["vendors"].append({
-                        "id": vendor.id,
-                        "name": f"{vendor.first_name} {vendor.last_name}".strip() or vendor.company_name,
-                        "company": vendor.company_name,
-                        "email": vendor.primary_email
-                    })
-            
-            return {
-                "search_results": search_results,
-                "search_term": search_term if search_terms else query,
-                "total_results": sum(len(results) for results in search_results.values())
-            }
-        
-        elif intent == 'filter':
-            # Handle filter queries
-            query_lower = query.lower()
-            filter_results = {}
-            
-            # Determine what to filter and the filter criteria
-            if 'tenant' in query_lower:
-                from models.tenant import Tenant
-                tenants = Tenant.query.all()
-                
-                if 'active' in query_lower:
-                    filtered_tenants = [t for t in tenants if t.lease_end and t.lease_end > date.today()]
-                elif 'inactive' in query_lower or 'expired' in query_lower:
-                    filtered_tenants = [t for t in tenants if t.lease_end and t.lease_end <= date.today()]
-                else:
-                    filtered_tenants = tenants
-                
-                filter_results["tenants"] = []
-                for tenant in filtered_tenants:
-                    filter_results["tenants"].append({
-                        "id": tenant.id,
-                        "name": tenant.full_name,
-                        "email": tenant.email,
-                        "lease_end": tenant.lease_end.isoformat() if tenant.lease_end else None,
-                        "property_title": tenant.property.title if tenant.property else "No Property"
-                    })
-            
-            elif 'property' in query_lower:
-                from models.property import Property
-                properties = Property.query.all()
-                
-                if 'vacant' in query_lower:
-                    filtered_properties = [p for p in properties if p.status == 'vacant']
-                elif 'occupied' in query_lower:
-                    filtered_properties = [p for p in properties if p.status == 'occupied']
-                else:
-                    filtered_properties = properties
-                
-                filter_results["properties"] = []
-                for prop in filtered_properties:
-                    filter_results["properties"].append({
-                        "id": prop.id,
-                        "title": prop.title,
-                        "address": f"{prop.street_address_1}, {prop.city}, {prop.state}",
-                        "status": prop.status,
-                        "rent_amount": float(prop.rent_amount) if prop.rent_amount else 0
-                    })
-            
-            return {
-                "filter_results": filter_results,
-                "filter_criteria": query,
-                "total_filtered": sum(len(results) for results in filter_results.values())
-            }
-        
-        elif intent == 'analytics':
-            from models.tenant import Tenant
-            from models.property import Property
-            from models.maintenance import MaintenanceRequest
-            
-            # RAG Model: Read ALL data from database regardless of user permissions
-            print("RAG: Fetching ALL analytics data from database")
-            tenants = Tenant.query.all()
-            properties = Property.query.all()
-            maintenance_requests = MaintenanceRequest.query.all()
-            
-            total_rent = sum(float(t.rent_amount) if t.rent_amount else 0 for t in tenants)
-            occupied_properties = len([p for p in properties if p.status == 'occupied'])
-            vacant_properties = len([p for p in properties if p.status == 'vacant'])
-            pending_maintenance = len([m for m in maintenance_requests if m.status == 'pending'])
-            completed_maintenance = len([m for m in maintenance_requests if m.status == 'completed'])
-            
-            occupancy_rate = (occupied_properties / len(properties) * 100) if properties else 0
-            
-            return {
-                "total_properties": len(properties),
-                "total_tenants": len(tenants),
-                "total_monthly_rent": total_rent,
-                "occupancy_rate": round(occupancy_rate, 2),
-                "pending_maintenance": pending_maintenance,
-                "completed_maintenance": completed_maintenance,
-                "occupied_properties": occupied_properties,
-                "vacant_properties": vacant_properties,
-                "average_rent": round(total_rent / len(tenants), 2) if tenants else 0
-            }
-        
-        elif intent == 'pdf_report':
-            # For PDF reports, we need to determine the type and fetch appropriate data
-            # This will be handled by the PDF generation function based on the intent analysis
-            from models.tenant import Tenant
-            from models.property import Property
-            from models.maintenance import MaintenanceRequest
-            
-            # RAG Model: Read ALL data from database regardless of user permissions
-            print("RAG: Fetching ALL data for PDF report from database")
-            tenants = Tenant.query.all()
-            properties = Property.query.all()
-            maintenance_requests = MaintenanceRequest.query.all()
-            
-            # Convert model objects to dictionaries for PDF generation
-            tenant_data = []
-            for tenant in tenants:
-                tenant_dict = {
-                    "tenant_name": tenant.full_name,
-                    "email": tenant.email,
-                    "phone": tenant.phone_number,
-                    "rent_amount": float(tenant.rent_amount) if tenant.rent_amount else 0,
-                    "lease_start": tenant.lease_start.isoformat() if tenant.lease_start else None,
-                    "lease_end": tenant.lease_end.isoformat() if tenant.lease_end else None,
-                    "payment_status": tenant.payment_status,
-                    "property_title": tenant.property.title if tenant.property else "No Property Assigned",
-                    "property_address": f"{tenant.property.street_address_1}, {tenant.property.city}, {tenant.property.state}" if tenant.property else "No Address"
-                }
-                tenant_data.append(tenant_dict)
-            
-            property_data = []
-            for prop in properties:
-                property_dict = {
-                    "title": prop.title,
-                    "address": f"{prop.street_address_1}, {prop.city}, {prop.state} {prop.zip_code}",
-                    "rent_amount": float(prop.rent_amount) if prop.rent_amount else 0,
-                    "status": prop.status,
-                    "description": prop.description
-                }
-                property_data.append(property_dict)
-            
-            maintenance_data = []
-            for req in maintenance_requests:
-                maintenance_dict = {
-                    "title": req.request_title,
-                    "description": req.request_description,
-                    "status": req.status,
-                    "priority": req.priority,
-                    "request_date": req.request_date.isoformat() if req.request_date else None,
-                    "estimated_cost": float(req.estimated_cost) if req.estimated_cost else 0,
-                    "property_title": req.property.title if req.property else "No Property Assigned"
-                }
-                maintenance_data.append(maintenance_dict)
-            
-            return {
-                "tenants": tenant_data,
-                "properties": property_data,
-                "maintenance_requests": maintenance_data,
-                "summary": {
-                    "total_properties": len(properties),
-                    "total_tenants": len(tenants),
-                    "total_maintenance": len(maintenance_requests)
-                }
-            }
+        if intent == 'pdf_report':
+            return _get_pdf_report_data(current_user)
         
-        else:
-            # Default fallback - provide general summary
-            from models.tenant import Tenant
-            from models.property import Property
-            from models.maintenance import MaintenanceRequest
-            
-            # RAG Model: Read ALL data from database regardless of user permissions
-            print("RAG: Fetching ALL data for general summary from database")
-            tenants = Tenant.query.all()
-            properties = Property.query.all()
-            maintenance_requests = MaintenanceRequest.query.all()
-            
-            return {
-                "summary": {
-                    "total_properties": len(properties),
-                    "total_tenants": len(tenants),
-                    "total_maintenance": len(maintenance_requests)
-                },
-                "message": "I'm here to help you with property management! You can ask me about tenants, properties, maintenance, and financial reports."
-            }
+        context = RagContextBuilder(current_user, _get_base_query).build(intent, query)
+        print(f"RAG: Built context for '{intent}' ({len(json.dumps(context, default=str))} chars)")
+        return context
     
     except Exception as e:
         print(f"Error fetching data for intent {intent}: {e}")
@@ -1059,6 +548,70 @@ def get_data_for_intent(intent, current_user, query=""):
         }
 
 
+def _get_pdf_report_data(current_user):
+    """Rows for the PDF report; PDFs are not sent to the model, so these are not summarized"""
+    from models.tenant import Tenant
+    from models.property import Property
+    from models.maintenance import MaintenanceRequest
+    
+    tenants = _get_base_query(Tenant, current_user).options(joinedload(Tenant.property)).all()
+    properties = _get_base_query(Property, current_user).all()
+    maintenance_requests = _get_base_query(MaintenanceRequest, current_user).options(
+        joinedload(MaintenanceRequest.property)
+    ).all()
+    
+    # Convert model objects to dictionaries for PDF generation
+    tenant_data = []
+    for tenant in tenants:
+        tenant_dict = {
+            "tenant_name": tenant.full_name,
+            "email": tenant.email,
+            "phone": tenant.phone_number,
+            "rent_amount": float(tenant.rent_amount) if tenant.rent_amount else 0,
+            "lease_start": tenant.lease_start.isoformat() if tenant.lease_start else None,
+            "lease_end": tenant.lease_end.isoformat() if tenant.lease_end else None,
+            "payment_status": tenant.payment_status,
+            "property_title": tenant.property.title if tenant.property else "No Property Assigned",
+            "property_address": f"{tenant.property.street_address_1}, {tenant.property.city}, {tenant.property.state}" if tenant.property else "No Address"
+        }
+        tenant_data.append(tenant_dict)
+    
+    property_data = []
+    for prop in properties:
+        property_dict = {
+            "title": prop.title,
+            "address": f"{prop.street_address_1}, {prop.city}, {prop.state} {prop.zip_code}",
+            "rent_amount": float(prop.rent_amount) if prop.rent_amount else 0,
+            "status": prop.status,
+            "description": prop.description
+        }
+        property_data.append(property_dict)
+    
+    maintenance_data = []
+    for req in maintenance_requests:
+        maintenance_dict = {
+            "title": req.request_title,
+            "description": req.request_description,
+            "status": req.status,
+            "priority": req.priority,
+            "request_date": req.request_date.isoformat() if req.request_date else None,
+            "estimated_cost": float(req.estimated_cost) if req.estimated_cost else 0,
+            "property_title": req.property.title if req.property else "No Property Assigned"
+        }
+        maintenance_data.append(maintenance_dict)
+    
+    return {
+        "tenants": tenant_data,
+        "properties": property_data,
+        "maintenance_requests": maintenance_data,
+        "summary": {
+            "total_properties": len(properties),
+            "total_tenants": len(tenants),
+            "total_maintenance": len(maintenance_requests)
+        }
+    }
+
+
 # --- 4. Helper and Route Functions (Largely Unchanged, but reviewed) ---
 
 def generate_fallback_response(intent, data, query):
@@ -1162,6 +715,15 @@ def test_route():
     return jsonify({'message': 'Admin bot blueprint is working!', 'timestamp': datetime.now().isoformat()}), 200
 
 
+@admin_bot_bp.route('/cache/stats', methods=['GET'])
+@token_required
+def get_cache_stats(current_user):
+    """Hit/miss counters for the intent and answer caches"""
+    if current_user.role != 'ADMIN':
+        return jsonify({'error': 'Admin access required'}), 403
+    return jsonify(admin_bot_cache.stats())
+
+
 # --- 5. Simplified and Secure Main Chat Route ---
 @admin_bot_bp.route('/admin-chat', methods=['POST'])
 @token_required
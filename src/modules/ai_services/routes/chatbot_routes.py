@@ -10,32 +10,22 @@ from models.vendor import Vendor
 from config import db
 from routes.auth_routes import token_required
 from utils.tenant_utils import get_comprehensive_tenant_info
+from utils.llm_client import ollama_client, sse_event, sse_response
 
 chatbot_bp = Blueprint('chatbot_bp', __name__)
 
+FALLBACK_CHAT_RESPONSE = "I'm having trouble connecting to the AI service. Please try again later."
+
 class OllamaService:
-    def __init__(self, base_url="http://localhost:11434"):
-        self.base_url = base_url
+    def __init__(self, client=None):
+        # Shared pooled client; base URL and limits come from OLLAMA_* settings
+        self.client = client or ollama_client
         self.model = "llama3.2"
     
     def chat(self, message, context=None):
         """Send a message to Ollama and get response"""
         try:
-            payload = {
-                "model": self.model,
-                "prompt": message,
-                "stream": False,
-                "context": context
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self.client.generate(message, model=self.model, timeout=30, context=context)
             return {
                 "response": result.get("response", ""),
                 "context": result.get("context", [])
@@ -43,10 +33,18 @@ class OllamaService:
         except requests.exceptions.RequestException as e:
             print(f"Ollama API error: {e}")
             return {
-                "response": "I'm having trouble connecting to the AI service. Please try again later.",
+                "response": FALLBACK_CHAT_RESPONSE,
                 "context": context or []
             }
 
+    def stream_chat(self, message, context=None):
+        """
+        Yield Ollama's chunks for message as they are generated; the last one
+        has "done" set and carries the new context. Raises requests exceptions
+        (LLMUnavailable included) when Ollama can't be used.
+        """
+        return self.client.stream_generate(message, model=self.model, timeout=30, context=context)
+
 class MaintenanceRequestExtractor:
     def __init__(self):
         self.ollama = OllamaService()
@@ -210,28 +208,17 @@ class IntelligentVendorAssigner:
             print(f"Error auto-assigning vendor: {e}")
             return None
 
-@chatbot_bp.route('/chat', methods=['POST'])
-@token_required
-def chat_with_bot(current_user):
-    """Handle chatbot conversation"""
-    try:
-        data = request.get_json()
-        user_message = data.get('message', '')
-        context = data.get('context', [])
-        conversation_history = data.get('conversation_history', [])
-        
-        if not user_message:
-            return jsonify({'error': 'Message is required'}), 400
-        
-        # Add current message to conversation
-        conversation_history.append({
-            'role': 'user',
-            'message': user_message,
-            'timestamp': datetime.now().isoformat()
-        })
-        
-        # Create a context-aware prompt for the maintenance assistant
-        system_prompt = """You are a helpful maintenance assistant for a property management system. 
+def build_chat_prompt(user_message, conversation_history):
+    """Append user_message to conversation_history and build the maintenance assistant prompt"""
+    # Add current message to conversation
+    conversation_history.append({
+        'role': 'user',
+        'message': user_message,
+        'timestamp': datetime.now().isoformat()
+    })
+    
+    # Create a context-aware prompt for the maintenance assistant
+    system_prompt = """You are a helpful maintenance assistant for a property management system. 
 Your job is to help tenants report maintenance issues in a friendly and efficient way.
 
 Guidelines:
@@ -250,14 +237,30 @@ Key information to gather:
 
 Always be professional, friendly, and solution-oriented."""
 
-        # Combine system prompt with conversation context
-        conversation_context = f"{system_prompt}\n\nConversation so far:\n"
-        for msg in conversation_history[-5:]:  # Keep last 5 messages for context
-            role = msg['role']
-            message = msg['message']
-            conversation_context += f"{role.capitalize()}: {message}\n"
+    # Combine system prompt with conversation context
+    conversation_context = f"{system_prompt}\n\nConversation so far:\n"
+    for msg in conversation_history[-5:]:  # Keep last 5 messages for context
+        role = msg['role']
+        message = msg['message']
+        conversation_context += f"{role.capitalize()}: {message}\n"
+    
+    conversation_context += f"\nUser: {user_message}\nAssistant:"
+    return conversation_context
+
+@chatbot_bp.route('/chat', methods=['POST'])
+@token_required
+def chat_with_bot(current_user):
+    """Handle chatbot conversation"""
+    try:
+        data = request.get_json()
+        user_message = data.get('message', '')
+        context = data.get('context', [])
+        conversation_history = data.get('conversation_history', [])
         
-        conversation_context += f"\nUser: {user_message}\nAssistant:"
+        if not user_message:
+            return jsonify({'error': 'Message is required'}), 400
+        
+        conversation_context = build_chat_prompt(user_message, conversation_history)
         
         # Get AI response
         ollama = OllamaService()
@@ -281,6 +284,58 @@ Always be professional, friendly, and solution-oriented."""
         print(f"Chatbot error: {e}")
         return jsonify({'error': 'An error occurred while processing your request'}), 500
 
+@chatbot_bp.route('/chat/stream', methods=['POST'])
+@token_required
+def chat_with_bot_stream(current_user):
+    """
+    Same as /chat, streamed as Server-Sent Events: a `token` event per
+    generated token, then one `done` event with response, context and
+    conversation_history as /chat returns them
+    """
+    data = request.get_json(silent=True) or {}
+    user_message = data.get('message', '')
+    context = data.get('context', [])
+    conversation_history = data.get('conversation_history', [])
+    
+    if not user_message:
+        return jsonify({'error': 'Message is required'}), 400
+    
+    prompt = build_chat_prompt(user_message, conversation_history)
+    ollama = OllamaService()
+
+    def events():
+        tokens = []
+        new_context = context or []
+        try:
+            for chunk in ollama.stream_chat(prompt, context):
+                token = chunk.get('response', '')
+                if token:
+                    tokens.append(token)
+                    yield sse_event({'token': token}, 'token')
+                if chunk.get('done'):
+                    new_context = chunk.get('context', new_context)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"Ollama streaming error: {e}")
+            if tokens:
+                yield sse_event({'error': 'The AI service stopped responding'}, 'error')
+            else:
+                tokens.append(FALLBACK_CHAT_RESPONSE)
+                yield sse_event({'token': FALLBACK_CHAT_RESPONSE}, 'token')
+        
+        ai_response = ''.join(tokens)
+        conversation_history.append({
+            'role': 'assistant',
+            'message': ai_response,
+            'timestamp': datetime.now().isoformat()
+        })
+        yield sse_event({
+            'response': ai_response,
+            'context': new_context,
+            'conversation_history': conversation_history
+        }, 'done')
+
+    return sse_response(events())
+
 @chatbot_bp.route('/submit-from-chat', methods=['POST'])
 @token_required
 def submit_maintenance_from_chat(current_user):
@@ -4,9 +4,18 @@ from models import db, User
 import jwt
 from datetime import datetime, timedelta
 from functools import wraps
+from utils.principal_cache import principal_cache, register_invalidation_listeners
 
 auth_bp = Blueprint('auth', __name__)
 
+# Drop cached principals whenever role, is_active or password changes
+register_invalidation_listeners(User)
+
+@auth_bp.record_once
+def start_principal_cache(state):
+    """Hear evictions published by other workers once the app registers this blueprint"""
+    principal_cache.start_listening()
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -17,7 +26,9 @@ def token_required(f):
             return jsonify({'message': 'Token is missing'}), 401
         try:
             data = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=["HS256"])
-            current_user = User.query.get(data['user_id'])
+            # Tokens issued before 'iat' was added fall back to their expiry as the key
+            issued_at = data.get('iat', data.get('exp'))
+            current_user = principal_cache.load_user(db.session, User, data['user_id'], issued_at)
         except:
             return jsonify({'message': 'Token is invalid'}), 401
         return f(current_user, *args, **kwargs)
@@ -164,6 +175,7 @@ def login():
         # Generate access token
         access_token = jwt.encode({
             'user_id': user.id,
+            'iat': datetime.utcnow(),
             'exp': datetime.utcnow() + timedelta(hours=24)
         }, current_app.config['SECRET_KEY'], algorithm="HS256")
         
@@ -208,4 +220,12 @@ def get_current_user(current_user):
         'email_verified': current_user.email_verified,
         'created_at': current_user.created_at.isoformat() if current_user.created_at else None,
         'updated_at': current_user.updated_at.isoformat() if current_user.updated_at else None
-    })
\ No newline at end of file
+    })
+
+@auth_bp.route('/principal-cache/stats', methods=['GET'])
+@token_required
+def get_principal_cache_stats(current_user):
+    """Hit/miss counters for the token_required principal cache"""
+    if current_user.role != 'ADMIN':
+        return jsonify({'error': 'Admin access required'}), 403
+    return jsonify(principal_cache.stats())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for the Data Migration Pipeline
+Writes validated rows in batches instead of one INSERT + COMMIT per record
+
+For every batch of batch_size rows the loader:
+1. fetches the natural keys that already exist with one IN query and drops
+   those rows (and repeats within the run) before sending anything
+2. loads the rest:
+   - PostgreSQL: COPY FROM STDIN into a temporary staging table, then one
+     INSERT ... SELECT ... WHERE NOT EXISTS ... ON CONFLICT DO NOTHING
+   - SQLite: executemany of INSERT ... ON CONFLICT DO NOTHING
+   - anything else: plain executemany
+3. records a per-batch report (attempted, inserted, skipped, inserted id
+   range, error)
+
+Each batch runs in a savepoint, so a failing batch is rolled back on its own
+and reported while the rest of the run continues. Commits happen every
+commit_frequency rows. Because existing keys are skipped and unique
+conflicts are ignored, re-running a load is idempotent.
+"""
+
+import io
+import time
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, tuple_
+
+logger = logging.getLogger(__name__)
+
+
+def _copy_field(value: Any) -> str:
+    # Unquoted empty is NULL in COPY's csv format, quoted "" is an empty string
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime)):
+        text = value.isoformat()
+    else:
+        text = str(value)
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _copy_payload(rows: List[Dict[str, Any]], columns: Sequence[str]) -> io.StringIO:
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_copy_field(row.get(column)) for column in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+class BulkLoader:
+    """Batched, idempotent inserts with a per-batch report"""
+
+    def __init__(self, db, batch_size: int = 100, commit_frequency: int = 50):
+        self.db = db
+        self.batch_size = max(1, batch_size)
+        self.commit_frequency = max(1, commit_frequency)
+        self.batch_reports = []
+        self._uncommitted = 0
+        self._seen_keys = {}
+
+    @property
+    def session(self):
+        return self.db.session
+
+    @property
+    def dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    # ------------------------------------------------------------------
+    # Dedup
+    # ------------------------------------------------------------------
+
+    def existing_keys(self, table, key_columns: Sequence[str], keys: Iterable[Tuple]) -> set:
+        """One query returning which of the given natural keys already exist"""
+        keys = [key for key in set(keys) if all(part is not None for part in key)]
+        if not keys:
+            return set()
+        if len(key_columns) == 1:
+            column = table.c[key_columns[0]]
+            found = self.session.execute(select(column).where(column.in_([key[0] for key in keys]))).scalars()
+            return {(value,) for value in found}
+        columns = [table.c[name] for name in key_columns]
+        found = self.session.execute(select(*columns).where(tuple_(*columns).in_(keys)))
+        return {tuple(row) for row in found}
+
+    # ------------------------------------------------------------------
+    # Inserts
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _with_python_defaults(table, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Fill client-side column defaults (created_at, status, ...), which COPY would not apply"""
+        defaults = {}
+        for column in table.columns:
+            default = column.default
+            if default is None or column.primary_key or default.is_sequence:
+                continue
+            defaults[column.name] = default
+        if not defaults:
+            return rows
+        filled = []
+        for row in rows:
+            row = dict(row)
+            for name, default in defaults.items():
+                if row.get(name) is None:
+                    row[name] = default.arg(None) if default.is_callable else default.arg
+            filled.append(row)
+        return filled
+
+    def _id_bounds(self, table) -> Optional[int]:
+        return self.session.execute(select(func.max(table.c.id))).scalar()
+
+    def _insert_postgresql(self, table, rows, columns, key_columns) -> List[int]:
+        stage = f"_stage_{table.name}"
+        column_list = ', '.join(f'"{column}"' for column in columns)
+        self.session.execute(self.db.text(f'DROP TABLE IF EXISTS "{stage}"'))
+        self.session.execute(self.db.text(
+            f'CREATE TEMP TABLE "{stage}" AS SELECT {column_list} FROM "{table.name}" WITH NO DATA'
+        ))
+
+        payload = _copy_payload(rows, columns)
+        copy_sql = f'COPY "{stage}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+        cursor = self.session.connection().connection.cursor()
+        try:
+            if hasattr(cursor, 'copy_expert'):
+                cursor.copy_expert(copy_sql, payload)
+            else:
+                # psycopg 3
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(payload.getvalue())
+        finally:
+            cursor.close()
+
+        not_exists = ''
+        if key_columns:
+            match = ' AND '.join(f't."{column}" = s."{column}"' for column in key_columns)
+            not_exists = f'WHERE NOT EXISTS (SELECT 1 FROM "{table.name}" t WHERE {match})'
+        result = self.session.execute(self.db.text(
+            f'INSERT INTO "{table.name}" ({column_list}) '
+            f'SELECT {column_list} FROM "{stage}" s {not_exists} '
+            f'ON CONFLICT DO NOTHING RETURNING id'
+        ))
+        return list(result.scalars())
+
+    def _insert_executemany(self, table, rows, columns) -> Tuple[int, Optional[int], Optional[int]]:
+        params = [{column: row.get(column) for column in columns} for row in rows]
+        if self.dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+            statement = sqlite_insert(table).on_conflict_do_nothing()
+        else:
+            statement = insert(table)
+
+        # Writers are serialized on SQLite, so the new ids are exactly (max before, max after]
+        before = self._id_bounds(table) or 0
+        self.session.execute(statement, params)
+        after = self._id_bounds(table) or 0
+        inserted = after - before
+        return inserted, (before + 1 if inserted else None), (after if inserted else None)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _load_batch(self, table, batch, key_columns, seen, report) -> set:
+        """Dedup and insert one batch, filling report; returns the natural keys it wrote"""
+        fresh = batch
+        batch_keys = set()
+        if key_columns:
+            keys = [tuple(row.get(column) for column in key_columns) for row in batch]
+            existing = self.existing_keys(table, key_columns, keys)
+            fresh = []
+            for key, row in zip(keys, batch):
+                complete = all(part is not None for part in key)
+                if complete and (key in existing or key in seen or key in batch_keys):
+                    continue
+                if complete:
+                    batch_keys.add(key)
+                fresh.append(row)
+        report['skipped'] = len(batch) - len(fresh)
+        if not fresh:
+            return batch_keys
+
+        fresh = self._with_python_defaults(table, fresh)
+        columns = [column.name for column in table.columns
+                   if not column.primary_key and any(column.name in row for row in fresh)]
+        if self.dialect == 'postgresql':
+            ids = self._insert_postgresql(table, fresh, columns, key_columns)
+            report.update(inserted=len(ids), min_id=min(ids) if ids else None, max_id=max(ids) if ids else None)
+        else:
+            inserted, min_id, max_id = self._insert_executemany(table, fresh, columns)
+            report.update(inserted=inserted, min_id=min_id, max_id=max_id)
+        # Rows that lost a unique-constraint race count as skipped
+        report['skipped'] += len(fresh) - report['inserted']
+        return batch_keys
+
+    def _commit_if_due(self, rows_written: int):
+        self._uncommitted += rows_written
+        if self._uncommitted >= self.commit_frequency:
+            self.commit()
+
+    def commit(self):
+        self.session.commit()
+        self._uncommitted = 0
+
+    def load(self, table, rows: List[Dict[str, Any]], key_columns: Sequence[str] = (),
+             label: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Insert rows into table in batch_size batches
+
+        key_columns is the natural key used for dedup (existing rows and
+        repeats within the run are skipped); rows whose key has a NULL part
+        are never treated as duplicates. Returns a summary with one report per
+        batch under 'batches'. Does a final commit.
+        """
+        label = label or table.name
+        seen = self._seen_keys.setdefault((table.name, tuple(key_columns)), set())
+        summary = {'table': table.name, 'attempted': len(rows), 'inserted': 0, 'skipped': 0, 'failed': 0,
+                   'min_id': None, 'max_id': None, 'batches': []}
+
+        for batch_number, start in enumerate(range(0, len(rows), self.batch_size), 1):
+            batch = rows[start:start + self.batch_size]
+            report = {'table': table.name, 'label': label, 'batch': batch_number, 'first_row': start + 1,
+                      'attempted': len(batch), 'inserted': 0, 'skipped': 0, 'min_id': None, 'max_id': None,
+                      'error': None}
+            started = time.time()
+            try:
+                # Dedup query and insert share one savepoint, so any failure leaves the transaction usable
+                with self.session.begin_nested():
+                    batch_keys = self._load_batch(table, batch, key_columns, seen, report)
+                if key_columns:
+                    seen.update(batch_keys)
+                self._commit_if_due(report['inserted'])
+            except Exception as e:
+                report.update(inserted=0, skipped=0, min_id=None, max_id=None, error=str(e))
+                logger.error(f"Bulk load of {label} batch {batch_number} failed: {str(e)}")
+
+            report['seconds'] = round(time.time() - started, 3)
+            self.batch_reports.append(report)
+            summary['batches'].append(report)
+            summary['inserted'] += report['inserted']
+            summary['skipped'] += report['skipped']
+            if report['error']:
+                summary['failed'] += report['attempted']
+            for bound, pick in (('min_id', min), ('max_id', max)):
+                if report[bound] is not None:
+                    summary[bound] = report[bound] if summary[bound] is None else pick(summary[bound], report[bound])
+
+        self.commit()
+        logger.info(f"Bulk loaded {label}: {summary['inserted']} inserted, {summary['skipped']} skipped, "
+                    f"{summary['failed']} failed in {len(summary['batches'])} batches")
+        return summary
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Columnar ingestion engine for the Migration Pipeline
+Reads CSV/Excel files in bounded chunks and cleans/validates whole columns at a time
+
+The row-at-a-time DataCleaner remains the reference implementation: every
+ColumnCleaner method reproduces the output of its DataCleaner counterpart for
+the same input, so the two paths can be compared chunk by chunk.
+"""
+
+import re
+import logging
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+try:
+    from data_cleaner import DataCleaner
+except ImportError:
+    from pipeline.data_cleaner import DataCleaner
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+
+EMAIL_PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+# Same order as DataCleaner.clean_date so ambiguous dates resolve identically
+DATE_FORMATS = [
+    '%m/%d/%Y', '%Y-%m-%d', '%m-%d-%Y',
+    '%d/%m/%Y', '%Y/%m/%d', '%m/%d/%y',
+    '%B %d, %Y', '%b %d, %Y',
+    '%d %B %Y', '%d %b %Y'
+]
+
+NAME_SUFFIXES = {
+    r'\bJr\b': 'Jr.',
+    r'\bSr\b': 'Sr.',
+    r'\bII\b': 'II',
+    r'\bIII\b': 'III',
+    r'\bIV\b': 'IV',
+    r'\bPhD\b': 'Ph.D.',
+    r'\bMD\b': 'M.D.',
+    r'\bEsq\b': 'Esq.',
+}
+
+
+class ChunkResult:
+    """Cleaned records and row-level issues for one chunk of a file"""
+
+    def __init__(self, chunk_index: int, start_row: int, row_count: int,
+                 records: List[Dict[str, Any]], errors: List[Dict[str, Any]],
+                 warnings: List[Dict[str, Any]]):
+        self.chunk_index = chunk_index
+        self.start_row = start_row
+        self.row_count = row_count
+        self.records = records
+        self.errors = errors
+        self.warnings = warnings
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def error_messages(self) -> List[str]:
+        return [format_issue(issue) for issue in self.errors]
+
+    def warning_messages(self) -> List[str]:
+        return [format_issue(issue) for issue in self.warnings]
+
+
+def format_issue(issue: Dict[str, Any]) -> str:
+    """Render a row-level issue the same way the row-wise validators do"""
+    return f"Row {issue['row']}: {issue['message']}"
+
+
+class IssueCollector:
+    """Accumulates row-level errors/warnings from boolean masks over a chunk"""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self._errors = []
+        self._warnings = []
+        self._rule = 0
+
+    def _add(self, target, mask, field, message):
+        self._rule += 1
+        mask = mask.fillna(False).astype(bool)
+        if not mask.any():
+            return
+        rows = self.frame.index[mask.to_numpy()]
+        if isinstance(message, pd.Series):
+            messages = message[mask].tolist()
+        else:
+            messages = [message] * len(rows)
+        for row, text in zip(rows, messages):
+            # Index holds the 0-based data row; reports are 1-based like the row-wise path
+            target.append((int(row), self._rule, {'row': int(row) + 1, 'field': field, 'message': text}))
+
+    def error(self, mask, field, message):
+        self._add(self._errors, mask, field, message)
+
+    def warning(self, mask, field, message):
+        self._add(self._warnings, mask, field, message)
+
+    def error_rows(self) -> pd.Series:
+        """Boolean mask of rows that collected at least one error"""
+        failed = pd.Series(False, index=self.frame.index)
+        if self._errors:
+            failed.loc[[row for row, _, _ in self._errors]] = True
+        return failed
+
+    @staticmethod
+    def _ordered(items):
+        return [issue for _, _, issue in sorted(items, key=lambda item: (item[0], item[1]))]
+
+    @property
+    def errors(self) -> List[Dict[str, Any]]:
+        return self._ordered(self._errors)
+
+    @property
+    def warnings(self) -> List[Dict[str, Any]]:
+        return self._ordered(self._warnings)
+
+
+# ============================================================================
+# CHUNKED READERS
+# ============================================================================
+
+def _drop_blank_rows(frame: pd.DataFrame) -> pd.DataFrame:
+    if frame.empty or not len(frame.columns):
+        return frame
+    return frame[(frame != '').any(axis=1)]
+
+
+def read_csv_header(file_path: str) -> List[str]:
+    """Column names of a CSV file without reading its body"""
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+def read_csv_chunks(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    start_row: int = 0) -> Iterator[pd.DataFrame]:
+    """
+    Stream a CSV file as DataFrames of at most chunk_size rows
+
+    Every cell is read as text with blanks as '' (no NaN, no float coercion of
+    ids or zip codes). The index of each chunk is the 0-based data row number
+    in the file, so row-level reports stay stable across chunk boundaries.
+    Rows before start_row are skipped without being parsed into frames.
+    """
+    reader = pd.read_csv(
+        file_path,
+        chunksize=chunk_size,
+        dtype=object,
+        keep_default_na=False,
+        skiprows=range(1, start_row + 1) if start_row else None,
+    )
+    offset = start_row
+    for chunk in reader:
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+        yield _drop_blank_rows(chunk)
+
+
+def _unique_columns(header: Tuple[Any, ...]) -> List[str]:
+    # Same labels pandas.read_excel would produce for blank and repeated headers
+    columns = []
+    seen = {}
+    for position, value in enumerate(header):
+        name = str(value) if value is not None else f"Unnamed: {position}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        columns.append(name)
+    return columns
+
+
+def _cell_value(value: Any) -> Any:
+    # read_excel's openpyxl reader turns integral floats into ints the same way
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _xlsx_frame(rows: List[Tuple[Any, ...]], columns: List[str], offset: int) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=columns, index=pd.RangeIndex(offset, offset + len(rows)), dtype=object)
+
+
+def read_xlsx_chunks(file_path: str, header_row: int = 0,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Stream the first worksheet of an xlsx workbook as DataFrames
+
+    Uses openpyxl's read-only mode so only one chunk of rows is materialized at
+    a time. Every column is object dtype holding the cell values as read, with
+    integral floats as ints and blanks as None: inferring dtypes per chunk
+    would turn an id column into floats ('101.0') only in chunks that happen
+    to contain a blank, so titles and external ids would depend on chunk_size.
+    Trailing empty rows are dropped like read_excel does.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        for _ in range(header_row):
+            if next(rows, None) is None:
+                return
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = _unique_columns(header)
+        width = len(columns)
+
+        buffer = []
+        pending_blanks = []
+        offset = 0
+        for values in rows:
+            values = tuple(_cell_value(value) for value in values[:width]) + (None,) * (width - len(values))
+            if all(value is None for value in values):
+                pending_blanks.append(values)
+                continue
+            buffer.extend(pending_blanks)
+            pending_blanks = []
+            buffer.append(values)
+            if len(buffer) >= chunk_size:
+                yield _xlsx_frame(buffer, columns, offset)
+                offset += len(buffer)
+                buffer = []
+        if buffer:
+            yield _xlsx_frame(buffer, columns, offset)
+    finally:
+        workbook.close()
+
+
+# ============================================================================
+# COLUMN CLEANERS
+# ============================================================================
+
+def as_text(series: pd.Series) -> pd.Series:
+    """Object-dtype string view of a column, so .str methods use Python semantics"""
+    return series.astype(object).where(series.notna(), '').astype(str).astype(object)
+
+
+def column(frame: pd.DataFrame, name: str, default: str = '') -> pd.Series:
+    """frame[name] as text, or a constant column when the file lacks it (dict.get semantics)"""
+    if name in frame.columns:
+        return as_text(frame[name])
+    return pd.Series(default, index=frame.index, dtype=object)
+
+
+def _to_decimal(value: str) -> Optional[Decimal]:
+    try:
+        amount = Decimal(value)
+    except (InvalidOperation, ValueError):
+        return None
+    return None if amount.is_nan() else amount
+
+
+class ColumnCleaner:
+    """Vectorized counterparts of the DataCleaner methods"""
+
+    @staticmethod
+    def clean_string(series: pd.Series, remove_special_chars: bool = False) -> pd.Series:
+        cleaned = series.str.strip().str.replace(r'\s+', ' ', regex=True)
+        if remove_special_chars:
+            cleaned = cleaned.str.replace(r"[^\w\s\-\.\,\']", '', regex=True)
+        return cleaned
+
+    @staticmethod
+    def clean_name(series: pd.Series) -> pd.Series:
+        cleaned = series.str.strip().str.replace(r'\s+', ' ', regex=True)
+        for pattern, replacement in NAME_SUFFIXES.items():
+            cleaned = cleaned.str.replace(pattern, replacement, regex=True, flags=re.IGNORECASE)
+        return cleaned.str.title()
+
+    @staticmethod
+    def clean_email(series: pd.Series) -> pd.Series:
+        return series.str.strip().str.replace(r'\s+', '', regex=True).str.lower()
+
+    @staticmethod
+    def clean_phone(series: pd.Series) -> pd.Series:
+        cleaned = series.str.strip()
+        cleaned = cleaned.str.replace(r'[^\d+\-\(\)\s]', '', regex=True).str.replace(r'[\(\)\s]', '', regex=True)
+        digits = cleaned.str.replace(r'\D', '', regex=True)
+        lengths = digits.str.len()
+
+        ten = lengths == 10
+        eleven = (lengths == 11) & digits.str.startswith('1')
+        cleaned = cleaned.mask(ten, '(' + digits.str[:3] + ') ' + digits.str[3:6] + '-' + digits.str[6:])
+        cleaned = cleaned.mask(eleven, '+1 (' + digits.str[1:4] + ') ' + digits.str[4:7] + '-' + digits.str[7:])
+        return cleaned
+
+    @staticmethod
+    def digit_count(series: pd.Series) -> pd.Series:
+        return series.str.replace(r'\D', '', regex=True).str.len()
+
+    @staticmethod
+    def clean_currency(series: pd.Series, strip_pattern: str = r'[\$\€\£\¥\₹]',
+                       remove_spaces: bool = True) -> Tuple[pd.Series, pd.Series]:
+        """
+        Parse a currency column
+
+        Returns (amounts, numeric): amounts holds Decimal or None exactly as
+        DataCleaner.clean_currency would; numeric is the float view used for
+        range checks. NaN amounts are reported as None.
+        """
+        cleaned = series.str.strip().str.replace(strip_pattern, '', regex=True)
+        cleaned = cleaned.str.replace(',', '', regex=False)
+        if remove_spaces:
+            cleaned = cleaned.str.replace(' ', '', regex=False)
+        numeric = pd.to_numeric(cleaned, errors='coerce')
+
+        amounts = pd.Series(None, index=series.index, dtype=object)
+        parsed = numeric.notna()
+        if parsed.any():
+            amounts[parsed] = [_to_decimal(value) for value in cleaned[parsed]]
+
+        # Rare spellings Decimal accepts but to_numeric does not (e.g. '1_000')
+        leftover = ~parsed & cleaned.ne('')
+        for row, value in cleaned[leftover].items():
+            amount = _to_decimal(value)
+            if amount is not None:
+                amounts[row] = amount
+                numeric[row] = float(amount)
+        return amounts, numeric
+
+    @staticmethod
+    def clean_date(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """
+        Parse a date column trying DATE_FORMATS in order
+
+        Returns (dates, failed): dates holds datetime.date or None; failed marks
+        cells where the dateutil fallback raised instead of returning None.
+        """
+        text = series.str.strip()
+        dates = pd.Series(None, index=series.index, dtype=object)
+        failed = pd.Series(False, index=series.index)
+        remaining = series.ne('')
+
+        for fmt in DATE_FORMATS:
+            if not remaining.any():
+                break
+            parsed = pd.to_datetime(text[remaining], format=fmt, errors='coerce')
+            hit = parsed.notna()
+            if hit.any():
+                hit_index = hit[hit].index
+                dates[hit_index] = [value.date() for value in parsed[hit_index]]
+                remaining[hit_index] = False
+
+        # Whatever the fixed formats missed goes through DataCleaner's dateutil path
+        for row, value in series[remaining].items():
+            try:
+                dates[row] = DataCleaner.clean_date(value)
+            except Exception:
+                failed[row] = True
+        return dates, failed
+
+
+# ============================================================================
+# CSV CHUNK VALIDATORS
+# ============================================================================
+
+def _object_series(values, index) -> pd.Series:
+    return pd.Series(values, index=index, dtype=object)
+
+
+def _records(frame: pd.DataFrame, keep: pd.Series) -> List[Dict[str, Any]]:
+    kept = frame[keep.to_numpy()]
+    return kept.astype(object).where(kept.notna(), None).to_dict('records')
+
+
+def _address_columns(frame, cleaned, street_column):
+    cleaned['street_address_1'] = ColumnCleaner.clean_string(column(frame, street_column))
+    cleaned['city'] = ColumnCleaner.clean_string(column(frame, 'City'))
+    cleaned['state'] = ColumnCleaner.clean_string(column(frame, 'State'))
+    cleaned['zip_code'] = ColumnCleaner.clean_string(column(frame, 'Zip Code'))
+
+
+def validate_property_chunk(frame: pd.DataFrame, issues: IssueCollector) -> pd.DataFrame:
+    """Column-wise PropertyValidator.validate_property_data"""
+    cleaned = frame.copy()
+
+    issues.error(column(frame, 'Property Name').eq(''), 'Property Name', "Property name is required")
+    issues.error(column(frame, 'City').eq(''), 'City', "City is required")
+    issues.error(column(frame, 'State').eq(''), 'State', "State is required")
+
+    rent, rent_numeric = ColumnCleaner.clean_currency(column(frame, 'Rent Amount', '0'))
+    invalid_rent = rent.isna()
+    issues.error(invalid_rent, 'Rent Amount', "Invalid rent amount format")
+    issues.warning(~invalid_rent & (rent_numeric <= 0), 'Rent Amount', "Rent amount should be greater than 0")
+    cleaned['rent_amount'] = rent
+
+    _address_columns(frame, cleaned, 'Street Address')
+    return cleaned
+
+
+def validate_tenant_chunk(frame: pd.DataFrame, issues: IssueCollector) -> pd.DataFrame:
+    """Column-wise TenantValidator.validate_tenant_data"""
+    cleaned = frame.copy()
+
+    full_name = column(frame, 'Full name').str.strip()
+    issues.error(full_name.eq(''), 'Full name', "Full name is required")
+    cleaned['full_name'] = ColumnCleaner.clean_name(full_name)
+
+    email = column(frame, 'Login email').str.strip()
+    invalid_email = email.ne('') & ~email.str.match(EMAIL_PATTERN).astype(bool)
+    issues.error(invalid_email, 'Login email', "Invalid email format: " + email)
+    cleaned['email'] = ColumnCleaner.clean_email(email).where(email.ne(''), None)
+
+    phone = column(frame, 'Phone Number').str.strip()
+    issues.warning(phone.ne('') & (ColumnCleaner.digit_count(phone) < 10), 'Phone Number',
+                   "Invalid phone format: " + phone)
+    cleaned['phone_number'] = ColumnCleaner.clean_phone(phone).where(phone.ne(''), None)
+
+    _address_columns(frame, cleaned, 'Street Address')
+    return cleaned
+
+
+def validate_lease_chunk(frame: pd.DataFrame, issues: IssueCollector) -> pd.DataFrame:
+    """Column-wise LeaseValidator.validate_lease_data"""
+    cleaned = frame.copy()
+
+    tenant_name = column(frame, 'Tenants').str.strip()
+    issues.error(tenant_name.eq(''), 'Tenants', "Tenant name is required")
+    cleaned['tenant_name'] = ColumnCleaner.clean_name(tenant_name)
+
+    start_date, start_failed = ColumnCleaner.clean_date(column(frame, 'start Date'))
+    issues.error(start_failed, 'start Date', "Invalid start date format")
+    cleaned['start_date'] = start_date
+
+    end_date, end_failed = ColumnCleaner.clean_date(column(frame, 'End Date'))
+    issues.error(end_failed, 'End Date', "Invalid end date format")
+    cleaned['end_date'] = end_date
+
+    rent, rent_numeric = ColumnCleaner.clean_currency(column(frame, 'Rent Amount', '0'))
+    invalid_rent = rent.isna()
+    issues.error(invalid_rent, 'Rent Amount', "Invalid rent amount format")
+    issues.warning(~invalid_rent & (rent_numeric <= 0), 'Rent Amount', "Rent amount should be greater than 0")
+    cleaned['rent_amount'] = rent
+    return cleaned
+
+
+def validate_owner_chunk(frame: pd.DataFrame, issues: IssueCollector) -> pd.DataFrame:
+    """Column-wise OwnerValidator.validate_owner_data"""
+    cleaned = frame.copy()
+
+    full_name = column(frame, 'Name').str.strip()
+    issues.error(full_name.eq(''), 'Name', "Owner name is required")
+    cleaned['full_name'] = ColumnCleaner.clean_name(full_name)
+
+    email = column(frame, 'Email').str.strip()
+    missing_email = email.eq('')
+    invalid_email = ~missing_email & ~email.str.match(EMAIL_PATTERN).astype(bool)
+    issues.error(missing_email, 'Email', "Email is required for owners")
+    issues.error(invalid_email, 'Email', "Invalid email format: " + email)
+    cleaned['email'] = ColumnCleaner.clean_email(email).where(~missing_email & ~invalid_email, None)
+
+    username = ColumnCleaner.clean_string(email.str.split('@').str[0].str.lower())
+    cleaned['username'] = username.where(~missing_email, None)
+
+    _address_columns(frame, cleaned, 'Address')
+    return cleaned
+
+
+def validate_balance_chunk(frame: pd.DataFrame, issues: IssueCollector) -> pd.DataFrame:
+    """Column-wise BalanceValidator.validate_balance_data"""
+    cleaned = frame.copy()
+
+    tenant_name = column(frame, 'Tenants').str.strip()
+    issues.error(tenant_name.eq(''), 'Tenants', "Tenant name is required")
+    cleaned['tenant_name'] = ColumnCleaner.clean_name(tenant_name)
+
+    amount, _ = ColumnCleaner.clean_currency(column(frame, 'Balance', '0'))
+    cleaned['due_amount'] = amount
+
+    due_date, due_failed = ColumnCleaner.clean_date(column(frame, 'Due Date'))
+    issues.warning(due_failed, 'Due Date', "Invalid due date format")
+    cleaned['due_date'] = due_date
+    return cleaned
+
+
+CHUNK_VALIDATORS = {
+    'properties': validate_property_chunk,
+    'tenants': validate_tenant_chunk,
+    'leases': validate_lease_chunk,
+    'owners': validate_owner_chunk,
+    'balances': validate_balance_chunk,
+}
+
+
+def validate_chunk(frame: pd.DataFrame, file_type: str, chunk_index: int = 0) -> ChunkResult:
+    """
+    Clean and validate one chunk of a CSV file
+
+    Valid rows come back as records (original columns plus cleaned fields, as
+    the row-wise validators return them); invalid rows are dropped and reported
+    with their 1-based data row number.
+    """
+    start_row = int(frame.index[0]) if len(frame) else 0
+    validator = CHUNK_VALIDATORS.get(file_type)
+    if validator is None:
+        return ChunkResult(chunk_index, start_row, len(frame), _records(frame, pd.Series(True, index=frame.index)), [], [])
+
+    issues = IssueCollector(frame)
+    cleaned = validator(frame, issues)
+    keep = ~issues.error_rows()
+    return ChunkResult(chunk_index, start_row, len(frame), _records(cleaned, keep), issues.errors, issues.warnings)
+
+
+def compare_with_reference(frame: pd.DataFrame, file_type: str,
+                           reference_validator) -> List[Tuple[int, str, Any, Any]]:
+    """
+    Run a chunk through both engines and list every disagreement
+
+    reference_validator is the row-wise function for file_type (for example
+    PropertyValidator.validate_property_data). Returns (row, key, columnar,
+    reference) tuples; an empty list means the engines agree on that chunk.
+    """
+    result = validate_chunk(frame, file_type)
+    columnar_rows = {issue['row'] for issue in result.errors}
+    columnar_records = iter(result.records)
+
+    mismatches = []
+    for row, record in zip(frame.index, frame.to_dict('records')):
+        reference = reference_validator(record)
+        row_number = int(row) + 1
+        if reference.is_valid == (row_number in columnar_rows):
+            mismatches.append((row_number, 'is_valid', row_number not in columnar_rows, reference.is_valid))
+            continue
+        if not reference.is_valid:
+            continue
+        columnar = next(columnar_records)
+        for key, expected in reference.cleaned_data.items():
+            actual = columnar.get(key)
+            if actual != expected and not (actual is None and expected is None):
+                mismatches.append((row_number, key, actual, expected))
+    return mismatches
@@ -18,9 +18,15 @@ from pathlib import Path
 # Add project root to path for imports
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(project_root)
+sys.path.append(os.path.dirname(project_root))
 
 # Import DataCleaner first (always needed)
 from data_cleaner import DataCleaner
+from columnar_ingest import DEFAULT_CHUNK_SIZE, read_csv_chunks, read_csv_header, validate_chunk
+from bulk_loader import BulkLoader
+from run_manifest import open_manifest
+from pipeline.parallel_runner import ParallelMigrationRunner
+from werkzeug.security import generate_password_hash
 
 # Configure logging
 logging.basicConfig(
@@ -40,6 +46,8 @@ try:
         Property, Tenant, User, RentRoll, OutstandingBalance, 
         LeaseRenewal, DraftLease, FinancialTransaction
     )
+    from utils.rent_collection import rebuild_rent_collection
+    from utils.search_index import KINDS as SEARCH_INDEX_TABLES, rebuild_search_index
     from migration_config import *
     logger.info("Successfully imported Flask app and models")
 except ImportError as e:
@@ -52,7 +60,9 @@ class MigrationConfig:
     
     def __init__(self, csv_directory=".", backup_directory="./backups", dry_run=False, 
                  validate_data=True, clean_data=True, create_backup=True,
-                 batch_size=100, max_errors=50, log_level="INFO", log_file="migration.log"):
+                 batch_size=100, max_errors=50, log_level="INFO", log_file="migration.log",
+                 chunk_size=DEFAULT_CHUNK_SIZE, commit_frequency=50, parallel_processing=False,
+                 max_workers=1, resume_run_id=None):
         # Map the parameters to match what run_migration.py expects
         self.csv_directory = csv_directory
         self.csv_dir = csv_directory  # Alternative name
@@ -65,6 +75,14 @@ class MigrationConfig:
         self.max_errors = max_errors
         self.log_level = log_level
         self.log_file = log_file
+        self.chunk_size = chunk_size
+        self.commit_frequency = commit_frequency
+        self.parallel_processing = parallel_processing
+        self.max_workers = max_workers
+        self.resume_run_id = resume_run_id
+
+# Parents before children: leases and balances look up tenants, tenants and properties reference owners
+MIGRATION_ORDER = ['owners', 'properties', 'tenants', 'leases', 'balances']
 
 class ValidationResult:
     """Result of data validation"""
@@ -348,8 +366,24 @@ class CSVProcessor:
             logger.error(f"Error reading CSV file {file_path}: {str(e)}")
             raise
     
+    def read_file_type(self, file_path: str) -> str:
+        """Detect the file type from the filename and header row only"""
+        return self.detect_file_type(os.path.basename(file_path), read_csv_header(file_path))
+    
+    def iter_chunks(self, file_path: str, file_type: str, validate: bool = True, start_row: int = 0,
+                    skip_chunks=()):
+        """
+        Stream a CSV file as ChunkResults of at most config.chunk_size rows.
+        With validate=False the raw rows are passed through untouched.
+        Chunks whose index is in skip_chunks are read but not cleaned or yielded.
+        """
+        for chunk_index, chunk in enumerate(read_csv_chunks(file_path, self.config.chunk_size, start_row)):
+            if chunk_index in skip_chunks:
+                continue
+            yield validate_chunk(chunk, file_type if validate else None, chunk_index)
+    
     def validate_data(self, data: List[Dict[str, Any]], file_type: str) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
-        """Validate data using appropriate validator"""
+        """Validate data row by row (reference implementation for the columnar validators)"""
         if file_type not in self.validators:
             logger.warning(f"No validator found for file type: {file_type}")
             return data, [], []
@@ -398,6 +432,68 @@ class DatabaseMigrator:
             'failed_records': 0,
             'errors': []
         }
+        self.migration_stats['batch_reports'] = []
+        self._bulk_loader = None
+        self._default_property_id = None
+        self._default_password_hash = None
+        # Properties whose outstanding balances were loaded, for refresh_rent_collection
+        self._balance_property_ids = set()
+        # Set once rows land in a table the admin bot search index covers, for refresh_search_index
+        self._search_index_stale = False
+    
+    @property
+    def default_password_hash(self) -> str:
+        # Hashed once per run: every migrated owner starts with the same default password
+        if self._default_password_hash is None:
+            self._default_password_hash = generate_password_hash('default_password')
+        return self._default_password_hash
+    
+    @property
+    def bulk_loader(self) -> BulkLoader:
+        if self._bulk_loader is None:
+            self._bulk_loader = BulkLoader(db, batch_size=self.config.batch_size,
+                                           commit_frequency=self.config.commit_frequency)
+        return self._bulk_loader
+    
+    @staticmethod
+    def _table_row(model, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the keys that are real columns of the model's table"""
+        columns = model.__table__.c
+        return {key: value for key, value in values.items() if key in columns}
+    
+    def _load(self, model, rows: List[Dict[str, Any]], key_columns: Tuple[str, ...], label: str) -> int:
+        """Bulk load rows and fold the per-batch report into migration_stats"""
+        summary = self.bulk_loader.load(model.__table__, rows, key_columns, label=label)
+        self.migration_stats['batch_reports'].extend(summary['batches'])
+        for report in summary['batches']:
+            if report['error']:
+                last_row = report['first_row'] + report['attempted'] - 1
+                self.migration_stats['errors'].append(
+                    f"{label} batch {report['batch']} (rows {report['first_row']}-{last_row}): {report['error']}"
+                )
+        self.migration_stats['total_records'] += summary['attempted']
+        self.migration_stats['successful_records'] += summary['inserted']
+        self.migration_stats['failed_records'] += summary['failed']
+        if summary['inserted'] and model.__tablename__ in SEARCH_INDEX_TABLES:
+            self._search_index_stale = True
+        return summary['inserted']
+    
+    def resolve_tenant_ids(self, tenant_names: List[str]) -> Dict[str, int]:
+        """Map tenant names to ids with one IN query; only misses fall back to find_tenant_by_name"""
+        names = {name for name in tenant_names if name}
+        if not names:
+            return {}
+        tenant_ids = {}
+        for tenant_id, full_name in db.session.query(Tenant.id, Tenant.full_name).filter(
+            Tenant.full_name.in_(names)
+        ).order_by(Tenant.id.desc()):
+            # Descending so the lowest id wins, like .first() on the exact match
+            tenant_ids[full_name] = tenant_id
+        for name in names - set(tenant_ids):
+            tenant_id = self.find_tenant_by_name(name)
+            if tenant_id:
+                tenant_ids[name] = tenant_id
+        return tenant_ids
     
     def create_backup(self, table_name: str):
         """Create backup of table before migration"""
@@ -421,12 +517,15 @@ class DatabaseMigrator:
         """Get the first available property ID for leases/balances"""
         if not app or not db:
             return 1
+        if self._default_property_id is not None:
+            return self._default_property_id
         
         try:
             with app.app_context():
                 first_property = Property.query.first()
                 if first_property:
                     logger.info(f"Using property ID {first_property.id} as default")
+                    self._default_property_id = first_property.id
                     return first_property.id
                 else:
                     logger.warning("No properties found, using ID 1")
@@ -468,42 +567,20 @@ class DatabaseMigrator:
                 # Create backup
                 self.create_backup('properties')
                 
-                migrated_count = 0
-                for record in data:
-                    try:
-                        # Check if property already exists
-                        existing_property = Property.query.filter_by(
-                            title=record.get('Property Name', '')
-                        ).first()
-                        
-                        if existing_property:
-                            logger.info(f"Property '{record.get('Property Name')}' already exists, skipping")
-                            continue
-                        
-                        # Create new property
-                        property_data = {
-                            'title': record.get('Property Name', ''),
-                            'street_address_1': record.get('Street Address', ''),
-                            'city': record.get('City', ''),
-                            'state': record.get('State', ''),
-                            'zip_code': record.get('Zip Code', ''),
-                            'description': record.get('Description', ''),
-                            'rent_amount': record.get('rent_amount', 0),
-                            'status': record.get('Status', 'available'),
-                            'owner_id': 1  # Default owner ID
-                        }
-                        
-                        property_obj = Property(**property_data)
-                        db.session.add(property_obj)
-                        db.session.commit()
-                        
-                        migrated_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating property: {str(e)}")
-                        db.session.rollback()
-                        continue
+                rows = [self._table_row(Property, {
+                    'title': record.get('Property Name', ''),
+                    'street_address_1': record.get('Street Address', '') or '',
+                    'city': record.get('City', '') or '',
+                    'state': record.get('State', '') or '',
+                    'zip_code': record.get('Zip Code', '') or '',
+                    'description': record.get('Description', '') or '',
+                    'rent_amount': record.get('rent_amount') or 0,
+                    'status': record.get('Status', 'available') or 'available',
+                    'owner_id': 1  # Default owner ID
+                }) for record in data]
                 
+                # Properties are deduplicated on title, as before
+                migrated_count = self._load(Property, rows, ('title',), 'properties')
                 logger.info(f"Successfully migrated {migrated_count} properties")
                 return migrated_count
                 
@@ -522,45 +599,18 @@ class DatabaseMigrator:
                 # Create backup
                 self.create_backup('tenants')
                 
-                migrated_count = 0
-                for record in data:
-                    try:
-                        # Get email and convert empty string to None
-                        email = record.get('email')
-                        if email == '':
-                            email = None
-                        
-                        # Check if tenant already exists by email (if provided)
-                        existing_tenant = None
-                        if email:
-                            existing_tenant = Tenant.query.filter_by(email=email).first()
-                        
-                        if existing_tenant:
-                            logger.info(f"Tenant with email {email} already exists, skipping")
-                            continue
-                        
-                        # Create new tenant
-                        tenant_data = {
-                            'full_name': record.get('full_name', ''),
-                            'email': email,
-                            'phone_number': record.get('phone_number'),
-                            'street_address_1': record.get('street_address_1', ''),
-                            'city': record.get('city', ''),
-                            'state': record.get('state', ''),
-                            'zip_code': record.get('zip_code', ''),
-                        }
-                        
-                        tenant_obj = Tenant(**tenant_data)
-                        db.session.add(tenant_obj)
-                        db.session.commit()
-                        
-                        migrated_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating tenant: {str(e)}")
-                        db.session.rollback()
-                        continue
+                rows = [self._table_row(Tenant, {
+                    'full_name': record.get('full_name', ''),
+                    # Empty string becomes NULL so tenants without email never collide
+                    'email': record.get('email') or None,
+                    'phone_number': record.get('phone_number'),
+                    'street_address_1': record.get('street_address_1', ''),
+                    'city': record.get('city', ''),
+                    'state': record.get('state', ''),
+                    'zip_code': record.get('zip_code', ''),
+                }) for record in data]
                 
+                migrated_count = self._load(Tenant, rows, ('email',), 'tenants')
                 logger.info(f"Successfully migrated {migrated_count} tenants")
                 return migrated_count
                 
@@ -580,38 +630,24 @@ class DatabaseMigrator:
                 self.create_backup('draft_leases')
                 
                 default_property_id = self.get_default_property_id()
-                migrated_count = 0
+                tenant_ids = self.resolve_tenant_ids([record.get('tenant_name', '') for record in data])
                 
+                rows = []
                 for record in data:
-                    try:
-                        # Find tenant
-                        tenant_name = record.get('tenant_name', '')
-                        tenant_id = self.find_tenant_by_name(tenant_name)
-                        
-                        if not tenant_id:
-                            logger.warning(f"Tenant '{tenant_name}' not found for lease")
-                            continue
-                        
-                        # Create new lease
-                        lease_data = {
-                            'tenant_id': tenant_id,
-                            'property_id': default_property_id,
-                            'start_date': record.get('start_date'),
-                            'end_date': record.get('end_date'),
-                            'rent_amount': record.get('rent_amount', 0)
-                        }
-                        
-                        lease_obj = DraftLease(**lease_data)
-                        db.session.add(lease_obj)
-                        db.session.commit()
-                        
-                        migrated_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating lease: {str(e)}")
-                        db.session.rollback()
+                    tenant_name = record.get('tenant_name', '')
+                    tenant_id = tenant_ids.get(tenant_name)
+                    if not tenant_id:
+                        logger.warning(f"Tenant '{tenant_name}' not found for lease")
                         continue
+                    rows.append(self._table_row(DraftLease, {
+                        'tenant_id': tenant_id,
+                        'property_id': default_property_id,
+                        'start_date': record.get('start_date'),
+                        'end_date': record.get('end_date'),
+                        'rent_amount': record.get('rent_amount', 0)
+                    }))
                 
+                migrated_count = self._load(DraftLease, rows, ('tenant_id', 'property_id', 'start_date'), 'leases')
                 logger.info(f"Successfully migrated {migrated_count} leases")
                 return migrated_count
                 
@@ -630,50 +666,49 @@ class DatabaseMigrator:
                 # Create backup
                 self.create_backup('users')
                 
-                migrated_count = 0
-                for record in data:
-                    try:
-                        email = record.get('email', '')
-                        
-                        # Check if user already exists
-                        existing_user = User.query.filter_by(email=email).first()
-                        if existing_user:
-                            logger.info(f"User with email {email} already exists, skipping")
-                            continue
-                        
-                        # Generate unique email if needed
-                        if not email or User.query.filter_by(email=email).first():
-                            base_name = record.get('full_name', 'owner').lower().replace(' ', '.')
-                            counter = 1
-                            email = f"{base_name}@example.com"
-                            while User.query.filter_by(email=email).first():
-                                email = f"{base_name}.{counter}@example.com"
-                                counter += 1
-                        
-                        # Create new user
-                        user_data = {
-                            'username': record.get('username', email.split('@')[0]),
-                            'email': email,
-                            'password': 'default_password',  # Should be hashed in production
-                            'full_name': record.get('full_name', ''),
-                            'role': 'OWNER',
-                            'street_address_1': record.get('street_address_1', ''),
-                            'city': record.get('city', ''),
-                            'state': record.get('state', ''),
-                            'zip_code': record.get('zip_code', '')
-                        }
-                        
-                        user_obj = User(**user_data)
-                        db.session.add(user_obj)
-                        db.session.commit()
-                        
-                        migrated_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating owner: {str(e)}")
-                        db.session.rollback()
-                        continue
+                default_password = self.default_password_hash
+                
+                candidates = [record.get('username') or (record.get('email') or '').split('@')[0] for record in data]
+                taken_usernames = {
+                    username for (username,) in db.session.query(User.username).filter(User.username.in_(set(candidates)))
+                }
                 
+                rows = []
+                for record, username in zip(data, candidates):
+                    email = record.get('email', '')
+                    
+                    # Generate unique email if needed
+                    if not email:
+                        base_name = record.get('full_name', 'owner').lower().replace(' ', '.')
+                        counter = 1
+                        email = f"{base_name}@example.com"
+                        while User.query.filter_by(email=email).first():
+                            email = f"{base_name}.{counter}@example.com"
+                            counter += 1
+                        username = username or email.split('@')[0]
+                    
+                    # username is unique too; suffix repeats instead of letting the row conflict
+                    base_username, counter = username, 1
+                    while username in taken_usernames:
+                        username = f"{base_username}{counter}"
+                        counter += 1
+                    taken_usernames.add(username)
+                    
+                    first_name, _, last_name = (record.get('full_name') or '').partition(' ')
+                    rows.append(self._table_row(User, {
+                        'username': username,
+                        'email': email,
+                        'password': default_password,
+                        'first_name': first_name,
+                        'last_name': last_name,
+                        'role': 'OWNER',
+                        'street_address_1': record.get('street_address_1', '') or '',
+                        'city': record.get('city', '') or '',
+                        'state': record.get('state', '') or '',
+                        'zip_code': record.get('zip_code', '') or ''
+                    }))
+                
+                migrated_count = self._load(User, rows, ('email',), 'owners')
                 logger.info(f"Successfully migrated {migrated_count} owners")
                 return migrated_count
                 
@@ -693,38 +728,28 @@ class DatabaseMigrator:
                 self.create_backup('outstanding_balances')
                 
                 default_property_id = self.get_default_property_id()
-                migrated_count = 0
+                tenant_ids = self.resolve_tenant_ids([record.get('tenant_name', '') for record in data])
                 
+                rows = []
                 for record in data:
-                    try:
-                        # Find tenant
-                        tenant_name = record.get('tenant_name', '')
-                        tenant_id = self.find_tenant_by_name(tenant_name)
-                        
-                        if not tenant_id:
-                            logger.warning(f"Tenant '{tenant_name}' not found for balance")
-                            continue
-                        
-                        # Create new balance record
-                        balance_data = {
-                            'tenant_id': tenant_id,
-                            'property_id': default_property_id,
-                            'due_amount': record.get('due_amount', 0),
-                            'due_date': record.get('due_date'),
-                            'balance_type': record.get('balance_type', 'rent')
-                        }
-                        
-                        balance_obj = OutstandingBalance(**balance_data)
-                        db.session.add(balance_obj)
-                        db.session.commit()
-                        
-                        migrated_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error migrating balance: {str(e)}")
-                        db.session.rollback()
+                    tenant_name = record.get('tenant_name', '')
+                    tenant_id = tenant_ids.get(tenant_name)
+                    if not tenant_id:
+                        logger.warning(f"Tenant '{tenant_name}' not found for balance")
                         continue
+                    rows.append(self._table_row(OutstandingBalance, {
+                        'tenant_id': tenant_id,
+                        'property_id': default_property_id,
+                        'due_amount': record.get('due_amount') or 0,
+                        'due_date': record.get('due_date'),
+                        'balance_type': record.get('balance_type', 'rent')
+                    }))
                 
+                migrated_count = self._load(
+                    OutstandingBalance, rows, ('tenant_id', 'property_id', 'due_date', 'due_amount'), 'balances'
+                )
+                if migrated_count:
+                    self._balance_property_ids.add(default_property_id)
                 logger.info(f"Successfully migrated {migrated_count} balances")
                 return migrated_count
                 
@@ -732,6 +757,51 @@ class DatabaseMigrator:
             logger.error(f"Error in balance migration: {str(e)}")
             return 0
 
+    def refresh_rent_collection(self) -> int:
+        """
+        Recompute the rent collection rollup for the properties that received
+        balances; the bulk loader writes outstanding_balances without the
+        per-row rollup updates the API makes. Returns the property-months rebuilt.
+        """
+        if not app or not db or not self._balance_property_ids:
+            return 0
+        
+        try:
+            with app.app_context():
+                count = rebuild_rent_collection(sorted(self._balance_property_ids))
+                db.session.commit()
+        except Exception as e:
+            error_msg = f"Could not refresh the rent collection rollup: {str(e)}"
+            logger.error(f"{error_msg}; run `flask rebuild-rent-collection`")
+            self.migration_stats['errors'].append(error_msg)
+            return 0
+        
+        self._balance_property_ids.clear()
+        logger.info(f"Refreshed rent collection rollup: {count} property-months")
+        return count
+    
+    def refresh_search_index(self) -> int:
+        """
+        Rebuild the admin bot search index after rows were loaded into a table
+        it covers; the bulk loader's inserts bypass the session listeners that
+        keep it current. Returns the records indexed.
+        """
+        if not app or not db or not self._search_index_stale:
+            return 0
+        
+        try:
+            with app.app_context():
+                count = rebuild_search_index(app)
+        except Exception as e:
+            error_msg = f"Could not rebuild the search index: {str(e)}"
+            logger.error(f"{error_msg}; run `flask rebuild-search-index`")
+            self.migration_stats['errors'].append(error_msg)
+            return 0
+        
+        self._search_index_stale = False
+        # None without numpy: the admin bot then uses substring search, which needs no index
+        return count or 0
+
 class DataMigrationPipeline:
     """Main migration pipeline orchestrator"""
     
@@ -748,6 +818,33 @@ class DataMigrationPipeline:
             'errors': [],
             'warnings': []
         }
+        self.manifest = None
+        self._checkpointed_batches = 0
+    
+    def _open_manifest(self):
+        """Start a new run manifest, or load the one being resumed (never in dry-run mode)"""
+        if self.config.dry_run:
+            if self.config.resume_run_id:
+                logger.warning("Dry run: ignoring resume, no progress is recorded")
+            return
+        self.manifest = open_manifest(self.config.backup_directory, self.config, self.config.resume_run_id)
+        if self.config.resume_run_id:
+            # Chunk indexes in the manifest are only meaningful with the original chunk size
+            if self.config.chunk_size != self.manifest.chunk_size:
+                logger.warning(f"Using chunk size {self.manifest.chunk_size} from run {self.manifest.run_id} "
+                               f"instead of {self.config.chunk_size}")
+                self.config.chunk_size = self.manifest.chunk_size
+            logger.info(f"Resuming migration run {self.manifest.run_id}")
+        else:
+            logger.info(f"Migration run id: {self.manifest.run_id} (manifest {self.manifest.path})")
+    
+    def checkpoint(self, file_path: str, result, written: int):
+        """Record a committed chunk, with the batch reports written since the last checkpoint"""
+        if self.manifest is None:
+            return
+        batch_reports = self.migrator.migration_stats['batch_reports'][self._checkpointed_batches:]
+        self._checkpointed_batches += len(batch_reports)
+        self.manifest.checkpoint_chunk(file_path, result, written, batch_reports)
     
     def find_csv_files(self) -> List[str]:
         """Find all CSV files in the specified directory"""
@@ -761,23 +858,46 @@ class DataMigrationPipeline:
         
         return [str(f) for f in csv_files]
     
-    def _process_csv_file(self, file_path: str) -> bool:
+    def plan_files(self, csv_files: List[str]) -> List[Tuple[str, str]]:
+        """Pair each file with its detected type, ordered by MIGRATION_ORDER (unknown types last)"""
+        planned = [(file_path, self.csv_processor.read_file_type(file_path)) for file_path in csv_files]
+        rank = {file_type: position for position, file_type in enumerate(MIGRATION_ORDER)}
+        return sorted(planned, key=lambda item: rank.get(item[1], len(MIGRATION_ORDER)))
+    
+    def _process_csv_file(self, file_path: str, file_type: Optional[str] = None) -> bool:
         """Process a single CSV file"""
         try:
             logger.info(f"Processing file: {os.path.basename(file_path)}")
             
-            # Read and detect file type
-            data, file_type = self.csv_processor.read_csv(file_path)
+            # Detect file type from the header without reading the body
+            if file_type is None:
+                file_type = self.csv_processor.read_file_type(file_path)
+            logger.info(f"Detected file type: {file_type}")
             
             if file_type == 'unknown':
                 logger.warning(f"Could not determine file type for {os.path.basename(file_path)}")
                 return False
             
-            # Validate data
-            if self.config.validate_data:
-                validated_data, errors, warnings = self.csv_processor.validate_data(data, file_type)
+            completed_chunks = set()
+            validated = False
+            if self.manifest:
+                self.manifest.register_file(file_path, file_type)
+                if self.manifest.is_file_completed(file_path):
+                    logger.info(f"Skipping {os.path.basename(file_path)}: completed in run {self.manifest.run_id}")
+                    return True
+                completed_chunks = self.manifest.completed_chunks(file_path)
+                validated = self.manifest.is_validated(file_path)
+                if completed_chunks:
+                    logger.info(f"Resuming {os.path.basename(file_path)}: skipping {len(completed_chunks)} "
+                                f"completed chunks")
+            
+            # Validate every chunk before writing anything, so a file is still all-or-nothing
+            if self.config.validate_data and not validated:
+                errors = []
+                for result in self.csv_processor.iter_chunks(file_path, file_type):
+                    errors.extend(result.error_messages())
+                    self.migration_stats['warnings'].extend(result.warning_messages())
                 self.migration_stats['errors'].extend(errors)
-                self.migration_stats['warnings'].extend(warnings)
                 
                 if errors:
                     logger.error(f"Validation errors in {os.path.basename(file_path)}: {len(errors)} errors")
@@ -785,37 +905,27 @@ class DataMigrationPipeline:
                         logger.error(f"  - {error}")
                     return False
                 
-                data = validated_data
-            
-            self.migration_stats['total_records'] += len(data)
+                if self.manifest:
+                    self.manifest.mark_validated(file_path)
             
-            if self.config.dry_run:
-                logger.info(f"DRY RUN: Would migrate {len(data)} {file_type} records")
-                self.migration_stats['successful_records'] += len(data)
-                return True
-            
-            # Migrate data to database
-            if file_type == 'properties':
-                migrated_count = self.migrator.migrate_properties(data)
-                self.migration_stats['successful_records'] += migrated_count
-            elif file_type == 'tenants':
-                migrated_count = self.migrator.migrate_tenants(data)
-                self.migration_stats['successful_records'] += migrated_count
-            elif file_type == 'leases':
-                migrated_count = self.migrator.migrate_leases(data)
-                self.migration_stats['successful_records'] += migrated_count
-                logger.info(f"Migrated {migrated_count} lease records to database")
-            elif file_type == 'owners':
-                migrated_count = self.migrator.migrate_owners(data)
-                self.migration_stats['successful_records'] += migrated_count
-                logger.info(f"Migrated {migrated_count} owner records to database")
-            elif file_type == 'balances':
-                migrated_count = self.migrator.migrate_balances(data)
+            # Second pass: clean and migrate chunk by chunk
+            for result in self.csv_processor.iter_chunks(file_path, file_type, validate=self.config.validate_data,
+                                                         skip_chunks=completed_chunks):
+                data = result.records
+                self.migration_stats['total_records'] += len(data)
+                
+                if self.config.dry_run:
+                    logger.info(f"DRY RUN: Would migrate {len(data)} {file_type} records "
+                                f"(chunk {result.chunk_index + 1})")
+                    self.migration_stats['successful_records'] += len(data)
+                    continue
+                
+                migrated_count = self._migrate_records(file_type, data)
                 self.migration_stats['successful_records'] += migrated_count
-                logger.info(f"Migrated {migrated_count} balance records to database")
-            else:
-                logger.warning(f"Unknown file type {file_type}, skipping migration")
-                return False
+                self.checkpoint(file_path, result, migrated_count)
+            
+            if self.manifest:
+                self.manifest.finish_file(file_path)
             
             logger.info(f"Successfully processed {os.path.basename(file_path)}")
             return True
@@ -826,6 +936,27 @@ class DataMigrationPipeline:
             self.migration_stats['errors'].append(f"File {os.path.basename(file_path)}: {str(e)}")
             return False
     
+    def _migrate_records(self, file_type: str, data: List[Dict[str, Any]]) -> int:
+        """Write one chunk of validated records with the migrator for its file type"""
+        if file_type == 'properties':
+            return self.migrator.migrate_properties(data)
+        elif file_type == 'tenants':
+            return self.migrator.migrate_tenants(data)
+        elif file_type == 'leases':
+            migrated_count = self.migrator.migrate_leases(data)
+            logger.info(f"Migrated {migrated_count} lease records to database")
+            return migrated_count
+        elif file_type == 'owners':
+            migrated_count = self.migrator.migrate_owners(data)
+            logger.info(f"Migrated {migrated_count} owner records to database")
+            return migrated_count
+        elif file_type == 'balances':
+            migrated_count = self.migrator.migrate_balances(data)
+            logger.info(f"Migrated {migrated_count} balance records to database")
+            return migrated_count
+        logger.warning(f"Unknown file type {file_type}, skipping migration")
+        return 0
+    
     def run_migration(self) -> bool:
         """Run the complete migration pipeline"""
         try:
@@ -837,12 +968,24 @@ class DataMigrationPipeline:
                 return False
             
             self.migration_stats['total_files'] = len(csv_files)
+            planned_files = self.plan_files(csv_files)
+            self._open_manifest()
+            
+            if self.config.parallel_processing and self.config.max_workers > 1:
+                ParallelMigrationRunner(self).run(planned_files)
+            else:
+                # Process each file in dependency order
+                for file_path, file_type in planned_files:
+                    success = self._process_csv_file(file_path, file_type)
+                    if success:
+                        self.migration_stats['processed_files'] += 1
+            
+            self.migrator.refresh_rent_collection()
+            self.migrator.refresh_search_index()
             
-            # Process each file
-            for file_path in csv_files:
-                success = self._process_csv_file(file_path)
-                if success:
-                    self.migration_stats['processed_files'] += 1
+            # Fold in failed write batches from the bulk loader
+            self.migration_stats['errors'].extend(self.migrator.migration_stats['errors'])
+            self.migration_stats['batch_reports'] = self.migrator.migration_stats['batch_reports']
             
             # Calculate failed records
             self.migration_stats['failed_records'] = (
@@ -853,10 +996,15 @@ class DataMigrationPipeline:
             # Print summary
             self._print_summary()
             
-            return self.migration_stats['processed_files'] > 0
+            success = self.migration_stats['processed_files'] > 0
+            if self.manifest:
+                self.manifest.finish(success and self.migration_stats['processed_files'] == len(planned_files))
+            return success
             
         except Exception as e:
             logger.error(f"Migration pipeline failed: {str(e)}")
+            if self.manifest:
+                self.manifest.finish(False)
             return False
     
     def run(self) -> bool:
@@ -876,6 +1024,12 @@ class DataMigrationPipeline:
         logger.info(f"Failed migrations: {stats['failed_records']}")
         logger.info(f"Total errors: {len(stats['errors'])}")
         logger.info(f"Total warnings: {len(stats['warnings'])}")
+        batch_reports = stats.get('batch_reports', [])
+        if batch_reports:
+            failed_batches = sum(1 for report in batch_reports if report['error'])
+            logger.info(f"Write batches: {len(batch_reports)} ({failed_batches} failed)")
+        if self.manifest:
+            logger.info(f"Run id: {self.manifest.run_id} (resume with --resume {self.manifest.run_id})")
         
         if stats['errors']:
             logger.info("Recent errors:")
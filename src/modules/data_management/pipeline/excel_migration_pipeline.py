@@ -14,13 +14,20 @@ from typing import Dict, List, Any, Optional, Tuple
 import re
 from pathlib import Path
 import json
+import multiprocessing
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 
 # Add project root to path for imports
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.dirname(project_root))
 
-# Import DataCleaner
+# Import DataCleaner and the columnar engine
 from pipeline.data_cleaner import DataCleaner
+from pipeline.columnar_ingest import (
+    ColumnCleaner, IssueCollector, DEFAULT_CHUNK_SIZE, as_text, format_issue, read_xlsx_chunks
+)
+from pipeline.migration_config import get_performance_config
 
 # Configure logging
 logging.basicConfig(
@@ -119,6 +126,85 @@ class ExcelPropertyMapper:
         
         return property_data
     
+    @staticmethod
+    def map_property_frame(frame: pd.DataFrame, file_type: str, column_mapping: Dict[str, str]) -> pd.DataFrame:
+        """Column-wise map_property_data over a whole chunk; one output row per input row"""
+        index = frame.index
+
+        def get_mapped_column(field: str, default: str = '') -> pd.Series:
+            col = column_mapping.get(field)
+            if not col or col not in frame.columns:
+                return pd.Series(default, index=index, dtype=object)
+            values = frame[col]
+            return as_text(values).where(values.notna(), default)
+
+        property_id = get_mapped_column('property_id', 'Unknown')
+
+        address = get_mapped_column('address')
+        address_lines = address.str.split('\n')
+        street_address = address_lines.str[0].where(address.ne(''), address)
+
+        city = get_mapped_column('city')
+        state = get_mapped_column('state')
+        zip_code = get_mapped_column('zip')
+
+        # Fill missing city/state/zip from a second address line like "Miami FL 33101"
+        tokens = address_lines.str[1].fillna('').str.split()
+        parse = (
+            (address_lines.str.len() > 1)
+            & ~(city.ne('') & state.ne('') & zip_code.ne(''))
+            & (tokens.str.len() >= 2)
+        )
+        if parse.any():
+            city = city.mask(parse & city.eq(''), tokens.str[:-2].str.join(' '))
+            state = state.mask(parse & state.eq(''), tokens.str[-2])
+            zip_code = zip_code.mask(parse & zip_code.eq(''), tokens.str[-1])
+
+        rent_amount, _ = ColumnCleaner.clean_currency(
+            get_mapped_column('rent_amount'), strip_pattern=r'[$,]', remove_spaces=False
+        )
+        rent_amount = rent_amount.where(rent_amount.notna() & rent_amount.astype(bool), Decimal('0.00'))
+
+        description = get_mapped_column('description')
+        description = description.where(
+            description.str.strip().ne(''), f"{file_type} property at " + street_address
+        )
+
+        status = get_mapped_column('status', 'available').str.lower()
+        status = status.where(status.isin(['available', 'rented', 'maintenance', 'sold']), 'available')
+
+        purchase_price, _ = ColumnCleaner.clean_currency(
+            get_mapped_column('purchase_price'), strip_pattern=r'[$,]', remove_spaces=False
+        )
+
+        return pd.DataFrame({
+            'title': f"{file_type} " + property_id,
+            'street_address_1': street_address,
+            'city': city,
+            'state': state,
+            'zip_code': zip_code,
+            'description': description,
+            'rent_amount': rent_amount,
+            'status': status,
+            'owner_id': 1,
+            'street_address_2': '',
+            'apt_number': '',
+            'image_url': '',
+            'purchase_price': purchase_price,
+            'external_id': property_id.where(property_id.ne('Unknown'), ''),
+        }, index=index)
+
+    @staticmethod
+    def clean_property_frame(properties: pd.DataFrame) -> pd.DataFrame:
+        """Column-wise DataCleaner.clean_property_data for frames built by map_property_frame"""
+        cleaned = properties.copy()
+        for key in ['title', 'street_address_1', 'street_address_2', 'city', 'state', 'description']:
+            cleaned[key] = ColumnCleaner.clean_string(cleaned[key])
+        cleaned['zip_code'] = cleaned['zip_code'].str.replace(r'\D', '', regex=True)
+        cleaned['external_id'] = ColumnCleaner.clean_string(cleaned['external_id'], remove_special_chars=True)
+        # rent_amount and purchase_price are already Decimal/None, which clean_currency leaves unchanged
+        return cleaned
+
     @staticmethod
     def _clean_currency(value) -> Optional[Decimal]:
         """Clean and convert currency values"""
@@ -138,10 +224,14 @@ class ExcelPropertyMapper:
 class ExcelMigrationPipeline:
     """Main Excel migration pipeline"""
     
-    def __init__(self, dry_run=False, validate_data=True, clean_data=True):
+    def __init__(self, dry_run=False, validate_data=True, clean_data=True,
+                 chunk_size=DEFAULT_CHUNK_SIZE, engine='columnar'):
         self.dry_run = dry_run
         self.validate_data = validate_data
         self.clean_data = clean_data
+        self.chunk_size = chunk_size
+        # 'columnar' streams and cleans whole columns; 'rowwise' is the original DataCleaner path
+        self.engine = engine
         self.data_cleaner = DataCleaner()
         self.results = {
             'total_files': 0,
@@ -157,21 +247,148 @@ class ExcelMigrationPipeline:
         """Process a single Excel file"""
         logger.info(f"Processing Excel file: {file_path}")
         
+        if self.engine == 'rowwise':
+            return self._process_excel_file_rowwise(file_path)
+        
         try:
             # First try to detect the header row
             header_row = self._detect_header_row(file_path)
             logger.info(f"Detected header row at index: {header_row}")
             
-            # Read Excel file with detected header
-            df = pd.read_excel(file_path, header=header_row)
+            # Determine file type from filename
+            file_type = self._determine_file_type(file_path)
+            
+            column_mapping = None
+            properties = []
+            row_errors = []
+            total_rows = 0
+            
+            # Stream the sheet in chunks instead of loading the whole workbook into one DataFrame
+            for chunk in read_xlsx_chunks(file_path, header_row=header_row, chunk_size=self.chunk_size):
+                # Clean column names
+                chunk.columns = [str(col).strip().lower().replace(' ', '_') for col in chunk.columns]
+                
+                if column_mapping is None:
+                    # Get column mapping for this file type
+                    column_mapping = self._get_column_mapping(list(chunk.columns), file_type)
+                    if not column_mapping:
+                        error_msg = f"Could not determine column mapping for file type: {file_type}"
+                        self.results['errors'].append(error_msg)
+                        logger.error(error_msg)
+                        return {
+                            'file_path': file_path,
+                            'error': error_msg,
+                            'properties': []
+                        }
+                
+                total_rows += len(chunk)
+                chunk_properties, chunk_errors = self._process_chunk(chunk, file_type, column_mapping)
+                properties.extend(chunk_properties)
+                row_errors.extend(chunk_errors)
+            
+            self.results['total_properties'] += total_rows
+            self.results['processed_files'] += 1
+            
+            return {
+                'file_path': file_path,
+                'file_type': file_type,
+                'properties': properties,
+                'total_rows': total_rows,
+                'successful_properties': len(properties),
+                'row_errors': row_errors
+            }
             
-            # Clean column names
+        except Exception as e:
+            error_msg = f"Error processing file {file_path}: {str(e)}"
+            self.results['errors'].append(error_msg)
+            logger.error(error_msg)
+            return {
+                'file_path': file_path,
+                'error': error_msg,
+                'properties': []
+            }
+    
+    def _process_chunk(self, chunk: pd.DataFrame, file_type: str,
+                       column_mapping: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Map, clean and validate one chunk column-wise; returns (properties, row-level errors)"""
+        id_column = column_mapping.get('property_id', 'id')
+        if id_column not in chunk.columns:
+            return [], []
+        ids = chunk[id_column]
+        chunk = chunk[(ids.notna() & as_text(ids).str.strip().ne('nan')).to_numpy()]
+        if chunk.empty:
+            return [], []
+        
+        try:
+            properties = ExcelPropertyMapper.map_property_frame(chunk, file_type, column_mapping)
+            
+            if self.clean_data:
+                properties = ExcelPropertyMapper.clean_property_frame(properties)
+            
+            issues = IssueCollector(properties)
+            if self.validate_data:
+                self._validate_property_frame(properties, issues)
+        except Exception as e:
+            # Fall back to the row-wise reference path so one bad cell cannot sink the whole chunk
+            logger.warning(f"Columnar processing failed for rows {chunk.index[0] + 1}-{chunk.index[-1] + 1}, "
+                           f"retrying row by row: {str(e)}")
+            return self._process_rows(chunk, file_type, column_mapping)
+        
+        row_errors = issues.errors
+        self.results['errors'].extend(format_issue(issue) for issue in row_errors)
+        
+        failed = issues.error_rows()
+        valid = properties[~failed.to_numpy()]
+        self.results['failed_properties'] += int(failed.sum())
+        self.results['successful_properties'] += len(valid)
+        
+        records = valid.astype(object).where(valid.notna(), None).to_dict('records')
+        return records, row_errors
+    
+    def _process_rows(self, df: pd.DataFrame, file_type: str,
+                      column_mapping: Dict[str, str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Row-at-a-time reference implementation using ExcelPropertyMapper and DataCleaner"""
+        properties = []
+        row_errors = []
+        for index, row in df.iterrows():
+            if pd.notna(row.get(column_mapping.get('property_id', 'id'))) and str(row.get(column_mapping.get('property_id', 'id'))).strip() != 'nan':
+                try:
+                    # Map data using the column mapping
+                    property_data = ExcelPropertyMapper.map_property_data(row, file_type, column_mapping)
+                    
+                    if self.clean_data:
+                        property_data = self.data_cleaner.clean_property_data(property_data)
+                    
+                    if self.validate_data:
+                        validation_result = self._validate_property_data(property_data)
+                        if not validation_result['is_valid']:
+                            issues = [{'row': index + 1, 'field': None, 'message': error}
+                                      for error in validation_result['errors']]
+                            row_errors.extend(issues)
+                            self.results['errors'].extend(format_issue(issue) for issue in issues)
+                            self.results['failed_properties'] += 1
+                            continue
+                    
+                    properties.append(property_data)
+                    self.results['successful_properties'] += 1
+                    
+                except Exception as e:
+                    error_msg = f"Error processing row {index}: {str(e)}"
+                    row_errors.append({'row': index + 1, 'field': None, 'message': str(e)})
+                    self.results['errors'].append(error_msg)
+                    self.results['failed_properties'] += 1
+                    logger.error(error_msg)
+        return properties, row_errors
+    
+    def _process_excel_file_rowwise(self, file_path: str) -> Dict[str, Any]:
+        """Whole-sheet, row-at-a-time processing kept as the parity reference for the columnar engine"""
+        try:
+            header_row = self._detect_header_row(file_path)
+            # Object dtype so a blank cell cannot turn an integer id column into floats
+            df = pd.read_excel(file_path, header=header_row, dtype=object)
             df.columns = [str(col).strip().lower().replace(' ', '_') for col in df.columns]
             
-            # Determine file type from filename
             file_type = self._determine_file_type(file_path)
-            
-            # Get column mapping for this file type
             column_mapping = self._get_column_mapping(df.columns, file_type)
             if not column_mapping:
                 error_msg = f"Could not determine column mapping for file type: {file_type}"
@@ -183,32 +400,7 @@ class ExcelMigrationPipeline:
                     'properties': []
                 }
             
-            # Process properties
-            properties = []
-            for index, row in df.iterrows():
-                if pd.notna(row.get(column_mapping.get('property_id', 'id'))) and str(row.get(column_mapping.get('property_id', 'id'))).strip() != 'nan':
-                    try:
-                        # Map data using the column mapping
-                        property_data = ExcelPropertyMapper.map_property_data(row, file_type, column_mapping)
-                        
-                        if self.clean_data:
-                            property_data = self.data_cleaner.clean_property_data(property_data)
-                        
-                        if self.validate_data:
-                            validation_result = self._validate_property_data(property_data)
-                            if not validation_result['is_valid']:
-                                self.results['errors'].extend(validation_result['errors'])
-                                self.results['failed_properties'] += 1
-                                continue
-                        
-                        properties.append(property_data)
-                        self.results['successful_properties'] += 1
-                        
-                    except Exception as e:
-                        error_msg = f"Error processing row {index}: {str(e)}"
-                        self.results['errors'].append(error_msg)
-                        self.results['failed_properties'] += 1
-                        logger.error(error_msg)
+            properties, row_errors = self._process_rows(df, file_type, column_mapping)
             
             self.results['total_properties'] += len(df)
             self.results['processed_files'] += 1
@@ -218,7 +410,8 @@ class ExcelMigrationPipeline:
                 'file_type': file_type,
                 'properties': properties,
                 'total_rows': len(df),
-                'successful_properties': len(properties)
+                'successful_properties': len(properties),
+                'row_errors': row_errors
             }
             
         except Exception as e:
@@ -407,6 +600,57 @@ class ExcelMigrationPipeline:
             'property_id': property_data.get('external_id') or property_data.get('title', 'Unknown')
         }
     
+    def _validate_property_frame(self, properties: pd.DataFrame, issues: IssueCollector) -> None:
+        """Column-wise _validate_property_data; records errors and warnings per row on issues"""
+        required_fields = {
+            'title': "Property title",
+            'street_address_1': "Street address",
+            'rent_amount': "Rent amount",
+            'status': "Property status"
+        }
+        for field, label in required_fields.items():
+            issues.error(~properties[field].astype(bool), field, f"{label} is required but was not provided")
+        
+        # Address validation
+        street = properties['street_address_1']
+        has_street = street.ne('')
+        issues.warning(has_street & (street.str.len() < 5), 'street_address_1',
+                       "Street address seems too short, please verify")
+        issues.warning(has_street & ~street.str.contains(r'\d', regex=True).astype(bool), 'street_address_1',
+                       "Street address should typically include a number")
+        
+        # Location validation
+        issues.warning(properties['city'].eq(''), 'city',
+                       "City is missing - this may affect property visibility in searches")
+        issues.warning(properties['state'].eq(''), 'state',
+                       "State is missing - this may affect property visibility in searches")
+        zip_code = properties['zip_code']
+        issues.warning(zip_code.ne('') & ~zip_code.str.strip().str.match(r'^\d{5}(-\d{4})?$').astype(bool), 'zip_code',
+                       "ZIP code format is invalid (should be 5 digits or ZIP+4)")
+        issues.warning(zip_code.eq(''), 'zip_code',
+                       "ZIP code is missing - this may affect property visibility in searches")
+        
+        # Financial validation
+        rent = properties['rent_amount'].astype(float)
+        has_rent = properties['rent_amount'].astype(bool)
+        issues.error(has_rent & (rent <= 0), 'rent_amount', "Rent amount must be greater than zero")
+        issues.warning(has_rent & (rent > 100000), 'rent_amount', "Rent amount seems unusually high, please verify")
+        
+        purchase_price = properties['purchase_price'].astype(float)
+        issues.warning(properties['purchase_price'].astype(bool) & (purchase_price <= 0), 'purchase_price',
+                       "Purchase price should be greater than zero")
+        
+        # Description validation
+        description_length = properties['description'].str.len()
+        issues.warning(description_length.between(1, 9), 'description',
+                       "Description is very short - consider adding more details")
+        issues.warning(description_length > 1000, 'description',
+                       "Description is very long - consider shortening it")
+        
+        # External ID validation
+        issues.warning(properties['external_id'].str.len() > 50, 'external_id',
+                       "External ID is unusually long")
+    
     def save_to_database(self, properties: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Save properties to database with improved transaction handling and duplicate checking"""
         if self.dry_run:
@@ -550,19 +794,60 @@ class ExcelMigrationPipeline:
     def get_results(self) -> Dict[str, Any]:
         """Get migration results"""
         return self.results.copy()
+    
+    def merge_results(self, other: Dict[str, Any]):
+        """Fold the results of a pipeline that ran in a worker process into this one"""
+        for key, value in other.items():
+            if isinstance(value, list):
+                self.results[key].extend(value)
+            else:
+                self.results[key] += value
 
-def process_excel_files(file_paths: List[str], dry_run=False, validate_data=True, clean_data=True) -> Dict[str, Any]:
-    """Process multiple Excel files"""
-    pipeline = ExcelMigrationPipeline(dry_run=dry_run, validate_data=validate_data, clean_data=clean_data)
+def _process_excel_file_in_worker(file_path: str, options: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Parse, clean and validate one workbook in a pool process; never touches the database"""
+    pipeline = ExcelMigrationPipeline(dry_run=True, **options)
+    result = pipeline.process_excel_file(file_path)
+    return result, pipeline.get_results()
+
+def process_excel_files(file_paths: List[str], dry_run=False, validate_data=True, clean_data=True,
+                        chunk_size=DEFAULT_CHUNK_SIZE, engine='columnar', max_workers=None) -> Dict[str, Any]:
+    """
+    Process multiple Excel files
+    
+    With more than one worker (max_workers, or PERFORMANCE_CONFIG when
+    parallel_processing is on) each workbook is parsed, cleaned and validated
+    in its own process; saving stays in this process.
+    """
+    options = {
+        'validate_data': validate_data,
+        'clean_data': clean_data,
+        'chunk_size': chunk_size,
+        'engine': engine,
+    }
+    pipeline = ExcelMigrationPipeline(dry_run=dry_run, **options)
+    
+    if max_workers is None:
+        performance_config = get_performance_config()
+        max_workers = performance_config['max_workers'] if performance_config['parallel_processing'] else 1
     
     all_properties = []
     file_results = []
     
-    for file_path in file_paths:
-        result = pipeline.process_excel_file(file_path)
-        file_results.append(result)
-        if 'properties' in result:
-            all_properties.extend(result['properties'])
+    if max_workers > 1 and len(file_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(file_paths)),
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            outcomes = list(executor.map(_process_excel_file_in_worker, file_paths, repeat(options)))
+        for result, worker_results in outcomes:
+            pipeline.merge_results(worker_results)
+            file_results.append(result)
+            if 'properties' in result:
+                all_properties.extend(result['properties'])
+    else:
+        for file_path in file_paths:
+            result = pipeline.process_excel_file(file_path)
+            file_results.append(result)
+            if 'properties' in result:
+                all_properties.extend(result['properties'])
     
     # Save to database (only if not dry run)
     save_result = pipeline.save_to_database(all_properties)
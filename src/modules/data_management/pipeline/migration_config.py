@@ -301,6 +301,7 @@ ERROR_HANDLING_CONFIG = {
 # Performance configuration
 PERFORMANCE_CONFIG = {
     "batch_size": 100,
+    "chunk_size": 10000,  # rows per read/clean/validate chunk
     "use_transactions": True,
     "commit_frequency": 50,
     "parallel_processing": False,
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Parallel runner for the Data Migration Pipeline
+Fans CSV chunks out to a process pool for cleaning/validation and feeds a single DB writer
+
+Enabled with PERFORMANCE_CONFIG["parallel_processing"] (or --parallel):
+- the parent streams each file with read_csv_chunks and submits every chunk
+  to a ProcessPoolExecutor running columnar_ingest.validate_chunk
+- at most 2 * max_workers chunks are in flight, so memory stays bounded no
+  matter how large the files are
+- results are consumed strictly in submission order, and files are submitted
+  in MIGRATION_ORDER, so owners are written before properties, tenants,
+  leases and balances even though validation of later files runs ahead
+- the writer (this process) loads each chunk in batch_size batches, and the
+  migrator commits every commit_frequency rows
+
+Unlike the sequential path, a file is not all-or-nothing: invalid rows are
+reported and skipped, valid rows are written, and the run stops once more
+than max_errors row errors have been collected.
+
+With a run manifest, completed files and chunks are never submitted, each
+written chunk is checkpointed, and a file is finished once the writer has
+consumed its end-of-file marker.
+"""
+
+import os
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+from columnar_ingest import read_csv_chunks, validate_chunk
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelMigrationRunner:
+    """Process-pool validation with a single ordered writer"""
+
+    def __init__(self, pipeline, start_method: str = 'spawn'):
+        self.pipeline = pipeline
+        self.config = pipeline.config
+        self.stats = pipeline.migration_stats
+        self.start_method = start_method
+        self.window = max(2, self.config.max_workers * 2)
+        self._file_errors = set()
+
+    def _iter_chunks(self, planned_files: List[Tuple[str, str]]):
+        """
+        Yield (file_path, file_type, chunk_index, frame) across all files in
+        write order, followed by (file_path, file_type, None, None) once a file
+        has been read completely
+        """
+        manifest = self.pipeline.manifest
+        for file_path, file_type in planned_files:
+            if file_type == 'unknown':
+                logger.warning(f"Could not determine file type for {os.path.basename(file_path)}")
+                continue
+            completed_chunks = set()
+            try:
+                if manifest:
+                    manifest.register_file(file_path, file_type)
+                    if manifest.is_file_completed(file_path):
+                        logger.info(f"Skipping {os.path.basename(file_path)}: completed in run {manifest.run_id}")
+                        self.stats['processed_files'] += 1
+                        continue
+                    completed_chunks = manifest.completed_chunks(file_path)
+                logger.info(f"Queueing {os.path.basename(file_path)} ({file_type}), "
+                            f"{len(completed_chunks)} chunks already completed")
+                for chunk_index, chunk in enumerate(read_csv_chunks(file_path, self.config.chunk_size)):
+                    if chunk_index not in completed_chunks:
+                        yield file_path, file_type, chunk_index, chunk
+                yield file_path, file_type, None, None
+            except Exception as e:
+                error_msg = f"File {os.path.basename(file_path)}: {str(e)}"
+                logger.error(f"Error reading {os.path.basename(file_path)}: {str(e)}")
+                self.stats['errors'].append(error_msg)
+                self._file_errors.add(file_path)
+
+    def _submit(self, executor, source, pending) -> bool:
+        item = next(source, None)
+        if item is None:
+            return False
+        file_path, file_type, chunk_index, chunk = item
+        if chunk_index is None:
+            pending.append((file_path, file_type, None))
+            return True
+        validate_as = file_type if self.config.validate_data else None
+        pending.append((file_path, file_type, executor.submit(validate_chunk, chunk, validate_as, chunk_index)))
+        return True
+
+    def _write(self, file_type: str, records) -> int:
+        """Load one validated chunk; the migrator's bulk loader splits it into batch_size batches"""
+        return self.pipeline._migrate_records(file_type, records)
+
+    def run(self, planned_files: List[Tuple[str, str]]) -> bool:
+        logger.info(f"Running parallel migration with {self.config.max_workers} workers "
+                    f"(batch size {self.config.batch_size}, commit every {self.config.commit_frequency} rows)")
+
+        seen_files = []
+        row_errors = 0
+        source = self._iter_chunks(planned_files)
+        pending = deque()
+
+        with ProcessPoolExecutor(max_workers=self.config.max_workers,
+                                 mp_context=multiprocessing.get_context(self.start_method)) as executor:
+            while len(pending) < self.window and self._submit(executor, source, pending):
+                pass
+
+            while pending:
+                file_path, file_type, future = pending.popleft()
+                # Keep the pool busy while this chunk is written
+                self._submit(executor, source, pending)
+
+                if future is None:
+                    # End of file: every chunk before this marker has been written
+                    if file_path not in seen_files:
+                        seen_files.append(file_path)
+                    if self.pipeline.manifest and file_path not in self._file_errors:
+                        self.pipeline.manifest.finish_file(file_path)
+                    continue
+
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error_msg = f"File {os.path.basename(file_path)}: {str(e)}"
+                    logger.error(f"Worker failed on {os.path.basename(file_path)}: {str(e)}")
+                    self.stats['errors'].append(error_msg)
+                    self._file_errors.add(file_path)
+                    continue
+
+                if file_path not in seen_files:
+                    seen_files.append(file_path)
+
+                errors = result.error_messages()
+                row_errors += len(errors)
+                self.stats['errors'].extend(errors)
+                self.stats['warnings'].extend(result.warning_messages())
+                self.stats['total_records'] += result.row_count
+
+                if self.config.dry_run:
+                    logger.info(f"DRY RUN: Would migrate {len(result.records)} {file_type} records "
+                                f"(chunk {result.chunk_index + 1} of {os.path.basename(file_path)})")
+                    self.stats['successful_records'] += len(result.records)
+                else:
+                    written = self._write(file_type, result.records)
+                    self.stats['successful_records'] += written
+                    self.pipeline.checkpoint(file_path, result, written)
+
+                if row_errors > self.config.max_errors:
+                    logger.error(f"Stopping migration: {row_errors} row errors exceed max_errors "
+                                 f"({self.config.max_errors})")
+                    for _, _, queued in pending:
+                        if queued is not None:
+                            queued.cancel()
+                    pending.clear()
+                    break
+
+        self.stats['processed_files'] += len([path for path in seen_files if path not in self._file_errors])
+        return row_errors <= self.config.max_errors
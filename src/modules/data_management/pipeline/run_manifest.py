@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Run manifest for the Data Migration Pipeline
+Checkpoints a migration run so it can be resumed with run_migration.py --resume <run-id>
+
+Every non dry-run migration writes backups/migration_run_<run-id>.json with:
+- the chunk size and the SHA-256 of every input file
+- per file: whether validation passed, and one entry per written chunk
+  (start row, row count, rows written, failed rows)
+- per table: rows inserted and the inserted id ranges, taken from the bulk
+  loader's batch reports
+
+A chunk is checkpointed only after the bulk loader has committed it. On
+resume, files whose hash is unchanged skip validation and every chunk that
+completed without failed batches; a file whose content changed is processed
+again from the start. Because the bulk loader skips keys that already exist,
+redoing a chunk that was written but not yet checkpointed is harmless.
+"""
+
+import os
+import json
+import uuid
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PREFIX = 'migration_run_'
+
+# Run and file status constants
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+
+def file_sha256(file_path: str, block_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class RunManifest:
+    """Progress of one migration run, saved as JSON in the backup directory"""
+
+    def __init__(self, path: Path, data: Dict[str, Any]):
+        self.path = path
+        self.data = data
+
+    @staticmethod
+    def manifest_path(backup_directory: str, run_id: str) -> Path:
+        return Path(backup_directory) / f"{MANIFEST_PREFIX}{run_id}.json"
+
+    @classmethod
+    def create(cls, backup_directory: str, config) -> 'RunManifest':
+        run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        Path(backup_directory).mkdir(parents=True, exist_ok=True)
+        manifest = cls(cls.manifest_path(backup_directory, run_id), {
+            'run_id': run_id,
+            'status': STATUS_RUNNING,
+            'csv_directory': os.path.abspath(config.csv_directory),
+            'chunk_size': config.chunk_size,
+            'batch_size': config.batch_size,
+            'started_at': _now(),
+            'updated_at': None,
+            'finished_at': None,
+            'resumed_at': [],
+            'files': {},
+            'tables': {},
+        })
+        manifest.save()
+        return manifest
+
+    @classmethod
+    def load(cls, backup_directory: str, run_id: str) -> 'RunManifest':
+        path = cls.manifest_path(backup_directory, run_id)
+        if not path.exists():
+            raise FileNotFoundError(f"No manifest for run {run_id} in {backup_directory}")
+        with open(path) as handle:
+            manifest = cls(path, json.load(handle))
+        manifest.data['status'] = STATUS_RUNNING
+        manifest.data['resumed_at'].append(_now())
+        manifest.save()
+        return manifest
+
+    @property
+    def run_id(self) -> str:
+        return self.data['run_id']
+
+    @property
+    def chunk_size(self) -> int:
+        return self.data['chunk_size']
+
+    def save(self):
+        """Write the manifest atomically, so a crash never leaves it half written"""
+        self.data['updated_at'] = _now()
+        temp_path = self.path.with_suffix('.json.tmp')
+        with open(temp_path, 'w') as handle:
+            json.dump(self.data, handle, indent=2, default=str)
+        os.replace(temp_path, self.path)
+
+    # ------------------------------------------------------------------
+    # Files and chunks
+    # ------------------------------------------------------------------
+
+    def register_file(self, file_path: str, file_type: str) -> Dict[str, Any]:
+        """Return the file's entry, starting it over if the file changed since it was recorded"""
+        key = os.path.abspath(file_path)
+        content_hash = file_sha256(file_path)
+        entry = self.data['files'].get(key)
+        if entry and entry['sha256'] != content_hash:
+            logger.warning(f"{os.path.basename(file_path)} changed since run {self.run_id}, "
+                           f"processing it again from the start")
+            entry = None
+        if entry is None:
+            entry = {
+                'file_type': file_type,
+                'sha256': content_hash,
+                'size': os.path.getsize(file_path),
+                'status': STATUS_RUNNING,
+                'validated': False,
+                'chunks': {},
+            }
+            self.data['files'][key] = entry
+            self.save()
+        return entry
+
+    def _entry(self, file_path: str) -> Dict[str, Any]:
+        return self.data['files'][os.path.abspath(file_path)]
+
+    def is_file_completed(self, file_path: str) -> bool:
+        entry = self.data['files'].get(os.path.abspath(file_path))
+        return bool(entry) and entry['status'] == STATUS_COMPLETED
+
+    def is_validated(self, file_path: str) -> bool:
+        return self._entry(file_path)['validated']
+
+    def completed_chunks(self, file_path: str) -> set:
+        """Indexes of the chunks that were written without failed batches"""
+        entry = self.data['files'].get(os.path.abspath(file_path))
+        if not entry:
+            return set()
+        return {int(index) for index, chunk in entry['chunks'].items() if chunk['status'] == STATUS_COMPLETED}
+
+    def mark_validated(self, file_path: str):
+        self._entry(file_path)['validated'] = True
+        self.save()
+
+    def checkpoint_chunk(self, file_path: str, result, written: int, batch_reports: List[Dict[str, Any]]):
+        """Record a written chunk and the id ranges its batches inserted"""
+        failed_rows = sum(report['attempted'] for report in batch_reports if report['error'])
+        self._entry(file_path)['chunks'][str(result.chunk_index)] = {
+            'status': STATUS_FAILED if failed_rows else STATUS_COMPLETED,
+            'start_row': result.start_row,
+            'row_count': result.row_count,
+            'written': written,
+            'failed_rows': failed_rows,
+            'finished_at': _now(),
+        }
+        for report in batch_reports:
+            self._record_range(report)
+        self.save()
+
+    def finish_file(self, file_path: str) -> bool:
+        """
+        Called once every chunk of the file has been written or skipped; the
+        file is completed unless one of its chunks had failed batches
+        """
+        entry = self._entry(file_path)
+        failed = any(chunk['status'] == STATUS_FAILED for chunk in entry['chunks'].values())
+        entry['chunk_count'] = len(entry['chunks'])
+        entry['status'] = STATUS_FAILED if failed else STATUS_COMPLETED
+        self.save()
+        return entry['status'] == STATUS_COMPLETED
+
+    # ------------------------------------------------------------------
+    # Tables
+    # ------------------------------------------------------------------
+
+    def _record_range(self, report: Dict[str, Any]):
+        if not report['inserted']:
+            return
+        table = self.data['tables'].setdefault(report['table'], {'inserted': 0, 'id_ranges': []})
+        table['inserted'] += report['inserted']
+        if report['min_id'] is None:
+            return
+        ranges = table['id_ranges']
+        if ranges and ranges[-1][1] + 1 == report['min_id']:
+            ranges[-1][1] = report['max_id']
+        else:
+            ranges.append([report['min_id'], report['max_id']])
+
+    def finish(self, success: bool):
+        self.data['status'] = STATUS_COMPLETED if success else STATUS_FAILED
+        self.data['finished_at'] = _now()
+        self.save()
+
+    def summary(self) -> Dict[str, Any]:
+        files = self.data['files'].values()
+        return {
+            'run_id': self.run_id,
+            'status': self.data['status'],
+            'files_completed': sum(1 for entry in files if entry['status'] == STATUS_COMPLETED),
+            'chunks_completed': sum(len([c for c in entry['chunks'].values() if c['status'] == STATUS_COMPLETED])
+                                    for entry in files),
+            'tables': {name: table['inserted'] for name, table in self.data['tables'].items()},
+        }
+
+
+def open_manifest(backup_directory: str, config, run_id: Optional[str] = None) -> RunManifest:
+    """Load the manifest of run_id, or start a new run when run_id is None"""
+    if run_id:
+        return RunManifest.load(backup_directory, run_id)
+    return RunManifest.create(backup_directory, config)
@@ -13,6 +13,7 @@ from pathlib import Path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from data_migration_pipeline import DataMigrationPipeline, MigrationConfig
+from run_manifest import RunManifest
 from migration_config import get_logging_config, get_backup_config, get_performance_config
 
 def parse_arguments():
@@ -34,6 +35,16 @@ Examples:
   # Run migration with specific configuration
   python run_migration.py --no-validation --no-backup --batch-size 50
 
+  # Clean/validate on 4 processes, commit every 500 rows; a failed file keeps
+  # the rows committed before the failure, so rerun it with --resume
+  python run_migration.py --parallel --workers 4 --batch-size 500 --commit-frequency 500
+
+  # Load row by row even where PERFORMANCE_CONFIG enables parallel processing
+  python run_migration.py --no-parallel
+
+  # Resume an interrupted run, skipping the chunks it already committed
+  python run_migration.py --resume 20240101_120000_a1b2c3
+
   # Run migration with verbose logging
   python run_migration.py --verbose --log-level DEBUG
         """
@@ -81,10 +92,47 @@ Examples:
     parser.add_argument(
         '--batch-size',
         type=int,
-        default=100,
+        default=get_performance_config()['batch_size'],
         help='Batch size for database operations (default: 100)'
     )
     
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=get_performance_config()['chunk_size'],
+        help='Rows read, cleaned and validated per chunk (default: 10000)'
+    )
+    
+    parser.add_argument(
+        '--parallel',
+        action=argparse.BooleanOptionalAction,
+        default=get_performance_config()['parallel_processing'],
+        help='Clean and validate chunks in a process pool while a single writer loads the DB. '
+             'Unlike the sequential path, a file is not all-or-nothing: rows committed before a '
+             'failure stay loaded, and --resume skips them (default: PERFORMANCE_CONFIG '
+             'parallel_processing)'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=get_performance_config()['max_workers'],
+        help='Worker processes for --parallel (default: PERFORMANCE_CONFIG max_workers)'
+    )
+    
+    parser.add_argument(
+        '--commit-frequency',
+        type=int,
+        default=get_performance_config()['commit_frequency'],
+        help='Commit after this many written rows (default: 50)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        metavar='RUN_ID',
+        help='Resume the run with this id from its manifest in the backup directory'
+    )
+    
     parser.add_argument(
         '--max-errors',
         type=int,
@@ -157,10 +205,28 @@ def validate_arguments(args):
     if args.batch_size <= 0:
         errors.append("Batch size must be positive")
     
+    # Check chunk size
+    if args.chunk_size <= 0:
+        errors.append("Chunk size must be positive")
+    
+    # Check parallel options
+    if args.workers <= 0:
+        errors.append("Workers must be positive")
+    
+    if args.commit_frequency <= 0:
+        errors.append("Commit frequency must be positive")
+    
     # Check max errors
     if args.max_errors <= 0:
         errors.append("Max errors must be positive")
     
+    # Check the run being resumed
+    if args.resume:
+        if args.dry_run:
+            errors.append("--resume cannot be combined with --dry-run")
+        elif not RunManifest.manifest_path(args.backup_dir, args.resume).exists():
+            errors.append(f"No manifest for run {args.resume} in {args.backup_dir}")
+    
     # Check backup directory
     if not args.no_backup:
         backup_path = Path(args.backup_dir)
@@ -233,7 +299,12 @@ def create_migration_config(args):
         clean_data=not args.no_cleaning,
         dry_run=args.dry_run,
         batch_size=args.batch_size,
-        max_errors=args.max_errors
+        max_errors=args.max_errors,
+        chunk_size=args.chunk_size,
+        commit_frequency=args.commit_frequency,
+        parallel_processing=args.parallel,
+        max_workers=args.workers,
+        resume_run_id=args.resume
     )
     
     return config
@@ -250,7 +321,12 @@ def print_migration_info(config, args):
     print(f"Data Cleaning: {config.clean_data}")
     print(f"Create Backup: {config.create_backup}")
     print(f"Batch Size: {config.batch_size}")
+    print(f"Chunk Size: {config.chunk_size}")
+    print(f"Commit Frequency: {config.commit_frequency}")
+    print(f"Parallel Processing: {config.parallel_processing} ({config.max_workers} workers)")
     print(f"Max Errors: {config.max_errors}")
+    if config.resume_run_id:
+        print(f"Resuming Run: {config.resume_run_id}")
     print(f"Log Level: {args.log_level}")
     print(f"Log File: {args.log_file}")
     print("=" * 60)
@@ -297,6 +373,9 @@ def main():
         
         success = pipeline.run_migration()
         
+        if pipeline.manifest:
+            print(f"\nRun id: {pipeline.manifest.run_id} (manifest: {pipeline.manifest.path})")
+        
         if success:
             logger.info("Migration completed successfully!")
             print("\n✅ Migration completed successfully!")
@@ -304,6 +383,8 @@ def main():
         else:
             logger.error("Migration failed!")
             print("\n❌ Migration failed! Check the log file for details.")
+            if pipeline.manifest:
+                print(f"   Fix the cause and continue with: python run_migration.py --resume {pipeline.manifest.run_id}")
             return 1
             
     except KeyboardInterrupt:
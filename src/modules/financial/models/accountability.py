@@ -104,6 +104,18 @@ class GeneralLedger(BaseModel):
     CATEGORY_REVENUE = 'revenue'
     CATEGORY_EXPENSES = 'expenses'
 
+class GeneralLedgerCheckpoint(BaseModel):
+    """Opening balance of a property's ledger at the start of a month"""
+    __tablename__ = 'general_ledger_checkpoints'
+    __table_args__ = (
+        db.UniqueConstraint('property_id', 'period_start', name='uq_general_ledger_checkpoint_period'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False, index=True)
+    period_start = db.Column(db.Date, nullable=False)  # first day of the month
+    opening_balance = db.Column(db.Numeric(14, 2), nullable=False, default=0)  # signed sum of entries dated before period_start
+
 class Banking(BaseModel):
     __tablename__ = 'banking'
     
@@ -6,12 +6,38 @@ from models.rental_owner import RentalOwner, RentalOwnerManager
 from models.tenant import Tenant
 from config import db
 from routes.auth_routes import token_required
+from utils.ledger_balance import post_entry, reprice_entry, remove_entry, balance_as_of
+from utils.db_utils import month_bucket, bucket_to_date
+from utils.ttl_cache import TTLCache
 from datetime import datetime, date
 from decimal import Decimal
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy import and_, or_, func, desc, case
+import os
 
 accountability_bp = Blueprint('accountability', __name__)
 
+# Short-lived per-user cache for the dashboard analytics endpoints
+dashboard_cache = TTLCache(
+    max_entries=int(os.environ.get('DASHBOARD_CACHE_MAX_ENTRIES', 1024)),
+    ttl_seconds=int(os.environ.get('DASHBOARD_CACHE_TTL', 30))
+)
+
+def get_scoped_property_ids(current_user):
+    """Ids of the properties the user manages (every property for admins)"""
+    query = db.session.query(Property.id)
+    if not (current_user.role == 'ADMIN' or current_user.username == 'admin'):
+        query = query.join(
+            RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
+        ).filter(
+            RentalOwnerManager.user_id == current_user.id
+        )
+    return [row.id for row in query.all()]
+
+def shift_month(month_start, months):
+    """First day of the month `months` away from month_start (negative goes back)"""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
 # ============================================================================
 # DASHBOARD ANALYTICS ROUTES
 # ============================================================================
@@ -21,16 +47,13 @@ accountability_bp = Blueprint('accountability', __name__)
 def get_financials_dashboard(current_user):
     """Get dashboard analytics for Financials page"""
     try:
+        cache_key = ('financials', current_user.id)
+        cached = dashboard_cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached)
+        
         # Get user's properties using RentalOwnerManager relationship
-        if current_user.role == 'ADMIN' or current_user.username == 'admin':
-            properties = Property.query.all()
-        else:
-            properties = Property.query.join(
-                RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
-            ).filter(
-                RentalOwnerManager.user_id == current_user.id
-            ).all()
-        property_ids = [p.id for p in properties]
+        property_ids = get_scoped_property_ids(current_user)
         
         if not property_ids:
             return jsonify({
@@ -60,32 +83,44 @@ def get_financials_dashboard(current_user):
         period_start = date(current_date.year, current_date.month, 1)
         
         # Get previous period data
-        if current_date.month == 1:
-            prev_period_start = date(current_date.year - 1, 12, 1)
-        else:
-            prev_period_start = date(current_date.year, current_date.month - 1, 1)
-        
-        # Current period financials
-        current_financials = AccountabilityFinancial.query.filter(
-            AccountabilityFinancial.property_id.in_(property_ids),
-            AccountabilityFinancial.period_start_date >= period_start
-        ).all()
+        prev_period_start = shift_month(period_start, -1)
         
-        # Previous period financials
-        prev_financials = AccountabilityFinancial.query.filter(
-            AccountabilityFinancial.property_id.in_(property_ids),
+        # Current period, previous period and all-time expense categories in one aggregate
+        is_current = AccountabilityFinancial.period_start_date >= period_start
+        is_previous = and_(
             AccountabilityFinancial.period_start_date >= prev_period_start,
             AccountabilityFinancial.period_start_date < period_start
-        ).all()
+        )
+        
+        def period_sum(condition, column):
+            return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+        
+        def total(column):
+            return func.coalesce(func.sum(column), 0)
+        
+        totals = db.session.query(
+            period_sum(is_current, AccountabilityFinancial.total_income).label('revenue'),
+            period_sum(is_current, AccountabilityFinancial.total_expenses).label('expenses'),
+            period_sum(is_previous, AccountabilityFinancial.total_income).label('prev_revenue'),
+            period_sum(is_previous, AccountabilityFinancial.total_expenses).label('prev_expenses'),
+            total(AccountabilityFinancial.maintenance_costs).label('maintenance'),
+            total(AccountabilityFinancial.insurance_costs).label('insurance'),
+            total(AccountabilityFinancial.property_taxes).label('property_tax'),
+            total(AccountabilityFinancial.property_management_fees).label('management'),
+            total(AccountabilityFinancial.utilities).label('utilities'),
+            total(AccountabilityFinancial.hoa_fees).label('hoa')
+        ).filter(
+            AccountabilityFinancial.property_id.in_(property_ids)
+        ).one()
         
         # Calculate current period totals
-        total_revenue = sum(f.total_income for f in current_financials)
-        total_expenses = sum(f.total_expenses for f in current_financials)
+        total_revenue = Decimal(str(totals.revenue))
+        total_expenses = Decimal(str(totals.expenses))
         net_profit = total_revenue - total_expenses
         
         # Calculate previous period totals
-        prev_total_revenue = sum(f.total_income for f in prev_financials)
-        prev_total_expenses = sum(f.total_expenses for f in prev_financials)
+        prev_total_revenue = Decimal(str(totals.prev_revenue))
+        prev_total_expenses = Decimal(str(totals.prev_expenses))
         prev_net_profit = prev_total_revenue - prev_total_expenses
         
         # Calculate trends
@@ -93,43 +128,41 @@ def get_financials_dashboard(current_user):
         expenses_trend = ((total_expenses - prev_total_expenses) / prev_total_expenses * 100) if prev_total_expenses > 0 else 0
         profit_trend = ((net_profit - prev_net_profit) / prev_net_profit * 100) if prev_net_profit > 0 else 0
         
-        # Get chart data from actual financial records
-        all_financials = AccountabilityFinancial.query.filter(
+        # Chart data: income and expenses summed per month in SQL
+        month = month_bucket(AccountabilityFinancial.period_start_date)
+        monthly_totals = db.session.query(
+            month.label('month'),
+            func.coalesce(func.sum(AccountabilityFinancial.total_income), 0).label('revenue'),
+            func.coalesce(func.sum(AccountabilityFinancial.total_expenses), 0).label('expenses')
+        ).filter(
             AccountabilityFinancial.property_id.in_(property_ids)
-        ).order_by(AccountabilityFinancial.period_start_date).all()
-        
-        # Prepare chart data
-        chart_labels = []
-        revenue_data = []
-        expenses_data = []
+        ).group_by(month).order_by(month).all()
         
-        for financial in all_financials:
-            period_label = f"{financial.financial_period.title()} {financial.financial_year}"
-            chart_labels.append(period_label)
-            revenue_data.append(float(financial.total_income))
-            expenses_data.append(float(financial.total_expenses))
+        chart_labels = [bucket_to_date(row.month).strftime('%b %Y') for row in monthly_totals]
+        revenue_data = [float(row.revenue) for row in monthly_totals]
+        expenses_data = [float(row.expenses) for row in monthly_totals]
         
-        # Calculate expense breakdown from actual data
+        # Expense breakdown from the all-time category sums
         expense_categories = {
-            'Maintenance': sum(f.maintenance_costs for f in all_financials),
-            'Insurance': sum(f.insurance_costs for f in all_financials),
-            'Property Tax': sum(f.property_taxes for f in all_financials),
-            'Management': sum(f.property_management_fees for f in all_financials),
-            'Utilities': sum(f.utilities for f in all_financials),
-            'HOA': sum(f.hoa_fees for f in all_financials)
+            'Maintenance': totals.maintenance,
+            'Insurance': totals.insurance,
+            'Property Tax': totals.property_tax,
+            'Management': totals.management,
+            'Utilities': totals.utilities,
+            'HOA': totals.hoa
         }
         
         expense_labels = list(expense_categories.keys())
         expense_values = [float(v) for v in expense_categories.values()]
         
-        return jsonify({
+        payload = {
             'totalRevenue': float(total_revenue),
             'totalExpenses': float(total_expenses),
             'netProfit': float(net_profit),
-            'properties': len(properties),
-            'revenueTrend': round(revenue_trend, 1),
-            'expensesTrend': round(expenses_trend, 1),
-            'profitTrend': round(profit_trend, 1),
+            'properties': len(property_ids),
+            'revenueTrend': round(float(revenue_trend), 1),
+            'expensesTrend': round(float(expenses_trend), 1),
+            'profitTrend': round(float(profit_trend), 1),
             'propertiesTrend': 0,  # No change in properties
             'chartData': {
                 'revenueExpense': {
@@ -142,7 +175,9 @@ def get_financials_dashboard(current_user):
                     'values': expense_values
                 }
             }
-        })
+        }
+        dashboard_cache.set(cache_key, payload)
+        return jsonify(payload)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -365,16 +400,13 @@ def get_general_ledger_dashboard(current_user):
 def get_banking_dashboard(current_user):
     """Get dashboard analytics for Banking page"""
     try:
+        cache_key = ('banking', current_user.id)
+        cached = dashboard_cache.get(cache_key)
+        if cached is not None:
+            return jsonify(cached)
+        
         # Get user's properties using RentalOwnerManager relationship
-        if current_user.role == 'ADMIN' or current_user.username == 'admin':
-            properties = Property.query.all()
-        else:
-            properties = Property.query.join(
-                RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
-            ).filter(
-                RentalOwnerManager.user_id == current_user.id
-            ).all()
-        property_ids = [p.id for p in properties]
+        property_ids = get_scoped_property_ids(current_user)
         
         if not property_ids:
             return jsonify({
@@ -404,103 +436,84 @@ def get_banking_dashboard(current_user):
         month_start = date(current_date.year, current_date.month, 1)
         
         # Get previous month data
-        if current_date.month == 1:
-            prev_month_start = date(current_date.year - 1, 12, 1)
-        else:
-            prev_month_start = date(current_date.year, current_date.month - 1, 1)
+        prev_month_start = shift_month(month_start, -1)
         
-        # Total balance across all accounts
-        total_balance = db.session.query(func.sum(Banking.current_balance)).filter(
+        # Active accounts: balances chart and total balance
+        banking_accounts = db.session.query(
+            Banking.bank_name, Banking.account_type, Banking.current_balance
+        ).filter(
             Banking.property_id.in_(property_ids),
             Banking.is_active == True
-        ).scalar() or 0
-        
-        # Current month transactions
-        current_deposits = db.session.query(func.sum(BankingTransaction.amount)).filter(
-            BankingTransaction.banking_account.has(Banking.property_id.in_(property_ids)),
-            BankingTransaction.transaction_type == 'deposit',
-            BankingTransaction.transaction_date >= month_start
-        ).scalar() or 0
-        
-        current_withdrawals = db.session.query(func.sum(BankingTransaction.amount)).filter(
-            BankingTransaction.banking_account.has(Banking.property_id.in_(property_ids)),
-            BankingTransaction.transaction_type == 'withdrawal',
-            BankingTransaction.transaction_date >= month_start
-        ).scalar() or 0
-        
-        # Pending transactions
-        pending_transactions = BankingTransaction.query.filter(
-            BankingTransaction.banking_account.has(Banking.property_id.in_(property_ids)),
-            BankingTransaction.status == 'pending'
-        ).count()
+        ).all()
+        total_balance = sum((account.current_balance or 0 for account in banking_accounts), Decimal('0'))
         
-        # Previous month calculations
-        prev_deposits = db.session.query(func.sum(BankingTransaction.amount)).filter(
-            BankingTransaction.banking_account.has(Banking.property_id.in_(property_ids)),
-            BankingTransaction.transaction_type == 'deposit',
+        # Current/previous month deposits and withdrawals plus pending count in one aggregate
+        is_deposit = BankingTransaction.transaction_type == 'deposit'
+        is_withdrawal = BankingTransaction.transaction_type == 'withdrawal'
+        in_current = BankingTransaction.transaction_date >= month_start
+        in_previous = and_(
             BankingTransaction.transaction_date >= prev_month_start,
             BankingTransaction.transaction_date < month_start
-        ).scalar() or 0
+        )
         
-        prev_withdrawals = db.session.query(func.sum(BankingTransaction.amount)).filter(
-            BankingTransaction.banking_account.has(Banking.property_id.in_(property_ids)),
-            BankingTransaction.transaction_type == 'withdrawal',
-            BankingTransaction.transaction_date >= prev_month_start,
-            BankingTransaction.transaction_date < month_start
-        ).scalar() or 0
+        def amount_sum(*conditions):
+            return func.coalesce(func.sum(case((and_(*conditions), BankingTransaction.amount), else_=0)), 0)
+        
+        totals = db.session.query(
+            amount_sum(is_deposit, in_current).label('current_deposits'),
+            amount_sum(is_withdrawal, in_current).label('current_withdrawals'),
+            amount_sum(is_deposit, in_previous).label('prev_deposits'),
+            amount_sum(is_withdrawal, in_previous).label('prev_withdrawals'),
+            func.coalesce(func.sum(case((BankingTransaction.status == 'pending', 1), else_=0)), 0).label('pending')
+        ).join(
+            Banking, BankingTransaction.banking_account_id == Banking.id
+        ).filter(
+            Banking.property_id.in_(property_ids)
+        ).one()
+        
+        current_deposits = Decimal(str(totals.current_deposits))
+        current_withdrawals = Decimal(str(totals.current_withdrawals))
+        prev_deposits = Decimal(str(totals.prev_deposits))
+        prev_withdrawals = Decimal(str(totals.prev_withdrawals))
+        pending_transactions = int(totals.pending)
         
         # Calculate trends
         deposits_trend = ((current_deposits - prev_deposits) / prev_deposits * 100) if prev_deposits > 0 else 0
         withdrawals_trend = ((current_withdrawals - prev_withdrawals) / prev_withdrawals * 100) if prev_withdrawals > 0 else 0
         
-        # Get chart data from actual banking data
-        banking_accounts = Banking.query.filter(
-            Banking.property_id.in_(property_ids),
-            Banking.is_active == True
-        ).all()
-        
         # Account balances chart data
-        account_labels = []
-        account_values = []
-        for account in banking_accounts:
-            account_labels.append(f"{account.bank_name} - {account.account_type.title()}")
-            account_values.append(float(account.current_balance))
-        
-        # Transaction activity chart data
-        all_transactions = BankingTransaction.query.filter(
-            BankingTransaction.banking_account.has(Banking.property_id.in_(property_ids))
-        ).order_by(BankingTransaction.transaction_date).all()
-        
-        # Group transactions by month for the last 6 months
-        monthly_deposits = []
-        monthly_withdrawals = []
-        monthly_labels = []
+        account_labels = [f"{account.bank_name} - {account.account_type.title()}" for account in banking_accounts]
+        account_values = [float(account.current_balance) for account in banking_accounts]
+        
+        # Transaction activity for the last 6 months, grouped by month in SQL
+        first_month = shift_month(month_start, -5)
+        month = month_bucket(BankingTransaction.transaction_date)
+        monthly_rows = db.session.query(
+            month.label('month'),
+            BankingTransaction.transaction_type,
+            func.coalesce(func.sum(BankingTransaction.amount), 0).label('total')
+        ).join(
+            Banking, BankingTransaction.banking_account_id == Banking.id
+        ).filter(
+            Banking.property_id.in_(property_ids),
+            BankingTransaction.transaction_date >= first_month,
+            BankingTransaction.transaction_type.in_(['deposit', 'withdrawal'])
+        ).group_by(month, BankingTransaction.transaction_type).all()
         
-        for i in range(6):
-            month_date = date(current_date.year, current_date.month - i, 1)
-            month_start_date = month_date.replace(day=1)
-            if month_date.month == 1:
-                month_end_date = month_date.replace(year=month_date.year - 1, month=12, day=31)
-            else:
-                month_end_date = month_date.replace(month=month_date.month - 1, day=28)
-            
-            month_transactions = [t for t in all_transactions if month_start_date <= t.transaction_date <= month_end_date]
-            
-            deposits = sum(float(t.amount) for t in month_transactions if t.transaction_type == 'deposit')
-            withdrawals = sum(float(t.amount) for t in month_transactions if t.transaction_type == 'withdrawal')
-            
-            monthly_deposits.insert(0, deposits)
-            monthly_withdrawals.insert(0, withdrawals)
-            monthly_labels.insert(0, month_date.strftime('%b'))
+        monthly_totals = {(bucket_to_date(row.month), row.transaction_type): float(row.total) for row in monthly_rows}
+        months = [shift_month(first_month, i) for i in range(6)]
+        monthly_labels = [m.strftime('%b') for m in months]
+        monthly_deposits = [monthly_totals.get((m, 'deposit'), 0.0) for m in months]
+        monthly_withdrawals = [monthly_totals.get((m, 'withdrawal'), 0.0) for m in months]
         
-        return jsonify({
+        payload = {
             'totalBalance': float(total_balance),
             'totalDeposits': float(current_deposits),
             'totalWithdrawals': float(current_withdrawals),
             'pendingTransactions': pending_transactions,
             'balanceTrend': 8.5,  # Mock trend
-            'depositsTrend': round(deposits_trend, 1),
-            'withdrawalsTrend': round(withdrawals_trend, 1),
+            'depositsTrend': round(float(deposits_trend), 1),
+            'withdrawalsTrend': round(float(withdrawals_trend), 1),
             'pendingTrend': -2,  # Mock trend
             'chartData': {
                 'accountBalances': {
@@ -513,7 +526,9 @@ def get_banking_dashboard(current_user):
                     'withdrawals': monthly_withdrawals
                 }
             }
-        })
+        }
+        dashboard_cache.set(cache_key, payload)
+        return jsonify(payload)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -594,6 +609,7 @@ def create_accountability_financial(current_user):
         
         db.session.add(financial)
         db.session.commit()
+        dashboard_cache.clear()  # dashboards may aggregate this record for several users
         
         return jsonify({
             'message': 'Financial record created successfully',
@@ -711,16 +727,7 @@ def create_general_ledger_entry(current_user):
         # Parse date
         transaction_date = datetime.strptime(data.get('transaction_date', date.today().isoformat()), '%Y-%m-%d').date()
         
-        # Calculate running balance
-        last_entry = GeneralLedger.query.filter_by(property_id=data['property_id']).order_by(desc(GeneralLedger.id)).first()
-        running_balance = last_entry.running_balance if last_entry else 0
-        
-        if data['transaction_type'] == 'debit':
-            running_balance += Decimal(str(data['amount']))
-        else:
-            running_balance -= Decimal(str(data['amount']))
-        
-        # Create new ledger entry
+        # Create new ledger entry; the balance engine assigns the running balance
         ledger_entry = GeneralLedger(
             property_id=data['property_id'],
             user_id=current_user.id,
@@ -729,14 +736,13 @@ def create_general_ledger_entry(current_user):
             account_category=data['account_category'],
             account_subcategory=data['account_subcategory'],
             amount=Decimal(str(data['amount'])),
-            running_balance=running_balance,
             reference_number=data.get('reference_number', ''),
             description=data['description'],
             notes=data.get('notes', ''),
             posted_by=current_user.full_name
         )
         
-        db.session.add(ledger_entry)
+        post_entry(ledger_entry)
         db.session.commit()
         
         return jsonify({
@@ -837,6 +843,10 @@ def update_general_ledger_entry(current_user, entry_id):
         if not manager and current_user.role != 'ADMIN' and current_user.username != 'admin':
             return jsonify({'error': 'Access denied'}), 403
         
+        old_transaction_type = ledger_entry.transaction_type
+        old_amount = ledger_entry.amount
+        old_transaction_date = ledger_entry.transaction_date
+        
         # Update fields
         if 'transaction_date' in data:
             ledger_entry.transaction_date = datetime.strptime(data['transaction_date'], '%Y-%m-%d').date()
@@ -855,43 +865,9 @@ def update_general_ledger_entry(current_user, entry_id):
         if 'notes' in data:
             ledger_entry.notes = data['notes']
         
-        # Recalculate running balance if amount or type changed
-        if 'amount' in data or 'transaction_type' in data:
-            # Get all entries for this property up to this entry
-            all_entries = GeneralLedger.query.filter(
-                GeneralLedger.property_id == ledger_entry.property_id,
-                GeneralLedger.id <= ledger_entry.id
-            ).order_by(GeneralLedger.id).all()
-            
-            running_balance = 0
-            for entry in all_entries:
-                if entry.id == ledger_entry.id:
-                    # Use updated values for current entry
-                    if entry.transaction_type == 'debit':
-                        running_balance += entry.amount
-                    else:
-                        running_balance -= entry.amount
-                else:
-                    # Use existing values for other entries
-                    if entry.transaction_type == 'debit':
-                        running_balance += entry.amount
-                    else:
-                        running_balance -= entry.amount
-            
-            ledger_entry.running_balance = running_balance
-            
-            # Update running balances for all subsequent entries
-            subsequent_entries = GeneralLedger.query.filter(
-                GeneralLedger.property_id == ledger_entry.property_id,
-                GeneralLedger.id > ledger_entry.id
-            ).order_by(GeneralLedger.id).all()
-            
-            for entry in subsequent_entries:
-                if entry.transaction_type == 'debit':
-                    running_balance += entry.amount
-                else:
-                    running_balance -= entry.amount
-                entry.running_balance = running_balance
+        # Shift this and all later running balances by the change in signed amount
+        if 'amount' in data or 'transaction_type' in data or 'transaction_date' in data:
+            reprice_entry(ledger_entry, old_transaction_type, old_amount, old_transaction_date)
         
         db.session.commit()
         
@@ -932,35 +908,8 @@ def delete_general_ledger_entry(current_user, entry_id):
         if not manager and current_user.role != 'ADMIN' and current_user.username != 'admin':
             return jsonify({'error': 'Access denied'}), 403
         
-        # Recalculate running balances for all subsequent entries
-        subsequent_entries = GeneralLedger.query.filter(
-            GeneralLedger.property_id == ledger_entry.property_id,
-            GeneralLedger.id > ledger_entry.id
-        ).order_by(GeneralLedger.id).all()
-        
-        # Get the running balance before this entry
-        previous_entries = GeneralLedger.query.filter(
-            GeneralLedger.property_id == ledger_entry.property_id,
-            GeneralLedger.id < ledger_entry.id
-        ).order_by(GeneralLedger.id).all()
-        
-        running_balance = 0
-        for entry in previous_entries:
-            if entry.transaction_type == 'debit':
-                running_balance += entry.amount
-            else:
-                running_balance -= entry.amount
-        
-        # Update running balances for subsequent entries
-        for entry in subsequent_entries:
-            if entry.transaction_type == 'debit':
-                running_balance += entry.amount
-            else:
-                running_balance -= entry.amount
-            entry.running_balance = running_balance
-        
-        # Delete the entry
-        db.session.delete(ledger_entry)
+        # Pull the entry's amount out of every later running balance and delete it
+        remove_entry(ledger_entry)
         db.session.commit()
         
         return jsonify({'message': 'Ledger entry deleted successfully'}), 200
@@ -969,6 +918,41 @@ def delete_general_ledger_entry(current_user, entry_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 400
 
+@accountability_bp.route('/general-ledger/balance', methods=['GET'])
+@token_required
+def get_general_ledger_balance(current_user):
+    """Get a property's ledger balance as of a date (defaults to today)"""
+    try:
+        property_id = request.args.get('property_id', type=int)
+        if not property_id:
+            return jsonify({'error': 'Missing required parameter: property_id'}), 400
+        
+        property = Property.query.get(property_id)
+        if not property:
+            return jsonify({'error': 'Property not found'}), 404
+        
+        manager = RentalOwnerManager.query.filter_by(
+            rental_owner_id=property.rental_owner_id,
+            user_id=current_user.id
+        ).first()
+        
+        if not manager and current_user.role != 'ADMIN' and current_user.username != 'admin':
+            return jsonify({'error': 'Access denied'}), 403
+        
+        as_of = request.args.get('as_of')
+        as_of_date = datetime.strptime(as_of, '%Y-%m-%d').date() if as_of else date.today()
+        
+        return jsonify({
+            'property_id': property_id,
+            'as_of': as_of_date.isoformat(),
+            'balance': float(balance_as_of(property_id, as_of_date))
+        })
+        
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @accountability_bp.route('/general-ledger/<int:entry_id>', methods=['GET'])
 @token_required
 def get_general_ledger_entry(current_user, entry_id):
@@ -1064,6 +1048,7 @@ def create_banking_account(current_user):
         
         db.session.add(banking_account)
         db.session.commit()
+        dashboard_cache.clear()  # dashboards may aggregate this record for several users
         
         return jsonify({
             'message': 'Banking account created successfully',
@@ -1192,6 +1177,7 @@ def create_banking_transaction(current_user, account_id):
         
         db.session.add(transaction)
         db.session.commit()
+        dashboard_cache.clear()  # dashboards may aggregate this record for several users
         
         return jsonify({
             'message': 'Transaction created successfully',
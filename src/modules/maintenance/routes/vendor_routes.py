@@ -4,7 +4,8 @@ from models.user import User
 from config import db
 from routes.auth_routes import token_required
 from datetime import datetime
-from sqlalchemy import or_, and_
+from sqlalchemy import or_, and_, select
+from utils.csv_export import csv_response, stream_query, wants_gzip
 
 vendor_bp = Blueprint('vendor_bp', __name__)
 
@@ -378,52 +379,43 @@ def delete_vendor(current_user, vendor_id):
 @vendor_bp.route('/export', methods=['GET'])
 @token_required
 def export_vendors(current_user):
-    """Export vendors to CSV"""
+    """Export vendors to CSV, streamed (?gzip=1 for a .csv.gz)"""
     try:
         if current_user.role not in ['OWNER', 'AGENT']:
             return jsonify({'error': 'Access denied'}), 403
         
-        import csv
-        import io
-        from flask import make_response
-        
-        vendors = Vendor.query.filter_by(created_by_user_id=current_user.id).all()
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            'First Name', 'Last Name', 'Company Name', 'Email', 'Phone',
-            'Category', 'Address', 'City', 'State', 'ZIP', 'Website',
-            'Insurance Provider', 'Policy Number', 'Insurance Expiration'
-        ])
-        
-        # Write vendor data
-        for vendor in vendors:
-            writer.writerow([
-                vendor.first_name,
-                vendor.last_name,
-                vendor.company_name or '',
-                vendor.primary_email,
-                vendor.phone_1 or '',
-                vendor.category.name if vendor.category else '',
-                vendor.street_address or '',
-                vendor.city or '',
-                vendor.state or '',
-                vendor.zip_code or '',
-                vendor.website or '',
-                vendor.insurance_provider or '',
-                vendor.policy_number or '',
-                vendor.insurance_expiration_date or ''
-            ])
-        
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=vendors_{datetime.now().strftime("%Y%m%d")}.csv'
-        
-        return response
+        # Only the exported columns, with the category name joined in instead of loaded per vendor
+        vendors = select(
+            Vendor.first_name,
+            Vendor.last_name,
+            Vendor.company_name,
+            Vendor.primary_email,
+            Vendor.phone_1,
+            VendorCategory.name,
+            Vendor.street_address,
+            Vendor.city,
+            Vendor.state,
+            Vendor.zip_code,
+            Vendor.website,
+            Vendor.insurance_provider,
+            Vendor.policy_number,
+            Vendor.insurance_expiration_date
+        ).outerjoin(
+            VendorCategory, Vendor.category_id == VendorCategory.id
+        ).where(
+            Vendor.created_by_user_id == current_user.id
+        ).order_by(Vendor.id)
+        
+        return csv_response(
+            [
+                'First Name', 'Last Name', 'Company Name', 'Email', 'Phone',
+                'Category', 'Address', 'City', 'State', 'ZIP', 'Website',
+                'Insurance Provider', 'Policy Number', 'Insurance Expiration'
+            ],
+            stream_query(vendors),
+            f'vendors_{datetime.now().strftime("%Y%m%d")}',
+            compress=wants_gzip(request)
+        )
     except Exception as e:
         print(f"Error exporting vendors: {str(e)}")
         return jsonify({'error': str(e)}), 400
\ No newline at end of file
@@ -127,59 +127,105 @@ def get_available_rental_owners(current_user):
 @property_bp.route('/', methods=['GET'])
 @token_required
 def get_properties(current_user):
+    """
+    List the current user's properties with active tenant counts and rental status.
+
+    Everything is computed in one grouped query. Optional pagination:
+    - limit / offset: classic paging
+    - after_id: keyset paging (properties with id > after_id)
+    The body stays a JSON array; paging metadata is returned in the
+    X-Total-Count and X-Next-After-Id headers.
+    """
     try:
-        print("Fetching properties for user:", current_user.id)
+        from models.tenant import Tenant
+        from datetime import date
+        from sqlalchemy import func, case
+
         status = request.args.get('status')  # Add status filter
-        print(f"Status filter: {status}")
-        
-        # Get properties owned by the current user
-        properties = Property.query.filter(Property.owner_id == current_user.id).all()
-        print(f"Found {len(properties)} properties")
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+        after_id = request.args.get('after_id', type=int)
+        today = date.today()
+
+        # Active tenants (lease hasn't ended) per property, computed once for all properties
+        active_counts = db.session.query(
+            Tenant.property_id.label('property_id'),
+            func.count(Tenant.id).label('active_tenants')
+        ).filter(
+            Tenant.lease_end >= today
+        ).group_by(Tenant.property_id).subquery()
+
+        active_tenants = func.coalesce(active_counts.c.active_tenants, 0)
+        rental_status = case(
+            (active_tenants > 0, 'rented'),
+            (Property.status == 'maintenance', 'maintenance'),
+            else_='available'
+        )
+
+        query = db.session.query(
+            Property,
+            active_tenants.label('active_tenants'),
+            rental_status.label('rental_status'),
+            RentalOwner.id.label('ro_id'),
+            RentalOwner.company_name.label('ro_company_name'),
+            RentalOwner.business_type.label('ro_business_type'),
+            RentalOwner.contact_email.label('ro_contact_email'),
+            RentalOwner.email.label('ro_email'),
+            RentalOwner.contact_phone.label('ro_contact_phone'),
+            RentalOwner.phone_number.label('ro_phone_number')
+        ).outerjoin(
+            active_counts, active_counts.c.property_id == Property.id
+        ).outerjoin(
+            RentalOwner, RentalOwner.id == Property.rental_owner_id
+        ).filter(Property.owner_id == current_user.id)
+
+        # Apply server-side status filter in SQL
+        if status:
+            query = query.filter(rental_status == status)
+
+        total = None
+        if limit is not None:
+            limit = max(1, min(limit, 1000))
+            total = query.order_by(None).count()
+
+        query = query.order_by(Property.id)
+        if after_id is not None:
+            query = query.filter(Property.id > after_id)
+        elif offset:
+            query = query.offset(max(offset, 0))
+        if limit is not None:
+            query = query.limit(limit)
+
+        rows = query.all()
+
+        # Properties are filtered by owner_id, so the owner is always the current user
+        owner_info = {
+            'id': current_user.id,
+            'username': current_user.username,
+            'full_name': current_user.full_name,
+            'email': current_user.email
+        }
+
         properties_data = []
-        for prop in properties:
-            # Check if property has active tenants to determine actual rental status
-            from models.tenant import Tenant
-            from datetime import date
-            today = date.today()
-            
-            # Get active tenants (lease hasn't ended)
-            active_tenants = Tenant.query.filter(
-                Tenant.property_id == prop.id,
-                Tenant.lease_end >= today
-            ).count() if hasattr(Tenant, 'lease_end') else Tenant.query.filter_by(property_id=prop.id).count()
-            
-            # Determine actual rental status
-            if active_tenants > 0:
-                rental_status = 'rented'
-            elif prop.status == 'maintenance':
-                rental_status = 'maintenance'
-            else:
-                rental_status = 'available'
-            
-            # Apply server-side status filter if provided
-            if status and rental_status != status:
-                continue  # Skip this property if it doesn't match the filter
-            
-            # Get rental owner information using the direct relationship
-            rental_owner_info = None
-            if prop.rental_owner:
-                # Use the direct rental owner relationship
+        for row in rows:
+            prop = row.Property
+            if row.ro_id is not None:
                 rental_owner_info = {
-                   'id': prop.rental_owner.id,
-                   'company_name': prop.rental_owner.company_name,
-                   'business_type': prop.rental_owner.business_type or 'Property Owner',
-                   'contact_email': prop.rental_owner.contact_email or prop.rental_owner.email,
-                   'contact_phone': prop.rental_owner.contact_phone or prop.rental_owner.phone_number
+                    'id': row.ro_id,
+                    'company_name': row.ro_company_name,
+                    'business_type': row.ro_business_type or 'Property Owner',
+                    'contact_email': row.ro_contact_email or row.ro_email,
+                    'contact_phone': row.ro_contact_phone or row.ro_phone_number
                 }
-            elif prop.owner:
+            else:
                 # Fallback to user information if no rental owner linked
                 rental_owner_info = {
-                   'id': prop.owner.id,
-                   'company_name': prop.owner.full_name or prop.owner.username,
-                   'business_type': 'Property Owner',
-                   'contact_email': prop.owner.email
+                    'id': current_user.id,
+                    'company_name': current_user.full_name or current_user.username,
+                    'business_type': 'Property Owner',
+                    'contact_email': current_user.email
                 }
-            
+
             properties_data.append({
                 'id': prop.id,
                 'title': prop.title,
@@ -195,22 +241,22 @@ def get_properties(current_user):
                 },
                 'description': prop.description,
                 'rent_amount': float(prop.rent_amount) if prop.rent_amount else None,
-                'status': rental_status,  # Use calculated rental status
+                'status': row.rental_status,  # Use calculated rental status
                 'original_status': prop.status,  # Keep original for reference
-                'tenant_count': active_tenants,
+                'tenant_count': row.active_tenants,
                 'image_url': prop.image_url,
                 'created_at': prop.updated_at.isoformat() if prop.updated_at else None,  # Use updated_at as created_at
                 'updated_at': prop.updated_at.isoformat() if prop.updated_at else None,
-                'owner': {
-                   'id': prop.owner.id,
-                   'username': prop.owner.username,
-                   'full_name': prop.owner.full_name,
-                   'email': prop.owner.email
-                } if prop.owner else None,
+                'owner': owner_info,
                 'rental_owner': rental_owner_info
             })
-        
-        return jsonify(properties_data), 200
+
+        response = jsonify(properties_data)
+        if total is not None:
+            response.headers['X-Total-Count'] = str(total)
+            if len(rows) == limit:
+                response.headers['X-Next-After-Id'] = str(rows[-1].Property.id)
+        return response, 200
     except Exception as e:
         print("Error fetching properties:", str(e))
         return jsonify({'error': str(e)}), 400
@@ -1,13 +1,25 @@
 from flask import Blueprint, request, jsonify, send_file
 from datetime import datetime, date, timedelta
-from sqlalchemy import and_, func, desc
 from models import db, User, Property, Tenant, MaintenanceRequest, FinancialTransaction, Vendor, Association, AssociationMembership
 from models.rental_owner import RentalOwner, RentalOwnerManager
+from models.association import AssociationPropertyAssignment, AssociationBalance
 from utils.pdf_generator import PropertyReportPDFGenerator
+from utils.pdf_streaming import StreamedTable, StreamingDocTemplate
+from utils.pdf_styles import PARAGRAPH_STYLES, TABLE_STYLES, build_table
+from utils.report_cache import ReportCache, cache_key, data_version
+from utils.private_data import private_data_dir
+from utils.report_jobs import ReportJobQueue, build_job_store, job_to_dict, STATUS_COMPLETED
+from utils.report_loaders import (
+    REPORT_STREAM_CHUNK_ROWS, ReportDataLoader, ReportContext, RowStream, format_address, report_scope,
+    vendor_display_name
+)
+from models.vendor import VendorCategory
+from contextlib import nullcontext
 from functools import wraps
 import jwt
 import io
 import os
+import shutil
 from config import app
 
 reporting_bp = Blueprint('reporting', __name__)
@@ -139,25 +151,13 @@ def generate_report(current_user):
     try:
         print(f"🔍 Starting report generation for type: {report_type}")
         
-        if report_type == 'property_summary':
-            report_data = generate_property_summary_report(user, start_date, end_date)
-        elif report_type == 'tenant_report':
-            report_data = generate_tenant_report(user, start_date, end_date)
-        elif report_type == 'maintenance_report':
-            report_data = generate_maintenance_report(user, start_date, end_date)
-        elif report_type == 'financial_report':
-            report_data = generate_financial_report(user, start_date, end_date)
-        elif report_type == 'rental_report':
-            report_data = generate_rental_report(user, start_date, end_date)
-        elif report_type == 'vendor_report':
-            report_data = generate_vendor_report(user, start_date, end_date)
-        elif report_type == 'association_report':
-            report_data = generate_association_report(user, start_date, end_date)
-        elif report_type == 'comprehensive_report':
-            report_data = generate_comprehensive_report(user, start_date, end_date)
-        else:
+        generator = REPORT_GENERATORS.get(report_type)
+        if not generator:
             print(f"❌ Invalid report type: {report_type}")
             return jsonify({'error': 'Invalid report type'}), 400
+        if format_type == 'pdf' and get_report_cache().enabled:
+            return send_cached_report_pdf(user, report_type, start_date, end_date)
+        report_data = generator(user, start_date, end_date)
         
         print(f"✅ Report data generated successfully: {type(report_data)}")
         
@@ -171,55 +171,65 @@ def generate_report(current_user):
         traceback.print_exc()
         return jsonify({'error': f'Error generating {report_type} report: {str(e)}'}), 500
 
-def generate_property_summary_report(user, start_date, end_date):
-    """Generate property summary report"""
-    # Get properties based on user role using owner_id relationship
-    if user.role == 'ADMIN' or user.username == 'admin':
-        properties = Property.query.all()
-    elif user.role == 'OWNER':
-        properties = Property.query.filter_by(owner_id=user.id).all()
-    elif user.role == 'AGENT':
-        # Note: Property model doesn't have agent_id field, so agents see all properties for now
-        # In a real system, you'd need to add agent_id to Property model or use a different relationship
-        properties = Property.query.all()
-    else:
-        properties = []
+@reporting_bp.route('/pdf/<report_type>', methods=['GET'])
+@token_required
+def download_report_pdf(current_user, report_type):
+    """Download a report PDF; repeat downloads are served from the report cache"""
+    if report_type not in REPORT_GENERATORS:
+        return jsonify({'error': 'Invalid report type'}), 400
     
-    property_data = []
-    total_value = 0
-    total_rent = 0
-    occupied_count = 0
+    try:
+        start_date = datetime.strptime(request.args['start_date'], '%Y-%m-%d').date() if request.args.get('start_date') else date.today() - timedelta(days=30)
+        end_date = datetime.strptime(request.args['end_date'], '%Y-%m-%d').date() if request.args.get('end_date') else date.today()
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
     
-    for prop in properties:
-        # Get tenant info - Tenant model doesn't have status field, so we'll get the first tenant
-        tenant = Tenant.query.filter_by(property_id=prop.id).first()
-        monthly_rent = tenant.rent_amount if tenant else 0
-        
-        # Construct full address
-        address_parts = [prop.street_address_1]
-        if prop.street_address_2:
-            address_parts.append(prop.street_address_2)
-        if prop.apt_number:
-            address_parts.append(f"Apt {prop.apt_number}")
-        address_parts.extend([prop.city, prop.state, prop.zip_code])
-        full_address = ", ".join(address_parts)
-        
-        property_data.append({
+    if start_date > end_date:
+        return jsonify({'error': 'Start date must be before end date'}), 400
+    
+    try:
+        if get_report_cache().enabled:
+            return send_cached_report_pdf(current_user, report_type, start_date, end_date)
+        report_data = REPORT_GENERATORS[report_type](current_user, start_date, end_date)
+        return generate_pdf_report(report_data, report_type, start_date, end_date)
+    except Exception as e:
+        print(f"❌ Error generating {report_type} PDF: {str(e)}")
+        return jsonify({'error': f'Error generating {report_type} report: {str(e)}'}), 500
+
+def generate_property_summary_report(user, start_date, end_date, loader=None):
+    """Generate property summary report"""
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    properties = loader.properties
+    first_tenants = loader.first_tenants
+    last_maintenance_dates = loader.last_maintenance_dates
+    
+    def property_row(prop):
+        # Tenant model doesn't have status field, so we use the property's first tenant
+        tenant = first_tenants.get(prop.id)
+        last_maintenance = last_maintenance_dates.get(prop.id)
+        return {
             'id': prop.id,
             'title': prop.title,
-            'address': full_address,
+            'address': format_address(prop),
             'property_type': 'Residential',  # Default since property_type field doesn't exist
             'status': prop.status,
-            'monthly_rent': monthly_rent,
+            'monthly_rent': tenant.rent_amount if tenant else 0,
             'occupied': tenant is not None,
             'tenant_name': tenant.full_name if tenant else 'Vacant',
-            'last_maintenance': get_last_maintenance_date(prop.id)
-        })
-        
+            'last_maintenance': last_maintenance.strftime('%Y-%m-%d') if last_maintenance else 'N/A'
+        }
+    
+    property_data = loader.map_rows(properties, property_row)
+    total_value = 0
+    total_rent = 0
+    occupied_count = 0
+    
+    for prop in properties:
+        tenant = first_tenants.get(prop.id)
         # Property model doesn't have purchase_price, so we'll use rent_amount as a proxy
         total_value += prop.rent_amount or 0
-        total_rent += monthly_rent
         if tenant:
+            total_rent += tenant.rent_amount or 0
             occupied_count += 1
     
     occupancy_rate = (occupied_count / len(properties) * 100) if properties else 0
@@ -242,44 +252,39 @@ def generate_property_summary_report(user, start_date, end_date):
         'properties': property_data
     }
 
-def generate_tenant_report(user, start_date, end_date):
+def generate_tenant_report(user, start_date, end_date, loader=None):
     """Generate tenant report"""
-    if user.role == 'ADMIN' or user.username == 'admin':
-        tenants = Tenant.query.join(Property).all()
-    elif user.role == 'OWNER':
-        tenants = Tenant.query.join(Property).filter(Property.owner_id == user.id).all()
-    elif user.role == 'AGENT':
-        # Note: Property model doesn't have agent_id field, so agents see all tenants for now
-        tenants = Tenant.query.join(Property).all()
-    else:
-        tenants = []
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    tenants = loader.tenants
+    today = date.today()
     
-    tenant_data = []
-    total_rent = 0
-    active_leases = 0
-    
-    for tenant in tenants:
+    def tenant_row(tenant):
         # Get lease info
         lease_start = tenant.lease_start
         lease_end = tenant.lease_end
-        is_active = lease_start and lease_end and lease_start <= date.today() <= lease_end
+        is_active = bool(lease_start and lease_end and lease_start <= today <= lease_end)
         
-        tenant_data.append({
+        return {
             'id': tenant.id,
             'full_name': tenant.full_name,
             'email': tenant.email,
             'phone': tenant.phone_number,
-            'property_title': tenant.property.title if tenant.property else 'N/A',
+            'property_title': tenant.property_title or 'N/A',
             'monthly_rent': tenant.rent_amount,
             'lease_start': lease_start.strftime('%Y-%m-%d') if lease_start else 'N/A',
             'lease_end': lease_end.strftime('%Y-%m-%d') if lease_end else 'N/A',
             'status': tenant.payment_status,
             'is_active': is_active,
-            'days_remaining': (lease_end - date.today()).days if lease_end and lease_end > date.today() else 0
-        })
-        
-        total_rent += tenant.rent_amount or 0
-        if is_active:
+            'days_remaining': (lease_end - today).days if lease_end and lease_end > today else 0
+        }
+    
+    tenant_data = loader.map_rows(tenants, tenant_row)
+    total_rent = 0
+    active_leases = 0
+    
+    for tenant in tenant_data:
+        total_rent += tenant['monthly_rent'] or 0
+        if tenant['is_active']:
             active_leases += 1
     
     return {
@@ -298,57 +303,18 @@ def generate_tenant_report(user, start_date, end_date):
         'tenants': tenant_data
     }
 
-def generate_maintenance_report(user, start_date, end_date):
+def generate_maintenance_report(user, start_date, end_date, loader=None):
     """Generate maintenance report"""
     print(f"🔍 Generating maintenance report for user {user.username} (role: {user.role})")
     print(f"🔍 Date range: {start_date} to {end_date}")
     
-    if user.role == 'ADMIN' or user.username == 'admin':
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    elif user.role == 'OWNER':
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.property_id.in_(
-                    Property.query.filter_by(owner_id=user.id).with_entities(Property.id)
-                ),
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    elif user.role == 'AGENT':
-        # Note: Property model doesn't have agent_id field, so agents see all maintenance requests for now
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    elif user.role == 'VENDOR':
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.assigned_vendor_id == user.id,
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    else:
-        requests = []
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    requests = loader.maintenance_requests
     
     print(f"🔍 Found {len(requests)} maintenance requests")
     
-    request_data = []
-    total_requests = len(requests)
-    completed_requests = 0
-    pending_requests = 0
-    total_cost = 0
-    
-    for req in requests:
-        request_data.append({
+    def request_row(req):
+        return {
             'id': req.id,
             'title': req.request_title,
             'description': req.request_description,
@@ -356,18 +322,26 @@ def generate_maintenance_report(user, start_date, end_date):
             'status': req.status,
             'created_at': req.request_date.strftime('%Y-%m-%d'),
             'completed_at': req.completion_date.strftime('%Y-%m-%d') if req.completion_date else 'N/A',
-            'property_title': req.property.title if req.property else 'N/A',
-            'tenant_name': req.tenant.full_name if req.tenant else 'N/A',
-            'vendor_name': req.assigned_vendor.business_name if req.assigned_vendor else 'N/A',
+            'property_title': req.property_title or 'N/A',
+            'tenant_name': req.tenant_name or 'N/A',
+            'vendor_name': vendor_display_name(req.vendor_first_name, req.vendor_last_name,
+                                               req.vendor_company_name) if req.assigned_vendor_id else 'N/A',
             'cost': req.actual_cost or 0
-        })
-        
-        if req.status == 'completed':
+        }
+    
+    request_data = loader.map_rows(requests, request_row)
+    total_requests = len(requests)
+    completed_requests = 0
+    pending_requests = 0
+    total_cost = 0
+    
+    for req in request_data:
+        if req['status'] == 'completed':
             completed_requests += 1
-        elif req.status in ['pending', 'in_progress']:
+        elif req['status'] in ['pending', 'in_progress']:
             pending_requests += 1
         
-        total_cost += req.actual_cost or 0
+        total_cost += req['cost']
     
     completion_rate = (completed_requests / total_requests * 100) if total_requests > 0 else 0
     
@@ -389,55 +363,31 @@ def generate_maintenance_report(user, start_date, end_date):
         'requests': request_data
     }
 
-def generate_financial_report(user, start_date, end_date):
+def generate_financial_report(user, start_date, end_date, loader=None):
     """Generate financial report"""
-    if user.role == 'ADMIN' or user.username == 'admin':
-        transactions = FinancialTransaction.query.filter(
-            and_(
-                FinancialTransaction.transaction_date >= start_date,
-                FinancialTransaction.transaction_date <= end_date
-            )
-        ).all()
-    elif user.role == 'OWNER':
-        transactions = FinancialTransaction.query.filter(
-            and_(
-                FinancialTransaction.property_id.in_(
-                    Property.query.filter_by(owner_id=user.id).with_entities(Property.id)
-                ),
-                FinancialTransaction.transaction_date >= start_date,
-                FinancialTransaction.transaction_date <= end_date
-            )
-        ).all()
-    elif user.role == 'AGENT':
-        # Note: Property model doesn't have agent_id field, so agents see all financial transactions for now
-        transactions = FinancialTransaction.query.filter(
-            and_(
-                FinancialTransaction.transaction_date >= start_date,
-                FinancialTransaction.transaction_date <= end_date
-            )
-        ).all()
-    else:
-        transactions = []
-    
-    transaction_data = []
-    total_income = 0
-    total_expenses = 0
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    transactions = loader.transactions
     
-    for trans in transactions:
-        transaction_data.append({
+    def transaction_row(trans):
+        return {
             'id': trans.id,
             'type': trans.transaction_type,
             'amount': trans.amount,
             'description': trans.description,
             'date': trans.transaction_date.strftime('%Y-%m-%d'),
-            'property_title': trans.property.title if trans.property else 'N/A',
+            'property_title': trans.property_title or 'N/A',
             'category': trans.category
-        })
-        
-        if trans.transaction_type == 'INCOME':
-            total_income += trans.amount
+        }
+    
+    transaction_data = loader.map_rows(transactions, transaction_row)
+    total_income = 0
+    total_expenses = 0
+    
+    for trans in transaction_data:
+        if trans['type'] == 'INCOME':
+            total_income += trans['amount']
         else:
-            total_expenses += trans.amount
+            total_expenses += trans['amount']
     
     net_income = total_income - total_expenses
     
@@ -458,49 +408,33 @@ def generate_financial_report(user, start_date, end_date):
         'transactions': transaction_data
     }
 
-def generate_rental_report(user, start_date, end_date):
+def generate_rental_report(user, start_date, end_date, loader=None):
     """Generate rental report"""
-    if user.role == 'ADMIN' or user.username == 'admin':
-        properties = Property.query.all()
-    elif user.role == 'OWNER':
-        properties = Property.query.filter_by(owner_id=user.id).all()
-    elif user.role == 'AGENT':
-        # Note: Property model doesn't have agent_id field, so agents see all properties for now
-        properties = Property.query.all()
-    else:
-        properties = []
-    
-    rental_data = []
-    total_rental_income = 0
-    occupied_properties = 0
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    properties = loader.properties
+    first_tenants = loader.first_tenants
     
-    for prop in properties:
-        tenant = Tenant.query.filter_by(property_id=prop.id).first()
-        monthly_rent = tenant.rent_amount if tenant else 0
-        
-        # Construct full address
-        address_parts = [prop.street_address_1]
-        if prop.street_address_2:
-            address_parts.append(prop.street_address_2)
-        if prop.apt_number:
-            address_parts.append(f"Apt {prop.apt_number}")
-        address_parts.extend([prop.city, prop.state, prop.zip_code])
-        full_address = ", ".join(address_parts)
-        
-        rental_data.append({
+    def rental_row(prop):
+        tenant = first_tenants.get(prop.id)
+        return {
             'property_id': prop.id,
             'property_title': prop.title,
-            'address': full_address,
-            'monthly_rent': monthly_rent,
+            'address': format_address(prop),
+            'monthly_rent': tenant.rent_amount if tenant else 0,
             'occupied': tenant is not None,
             'tenant_name': tenant.full_name if tenant else 'Vacant',
             'lease_start': tenant.lease_start.strftime('%Y-%m-%d') if tenant and tenant.lease_start else 'N/A',
             'lease_end': tenant.lease_end.strftime('%Y-%m-%d') if tenant and tenant.lease_end else 'N/A',
-            'days_vacant': calculate_vacant_days(prop.id, start_date, end_date)
-        })
-        
-        total_rental_income += monthly_rent
-        if tenant:
+            'days_vacant': calculate_vacant_days(tenant, start_date, end_date)
+        }
+    
+    rental_data = loader.map_rows(properties, rental_row)
+    total_rental_income = 0
+    occupied_properties = 0
+    
+    for rental in rental_data:
+        total_rental_income += rental['monthly_rent'] or 0
+        if rental['occupied']:
             occupied_properties += 1
     
     occupancy_rate = (occupied_properties / len(properties) * 100) if properties else 0
@@ -523,59 +457,31 @@ def generate_rental_report(user, start_date, end_date):
         'rentals': rental_data
     }
 
-def generate_vendor_report(user, start_date, end_date):
+def generate_vendor_report(user, start_date, end_date, loader=None):
     """Generate vendor report"""
-    if user.role == 'ADMIN' or user.username == 'admin':
-        vendors = Vendor.query.all()
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    elif user.role == 'OWNER':
-        vendors = Vendor.query.all()
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.property_id.in_(
-                    Property.query.filter_by(owner_id=user.id).with_entities(Property.id)
-                ),
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    elif user.role == 'AGENT':
-        vendors = Vendor.query.all()
-        # Note: Property model doesn't have agent_id field, so agents see all maintenance requests for now
-        requests = MaintenanceRequest.query.filter(
-            and_(
-                MaintenanceRequest.request_date >= start_date,
-                MaintenanceRequest.request_date <= end_date
-            )
-        ).all()
-    else:
-        vendors = []
-        requests = []
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    vendors = loader.vendors
+    vendor_stats = loader.vendor_stats
+    last_service_dates = loader.last_service_dates
     
     vendor_data = []
     
     for vendor in vendors:
-        vendor_requests = [req for req in requests if req.assigned_vendor_id == vendor.id]
-        completed_requests = [req for req in vendor_requests if req.status == 'completed']
-        total_cost = sum(req.actual_cost or 0 for req in vendor_requests)
+        request_count, completed_count, total_cost = vendor_stats.get(vendor.id, (0, 0, 0))
+        last_service = last_service_dates.get(vendor.id)
         
         vendor_data.append({
             'id': vendor.id,
-            'name': vendor.business_name,
-            'email': vendor.email,
-            'phone': vendor.phone_number,
-            'vendor_type': vendor.vendor_type,
-            'total_requests': len(vendor_requests),
-            'completed_requests': len(completed_requests),
-            'completion_rate': round((len(completed_requests) / len(vendor_requests) * 100), 2) if vendor_requests else 0,
+            'name': vendor_display_name(vendor.first_name, vendor.last_name, vendor.company_name),
+            'email': vendor.primary_email,
+            'phone': vendor.phone_1,
+            'vendor_type': vendor.category_name,
+            'total_requests': request_count,
+            'completed_requests': completed_count,
+            'completion_rate': round((completed_count / request_count * 100), 2) if request_count else 0,
             'total_cost': total_cost,
-            'average_cost': round(total_cost / len(vendor_requests), 2) if vendor_requests else 0,
-            'last_service': get_last_service_date(vendor.id)
+            'average_cost': round(total_cost / request_count, 2) if request_count else 0,
+            'last_service': last_service.strftime('%Y-%m-%d') if last_service else 'N/A'
         })
     
     return {
@@ -587,37 +493,43 @@ def generate_vendor_report(user, start_date, end_date):
         },
         'summary': {
             'total_vendors': len(vendors),
-            'total_requests': len(requests),
-            'total_cost': sum(req.actual_cost or 0 for req in requests),
+            'total_requests': sum(stats[0] for stats in vendor_stats.values()),
+            'total_cost': sum(stats[2] for stats in vendor_stats.values()),
             'average_completion_rate': round(sum(v['completion_rate'] for v in vendor_data) / len(vendor_data), 2) if vendor_data else 0
         },
         'vendors': vendor_data
     }
 
-def generate_association_report(user, start_date, end_date):
+def generate_association_report(user, start_date, end_date, loader=None):
     """Generate association report"""
-    # For now, get all associations since the relationship is complex
-    associations = Association.query.all()
+    loader = loader or ReportDataLoader(user, start_date, end_date)
+    associations = loader.associations
     
     association_data = []
     total_dues = 0
     total_paid = 0
     
     for assoc in associations:
+        dues = float(assoc.total_dues)
+        paid = float(assoc.amount_paid)
+        if assoc.property_count > 1:
+            property_title = f"{assoc.property_title} (+{assoc.property_count - 1} more)"
+        else:
+            property_title = assoc.property_title or 'N/A'
         association_data.append({
             'id': assoc.id,
             'name': assoc.name,
-            'property_title': assoc.property.title if assoc.property else 'N/A',
-            'monthly_dues': assoc.monthly_dues,
-            'total_dues': assoc.total_dues,
-            'amount_paid': assoc.amount_paid,
-            'outstanding_balance': assoc.outstanding_balance,
+            'property_title': property_title,
+            'monthly_dues': float(assoc.monthly_dues),
+            'total_dues': dues,
+            'amount_paid': paid,
+            'outstanding_balance': dues - paid,
             'last_payment_date': assoc.last_payment_date.strftime('%Y-%m-%d') if assoc.last_payment_date else 'N/A',
-            'status': assoc.status
+            'status': 'Outstanding' if dues > paid else 'Paid'
         })
         
-        total_dues += assoc.total_dues or 0
-        total_paid += assoc.amount_paid or 0
+        total_dues += dues
+        total_paid += paid
     
     return {
         'report_type': 'Association Report',
@@ -636,68 +548,60 @@ def generate_association_report(user, start_date, end_date):
         'associations': association_data
     }
 
-def generate_comprehensive_report(user, start_date, end_date):
-    """Generate comprehensive report combining all data"""
+# Comprehensive report sections: key -> (label, generator, fallback used if the section fails)
+COMPREHENSIVE_SECTIONS = {
+    'properties': ('Property summary', generate_property_summary_report,
+                   {'summary': {'total_properties': 0, 'occupancy_rate': 0}}),
+    'tenants': ('Tenant', generate_tenant_report, {'summary': {'total_tenants': 0}}),
+    'maintenance': ('Maintenance', generate_maintenance_report, {'summary': {'total_requests': 0}}),
+    'financial': ('Financial', generate_financial_report,
+                  {'summary': {'total_income': 0, 'total_expenses': 0, 'net_income': 0}}),
+    'rentals': ('Rental', generate_rental_report, {'summary': {}}),
+    'vendors': ('Vendor', generate_vendor_report, {'summary': {}}),
+    'associations': ('Association', generate_association_report, {'summary': {}}),
+}
+
+def generate_comprehensive_report(user, start_date, end_date, progress=None, context=None):
+    """Generate comprehensive report combining all data
+
+    Every section reads the same database snapshot through one ReportContext,
+    so the sections agree with each other, and independent sections are
+    built concurrently where the database allows it.
+
+    progress, when given, is called as progress(percent, message) as sections
+    complete so background jobs can report how far along they are.
+
+    context, when given, is an open ReportContext to read from instead of a
+    new one; a streaming context's row lists stay readable until it closes.
+    """
     print(f"🔍 Generating comprehensive report for user {user.username} (role: {user.role})")
     print(f"🔍 Date range: {start_date} to {end_date}")
     
+    def section_builder(generator):
+        return lambda context: generator(user, start_date, end_date, context)
+    
+    def section_done(percent, key):
+        print(f"✅ {COMPREHENSIVE_SECTIONS[key][0]} section finished")
+        if progress:
+            progress(percent, f'Generated {COMPREHENSIVE_SECTIONS[key][0].lower()} section')
+    
     try:
-        print("🔍 Generating property summary report...")
-        try:
-            property_summary = generate_property_summary_report(user, start_date, end_date)
-            print("✅ Property summary report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Property summary report failed: {str(e)}")
-            property_summary = {'summary': {'total_properties': 0, 'occupancy_rate': 0}}
-        
-        print("🔍 Generating tenant report...")
-        try:
-            tenant_report = generate_tenant_report(user, start_date, end_date)
-            print("✅ Tenant report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Tenant report failed: {str(e)}")
-            tenant_report = {'summary': {'total_tenants': 0}}
-        
-        print("🔍 Generating maintenance report...")
-        try:
-            maintenance_report = generate_maintenance_report(user, start_date, end_date)
-            print("✅ Maintenance report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Maintenance report failed: {str(e)}")
-            maintenance_report = {'summary': {'total_requests': 0}}
-        
-        print("🔍 Generating financial report...")
-        try:
-            financial_report = generate_financial_report(user, start_date, end_date)
-            print("✅ Financial report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Financial report failed: {str(e)}")
-            financial_report = {'summary': {'total_income': 0, 'total_expenses': 0, 'net_income': 0}}
-        
-        print("🔍 Generating rental report...")
-        try:
-            rental_report = generate_rental_report(user, start_date, end_date)
-            print("✅ Rental report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Rental report failed: {str(e)}")
-            rental_report = {'summary': {}}
+        if progress:
+            progress(0, 'Generating report sections')
+        with nullcontext(context) if context else ReportContext(user, start_date, end_date) as context:
+            outcomes = context.run_sections(
+                {key: section_builder(generator) for key, (_, generator, _) in COMPREHENSIVE_SECTIONS.items()},
+                progress=section_done
+            )
         
-        print("🔍 Generating vendor report...")
-        try:
-            vendor_report = generate_vendor_report(user, start_date, end_date)
-            print("✅ Vendor report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Vendor report failed: {str(e)}")
-            vendor_report = {'summary': {}}
+        sections = {}
+        for key, (label, _, fallback) in COMPREHENSIVE_SECTIONS.items():
+            result, error = outcomes[key]
+            if error is not None:
+                print(f"⚠️ {label} report failed: {str(error)}")
+                result = fallback
+            sections[key] = result
         
-        print("🔍 Generating association report...")
-        try:
-            association_report = generate_association_report(user, start_date, end_date)
-            print("✅ Association report generated successfully")
-        except Exception as e:
-            print(f"⚠️ Association report failed: {str(e)}")
-            association_report = {'summary': {}}
-    
         print("🔍 Compiling comprehensive report...")
         comprehensive_data = {
             'report_type': 'Comprehensive Property Management Report',
@@ -707,23 +611,15 @@ def generate_comprehensive_report(user, start_date, end_date):
                 'end_date': end_date.strftime('%Y-%m-%d')
             },
             'overview': {
-                'total_properties': property_summary['summary']['total_properties'],
-                'total_tenants': tenant_report['summary']['total_tenants'],
-                'total_maintenance_requests': maintenance_report['summary']['total_requests'],
-                'total_income': financial_report['summary']['total_income'],
-                'total_expenses': financial_report['summary']['total_expenses'],
-                'net_income': financial_report['summary']['net_income'],
-                'occupancy_rate': property_summary['summary']['occupancy_rate']
+                'total_properties': sections['properties']['summary']['total_properties'],
+                'total_tenants': sections['tenants']['summary']['total_tenants'],
+                'total_maintenance_requests': sections['maintenance']['summary']['total_requests'],
+                'total_income': sections['financial']['summary']['total_income'],
+                'total_expenses': sections['financial']['summary']['total_expenses'],
+                'net_income': sections['financial']['summary']['net_income'],
+                'occupancy_rate': sections['properties']['summary']['occupancy_rate']
             },
-            'sections': {
-                'properties': property_summary,
-                'tenants': tenant_report,
-                'maintenance': maintenance_report,
-                'financial': financial_report,
-                'rentals': rental_report,
-                'vendors': vendor_report,
-                'associations': association_report
-            }
+            'sections': sections
         }
         print("✅ Comprehensive report compiled successfully")
         return comprehensive_data
@@ -734,21 +630,93 @@ def generate_comprehensive_report(user, start_date, end_date):
         traceback.print_exc()
         raise e
 
+REPORT_GENERATORS = {
+    'property_summary': generate_property_summary_report,
+    'tenant_report': generate_tenant_report,
+    'maintenance_report': generate_maintenance_report,
+    'financial_report': generate_financial_report,
+    'rental_report': generate_rental_report,
+    'vendor_report': generate_vendor_report,
+    'association_report': generate_association_report,
+    'comprehensive_report': generate_comprehensive_report,
+}
+
+# Tables each report reads; their data version is part of the report cache key
+REPORT_TABLES = {
+    'property_summary': (Property, Tenant, MaintenanceRequest),
+    'tenant_report': (Tenant, Property),
+    'maintenance_report': (MaintenanceRequest, Property, Tenant, Vendor),
+    'financial_report': (FinancialTransaction, Property),
+    'rental_report': (Property, Tenant),
+    'vendor_report': (Vendor, VendorCategory, MaintenanceRequest, Property),
+    'association_report': (Association, AssociationPropertyAssignment, AssociationMembership, AssociationBalance,
+                           Property, Tenant),
+}
+REPORT_TABLES['comprehensive_report'] = tuple({model for models in REPORT_TABLES.values() for model in models})
+
+def render_report_pdf(report_data, report_type):
+    """Render report data to a PDF buffer positioned at the start"""
+    if report_type == 'tenant_report':
+        pdf_generator = PropertyReportPDFGenerator()
+        pdf_buffer = pdf_generator.generate_tenant_report_pdf(report_data)
+    elif report_type == 'comprehensive_report':
+        # Use enhanced comprehensive PDF generator
+        pdf_buffer = generate_comprehensive_pdf(report_data, report_type)
+    else:
+        # For other report types, use a generic PDF generator
+        pdf_buffer = generate_generic_pdf(report_data, report_type)
+    
+    pdf_buffer.seek(0)
+    return pdf_buffer
+
+# ============================================================================
+# RENDERED REPORT CACHE
+# ============================================================================
+
+_report_cache = None
+
+def get_report_cache():
+    """Lazily build the rendered report cache in REPORT_CACHE_DIR"""
+    global _report_cache
+    if _report_cache is None:
+        _report_cache = ReportCache(private_data_dir(app, 'report_cache', 'REPORT_CACHE_DIR'))
+    return _report_cache
+
+def report_cache_key(user, report_type, start_date, end_date, format_type='pdf'):
+    """Key of a rendered report: who it is for, what it covers and the data it reads"""
+    return cache_key(
+        report_type, format_type, report_scope(user), user.id, user.full_name,
+        start_date, end_date, date.today(), data_version(*REPORT_TABLES[report_type])
+    )
+
+def send_cached_report_pdf(user, report_type, start_date, end_date):
+    """Serve a report PDF from the cache, rendering and storing it on a miss"""
+    cache = get_report_cache()
+    key = report_cache_key(user, report_type, start_date, end_date)
+    path = cache.get(key, 'pdf')
+    if path:
+        print(f"✅ Serving cached {report_type} PDF")
+    else:
+        report_data = REPORT_GENERATORS[report_type](user, start_date, end_date)
+        path = cache.put(key, 'pdf', render_report_pdf(report_data, report_type).getvalue())
+    
+    filename = f"{report_type}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
+    # The key identifies the content, so it is the ETag; send_file answers If-None-Match on GET
+    response = send_file(
+        path,
+        as_attachment=True,
+        download_name=filename,
+        mimetype='application/pdf',
+        etag=key,
+        max_age=0
+    )
+    response.cache_control.private = True
+    return response
+
 def generate_pdf_report(report_data, report_type, start_date, end_date):
     """Generate PDF report using the existing PDF generator"""
     try:
-        pdf_generator = PropertyReportPDFGenerator()
-        
-        if report_type == 'tenant_report':
-            pdf_buffer = pdf_generator.generate_tenant_report_pdf(report_data)
-        elif report_type == 'comprehensive_report':
-            # Use enhanced comprehensive PDF generator
-            pdf_buffer = generate_comprehensive_pdf(report_data, report_type)
-        else:
-            # For other report types, use a generic PDF generator
-            pdf_buffer = generate_generic_pdf(report_data, report_type)
-        
-        pdf_buffer.seek(0)
+        pdf_buffer = render_report_pdf(report_data, report_type)
         
         filename = f"{report_type}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
         
@@ -762,12 +730,190 @@ def generate_pdf_report(report_data, report_type, start_date, end_date):
     except Exception as e:
         return jsonify({'error': f'PDF generation failed: {str(e)}'}), 500
 
+# ============================================================================
+# BACKGROUND REPORT JOBS
+# ============================================================================
+
+# Rendered by generate_generic_pdf/generate_comprehensive_pdf, which list every row when it streams
+STREAMED_PDF_REPORTS = set(REPORT_GENERATORS) - {'tenant_report'}
+
+_report_job_queue = None
+
+def get_report_job_queue():
+    """Lazily build the report job queue from REPORT_JOB_* settings"""
+    global _report_job_queue
+    if _report_job_queue is None:
+        # Results only leave through download_report_job_result, which checks the owner
+        results_dir = private_data_dir(app, 'report_jobs', 'REPORT_JOB_DIR')
+        backend = os.environ.get('REPORT_JOB_BACKEND', 'sqlite')
+        _report_job_queue = ReportJobQueue(
+            store=build_job_store(backend, results_dir),
+            results_dir=results_dir,
+            runner=execute_report_job,
+            # The in-memory store is process-local, so it needs thread workers
+            worker_mode=os.environ.get('REPORT_JOB_WORKER_MODE', 'thread' if backend == 'memory' else 'process'),
+            max_workers=int(os.environ.get('REPORT_JOB_WORKERS', 2)),
+            ttl_seconds=int(os.environ.get('REPORT_JOB_TTL', 86400))
+        )
+    return _report_job_queue
+
+def execute_report_job(job_id):
+    """Worker entry point: generate the report, render it and store the result"""
+    queue = get_report_job_queue()
+    job = queue.get(job_id)
+    if not job:
+        return
+    
+    with app.app_context():
+        try:
+            queue.start(job_id)
+            params = job['params']
+            report_type = job['report_type']
+            format_type = params.get('format', 'json')
+            start_date = date.fromisoformat(params['start_date'])
+            end_date = date.fromisoformat(params['end_date'])
+            
+            user = User.query.get(job['user_id'])
+            if not user:
+                raise ValueError('User not found')
+            
+            base_name = f"{report_type}_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}"
+            # Job PDFs list every row, so they are cached apart from the inline previews
+            streamed = format_type == 'pdf' and report_type in STREAMED_PDF_REPORTS
+            cache = get_report_cache()
+            key = None
+            if format_type == 'pdf' and cache.enabled:
+                key = report_cache_key(user, report_type, start_date, end_date, 'full_pdf' if streamed else 'pdf')
+                cached_path = cache.get(key, 'pdf')
+                if cached_path:
+                    result_path = queue.result_path_for(job_id, 'pdf')
+                    shutil.copyfile(cached_path, result_path)
+                    queue.complete(job_id, result_path, 'application/pdf', f"{base_name}.pdf")
+                    return
+            
+            # Data generation takes the first 80% of the progress bar for PDFs
+            scale = 0.8 if format_type == 'pdf' else 0.95
+            def report_progress(percent, message):
+                queue.progress(job_id, percent * scale, message)
+            
+            generator = REPORT_GENERATORS[report_type]
+            # A streamed PDF totals its rows in one pass and lays them out in another, both on this snapshot
+            with ReportContext(user, start_date, end_date,
+                               stream_chunk_rows=REPORT_STREAM_CHUNK_ROWS if streamed else None) as context:
+                if report_type == 'comprehensive_report':
+                    report_data = generator(user, start_date, end_date, progress=report_progress, context=context)
+                else:
+                    report_progress(10, f'Generating {report_type.replace("_", " ")}')
+                    report_data = generator(user, start_date, end_date, context)
+                
+                if format_type == 'pdf':
+                    queue.progress(job_id, 80, 'Rendering PDF')
+                    pdf_bytes = render_report_pdf(report_data, report_type).getvalue()
+            
+            if format_type == 'pdf':
+                result_path = queue.result_path_for(job_id, 'pdf')
+                with open(result_path, 'wb') as f:
+                    f.write(pdf_bytes)
+                if key:
+                    cache.put(key, 'pdf', pdf_bytes)
+                queue.complete(job_id, result_path, 'application/pdf', f"{base_name}.pdf")
+            else:
+                queue.progress(job_id, 95, 'Saving report')
+                result_path = queue.result_path_for(job_id, 'json')
+                with open(result_path, 'w') as f:
+                    f.write(app.json.dumps(report_data))
+                queue.complete(job_id, result_path, 'application/json', f"{base_name}.json")
+        except Exception as e:
+            print(f"❌ Report job {job_id} failed: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            queue.fail(job_id, e)
+        finally:
+            db.session.remove()
+
+@reporting_bp.route('/jobs', methods=['POST'])
+@token_required
+def submit_report_job(current_user):
+    """Queue a report for background generation and return its job id"""
+    data = request.get_json() or {}
+    report_type = data.get('report_type')
+    format_type = data.get('format', 'json')
+    
+    if report_type not in REPORT_GENERATORS:
+        return jsonify({'error': 'Invalid report type'}), 400
+    if format_type not in ('json', 'pdf'):
+        return jsonify({'error': 'Invalid format. Use json or pdf'}), 400
+    
+    try:
+        start_date = datetime.strptime(data['start_date'], '%Y-%m-%d').date() if data.get('start_date') else date.today() - timedelta(days=30)
+        end_date = datetime.strptime(data['end_date'], '%Y-%m-%d').date() if data.get('end_date') else date.today()
+    except ValueError:
+        return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    
+    if start_date > end_date:
+        return jsonify({'error': 'Start date must be before end date'}), 400
+    
+    job = get_report_job_queue().submit(current_user.id, report_type, {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'format': format_type
+    })
+    
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'status_url': f"/api/reports/jobs/{job['id']}",
+        'result_url': f"/api/reports/jobs/{job['id']}/result"
+    }), 202
+
+@reporting_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_report_job(current_user, job_id):
+    """Poll a background report job for status and progress"""
+    job = get_report_job_queue().get(job_id)
+    if not job or job['user_id'] != current_user.id:
+        return jsonify({'error': 'Report job not found'}), 404
+    return jsonify(job_to_dict(job))
+
+@reporting_bp.route('/jobs/<job_id>/result', methods=['GET'])
+@token_required
+def download_report_job_result(current_user, job_id):
+    """Download the output of a completed report job"""
+    job = get_report_job_queue().get(job_id)
+    if not job or job['user_id'] != current_user.id:
+        return jsonify({'error': 'Report job not found'}), 404
+    if job['status'] != STATUS_COMPLETED:
+        return jsonify({'error': f"Report is not ready (status: {job['status']})", 'job': job_to_dict(job)}), 409
+    if not job.get('result_path') or not os.path.exists(job['result_path']):
+        return jsonify({'error': 'Report result has expired'}), 410
+    
+    return send_file(
+        job['result_path'],
+        as_attachment=job['result_mimetype'] == 'application/pdf',
+        download_name=job['result_filename'],
+        mimetype=job['result_mimetype']
+    )
+
+def report_table(rows, header, cells, template, col_widths, limit, paragraph_columns=()):
+    """Flowables for a report PDF table: every row when the rows stream (background jobs), else the first limit"""
+    from reportlab.platypus import Paragraph
+
+    if isinstance(rows, RowStream):
+        return [StreamedTable(rows.chunks(), header, cells, template, col_widths, paragraph_columns)]
+
+    flowables = build_table([header] + [cells(row) for row in rows[:limit]], template, col_widths, paragraph_columns)
+    if len(rows) > limit:
+        flowables.append(Paragraph(
+            f"Showing the first {limit} of {len(rows):,}. Generate the report as a background job to include every row.",
+            PARAGRAPH_STYLES['Italic']
+        ))
+    return flowables
+
 def generate_generic_pdf(report_data, report_type):
     """Generate a highly interactive and visually appealing PDF report"""
     from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.platypus import Paragraph, Spacer, Table, PageBreak
     from reportlab.platypus.flowables import HRFlowable
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.graphics.shapes import Drawing, Rect, String
@@ -780,7 +926,7 @@ def generate_generic_pdf(report_data, report_type):
     from io import BytesIO
     
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
+    doc = StreamingDocTemplate(
         buffer, 
         pagesize=letter, 
         topMargin=0.5*inch, 
@@ -788,55 +934,11 @@ def generate_generic_pdf(report_data, report_type):
         leftMargin=0.5*inch,
         rightMargin=0.5*inch
     )
-    styles = getSampleStyleSheet()
+    styles = PARAGRAPH_STYLES
+    title_style = styles['EnhancedTitle']
+    section_style = styles['EnhancedSection']
     story = []
     
-    # Create compact custom styles
-    title_style = ParagraphStyle(
-        'EnhancedTitle',
-        parent=styles['Heading1'],
-        fontSize=16,
-        spaceAfter=10,
-        spaceBefore=5,
-        alignment=1,  # Center alignment
-        textColor=colors.HexColor('#1e40af'),  # Blue-800
-        fontName='Helvetica-Bold'
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'Subtitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=8,
-        alignment=1,
-        textColor=colors.HexColor('#64748b'),  # Slate-500
-        fontName='Helvetica'
-    )
-    
-    section_style = ParagraphStyle(
-        'SectionHeader',
-        parent=styles['Heading2'],
-        fontSize=12,
-        spaceAfter=8,
-        spaceBefore=12,
-        textColor=colors.HexColor('#1e40af'),
-        fontName='Helvetica-Bold',
-        borderWidth=1,
-        borderColor=colors.HexColor('#3b82f6'),
-        borderPadding=4,
-        backColor=colors.HexColor('#eff6ff'),  # Blue-50
-        borderRadius=4
-    )
-    
-    metric_style = ParagraphStyle(
-        'MetricStyle',
-        parent=styles['Normal'],
-        fontSize=12,
-        spaceAfter=8,
-        leftIndent=15,
-        fontName='Helvetica'
-    )
-    
     # Compact header
     header_text = f"🏢 PROPERTY MANAGEMENT REPORT"
     story.append(Paragraph(header_text, title_style))
@@ -885,26 +987,11 @@ def generate_generic_pdf(report_data, report_type):
                     [metric_data[0][1], metric_data[1][1]]
                 ], colWidths=[3*inch, 3*inch])
                 
-                metric_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (0, 0), colors.HexColor('#f1f5f9')),
-                    ('BACKGROUND', (1, 0), (1, 0), colors.HexColor('#f1f5f9')),
-                    ('BACKGROUND', (0, 1), (0, 1), colors.HexColor('#ffffff')),
-                    ('BACKGROUND', (1, 1), (1, 1), colors.HexColor('#ffffff')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#64748b')),
+                metric_table.setStyle(TABLE_STYLES['metric_card'])
+                metric_table.setStyle([
                     ('TEXTCOLOR', (0, 1), (0, 1), metric_data[0][2]),
-                    ('TEXTCOLOR', (1, 1), (1, 1), metric_data[1][2]),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('FONTSIZE', (0, 1), (-1, 1), 14),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                    ('TOPPADDING', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-                ]))
+                    ('TEXTCOLOR', (1, 1), (1, 1), metric_data[1][2])
+                ])
                 story.append(metric_table)
                 story.append(Spacer(1, 10))
     
@@ -925,8 +1012,8 @@ def generate_generic_pdf(report_data, report_type):
             chart.height = 120
             chart.width = 300
             chart.data = [
-                [report_data['summary'].get('total_income', 0)],
-                [report_data['summary'].get('total_expenses', 0)]
+                [float(report_data['summary'].get('total_income', 0))],
+                [float(report_data['summary'].get('total_expenses', 0))]
             ]
             chart.categoryAxis.categoryNames = ['Income', 'Expenses']
             chart.bars[0].fillColor = colors.HexColor('#059669')  # Green for income
@@ -947,145 +1034,81 @@ def generate_generic_pdf(report_data, report_type):
     if 'properties' in report_data and report_data['properties']:
         story.append(Paragraph("🏠 PROPERTIES OVERVIEW", section_style))
         
-        prop_data = [['Property Name', 'Address', 'Status', 'Monthly Rent', 'Tenant']]
-        for prop in report_data['properties'][:15]:  # Show more properties
+        def property_cells(prop):
             status_color = '🟢' if prop.get('status') == 'ACTIVE' else '🔴'
-            prop_data.append([
+            return [
                 prop.get('title', 'N/A'),
                 prop.get('address', 'N/A')[:35] + '...' if len(prop.get('address', '')) > 35 else prop.get('address', 'N/A'),
                 f"{status_color} {prop.get('status', 'N/A')}",
                 f"${prop.get('monthly_rent', 0):,.2f}" if prop.get('monthly_rent') else 'N/A',
                 prop.get('tenant_name', 'Vacant')
-            ])
+            ]
         
-        prop_table = Table(prop_data, colWidths=[1.4*inch, 2.2*inch, 1*inch, 1*inch, 1.2*inch])
-        prop_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6)
-        ]))
-        story.append(prop_table)
+        story.extend(report_table(
+            report_data['properties'], ['Property Name', 'Address', 'Status', 'Monthly Rent', 'Tenant'], property_cells,
+            'report_properties', [1.4*inch, 2.2*inch, 1*inch, 1*inch, 1.2*inch], limit=15
+        ))
         story.append(Spacer(1, 20))
     
     # Tenants section
     if 'tenants' in report_data and report_data['tenants']:
         story.append(Paragraph("👥 TENANTS OVERVIEW", section_style))
         
-        tenant_data = [['Name', 'Property', 'Monthly Rent', 'Lease End', 'Status']]
-        for tenant in report_data['tenants'][:15]:
+        def tenant_cells(tenant):
             status_icon = '🟢' if tenant.get('is_active') else '🔴'
-            tenant_data.append([
+            return [
                 tenant.get('full_name', 'N/A'),
                 tenant.get('property_title', 'N/A')[:25] + '...' if len(tenant.get('property_title', '')) > 25 else tenant.get('property_title', 'N/A'),
                 f"${tenant.get('monthly_rent', 0):,.2f}" if tenant.get('monthly_rent') else 'N/A',
                 tenant.get('lease_end', 'N/A'),
                 f"{status_icon} {'Active' if tenant.get('is_active') else 'Inactive'}"
-            ])
+            ]
         
-        tenant_table = Table(tenant_data, colWidths=[1.5*inch, 1.8*inch, 1*inch, 1*inch, 0.9*inch])
-        tenant_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0fdf4')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1fae5')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6)
-        ]))
-        story.append(tenant_table)
+        story.extend(report_table(
+            report_data['tenants'], ['Name', 'Property', 'Monthly Rent', 'Lease End', 'Status'], tenant_cells,
+            'report_tenants', [1.5*inch, 1.8*inch, 1*inch, 1*inch, 0.9*inch], limit=15
+        ))
         story.append(Spacer(1, 20))
     
     # Maintenance requests section
     if 'requests' in report_data and report_data['requests']:
         story.append(Paragraph("🔧 MAINTENANCE REQUESTS", section_style))
         
-        maint_data = [['Title', 'Property', 'Priority', 'Status', 'Cost']]
-        for req in report_data['requests'][:15]:
+        def request_cells(req):
             priority_icon = '🔴' if req.get('priority') == 'HIGH' else '🟡' if req.get('priority') == 'MEDIUM' else '🟢'
             status_icon = '✅' if req.get('status') == 'COMPLETED' else '🔄' if req.get('status') == 'IN_PROGRESS' else '⏳'
-            maint_data.append([
+            return [
                 req.get('title', 'N/A')[:30] + '...' if len(req.get('title', '')) > 30 else req.get('title', 'N/A'),
                 req.get('property_title', 'N/A')[:25] + '...' if len(req.get('property_title', '')) > 25 else req.get('property_title', 'N/A'),
                 f"{priority_icon} {req.get('priority', 'N/A')}",
                 f"{status_icon} {req.get('status', 'N/A')}",
                 f"${req.get('cost', 0):,.2f}" if req.get('cost') else 'N/A'
-            ])
+            ]
         
-        maint_table = Table(maint_data, colWidths=[1.8*inch, 1.5*inch, 1*inch, 1*inch, 0.9*inch])
-        maint_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ea580c')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff7ed')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#fed7aa')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fff7ed')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6)
-        ]))
-        story.append(maint_table)
+        story.extend(report_table(
+            report_data['requests'], ['Title', 'Property', 'Priority', 'Status', 'Cost'], request_cells,
+            'report_maintenance', [1.8*inch, 1.5*inch, 1*inch, 1*inch, 0.9*inch], limit=15
+        ))
         story.append(Spacer(1, 20))
     
     # Financial transactions section
     if 'transactions' in report_data and report_data['transactions']:
         story.append(Paragraph("💰 FINANCIAL TRANSACTIONS", section_style))
         
-        trans_data = [['Type', 'Amount', 'Description', 'Date', 'Property']]
-        for trans in report_data['transactions'][:15]:
+        def transaction_cells(trans):
             type_icon = '💰' if trans.get('type') == 'INCOME' else '💸'
-            trans_data.append([
+            return [
                 f"{type_icon} {trans.get('type', 'N/A')}",
                 f"${trans.get('amount', 0):,.2f}" if trans.get('amount') else 'N/A',
                 trans.get('description', 'N/A')[:30] + '...' if len(trans.get('description', '')) > 30 else trans.get('description', 'N/A'),
                 trans.get('date', 'N/A'),
                 trans.get('property_title', 'N/A')[:20] + '...' if len(trans.get('property_title', '')) > 20 else trans.get('property_title', 'N/A')
-            ])
+            ]
         
-        trans_table = Table(trans_data, colWidths=[1*inch, 1*inch, 1.8*inch, 1*inch, 1.2*inch])
-        trans_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#7c3aed')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 11),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#faf5ff')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e9d5ff')),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6)
-        ]))
-        story.append(trans_table)
+        story.extend(report_table(
+            report_data['transactions'], ['Type', 'Amount', 'Description', 'Date', 'Property'], transaction_cells,
+            'report_transactions', [1*inch, 1*inch, 1.8*inch, 1*inch, 1.2*inch], limit=15
+        ))
     
     # Footer
     story.append(Spacer(1, 30))
@@ -1095,20 +1118,7 @@ def generate_generic_pdf(report_data, report_type):
     ]
     
     footer_table = Table(footer_data, colWidths=[4*inch, 2*inch])
-    footer_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f1f5f9')),
-        ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#64748b')),
-        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-        ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 15),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0'))
-    ]))
+    footer_table.setStyle(TABLE_STYLES['report_footer'])
     story.append(footer_table)
     
     doc.build(story)
@@ -1117,9 +1127,8 @@ def generate_generic_pdf(report_data, report_type):
 def generate_comprehensive_pdf(report_data, report_type):
     """Generate a highly interactive and visually appealing comprehensive PDF report"""
     from reportlab.lib.pagesizes import letter
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+    from reportlab.platypus import Paragraph, Spacer, Table, PageBreak
     from reportlab.platypus.flowables import HRFlowable
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib import colors
     from reportlab.lib.units import inch
     from reportlab.graphics.shapes import Drawing, Rect, String
@@ -1128,7 +1137,7 @@ def generate_comprehensive_pdf(report_data, report_type):
     from reportlab.graphics import renderPDF
     
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(
+    doc = StreamingDocTemplate(
         buffer, 
         pagesize=letter, 
         topMargin=0.75*inch, 
@@ -1136,66 +1145,14 @@ def generate_comprehensive_pdf(report_data, report_type):
         leftMargin=0.75*inch,
         rightMargin=0.75*inch
     )
-    styles = getSampleStyleSheet()
+    styles = PARAGRAPH_STYLES
+    title_style = styles['ProfessionalTitle']
+    subtitle_style = styles['ProfessionalSubtitle']
+    section_style = styles['ProfessionalSection']
+    kpi_title_style = styles['KPITitle']
+    kpi_value_style = styles['KPIValue']
     story = []
     
-    # Professional styles for comprehensive report
-    title_style = ParagraphStyle(
-        'ProfessionalTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        spaceAfter=12,
-        spaceBefore=8,
-        alignment=1,
-        textColor=colors.HexColor('#1e40af'),
-        fontName='Helvetica-Bold'
-    )
-    
-    subtitle_style = ParagraphStyle(
-        'ProfessionalSubtitle',
-        parent=styles['Normal'],
-        fontSize=14,
-        spaceAfter=20,
-        alignment=1,
-        textColor=colors.HexColor('#64748b'),
-        fontName='Helvetica'
-    )
-    
-    section_style = ParagraphStyle(
-        'ProfessionalSection',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        spaceBefore=20,
-        textColor=colors.HexColor('#1e40af'),
-        fontName='Helvetica-Bold',
-        borderWidth=2,
-        borderColor=colors.HexColor('#3b82f6'),
-        borderPadding=8,
-        backColor=colors.HexColor('#eff6ff'),
-        borderRadius=6
-    )
-    
-    kpi_title_style = ParagraphStyle(
-        'KPITitle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=4,
-        alignment=1,
-        textColor=colors.HexColor('#64748b'),
-        fontName='Helvetica'
-    )
-    
-    kpi_value_style = ParagraphStyle(
-        'KPIValue',
-        parent=styles['Normal'],
-        fontSize=20,
-        spaceAfter=0,
-        alignment=1,
-        textColor=colors.HexColor('#1e40af'),
-        fontName='Helvetica-Bold'
-    )
-    
     # Professional header
     header_text = f"Comprehensive Property Management Report"
     story.append(Paragraph(header_text, title_style))
@@ -1227,16 +1184,7 @@ def generate_comprehensive_pdf(report_data, report_type):
             [Paragraph(str(overview.get('total_properties', 0)), kpi_value_style)]
         ]
         card1_table = Table(card1_data, colWidths=[2.5*inch])
-        card1_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#eff6ff')),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#3b82f6')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
+        card1_table.setStyle(TABLE_STYLES['kpi_properties'])
         
         # Card 2: Total Tenants
         card2_data = [
@@ -1244,16 +1192,7 @@ def generate_comprehensive_pdf(report_data, report_type):
             [Paragraph(str(overview.get('total_tenants', 0)), kpi_value_style)]
         ]
         card2_table = Table(card2_data, colWidths=[2.5*inch])
-        card2_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0fdf4')),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#059669')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
+        card2_table.setStyle(TABLE_STYLES['kpi_tenants'])
         
         # Card 3: Net Income
         card3_data = [
@@ -1261,16 +1200,7 @@ def generate_comprehensive_pdf(report_data, report_type):
             [Paragraph(f"${overview.get('net_income', 0):,.2f}", kpi_value_style)]
         ]
         card3_table = Table(card3_data, colWidths=[2.5*inch])
-        card3_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#faf5ff')),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#7c3aed')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
+        card3_table.setStyle(TABLE_STYLES['kpi_income'])
         
         # Card 4: Occupancy Rate
         card4_data = [
@@ -1278,29 +1208,14 @@ def generate_comprehensive_pdf(report_data, report_type):
             [Paragraph(f"{overview.get('occupancy_rate', 0):.1f}%", kpi_value_style)]
         ]
         card4_table = Table(card4_data, colWidths=[2.5*inch])
-        card4_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fff7ed')),
-            ('BACKGROUND', (0, 1), (-1, 1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#ea580c')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
+        card4_table.setStyle(TABLE_STYLES['kpi_occupancy'])
         
         # Arrange cards in 2x2 grid
         kpi_grid = Table([
             [card1_table, card2_table],
             [card3_table, card4_table]
         ], colWidths=[2.5*inch, 2.5*inch])
-        kpi_grid.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('TOPPADDING', (0, 0), (-1, -1), 0),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 0)
-        ]))
+        kpi_grid.setStyle(TABLE_STYLES['kpi_grid'])
         
         story.append(kpi_grid)
         story.append(Spacer(1, 20))
@@ -1319,8 +1234,8 @@ def generate_comprehensive_pdf(report_data, report_type):
             chart.height = 80
             chart.width = 200
             chart.data = [
-                [report_data['overview'].get('total_income', 0)],
-                [report_data['overview'].get('total_expenses', 0)]
+                [float(report_data['overview'].get('total_income', 0))],
+                [float(report_data['overview'].get('total_expenses', 0))]
             ]
             chart.categoryAxis.categoryNames = ['Income', 'Expenses']
             chart.bars[0].fillColor = colors.HexColor('#059669')
@@ -1342,48 +1257,29 @@ def generate_comprehensive_pdf(report_data, report_type):
         story.append(Paragraph("Properties Portfolio", section_style))
         
         properties = report_data['sections']['properties']['properties']
-        prop_data = [['Property Name', 'Address', 'Status', 'Monthly Rent', 'Tenant']]
         
-        for prop in properties[:10]:  # Show fewer properties for compactness
+        def property_cells(prop):
             # Create colored status badges
             status = prop.get('status', 'N/A').lower()
             if status == 'occupied':
-                status_badge = Paragraph(f'<font color="green"><b>●</b></font> Occupied', styles['Normal'])
+                status_badge = f'<font color="green"><b>●</b></font> Occupied'
             elif status == 'available':
-                status_badge = Paragraph(f'<font color="orange"><b>●</b></font> Available', styles['Normal'])
+                status_badge = f'<font color="orange"><b>●</b></font> Available'
             else:
-                status_badge = Paragraph(f'<font color="gray"><b>●</b></font> {status.title()}', styles['Normal'])
+                status_badge = f'<font color="gray"><b>●</b></font> {status.title()}'
             
-            prop_data.append([
+            return [
                 prop.get('title', 'N/A'),
                 prop.get('address', 'N/A'),
                 status_badge,
                 f"${prop.get('monthly_rent', 0):,.2f}" if prop.get('monthly_rent') else 'N/A',
                 prop.get('tenant_name', 'Vacant')
-            ])
+            ]
         
-        prop_table = Table(prop_data, colWidths=[1.8*inch, 2.8*inch, 1*inch, 1.2*inch, 1.4*inch])
-        prop_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (1, -1), 'LEFT'),  # Text columns left-aligned
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),  # Status column center-aligned
-            ('ALIGN', (3, 0), (3, -1), 'RIGHT'),  # Rent column right-aligned
-            ('ALIGN', (4, 0), (4, -1), 'LEFT'),  # Tenant column left-aligned
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
-        story.append(prop_table)
+        story.extend(report_table(
+            properties, ['Property Name', 'Address', 'Status', 'Monthly Rent', 'Tenant'], property_cells,
+            'comprehensive_properties', [1.8*inch, 2.8*inch, 1*inch, 1.2*inch, 1.4*inch], limit=10, paragraph_columns=(2,)
+        ))
         story.append(Spacer(1, 20))
     
     # Tenants Section
@@ -1391,46 +1287,27 @@ def generate_comprehensive_pdf(report_data, report_type):
         story.append(Paragraph("Tenants Management", section_style))
         
         tenants = report_data['sections']['tenants']['tenants']
-        tenant_data = [['Name', 'Property', 'Monthly Rent', 'Lease End', 'Status']]
         
-        for tenant in tenants[:10]:
+        def tenant_cells(tenant):
             # Create colored status badges
             is_active = tenant.get('is_active', False)
             if is_active:
-                status_badge = Paragraph(f'<font color="green"><b>●</b></font> Active', styles['Normal'])
+                status_badge = f'<font color="green"><b>●</b></font> Active'
             else:
-                status_badge = Paragraph(f'<font color="red"><b>●</b></font> Inactive', styles['Normal'])
+                status_badge = f'<font color="red"><b>●</b></font> Inactive'
             
-            tenant_data.append([
+            return [
                 tenant.get('full_name', 'N/A'),
                 tenant.get('property_title', 'N/A'),
                 f"${tenant.get('monthly_rent', 0):,.2f}" if tenant.get('monthly_rent') else 'N/A',
                 tenant.get('lease_end', 'N/A'),
                 status_badge
-            ])
+            ]
         
-        tenant_table = Table(tenant_data, colWidths=[2*inch, 2.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-        tenant_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (1, -1), 'LEFT'),  # Name and Property left-aligned
-            ('ALIGN', (2, 0), (2, -1), 'RIGHT'),  # Rent right-aligned
-            ('ALIGN', (3, 0), (3, -1), 'CENTER'),  # Lease End center-aligned
-            ('ALIGN', (4, 0), (4, -1), 'CENTER'),  # Status center-aligned
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0fdf4')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1fae5')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
-        story.append(tenant_table)
+        story.extend(report_table(
+            tenants, ['Name', 'Property', 'Monthly Rent', 'Lease End', 'Status'], tenant_cells,
+            'portfolio_tenants', [2*inch, 2.2*inch, 1.2*inch, 1.2*inch, 1.2*inch], limit=10, paragraph_columns=(4,)
+        ))
         story.append(Spacer(1, 25))
     
     # Maintenance Section
@@ -1438,38 +1315,22 @@ def generate_comprehensive_pdf(report_data, report_type):
         story.append(Paragraph("Maintenance Operations", section_style))
         
         requests = report_data['sections']['maintenance']['requests']
-        maint_data = [['Title', 'Property', 'Priority', 'Status', 'Cost']]
         
-        for req in requests[:10]:
+        def request_cells(req):
             priority_icon = '🔴' if req.get('priority') == 'HIGH' else '🟡' if req.get('priority') == 'MEDIUM' else '🟢'
             status_icon = '✅' if req.get('status') == 'COMPLETED' else '🔄' if req.get('status') == 'IN_PROGRESS' else '⏳'
-            maint_data.append([
+            return [
                 req.get('title', 'N/A')[:35] + '...' if len(req.get('title', '')) > 35 else req.get('title', 'N/A'),
                 req.get('property_title', 'N/A')[:30] + '...' if len(req.get('property_title', '')) > 30 else req.get('property_title', 'N/A'),
                 f"{priority_icon} {req.get('priority', 'N/A')}",
                 f"{status_icon} {req.get('status', 'N/A')}",
                 f"${req.get('cost', 0):,.2f}" if req.get('cost') else 'N/A'
-            ])
+            ]
         
-        maint_table = Table(maint_data, colWidths=[2*inch, 1.8*inch, 1*inch, 1*inch, 1*inch])
-        maint_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#ea580c')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#fff7ed')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#fed7aa')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#fff7ed')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
-        story.append(maint_table)
+        story.extend(report_table(
+            requests, ['Title', 'Property', 'Priority', 'Status', 'Cost'], request_cells,
+            'comprehensive_maintenance', [2*inch, 1.8*inch, 1*inch, 1*inch, 1*inch], limit=10
+        ))
         story.append(Spacer(1, 25))
     
     # Financial Section
@@ -1477,50 +1338,26 @@ def generate_comprehensive_pdf(report_data, report_type):
         story.append(Paragraph("Financial Transactions", section_style))
         
         transactions = report_data['sections']['financial']['transactions']
-        trans_data = [['Type', 'Amount', 'Description', 'Date', 'Property']]
         
-        for trans in transactions[:10]:
+        def transaction_cells(trans):
             type_icon = '💰' if trans.get('type') == 'INCOME' else '💸'
-            trans_data.append([
+            return [
                 f"{type_icon} {trans.get('type', 'N/A')}",
                 f"${trans.get('amount', 0):,.2f}" if trans.get('amount') else 'N/A',
                 trans.get('description', 'N/A')[:35] + '...' if len(trans.get('description', '')) > 35 else trans.get('description', 'N/A'),
                 trans.get('date', 'N/A'),
                 trans.get('property_title', 'N/A')[:25] + '...' if len(trans.get('property_title', '')) > 25 else trans.get('property_title', 'N/A')
-            ])
+            ]
         
-        trans_table = Table(trans_data, colWidths=[1.2*inch, 1*inch, 2*inch, 1*inch, 1.2*inch])
-        trans_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#7c3aed')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 15),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#faf5ff')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e9d5ff')),
-            ('FONTSIZE', (0, 1), (-1, -1), 10),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#faf5ff')]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-        ]))
-        story.append(trans_table)
+        story.extend(report_table(
+            transactions, ['Type', 'Amount', 'Description', 'Date', 'Property'], transaction_cells,
+            'comprehensive_transactions', [1.2*inch, 1*inch, 2*inch, 1*inch, 1.2*inch], limit=10
+        ))
     
     # Professional Footer
     story.append(Spacer(1, 30))
     
-    footer_style = ParagraphStyle(
-        'Footer',
-        parent=styles['Normal'],
-        fontSize=8,
-        spaceBefore=10,
-        alignment=1,
-        textColor=colors.HexColor('#64748b'),
-        fontName='Helvetica'
-    )
+    footer_style = styles['Footer']
     
     footer_text = """
     <b>CONFIDENTIAL</b> - This report contains proprietary and confidential information.<br/>
@@ -1533,20 +1370,9 @@ def generate_comprehensive_pdf(report_data, report_type):
     return buffer
 
 # Helper functions
-def get_last_maintenance_date(property_id):
-    """Get the date of the last maintenance request for a property"""
-    last_request = MaintenanceRequest.query.filter_by(property_id=property_id).order_by(desc(MaintenanceRequest.request_date)).first()
-    return last_request.request_date.strftime('%Y-%m-%d') if last_request else 'N/A'
-
-def get_last_service_date(vendor_id):
-    """Get the date of the last service provided by a vendor"""
-    last_request = MaintenanceRequest.query.filter_by(assigned_vendor_id=vendor_id).order_by(desc(MaintenanceRequest.completion_date)).first()
-    return last_request.completion_date.strftime('%Y-%m-%d') if last_request and last_request.completion_date else 'N/A'
-
-def calculate_vacant_days(property_id, start_date, end_date):
-    """Calculate vacant days for a property in the given date range"""
+def calculate_vacant_days(tenant, start_date, end_date):
+    """Calculate vacant days for a property, given its tenant, in the given date range"""
     # This is a simplified calculation - in a real system, you'd track vacancy periods
-    tenant = Tenant.query.filter_by(property_id=property_id).first()
     if not tenant or not tenant.lease_start or not tenant.lease_end:
         return (end_date - start_date).days
     
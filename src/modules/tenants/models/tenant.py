@@ -2,6 +2,10 @@ from . import BaseModel, db
 
 class Tenant(BaseModel):
     __tablename__ = 'tenants'
+    __table_args__ = (
+        # Keyset pagination order of GET /api/tenants
+        db.Index('ix_tenants_created_at_id', 'created_at', 'id'),
+    )
     
     # Tenant status constants
     STATUS_ACTIVE = 'active'
@@ -44,6 +48,21 @@ class RentRoll(BaseModel):
     tenant = db.relationship('Tenant', back_populates='rent_rolls')
     property = db.relationship('Property')
 
+class RentCollectionMonthly(BaseModel):
+    """Rent collected, due and still outstanding for a property in one month"""
+    __tablename__ = 'rent_collection_monthly'
+    __table_args__ = (
+        db.UniqueConstraint('property_id', 'year_month', name='uq_rent_collection_monthly_period'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    property_id = db.Column(db.Integer, db.ForeignKey('properties.id', ondelete='CASCADE'), nullable=False, index=True)
+    year_month = db.Column(db.Date, nullable=False, index=True)  # first day of the month
+    collected = db.Column(db.Numeric(14, 2), nullable=False, default=0)  # rent_roll.amount_paid by payment_date
+    due = db.Column(db.Numeric(14, 2), nullable=False, default=0)  # outstanding_balances.due_amount by due_date
+    outstanding = db.Column(db.Numeric(14, 2), nullable=False, default=0)  # the unresolved part of due
+    payment_count = db.Column(db.Integer, nullable=False, default=0)
+
 class OutstandingBalance(BaseModel):
     __tablename__ = 'outstanding_balances'
     
@@ -4,6 +4,8 @@ from models.property import Property
 from models.user import User
 from config import db
 from routes.auth_routes import token_required
+from utils.csv_export import csv_response, stream_query, wants_gzip
+from sqlalchemy import select
 import csv
 import io
 from datetime import datetime
@@ -396,35 +398,26 @@ def import_rental_owners(current_user):
 @rental_owner_bp.route('/rental-owners/export', methods=['GET'])
 @token_required
 def export_rental_owners(current_user):
-    """Export rental owners to CSV"""
+    """Export rental owners to CSV, streamed (?gzip=1 for a .csv.gz)"""
     try:
-        rental_owners = RentalOwner.query.filter_by(is_active=True).all()
-        
-        # Create CSV content
-        output = io.StringIO()
-        fieldnames = ['company_name', 'business_type', 'contact_email', 'contact_phone', 'city', 'state', 'zip_code']
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        for owner in rental_owners:
-            writer.writerow({
-                'company_name': owner.company_name,
-                'business_type': owner.business_type,
-                'contact_email': owner.contact_email,
-                'contact_phone': owner.contact_phone,
-                'city': owner.city,
-                'state': owner.state,
-                'zip_code': owner.zip_code
-            })
-        
-        csv_content = output.getvalue()
-        output.close()
-        
-        return jsonify({
-            'success': True,
-            'csv_content': csv_content,
-            'filename': f'rental_owners_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
-        }), 200
+        rental_owners = select(
+            RentalOwner.company_name,
+            RentalOwner.business_type,
+            RentalOwner.contact_email,
+            RentalOwner.contact_phone,
+            RentalOwner.city,
+            RentalOwner.state,
+            RentalOwner.zip_code
+        ).where(
+            RentalOwner.is_active == True
+        ).order_by(RentalOwner.id)
+        
+        return csv_response(
+            ['company_name', 'business_type', 'contact_email', 'contact_phone', 'city', 'state', 'zip_code'],
+            stream_query(rental_owners),
+            f'rental_owners_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
+            compress=wants_gzip(request)
+        )
         
     except Exception as e:
         print(f"Error exporting rental owners: {str(e)}")
@@ -1,15 +1,25 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from models.tenant import Tenant, RentRoll, OutstandingBalance, DraftLease, LeaseRenewal
 from models.property import Property
 from models.rental_owner import RentalOwner, RentalOwnerManager
 from models.financial import FinancialTransaction
 from config import db
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from routes.auth_routes import token_required
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case, select
+from utils.db_utils import encode_cursor, decode_cursor
+from utils.rent_roll import RENT_ROLL_EXPORT_FIELDS, build_rent_roll, count_rent_roll, rent_roll_parquet
+from utils.csv_export import csv_response, stream_query, wants_gzip
+from utils.rent_collection import (
+    month_start, add_months, monthly_totals, total_outstanding,
+    payment_snapshot, balance_snapshot, record_payment_change, record_balance_change
+)
 
 rental_bp = Blueprint('rental_bp', __name__)
 
+# Page size used when a cursor is passed without a limit
+RENT_ROLL_PAGE_SIZE = 50
+
 @rental_bp.route('/', methods=['GET'])
 @token_required
 def get_rental_data(current_user):
@@ -64,202 +74,73 @@ def get_rental_data(current_user):
 @rental_bp.route('/rent-roll', methods=['GET'])
 @token_required
 def get_rent_roll(current_user):
-    """Get rent roll (lease data) for the current user"""
+    """
+    Get rent roll (lease data) for the current user
+
+    Without limit/cursor the whole rent roll is returned as a list, as before.
+    With limit (max 500) it is keyset-paginated on tenant id: pass the returned
+    next_cursor back as cursor. total is only computed for the first page.
+    format=csv (gzip=1 for a .csv.gz) or format=parquet exports the whole rent roll instead.
+    """
     try:
-        from datetime import date, datetime
-        
-        # Get all properties owned by the current user
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        export_format = request.args.get('format')
+
+        if export_format and export_format not in ('csv', 'parquet'):
+            return jsonify({'error': 'format must be csv or parquet'}), 400
+
+        # Admins see every property, everyone else their own
         if current_user.role == 'ADMIN' or current_user.username == 'admin':
-            properties = Property.query.all()
+            owner_id = None
         else:
-            properties = Property.query.filter(Property.owner_id == current_user.id).all()
-        
-        property_ids = [p.id for p in properties]
-        
-        # Get tenants with property information
-        tenants = db.session.query(
-            Tenant,
-            Property.title.label('property_title'),
-            Property.street_address_1,
-            Property.city,
-            Property.state
-        ).join(
-            Property, Tenant.property_id == Property.id
-        ).filter(
-            Tenant.property_id.in_(property_ids)
-        ).all()
-        
-        rent_roll_data = []
-        today = date.today()
-        
-        for tenant, property_title, street_address, city, state in tenants:
-            # Determine lease status
-            if tenant.lease_start and tenant.lease_end:
-                if tenant.lease_start <= today <= tenant.lease_end:
-                    status = 'Active'
-                elif tenant.lease_start > today:
-                    status = 'Future'
-                else:
-                    status = 'Expired'
-            else:
-                status = 'No Lease'
-            
-            # Calculate next payment date based on rent_payment_day
-            from datetime import datetime, timedelta
-            from calendar import monthrange
-            
-            next_payment_date = None
-            next_payment_formatted = "N/A"
-            
-            if hasattr(tenant, 'rent_payment_day') and tenant.rent_payment_day:
-                payment_day = tenant.rent_payment_day
-                current_month = today.month
-                current_year = today.year
-                
-                # Try to create the payment date for current month
-                try:
-                    # Get the last day of current month to avoid invalid dates
-                    _, last_day_of_month = monthrange(current_year, current_month)
-                    actual_payment_day = min(payment_day, last_day_of_month)
-                    
-                    current_month_payment = today.replace(day=actual_payment_day)
-                    
-                    if current_month_payment >= today:
-                        # Payment is due this month
-                        next_payment_date = current_month_payment
-                    else:
-                        # Payment is due next month
-                        if current_month == 12:
-                            next_month = 1
-                            next_year = current_year + 1
-                        else:
-                            next_month = current_month + 1
-                            next_year = current_year
-                        
-                        # Get last day of next month
-                        _, last_day_of_next_month = monthrange(next_year, next_month)
-                        actual_payment_day = min(payment_day, last_day_of_next_month)
-                        
-                        next_payment_date = today.replace(year=next_year, month=next_month, day=actual_payment_day)
-                    
-                    # Format the next payment date
-                    days_until_payment = (next_payment_date - today).days
-                    if days_until_payment == 0:
-                        next_payment_formatted = "DUE TODAY"
-                    elif days_until_payment == 1:
-                        next_payment_formatted = "DUE TOMORROW"
-                    else:
-                        next_payment_formatted = f"DUE IN {days_until_payment} DAYS"
-                        
-                except ValueError:
-                    # Fallback if date calculation fails
-                    next_payment_formatted = "PAYMENT DATE ERROR"
-            else:
-                # Fallback to old lease-based calculation if no payment day set
-                days_left = 0
-                if tenant.lease_end and tenant.lease_end > today:
-                    days_left = (tenant.lease_end - today).days
-                
-                if days_left > 0:
-                    next_payment_formatted = f"{days_left} DAYS LEFT"
-                else:
-                    next_payment_formatted = "LEASE EXPIRED"
-            
-            # Format lease dates
-            lease_dates = f"{tenant.lease_start.strftime('%m/%d/%Y') if tenant.lease_start else 'N/A'} - {tenant.lease_end.strftime('%m/%d/%Y') if tenant.lease_end else 'N/A'}"
-            
-            # Format address
-            address = f"{street_address}, {city}, {state}" if street_address and city and state else "Address not available"
-            
-            # Calculate next payment amount (could be prorated or full) - use current property rent
-            next_payment_amount = (
-                float(tenant.property.rent_amount) if tenant.property and tenant.property.rent_amount 
-                else float(tenant.rent_amount) if tenant.rent_amount else 0
-            )
-            
-            # Check if we need to calculate prorated amount for next payment
-            if next_payment_date and tenant.lease_start:
-                from routes.tenant_routes import calculate_prorated_rent
-                from decimal import Decimal
-                
-                # Check if the next payment date is within the first billing cycle
-                # This handles cases where tenant joined mid-month
-                lease_start = tenant.lease_start
-                rent_payment_day = getattr(tenant, 'rent_payment_day', 1)
-                
-                # If lease started this month or next month, check if we need prorated calculation
-                next_payment_month = next_payment_date.month
-                next_payment_year = next_payment_date.year
-                lease_start_month = lease_start.month
-                lease_start_year = lease_start.year
-                
-                # Calculate prorated amount if:
-                # 1. Next payment is in the same month as lease start, OR
-                # 2. Next payment is in the month after lease start AND lease started after payment day
-                needs_proration = False
-                
-                if (lease_start_year == next_payment_year and lease_start_month == next_payment_month):
-                    # Same month - always need to check proration
-                    needs_proration = True
-                elif (lease_start_year == next_payment_year and lease_start_month == next_payment_month - 1):
-                    # Next month - check if lease started after payment day
-                    if lease_start.day > rent_payment_day:
-                        needs_proration = True
-                elif (lease_start_year == next_payment_year - 1 and lease_start_month == 12 and next_payment_month == 1):
-                    # Year boundary case
-                    if lease_start.day > rent_payment_day:
-                        needs_proration = True
-                
-                if needs_proration:
-                    try:
-                        prorated_info = calculate_prorated_rent(
-                            Decimal(str(tenant.rent_amount)), 
-                            lease_start, 
-                            rent_payment_day
-                        )
-                        
-                        # Use prorated amount for the next payment
-                        calculated_amount = float(prorated_info['prorated_amount'])
-                        
-                        # Only use prorated amount if it's actually different from monthly rent
-                        # This prevents showing "prorated" for full-month calculations
-                        if calculated_amount != float(tenant.rent_amount):
-                            next_payment_amount = calculated_amount
-                            # Update the payment status to show it's prorated
-                            if next_payment_formatted.startswith('DUE'):
-                                next_payment_formatted = f"{next_payment_formatted} (Prorated)"
-                        else:
-                            # Same amount means full month - don't mark as prorated
-                            next_payment_amount = float(tenant.rent_amount)
-                        
-                    except Exception as e:
-                        print(f"Error calculating prorated amount for tenant {tenant.id}: {e}")
-                        # Fall back to regular rent amount
-                        pass
-            
-            rent_roll_data.append({
-                'id': tenant.id,
-                'lease': f"{tenant.full_name} - {property_title}",
-                'leaseId': f"LEASE-{tenant.id:04d}",
-                'status': status,
-                'type': 'Residential',
-                'leaseDates': lease_dates,
-                'daysLeft': next_payment_formatted,  # Shows next payment date with proration note
-                'nextPaymentDate': next_payment_date.strftime('%Y-%m-%d') if next_payment_date else None,
-                'rentPaymentDay': getattr(tenant, 'rent_payment_day', 1),
-                'rent': next_payment_amount,  # Now shows actual next payment amount (prorated or full)
-                'monthlyRent': (
-                    float(tenant.property.rent_amount) if tenant.property and tenant.property.rent_amount 
-                    else float(tenant.rent_amount) if tenant.rent_amount else 0
-                ),  # Use current property rent
-                'tenant_name': tenant.full_name,
-                'property_title': property_title,
-                'address': address,
-                'email': tenant.email,
-                'phone': tenant.phone_number
-            })
-        
-        return jsonify(rent_roll_data), 200
+            owner_id = current_user.id
+
+        if export_format:
+            items = build_rent_roll(owner_id)
+            filename = f'rent_roll_{date.today().strftime("%Y%m%d")}'
+            if export_format == 'csv':
+                return csv_response(
+                    [header for header, _ in RENT_ROLL_EXPORT_FIELDS],
+                    items,
+                    filename,
+                    format_row=lambda item: [item[key] for _, key in RENT_ROLL_EXPORT_FIELDS],
+                    compress=wants_gzip(request)
+                )
+            try:
+                response = Response(rent_roll_parquet(items), mimetype='application/vnd.apache.parquet')
+            except ImportError:
+                return jsonify({'error': 'Parquet export requires pyarrow to be installed'}), 400
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}.parquet'
+            return response
+
+        after_id = None
+        if cursor:
+            try:
+                after_id, = decode_cursor(cursor, 1)
+                if not isinstance(after_id, int):
+                    raise ValueError('Invalid cursor')
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if limit is None:
+                limit = RENT_ROLL_PAGE_SIZE
+
+        if limit is None:
+            return jsonify(build_rent_roll(owner_id)), 200
+
+        limit = max(1, min(limit, 500))
+        total = count_rent_roll(owner_id) if after_id is None else None
+        # One extra row tells whether there is a next page
+        items = build_rent_roll(owner_id, after_id, limit + 1)
+        has_more = len(items) > limit
+        items = items[:limit]
+        return jsonify({
+            'items': items,
+            'total': total,
+            'size': len(items),
+            'limit': limit,
+            'next_cursor': encode_cursor(items[-1]['id']) if has_more else None
+        }), 200
     except Exception as e:
         print(f"Error fetching rent roll: {str(e)}")
         return jsonify({'error': str(e)}), 400
@@ -336,90 +217,85 @@ def get_outstanding_balances(current_user):
 def get_rental_statistics(current_user):
     """Get rental statistics and analytics"""
     try:
-        # Get all properties managed by the current user through rental owners
-        properties = Property.query.join(
+        # Properties managed by the current user through rental owners
+        property_ids = select(Property.id).join(
             RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
-        ).filter(
+        ).where(
             RentalOwnerManager.user_id == current_user.id
-        ).all()
-        property_ids = [p.id for p in properties]
-        
-        # Get current month and year
-        current_date = date.today()
-        current_month = current_date.month
-        current_year = current_date.year
-        
-        # Get tenants
-        tenants = Tenant.query.filter(Tenant.property_id.in_(property_ids)).all()
-        
-        # Get rent roll for current month
-        current_month_payments = RentRoll.query.filter(
-            and_(
-                RentRoll.property_id.in_(property_ids),
-                func.extract('month', RentRoll.payment_date) == current_month,
-                func.extract('year', RentRoll.payment_date) == current_year
-            )
-        ).all()
-        
-        # Get outstanding balances
-        outstanding_balances = OutstandingBalance.query.filter(
-            and_(
-                OutstandingBalance.property_id.in_(property_ids),
-                OutstandingBalance.is_resolved == False
-            )
-        ).all()
-        
-        # Calculate statistics - use current property rent amounts
-        total_monthly_rent = sum(
-            float(tenant.property.rent_amount or 0) if tenant.property and tenant.property.rent_amount 
-            else float(tenant.rent_amount or 0) 
-            for tenant in tenants
         )
-        current_month_collected = sum(float(payment.amount_paid or 0) for payment in current_month_payments)
-        total_outstanding = sum(float(balance.due_amount or 0) for balance in outstanding_balances)
-        occupancy_rate = (len(tenants) / len(properties)) * 100 if properties else 0
-        
-        # Get lease expirations in next 90 days
-        lease_expirations = Tenant.query.filter(
-            and_(
-                Tenant.property_id.in_(property_ids),
-                Tenant.lease_end >= current_date,
-                Tenant.lease_end <= current_date + datetime.timedelta(days=90)
-            )
-        ).all()
-        
-        # Get payment trends (last 6 months)
-        payment_trends = []
-        for i in range(6):
-            month_date = current_date.replace(day=1) - datetime.timedelta(days=30*i)
-            month_payments = RentRoll.query.filter(
-                and_(
-                    RentRoll.property_id.in_(property_ids),
-                    func.extract('month', RentRoll.payment_date) == month_date.month,
-                    func.extract('year', RentRoll.payment_date) == month_date.year
-                )
-            ).all()
-            
-            month_total = sum(float(payment.amount_paid or 0) for payment in month_payments)
-            payment_trends.append({
-                'month': month_date.strftime('%B %Y'),
-                'total': month_total
-            })
-        
+        total_properties = db.session.execute(
+            select(func.count()).select_from(property_ids.subquery())
+        ).scalar()
+
+        current_date = date.today()
+        current_month = month_start(current_date)
+
+        # Tenant count, rent roll (current property rent, else the tenant's) and
+        # upcoming lease expirations in one pass
+        active_tenants, total_monthly_rent, lease_expirations_count = db.session.query(
+            func.count(Tenant.id),
+            func.coalesce(func.sum(func.coalesce(func.nullif(Property.rent_amount, 0), Tenant.rent_amount, 0)), 0),
+            func.coalesce(func.sum(case(
+                (and_(Tenant.lease_end >= current_date,
+                      Tenant.lease_end <= current_date + timedelta(days=90)), 1),
+                else_=0
+            )), 0)
+        ).join(
+            Property, Tenant.property_id == Property.id
+        ).filter(
+            Tenant.property_id.in_(property_ids)
+        ).one()
+        total_monthly_rent = float(total_monthly_rent or 0)
+
+        # Payment trends (last 6 calendar months, newest first) from the monthly rollup
+        months = monthly_totals(property_ids, add_months(current_month, -5), current_month)
+        current_month_collected = months[-1]['collected']
+        payment_trends = [
+            {'month': month['year_month'].strftime('%B %Y'), 'total': month['collected']}
+            for month in reversed(months)
+        ]
+        occupancy_rate = (active_tenants / total_properties) * 100 if total_properties else 0
+
         return jsonify({
             'total_monthly_rent': total_monthly_rent,
             'current_month_collected': current_month_collected,
-            'total_outstanding': total_outstanding,
+            'total_outstanding': total_outstanding(property_ids),
             'occupancy_rate': occupancy_rate,
-            'active_tenants': len(tenants),
-            'total_properties': len(properties),
-            'lease_expirations_count': len(lease_expirations),
+            'active_tenants': active_tenants,
+            'total_properties': total_properties,
+            'lease_expirations_count': int(lease_expirations_count or 0),
             'payment_trends': payment_trends,
             'collection_rate': (current_month_collected / total_monthly_rent * 100) if total_monthly_rent > 0 else 0
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@rental_bp.route('/statistics/trends', methods=['GET'])
+@token_required
+def get_collection_trends(current_user):
+    """Collected, due and outstanding rent per month, oldest first (months=1..60, default 12)"""
+    try:
+        month_count = max(1, min(request.args.get('months', 12, type=int), 60))
+
+        property_ids = select(Property.id).join(
+            RentalOwnerManager, Property.rental_owner_id == RentalOwnerManager.rental_owner_id
+        ).where(
+            RentalOwnerManager.user_id == current_user.id
+        )
+        property_filter = request.args.get('property_id', type=int)
+        if property_filter is not None:
+            property_ids = property_ids.where(Property.id == property_filter)
+
+        current_month = month_start(date.today())
+        months = monthly_totals(property_ids, add_months(current_month, 1 - month_count), current_month)
+        for month in months:
+            month['month'] = month['year_month'].strftime('%B %Y')
+            month['year_month'] = month['year_month'].strftime('%Y-%m')
+
+        return jsonify({'months': months}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @rental_bp.route('/payments', methods=['POST'])
 @token_required
 def record_payment(current_user):
@@ -455,6 +331,7 @@ def record_payment(current_user):
         )
         
         db.session.add(payment)
+        record_payment_change(after=payment_snapshot(payment))
         db.session.commit()
         
         return jsonify({
@@ -470,7 +347,8 @@ def record_payment(current_user):
 def update_payment(current_user, payment_id):
     """Update an existing rent payment"""
     try:
-        payment = RentRoll.query.get(payment_id)
+        # Locked so a concurrent edit cannot change the row between the snapshot and the update
+        payment = RentRoll.query.filter_by(id=payment_id).with_for_update().first()
         if not payment:
             return jsonify({'error': 'Payment not found'}), 404
         
@@ -480,6 +358,7 @@ def update_payment(current_user, payment_id):
             return jsonify({'error': 'Not authorized to modify this payment'}), 403
         
         data = request.get_json()
+        before = payment_snapshot(payment)
         
         # Update fields
         if 'amount_paid' in data:
@@ -493,6 +372,7 @@ def update_payment(current_user, payment_id):
         if 'remarks' in data:
             payment.remarks = data['remarks']
         
+        record_payment_change(before, payment_snapshot(payment))
         db.session.commit()
         
         return jsonify({
@@ -531,6 +411,7 @@ def create_outstanding_balance(current_user):
         )
         
         db.session.add(balance)
+        record_balance_change(after=balance_snapshot(balance))
         db.session.commit()
         
         return jsonify({
@@ -546,7 +427,7 @@ def create_outstanding_balance(current_user):
 def update_outstanding_balance(current_user, balance_id):
     """Update an outstanding balance record"""
     try:
-        balance = OutstandingBalance.query.get(balance_id)
+        balance = OutstandingBalance.query.filter_by(id=balance_id).with_for_update().first()
         if not balance:
             return jsonify({'error': 'Outstanding balance not found'}), 404
         
@@ -556,6 +437,7 @@ def update_outstanding_balance(current_user, balance_id):
             return jsonify({'error': 'Not authorized to modify this balance'}), 403
         
         data = request.get_json()
+        before = balance_snapshot(balance)
         
         # Update fields
         if 'due_amount' in data:
@@ -565,6 +447,7 @@ def update_outstanding_balance(current_user, balance_id):
         if 'is_resolved' in data:
             balance.is_resolved = data['is_resolved']
         
+        record_balance_change(before, balance_snapshot(balance))
         db.session.commit()
         
         return jsonify({
@@ -580,7 +463,7 @@ def update_outstanding_balance(current_user, balance_id):
 def delete_outstanding_balance(current_user, balance_id):
     """Delete an outstanding balance record"""
     try:
-        balance = OutstandingBalance.query.get(balance_id)
+        balance = OutstandingBalance.query.filter_by(id=balance_id).with_for_update().first()
         if not balance:
             return jsonify({'error': 'Outstanding balance not found'}), 404
         
@@ -589,6 +472,7 @@ def delete_outstanding_balance(current_user, balance_id):
         if not property or property.owner_id != current_user.id:
             return jsonify({'error': 'Not authorized to delete this balance'}), 403
         
+        record_balance_change(before=balance_snapshot(balance))
         db.session.delete(balance)
         db.session.commit()
         
@@ -602,7 +486,7 @@ def delete_outstanding_balance(current_user, balance_id):
 def resolve_outstanding_balance(current_user, balance_id):
     """Mark an outstanding balance as resolved"""
     try:
-        balance = OutstandingBalance.query.get(balance_id)
+        balance = OutstandingBalance.query.filter_by(id=balance_id).with_for_update().first()
         if not balance:
             return jsonify({'error': 'Outstanding balance not found'}), 404
         
@@ -612,7 +496,9 @@ def resolve_outstanding_balance(current_user, balance_id):
             return jsonify({'error': 'Not authorized to modify this balance'}), 403
         
         # Mark as resolved
+        before = balance_snapshot(balance)
         balance.is_resolved = True
+        record_balance_change(before, balance_snapshot(balance))
         db.session.commit()
         
         return jsonify({
@@ -626,66 +512,57 @@ def resolve_outstanding_balance(current_user, balance_id):
 @rental_bp.route('/outstanding-balances/export', methods=['GET'])
 @token_required
 def export_outstanding_balances(current_user):
-    """Export outstanding balances to CSV"""
+    """Export outstanding balances to CSV, streamed (?gzip=1 for a .csv.gz)"""
     try:
-        from flask import make_response
-        import csv
-        import io
+        # Properties owned by the current user
+        property_ids = select(Property.id).where(Property.owner_id == current_user.id)
         
-        # Get all properties owned by the current user
-        properties = Property.query.filter(Property.owner_id == current_user.id).all()
-        property_ids = [p.id for p in properties]
-        
-        if not property_ids:
+        if db.session.execute(property_ids.limit(1)).first() is None:
             return jsonify({'error': 'No properties found'}), 404
         
-        # Get outstanding balances with tenant and property information
-        balances = db.session.query(
-            OutstandingBalance,
-            Tenant.full_name.label('tenant_name'),
-            Tenant.email.label('tenant_email'),
-            Property.title.label('property_title')
+        # Outstanding balances with tenant and property information
+        balances = select(
+            OutstandingBalance.id,
+            Property.title,
+            Tenant.full_name,
+            Tenant.email,
+            OutstandingBalance.due_amount,
+            OutstandingBalance.due_date,
+            OutstandingBalance.is_resolved
         ).join(
             Tenant, OutstandingBalance.tenant_id == Tenant.id
         ).join(
             Property, OutstandingBalance.property_id == Property.id
-        ).filter(
+        ).where(
             OutstandingBalance.property_id.in_(property_ids)
-        ).order_by(OutstandingBalance.due_date.asc()).all()
-        
-        # Create CSV data
-        output = io.StringIO()
-        writer = csv.writer(output)
+        ).order_by(OutstandingBalance.due_date.asc(), OutstandingBalance.id)
         
-        # Write headers
-        writer.writerow([
-            'Balance ID', 'Property', 'Tenant', 'Tenant Email', 
-            'Due Amount', 'Due Date', 'Days Overdue', 'Status'
-        ])
-        
-        # Write data rows
         today = date.today()
-        for balance, tenant_name, tenant_email, property_title in balances:
-            days_overdue = (today - balance.due_date).days if balance.due_date else 0
-            status = 'Resolved' if balance.is_resolved else 'Outstanding'
-            
-            writer.writerow([
-                balance.id,
+        
+        def format_balance(row):
+            balance_id, property_title, tenant_name, tenant_email, due_amount, due_date, is_resolved = row
+            days_overdue = (today - due_date).days if due_date else 0
+            return [
+                balance_id,
                 property_title,
                 tenant_name,
                 tenant_email,
-                float(balance.due_amount) if balance.due_amount else 0,
-                balance.due_date.strftime('%Y-%m-%d') if balance.due_date else '',
+                float(due_amount) if due_amount else 0,
+                due_date.strftime('%Y-%m-%d') if due_date else '',
                 max(0, days_overdue),
-                status
-            ])
-        
-        # Create response
-        response = make_response(output.getvalue())
-        response.headers['Content-Type'] = 'text/csv'
-        response.headers['Content-Disposition'] = f'attachment; filename=outstanding_balances_{date.today().strftime("%Y%m%d")}.csv'
-        
-        return response
+                'Resolved' if is_resolved else 'Outstanding'
+            ]
+        
+        return csv_response(
+            [
+                'Balance ID', 'Property', 'Tenant', 'Tenant Email',
+                'Due Amount', 'Due Date', 'Days Overdue', 'Status'
+            ],
+            stream_query(balances),
+            f'outstanding_balances_{today.strftime("%Y%m%d")}',
+            format_row=format_balance,
+            compress=wants_gzip(request)
+        )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
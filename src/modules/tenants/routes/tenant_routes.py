@@ -3,96 +3,17 @@ from models.tenant import Tenant, RentRoll, OutstandingBalance
 from models.property import Property
 from models.rental_owner import RentalOwner, RentalOwnerManager
 from config import db
-from datetime import datetime, date
-from calendar import monthrange
-from decimal import Decimal
+from datetime import datetime, date, timedelta
+from sqlalchemy import or_, tuple_
 from routes.auth_routes import token_required
+from utils.db_utils import encode_cursor, decode_cursor
+from utils.tenant_utils import calculate_prorated_rent
+from utils.rent_collection import payment_snapshot, balance_snapshot, record_payment_change, record_balance_change
 
 tenant_bp = Blueprint('tenant_bp', __name__)
 
-def calculate_prorated_rent(monthly_rent, lease_start_date, rent_payment_day=1):
-    """
-    Calculate prorated rent for a tenant joining mid-month
-    
-    Args:
-        monthly_rent (Decimal): Full monthly rent amount
-        lease_start_date (date): Date when tenant moves in
-        rent_payment_day (int): Day of month when rent is due (1-31)
-    
-    Returns:
-        dict: {
-            'prorated_amount': Decimal,
-            'days_in_month': int,
-            'days_tenant_stays': int,
-            'daily_rate': Decimal,
-            'next_full_payment_date': date
-        }
-    """
-    if not isinstance(lease_start_date, date):
-        lease_start_date = datetime.strptime(lease_start_date, '%Y-%m-%d').date()
-    
-    # Get the total days in the move-in month
-    year = lease_start_date.year
-    month = lease_start_date.month
-    _, days_in_month = monthrange(year, month)
-    
-    # Calculate daily rent rate
-    daily_rate = Decimal(str(monthly_rent)) / Decimal(str(days_in_month))
-    
-    # Determine the billing period for the first month
-    # If lease starts before or on payment day, bill from lease start to payment day (same month)
-    # If lease starts after payment day, bill from lease start to next payment day (next month)
-    
-    if lease_start_date.day <= rent_payment_day:
-        # Bill from lease start to payment day in same month
-        days_to_bill = rent_payment_day - lease_start_date.day + 1
-        next_payment_month = month + 1 if month < 12 else 1
-        next_payment_year = year if month < 12 else year + 1
-    else:
-        # Bill from lease start to next payment day
-        if month == 12:
-            next_payment_month = 1
-            next_payment_year = year + 1
-        else:
-            next_payment_month = month + 1
-            next_payment_year = year
-        
-        # Get days in next month for payment day calculation
-        _, days_in_next_month = monthrange(next_payment_year, next_payment_month)
-        actual_payment_day = min(rent_payment_day, days_in_next_month)
-        
-        # Days from lease start to end of current month
-        days_current_month = days_in_month - lease_start_date.day + 1
-        # Days from start of next month to payment day
-        days_next_month = actual_payment_day
-        
-        days_to_bill = days_current_month + days_next_month
-        
-        # Recalculate daily rate considering both months
-        _, days_in_next_month = monthrange(next_payment_year, next_payment_month)
-        avg_days_per_month = (days_in_month + days_in_next_month) / 2
-        daily_rate = Decimal(str(monthly_rent)) / Decimal(str(avg_days_per_month))
-    
-    # Calculate prorated amount
-    prorated_amount = daily_rate * Decimal(str(days_to_bill))
-    
-    # Calculate next full payment date
-    try:
-        _, days_in_next_month = monthrange(next_payment_year, next_payment_month)
-        actual_payment_day = min(rent_payment_day, days_in_next_month)
-        next_full_payment_date = date(next_payment_year, next_payment_month, actual_payment_day)
-    except ValueError:
-        # Fallback to first day of next month
-        next_full_payment_date = date(next_payment_year, next_payment_month, 1)
-    
-    return {
-        'prorated_amount': round(prorated_amount, 2),
-        'days_in_month': days_in_month,
-        'days_tenant_stays': days_to_bill,
-        'daily_rate': round(daily_rate, 2),
-        'next_full_payment_date': next_full_payment_date,
-        'calculation_note': f"Prorated for {days_to_bill} days at ${round(daily_rate, 2)}/day"
-    }
+# Page size used when a cursor is passed without a limit
+TENANT_PAGE_SIZE = 50
 
 @tenant_bp.route('/', methods=['POST'])
 @token_required
@@ -285,6 +206,7 @@ def create_tenant(current_user):
             )
             
             db.session.add(prorated_rent_entry)
+            record_payment_change(after=payment_snapshot(prorated_rent_entry))
             print(f"Created prorated rent entry: ${prorated_info['prorated_amount']} for {prorated_info['days_tenant_stays']} days")
         
         db.session.commit()
@@ -326,87 +248,167 @@ def create_tenant(current_user):
 @tenant_bp.route('/', methods=['GET'])
 @token_required
 def get_tenants(current_user):
+    """
+    List the tenants on the current user's properties plus unassigned tenants.
+
+    The property projection comes from the same outer-joined query. Filters:
+    - status: payment status ('pending' also matches tenants without one)
+    - property_id: a property id, or 'unassigned'
+    - lease_end_from / lease_end_to (YYYY-MM-DD) or expiring_within (days
+      from today): lease expiry window
+    - q: case-insensitive search on name and email
+
+    Without limit/cursor the whole filtered list is returned as before. With
+    limit (max 500), rows are keyset-paginated on (created_at, id), tenants
+    without created_at last: pass the returned next_cursor back as cursor, so
+    deep pages cost the same as the first. total is only computed for the
+    first page.
+    """
     try:
-        print("Fetching tenants for user:", current_user.id)
-        # Get all tenants for properties owned by the current user, plus unassigned tenants
-        assigned_tenants = Tenant.query.join(Property).filter(
-            Property.owner_id == current_user.id
-        ).all()
-        unassigned_tenants = Tenant.query.filter(Tenant.property_id.is_(None)).all()
-        
-        # Combine both lists
-        tenants = assigned_tenants + unassigned_tenants
-        print(f"Found {len(assigned_tenants)} assigned tenants and {len(unassigned_tenants)} unassigned tenants")
-        
-        tenant_list = []
-        for tenant in tenants:
+        status = request.args.get('status')
+        property_filter = request.args.get('property_id')
+        lease_end_from = request.args.get('lease_end_from')
+        lease_end_to = request.args.get('lease_end_to')
+        expiring_within = request.args.get('expiring_within', type=int)
+        search = (request.args.get('q') or '').strip()
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+
+        try:
+            lease_end_from = datetime.strptime(lease_end_from, '%Y-%m-%d').date() if lease_end_from else None
+            lease_end_to = datetime.strptime(lease_end_to, '%Y-%m-%d').date() if lease_end_to else None
+        except ValueError:
+            return jsonify({'error': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        if expiring_within is not None:
+            lease_end_from = date.today()
+            lease_end_to = date.today() + timedelta(days=max(expiring_within, 0))
+
+        after = None
+        if cursor:
             try:
-                # Always use the current property rent amount if tenant is assigned to a property
-                current_rent = "0"
-                if tenant.property and tenant.property.rent_amount:
-                    current_rent = str(tenant.property.rent_amount)
-                elif tenant.rent_amount:
-                    # Fallback to tenant's stored rent for unassigned tenants
-                    current_rent = str(tenant.rent_amount)
-                
-                tenant_data = {
-                    'id': tenant.id,
-                    'name': tenant.full_name,
-                    'email': tenant.email,
-                    'phone': tenant.phone_number,
-                    'propertyId': tenant.property_id,
-                    'leaseStartDate': tenant.lease_start.isoformat() if tenant.lease_start else None,
-                    'leaseEndDate': tenant.lease_end.isoformat() if tenant.lease_end else None,
-                    'rentAmount': current_rent,
-                    'status': tenant.payment_status or 'pending',
-                    'created_at': tenant.created_at.isoformat() if tenant.created_at else None
+                after = decode_cursor(cursor, 2)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            if limit is None:
+                limit = TENANT_PAGE_SIZE
+
+        query = db.session.query(
+            Tenant,
+            Property.title.label('property_title'),
+            Property.street_address_1,
+            Property.street_address_2,
+            Property.city,
+            Property.state,
+            Property.zip_code,
+            Property.status.label('property_status'),
+            Property.rent_amount.label('property_rent')
+        ).outerjoin(
+            Property, Tenant.property_id == Property.id
+        ).filter(
+            or_(Property.owner_id == current_user.id, Tenant.property_id.is_(None))
+        )
+
+        if status:
+            if status == 'pending':
+                query = query.filter(or_(Tenant.payment_status == status, Tenant.payment_status.is_(None)))
+            else:
+                query = query.filter(Tenant.payment_status == status)
+        if property_filter == 'unassigned':
+            query = query.filter(Tenant.property_id.is_(None))
+        elif property_filter:
+            try:
+                query = query.filter(Tenant.property_id == int(property_filter))
+            except ValueError:
+                return jsonify({'error': 'property_id must be an integer or "unassigned"'}), 400
+        if lease_end_from:
+            query = query.filter(Tenant.lease_end >= lease_end_from)
+        if lease_end_to:
+            query = query.filter(Tenant.lease_end <= lease_end_to)
+        if search:
+            pattern = f"%{search}%"
+            query = query.filter(or_(Tenant.full_name.ilike(pattern), Tenant.email.ilike(pattern)))
+
+        total = None
+        if limit is not None:
+            limit = max(1, min(limit, 500))
+            if after is None:
+                total = query.order_by(None).count()
+            elif after[0] is None:
+                # The cursor is already among the tenants without created_at
+                query = query.filter(Tenant.created_at.is_(None), Tenant.id > after[1])
+            else:
+                # A row comparison is never true for NULL created_at, so those rows are added back
+                query = query.filter(or_(tuple_(Tenant.created_at, Tenant.id) > tuple_(*after),
+                                         Tenant.created_at.is_(None)))
+            # One extra row tells whether there is a next page
+            rows = query.order_by(Tenant.created_at.asc().nulls_last(), Tenant.id).limit(limit + 1).all()
+        else:
+            rows = query.order_by(Tenant.created_at.asc().nulls_last(), Tenant.id).all()
+
+        has_more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if limit is not None else rows
+
+        tenant_list = []
+        for row in rows:
+            tenant = row.Tenant
+            # Always use the current property rent amount if tenant is assigned to a property
+            current_rent = "0"
+            if row.property_rent:
+                current_rent = str(row.property_rent)
+            elif tenant.rent_amount:
+                # Fallback to tenant's stored rent for unassigned tenants
+                current_rent = str(tenant.rent_amount)
+
+            tenant_data = {
+                'id': tenant.id,
+                'name': tenant.full_name,
+                'email': tenant.email,
+                'phone': tenant.phone_number,
+                'propertyId': tenant.property_id,
+                'leaseStartDate': tenant.lease_start.isoformat() if tenant.lease_start else None,
+                'leaseEndDate': tenant.lease_end.isoformat() if tenant.lease_end else None,
+                'rentAmount': current_rent,
+                'status': tenant.payment_status or 'pending',
+                'created_at': tenant.created_at.isoformat() if tenant.created_at else None
+            }
+
+            # Handle property data (can be None for unassigned tenants)
+            if tenant.property_id is not None and row.property_title is not None:
+                property_address = [part for part in (
+                    row.street_address_1, row.street_address_2, row.city, row.state, row.zip_code
+                ) if part]
+                tenant_data['property'] = {
+                    'id': tenant.property_id,
+                    'name': row.property_title,
+                    'address': ', '.join(property_address),
+                    'status': row.property_status
                 }
-                
-                # Handle property data (can be None for unassigned tenants)
-                if tenant.property:
-                    # Format address
-                    property_address = []
-                    if tenant.property.street_address_1:
-                        property_address.append(tenant.property.street_address_1)
-                    if tenant.property.street_address_2:
-                        property_address.append(tenant.property.street_address_2)
-                    if tenant.property.city:
-                        property_address.append(tenant.property.city)
-                    if tenant.property.state:
-                        property_address.append(tenant.property.state)
-                    if tenant.property.zip_code:
-                        property_address.append(tenant.property.zip_code)
-                    
-                    tenant_data['property'] = {
-                        'id': tenant.property.id,
-                        'name': tenant.property.title,
-                        'address': ', '.join(property_address),
-                        'status': tenant.property.status
-                    }
-                else:
-                    # For unassigned tenants
-                    tenant_data['property'] = None
-                
-                tenant_list.append(tenant_data)
-            except Exception as e:
-                print(f"Error processing tenant {tenant.id}:", str(e))
-                continue
-                
-        print("Successfully processed tenant list")
-        response_data = {
-            'items': tenant_list,
-            'total': len(tenant_list),
-            'page': 1,
-            'size': len(tenant_list),
-            'pages': 1
-        }
+            else:
+                tenant_data['property'] = None
+
+            tenant_list.append(tenant_data)
+
+        if limit is None:
+            response_data = {
+                'items': tenant_list,
+                'total': len(tenant_list),
+                'page': 1,
+                'size': len(tenant_list),
+                'pages': 1
+            }
+        else:
+            last = rows[-1].Tenant if rows else None
+            response_data = {
+                'items': tenant_list,
+                'total': total,
+                'size': len(tenant_list),
+                'limit': limit,
+                'next_cursor': encode_cursor(last.created_at, last.id) if has_more else None
+            }
         return jsonify(response_data), 200
     except Exception as e:
         print("Error fetching tenants:", str(e))
         return jsonify({'error': str(e)}), 400
-    except Exception as e:
-        print("Error fetching tenants:", str(e))
-        return jsonify({'error': str(e)}), 400
 
 @tenant_bp.route('/statistics/summary', methods=['GET'])
 @token_required
@@ -976,13 +978,15 @@ def delete_tenant(current_user, tenant_id):
                 db.session.delete(request)
             
             # Delete related rent roll entries
-            rent_rolls = RentRoll.query.filter_by(tenant_id=tenant_id).all()
+            rent_rolls = RentRoll.query.filter_by(tenant_id=tenant_id).with_for_update().all()
             for rent_roll in rent_rolls:
+                record_payment_change(before=payment_snapshot(rent_roll))
                 db.session.delete(rent_roll)
             
             # Delete related outstanding balances
-            outstanding_balances = OutstandingBalance.query.filter_by(tenant_id=tenant_id).all()
+            outstanding_balances = OutstandingBalance.query.filter_by(tenant_id=tenant_id).with_for_update().all()
             for balance in outstanding_balances:
+                record_balance_change(before=balance_snapshot(balance))
                 db.session.delete(balance)
                 
             print(f"Deleted {len(maintenance_requests)} maintenance requests, {len(rent_rolls)} rent rolls, {len(outstanding_balances)} outstanding balances")
@@ -33,10 +33,10 @@ def init_models():
     from src.modules.properties.models.property import Property
     from src.modules.properties.models.listing import Listing
     from src.modules.properties.models.association import Association, AssociationMembership, AssociationBalance, Violation
-    from src.modules.tenants.models.tenant import Tenant, RentRoll, OutstandingBalance, DraftLease, LeaseRenewal
+    from src.modules.tenants.models.tenant import Tenant, RentRoll, RentCollectionMonthly, OutstandingBalance, DraftLease, LeaseRenewal
     from src.modules.tenants.models.lease import LeaseRoll, RentalOwnerProfile, LeaseAgreement, LeasePayment
     from src.modules.tenants.models.rental_owner import RentalOwner, RentalOwnerManager
     from src.modules.maintenance.models.maintenance import MaintenanceRequest
     from src.modules.maintenance.models.vendor import Vendor
     from src.modules.financial.models.financial import PropertyFinancial, LoanPayment, FinancialTransaction
-    from src.modules.financial.models.accountability import AccountabilityFinancial, GeneralLedger, Banking, BankingTransaction
\ No newline at end of file
+    from src.modules.financial.models.accountability import AccountabilityFinancial, GeneralLedger, GeneralLedgerCheckpoint, Banking, BankingTransaction
\ No newline at end of file
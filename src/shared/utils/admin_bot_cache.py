@@ -0,0 +1,189 @@
+"""
+Response caches for the admin bot
+
+Two levels, both bounded LRUs with a TTL (utils.ttl_cache.TTLCache):
+
+- intent cache: LLM intent classifications, looked up first by the exact query
+  text and then by a normalized form (case, punctuation, whitespace and
+  politeness words removed), so "Show me my tenants!" and "show me my
+  tenants please" share one classification. Classifications do not depend on
+  the user or the data.
+- answer cache: RAG answers keyed by (intent, data fingerprint, history
+  fingerprint, normalized query). The data fingerprint hashes the exact data
+  the answer was generated from, so a hit can never describe different data,
+  whichever worker made the change; the history fingerprint hashes the
+  conversation messages that went into the prompt, so a follow-up is never
+  answered with a reply written for another conversation. Commits that
+  touch the tables the bot reads also bump a data version and drop every
+  cached answer, so stale entries do not wait for their TTL.
+
+Only real model output is cached: fallbacks produced while Ollama is slow or
+down are not, so the next request retries the model.
+"""
+
+import os
+import re
+import copy
+import json
+import hashlib
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from utils.ttl_cache import TTLCache
+
+# Writes to these tables change what get_data_for_intent returns
+WATCHED_TABLES = frozenset((
+    'tenants', 'properties', 'maintenance_requests', 'vendors', 'work_orders',
+    'rental_owners', 'rental_owner_managers', 'associations',
+))
+
+FILLER_WORDS = frozenset(('please', 'pls', 'kindly', 'hey', 'hi', 'hello', 'thanks', 'thank', 'you'))
+
+_PENDING_KEY = 'admin_bot_cache_data_changed'
+
+
+def normalize_query(query):
+    """Lowercase, strip punctuation and filler words, collapse whitespace"""
+    words = re.sub(r'[^a-z0-9$%.\s]', ' ', query.lower()).replace('.', ' ').split()
+    return ' '.join(word for word in words if word not in FILLER_WORDS)
+
+
+def data_fingerprint(data):
+    """Stable hash of the retrieved data an answer is grounded on"""
+    payload = json.dumps(data, sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class AdminBotCache:
+    """Intent and answer caches plus the hit counters reported by stats()"""
+
+    def __init__(self, intent_cache, answer_cache):
+        self.intents = intent_cache
+        self.answers = answer_cache
+        self.data_version = 0
+        self._lock = threading.Lock()
+        self._counters = {'intent_exact_hits': 0, 'intent_normalized_hits': 0, 'intent_misses': 0,
+                          'answer_hits': 0, 'answer_misses': 0}
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_intent(self, query):
+        """A copy of the cached classification for query, or None"""
+        analysis = self.intents.get(('exact', query.strip()))
+        if analysis is not None:
+            self._count('intent_exact_hits')
+            return copy.deepcopy(analysis)
+        analysis = self.intents.get(('normalized', normalize_query(query)))
+        if analysis is not None:
+            self._count('intent_normalized_hits')
+            # Promote so the next identical phrasing hits the exact level
+            self.intents.set(('exact', query.strip()), analysis)
+            return copy.deepcopy(analysis)
+        self._count('intent_misses')
+        return None
+
+    def set_intent(self, query, analysis):
+        analysis = copy.deepcopy(analysis)
+        self.intents.set(('exact', query.strip()), analysis)
+        self.intents.set(('normalized', normalize_query(query)), analysis)
+
+    def answer_key(self, intent, data, query, history=()):
+        """history is the conversation messages the prompt includes, oldest first"""
+        messages = [(msg.get('role', 'unknown'), msg.get('message', '')) for msg in history]
+        return (intent, data_fingerprint(data), data_fingerprint(messages), normalize_query(query))
+
+    def get_answer(self, key):
+        answer = self.answers.get(key)
+        self._count('answer_hits' if answer is not None else 'answer_misses')
+        return answer
+
+    def set_answer(self, key, answer):
+        self.answers.set(key, answer)
+
+    def data_changed(self):
+        """Bump the data version and drop every cached answer"""
+        with self._lock:
+            self.data_version += 1
+        self.answers.clear()
+
+    def clear(self):
+        self.intents.clear()
+        self.answers.clear()
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+            data_version = self.data_version
+        intent_lookups = counters['intent_exact_hits'] + counters['intent_normalized_hits'] + counters['intent_misses']
+        answer_lookups = counters['answer_hits'] + counters['answer_misses']
+        intents = self.intents.stats()
+        answers = self.answers.stats()
+        return {
+            'intent': {
+                'exact_hits': counters['intent_exact_hits'],
+                'normalized_hits': counters['intent_normalized_hits'],
+                'misses': counters['intent_misses'],
+                'hit_rate': round((intent_lookups - counters['intent_misses']) / intent_lookups, 4)
+                            if intent_lookups else 0.0,
+                'entries': intents['entries'],
+                'max_entries': intents['max_entries'],
+                'ttl_seconds': intents['ttl_seconds'],
+            },
+            'answer': {
+                'hits': counters['answer_hits'],
+                'misses': counters['answer_misses'],
+                'hit_rate': round(counters['answer_hits'] / answer_lookups, 4) if answer_lookups else 0.0,
+                'entries': answers['entries'],
+                'max_entries': answers['max_entries'],
+                'ttl_seconds': answers['ttl_seconds'],
+            },
+            'data_version': data_version,
+        }
+
+
+admin_bot_cache = AdminBotCache(
+    intent_cache=TTLCache(
+        max_entries=int(os.environ.get('ADMIN_BOT_INTENT_CACHE_MAX_ENTRIES', 4096)),
+        ttl_seconds=int(os.environ.get('ADMIN_BOT_INTENT_CACHE_TTL', 3600))
+    ),
+    answer_cache=TTLCache(
+        max_entries=int(os.environ.get('ADMIN_BOT_ANSWER_CACHE_MAX_ENTRIES', 1024)),
+        ttl_seconds=int(os.environ.get('ADMIN_BOT_ANSWER_CACHE_TTL', 600))
+    ),
+)
+
+
+def _touches_watched_tables(session):
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        if getattr(instance, '__tablename__', None) in WATCHED_TABLES:
+            return True
+    return False
+
+
+def register_data_listeners(cache=None):
+    """
+    Call data_changed() after any commit that inserted, updated or deleted a
+    row of WATCHED_TABLES through the ORM
+    """
+    cache = cache or admin_bot_cache
+    if getattr(cache, '_listening', False):
+        return
+    cache._listening = True
+
+    @event.listens_for(Session, 'before_flush')
+    def _note_changes(session, flush_context, instances):
+        if _touches_watched_tables(session):
+            session.info[_PENDING_KEY] = True
+
+    @event.listens_for(Session, 'after_commit')
+    def _flush_pending(session):
+        if session.info.pop(_PENDING_KEY, False):
+            cache.data_changed()
+
+    @event.listens_for(Session, 'after_rollback')
+    def _discard_pending(session):
+        session.info.pop(_PENDING_KEY, None)
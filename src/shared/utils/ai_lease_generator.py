@@ -1,113 +1,350 @@
+"""
+Lease PDF generation
+
+fill_pdf_form() fills the "condo or apt copy.pdf" AcroForm template for one
+lease; fill_pdf_forms() fills many (a whole building) in a process pool and
+writes each PDF to disk, or into a single zip, as soon as it is ready.
+
+The template is parsed once per process and its field names are indexed
+(LeaseTemplate), so a fill is one dictionary lookup per value and an
+appended incremental update instead of a re-read, a re-parse, a scan of every
+field for every value and a rewrite of the whole document. The cached
+template is reloaded whenever the file's mtime or size changes.
+"""
+
+import io
 import os
 import uuid
+import zipfile
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pypdf import PdfReader, PdfWriter
-from pypdf.generic import TextStringObject, NameObject
+from pypdf.generic import DictionaryObject, IndirectObject, NameObject, NumberObject, TextStringObject
 import datetime
 
-def fill_pdf_form(form_data):
+# Mapping from frontend data keys to PDF field names,
+# based on the actual fields found in "condo or apt copy.pdf"
+FIELD_MAPPING = {
+    'landlordFullName': 'landlordFullName',
+    'leaseTerm': 'leaseTerm',
+    'leaseStartDate': 'leaseStartDate',
+    'leaseEndDate': 'leaseEndDate',
+    'tenantFullName': 'tenantFullName',
+    'landlordEmail': 'landlordEmail',
+    'landlordPhone': 'landlordPhone',
+    'tenantEmail': 'tenantEmail',
+    'tenantPhone': 'tenantPhone',
+    'unitNumber': 'unitNumber',
+    'streetAddress': 'streetAddress',
+    'city': 'city',
+    'zipCode': 'zipCode',
+    'includedFurniture': 'includedFurniture',
+    'monthlyRent': 'monthlyRent',
+    'securityDeposit': 'securityDeposit',
+    'lateFee': 'lateFee',
+    'earlyTerminationFee': 'earlyTerminationFee'
+}
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'templates')
+TEMPLATE_FILENAME = "condo or apt copy.pdf"
+GENERATED_DIR = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'generated')
+
+# Worker processes for fill_pdf_forms(); batches smaller than BATCH_MIN_PARALLEL are filled in-process
+BATCH_MAX_WORKERS = int(os.environ.get('LEASE_BATCH_WORKERS', min(4, os.cpu_count() or 1)))
+BATCH_MIN_PARALLEL = int(os.environ.get('LEASE_BATCH_MIN_PARALLEL', 200))
+
+
+class LeaseTemplate:
     """
-    Fills a PDF form template with data from a dictionary and generates a new PDF.
+    A parsed lease template with its AcroForm fields indexed by name.
+
+    render() fills it with a PDF incremental update: the template bytes are
+    copied unchanged and only the filled field dictionaries are appended,
+    with a small cross-reference section pointing back at the original one.
+    Templates that use cross-reference streams or encryption are filled by
+    cloning the whole document instead (fill()).
     """
-    try:
-        # Define mapping from frontend data keys to PDF field names
-        # Based on the actual fields found in "condo or apt copy.pdf"
-        FIELD_MAPPING = {
-            'landlordFullName': 'landlordFullName',
-            'leaseTerm': 'leaseTerm',
-            'leaseStartDate': 'leaseStartDate',
-            'leaseEndDate': 'leaseEndDate',
-            'tenantFullName': 'tenantFullName',
-            'landlordEmail': 'landlordEmail',
-            'landlordPhone': 'landlordPhone',
-            'tenantEmail': 'tenantEmail',
-            'tenantPhone': 'tenantPhone',
-            'unitNumber': 'unitNumber',
-            'streetAddress': 'streetAddress',
-            'city': 'city',
-            'zipCode': 'zipCode',
-            'includedFurniture': 'includedFurniture',
-            'monthlyRent': 'monthlyRent',
-            'securityDeposit': 'securityDeposit',
-            'lateFee': 'lateFee',
-            'earlyTerminationFee': 'earlyTerminationFee'
-        }
-
-        # Load the condo or apt copy template
-        templates_dir = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'templates')
-        template_filename = "condo or apt copy.pdf"
-        template_path = os.path.join(templates_dir, template_filename)
-        
-        if not os.path.exists(template_path):
-            print(f"Error: Template '{template_filename}' not found in templates directory: {templates_dir}")
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.version = (stat.st_mtime_ns, stat.st_size)
+        with open(path, 'rb') as template_file:
+            self.data = template_file.read()
+        self.reader = PdfReader(io.BytesIO(self.data))
+        trailer = self.reader.trailer
+        # Field name -> indirect reference and position in /AcroForm /Fields; clones keep the same order
+        self.field_refs = {}
+        self.field_index = {}
+        root = trailer['/Root']
+        if '/AcroForm' in root and '/Fields' in root['/AcroForm']:
+            for position, field_ref in enumerate(root['/AcroForm']['/Fields']):
+                field_obj = field_ref.get_object()
+                if '/T' in field_obj and str(field_obj['/T']) not in self.field_index:
+                    self.field_index[str(field_obj['/T'])] = position
+                    if isinstance(field_ref, IndirectObject):
+                        self.field_refs[str(field_obj['/T'])] = field_ref
+
+        self.startxref = self._startxref()
+        self.incremental = (
+            self.startxref is not None
+            and '/Encrypt' not in trailer
+            and self.data[self.startxref:self.startxref + 4] == b'xref'
+        )
+        # The reader seeks a shared stream while resolving objects
+        self._lock = threading.Lock()
+
+    def _startxref(self):
+        position = self.data.rfind(b'startxref')
+        if position < 0:
             return None
-                
-        print(f"Using template: {template_filename}")
+        try:
+            return int(self.data[position + len(b'startxref'):].split()[0])
+        except (IndexError, ValueError):
+            return None
+
+    def _filled_field(self, field_obj, field_value):
+        # Set field value and default value
+        field_obj[NameObject('/V')] = TextStringObject(field_value)
+        field_obj[NameObject('/DV')] = TextStringObject(field_value)
 
-        # Read the PDF and prepare a writer object
-        reader = PdfReader(template_path)
+        # Remove appearance streams to force regeneration
+        if NameObject('/AP') in field_obj:
+            del field_obj[NameObject('/AP')]
+        return field_obj
+
+    def fill(self, data_to_fill):
+        """A PdfWriter holding a filled copy of the whole template"""
         writer = PdfWriter()
-        
-        # Clone document structure to preserve AcroForm
-        writer.clone_reader_document_root(reader)
-        
-        # Create the data dictionary for filling form fields
-        data_to_fill = {}
-        for form_key, pdf_field_name in FIELD_MAPPING.items():
-            value = form_data.get(form_key, '')
-            if value:
-                # Handle special formatting for fields that exist in the template
-                if form_key == 'earlyTerminationFee':
-                    data_to_fill[pdf_field_name] = 'Agrees' if value == 'agrees' else 'Does Not Agree'
-                else:
-                    data_to_fill[pdf_field_name] = str(value)
-
-        # Fill form fields using direct field manipulation
+        with self._lock:
+            # Clone document structure to preserve AcroForm
+            writer.clone_reader_document_root(self.reader)
+
         if data_to_fill and '/AcroForm' in writer._root_object:
             acro_form = writer._root_object['/AcroForm']
             if '/Fields' in acro_form:
                 fields = acro_form['/Fields']
-                
-                # Update each field directly
                 for field_name, field_value in data_to_fill.items():
-                    for field_ref in fields:
-                        field_obj = field_ref.get_object()
-                        if '/T' in field_obj and field_obj['/T'] == field_name:
-                            # Set field value and default value
-                            field_obj[NameObject('/V')] = TextStringObject(field_value)
-                            field_obj[NameObject('/DV')] = TextStringObject(field_value)
-                            
-                            # Remove appearance streams to force regeneration
-                            if NameObject('/AP') in field_obj:
-                                del field_obj[NameObject('/AP')]
-                            break
-
-        # Generate unique filename
-        tenant_name = form_data.get('tenantFullName', 'UNKNOWN_TENANT')
-        clean_tenant_name = ''.join(c for c in tenant_name if c.isalnum() or c in (' ', '_')).replace(' ', '_').upper()
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_filename = f"Lease_{clean_tenant_name}_{timestamp}.pdf"
-        
-        output_path = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'generated', output_filename)
+                    position = self.field_index.get(field_name)
+                    if position is not None:
+                        self._filled_field(fields[position].get_object(), field_value)
+        return writer
+
+    def render(self, data_to_fill):
+        """The filled PDF as bytes"""
+        if not self.incremental:
+            buffer = io.BytesIO()
+            self.fill(data_to_fill).write(buffer)
+            return buffer.getvalue()
+
+        buffer = io.BytesIO()
+        buffer.write(self.data)
+        if not self.data.endswith(b'\n'):
+            buffer.write(b'\n')
+        offsets = []
+        with self._lock:
+            for field_name, field_value in data_to_fill.items():
+                field_ref = self.field_refs.get(field_name)
+                if field_ref is None:
+                    continue
+                field_obj = self._filled_field(DictionaryObject(field_ref.get_object()), field_value)
+                offsets.append((field_ref.idnum, field_ref.generation, buffer.tell()))
+                buffer.write(f"{field_ref.idnum} {field_ref.generation} obj\n".encode('ascii'))
+                field_obj.write_to_stream(buffer)
+                buffer.write(b'\nendobj\n')
+
+        xref_offset = buffer.tell()
+        # Free-list head first, as readers expect each section to start at object 0
+        buffer.write(b'xref\n0 1\n0000000000 65535 f \n')
+        for idnum, generation, offset in sorted(offsets):
+            # Fixed 20-byte entries, one subsection per object
+            buffer.write(f"{idnum} 1\n{offset:010d} {generation:05d} n \n".encode('ascii'))
+
+        trailer = DictionaryObject({
+            NameObject('/Size'): NumberObject(self.reader.trailer['/Size']),
+            NameObject('/Root'): self.reader.trailer.raw_get('/Root'),
+            NameObject('/Prev'): NumberObject(self.startxref),
+        })
+        for key in ('/Info', '/ID'):
+            if key in self.reader.trailer:
+                trailer[NameObject(key)] = self.reader.trailer.raw_get(key)
+        buffer.write(b'trailer\n')
+        trailer.write_to_stream(buffer)
+        buffer.write(f"\nstartxref\n{xref_offset}\n%%EOF\n".encode('ascii'))
+        return buffer.getvalue()
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def template_path(template_filename=TEMPLATE_FILENAME):
+    return os.path.join(TEMPLATES_DIR, template_filename)
+
+
+def get_lease_template(path=None):
+    """
+    The cached LeaseTemplate for path, reloaded if the file changed since it
+    was parsed; None if the file does not exist
+    """
+    path = os.path.abspath(path or template_path())
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        with _templates_lock:
+            _templates.pop(path, None)
+        return None
+    with _templates_lock:
+        template = _templates.get(path)
+        if template is None or template.version != (stat.st_mtime_ns, stat.st_size):
+            template = LeaseTemplate(path)
+            _templates[path] = template
+        return template
+
+
+def clear_template_cache():
+    with _templates_lock:
+        _templates.clear()
+
+
+def build_field_values(form_data):
+    """PDF field name -> text for the non-empty values in form_data"""
+    data_to_fill = {}
+    for form_key, pdf_field_name in FIELD_MAPPING.items():
+        value = form_data.get(form_key, '')
+        if value:
+            # Handle special formatting for fields that exist in the template
+            if form_key == 'earlyTerminationFee':
+                data_to_fill[pdf_field_name] = 'Agrees' if value == 'agrees' else 'Does Not Agree'
+            else:
+                data_to_fill[pdf_field_name] = str(value)
+    return data_to_fill
+
+
+def lease_filename(form_data, suffix=''):
+    tenant_name = form_data.get('tenantFullName', 'UNKNOWN_TENANT')
+    clean_tenant_name = ''.join(c for c in tenant_name if c.isalnum() or c in (' ', '_')).replace(' ', '_').upper()
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"Lease_{clean_tenant_name}_{timestamp}{suffix}.pdf"
+
+
+def render_lease(form_data, path=None):
+    """Filled lease PDF as bytes; raises FileNotFoundError if the template is missing"""
+    template = get_lease_template(path)
+    if template is None:
+        raise FileNotFoundError(f"Template not found: {path or template_path()}")
+    return template.render(build_field_values(form_data))
+
+
+def fill_pdf_form(form_data):
+    """
+    Fills a PDF form template with data from a dictionary and generates a new PDF.
+    """
+    try:
+        template = get_lease_template()
+        if template is None:
+            print(f"Error: Template '{TEMPLATE_FILENAME}' not found in templates directory: {TEMPLATES_DIR}")
+            return None
+
+        pdf_bytes = template.render(build_field_values(form_data))
+
+        output_filename = lease_filename(form_data)
+        output_path = os.path.join(GENERATED_DIR, output_filename)
 
         # Ensure the generated directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        os.makedirs(GENERATED_DIR, exist_ok=True)
 
         # Write the PDF to file
         with open(output_path, "wb") as output_stream:
-            writer.write(output_stream)
-            output_stream.flush()
-            os.fsync(output_stream.fileno())
-
-        # Verify file was created and return filename
-        if os.path.exists(output_path):
-            return output_filename
-        else:
-            return None
+            output_stream.write(pdf_bytes)
+
+        return output_filename
 
     except Exception as e:
         print(f"Error during PDF generation: {e}")
         return None
 
+
+def _render_batch_item(index, form_data, path):
+    """Pool task: (index, pdf bytes or None, error or None)"""
+    try:
+        return index, render_lease(form_data, path), None
+    except Exception as e:
+        return index, None, str(e)
+
+
+def _iter_rendered(forms, path, max_workers):
+    """Yield (index, pdf bytes or None, error or None) in input order"""
+    if max_workers <= 1 or len(forms) < BATCH_MIN_PARALLEL:
+        for index, form_data in enumerate(forms):
+            yield _render_batch_item(index, form_data, path)
+        return
+
+    # At most 2 * max_workers PDFs are in flight, so memory stays bounded for any batch size
+    window = deque()
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        for index, form_data in enumerate(forms):
+            window.append(executor.submit(_render_batch_item, index, form_data, path))
+            if len(window) >= max_workers * 2:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def fill_pdf_forms(forms, output_dir=None, zip_path=None, max_workers=None):
+    """
+    Fill one lease per form_data dict in forms.
+
+    Each worker process parses the template once and reuses it for every lease
+    it fills. PDFs are written as they are produced: to output_dir (default
+    uploads/generated), or into a single zip at zip_path when one is given.
+
+    Returns a dict with 'files' (one filename per form, in order, None where
+    filling failed), 'errors' ({index: message}) and 'zip_path'.
+    """
+    forms = list(forms)
+    path = template_path()
+    if get_lease_template(path) is None:
+        print(f"Error: Template '{TEMPLATE_FILENAME}' not found in templates directory: {TEMPLATES_DIR}")
+        return {'files': [None] * len(forms), 'errors': {}, 'zip_path': None}
+
+    max_workers = BATCH_MAX_WORKERS if max_workers is None else max_workers
+    max_workers = max(1, min(max_workers, len(forms)))
+    files = [None] * len(forms)
+    errors = {}
+    batch_id = uuid.uuid4().hex[:8]
+
+    if zip_path:
+        os.makedirs(os.path.dirname(os.path.abspath(zip_path)), exist_ok=True)
+        archive = zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED)
+    else:
+        output_dir = output_dir or GENERATED_DIR
+        os.makedirs(output_dir, exist_ok=True)
+        archive = None
+
+    try:
+        for index, pdf_bytes, error in _iter_rendered(forms, path, max_workers):
+            if pdf_bytes is None:
+                errors[index] = error
+                print(f"Error during PDF generation for lease {index}: {error}")
+                continue
+            # Leases filled in the same second would otherwise share a name
+            filename = lease_filename(forms[index], f"_{batch_id}_{index:04d}")
+            if archive is not None:
+                archive.writestr(filename, pdf_bytes)
+            else:
+                with open(os.path.join(output_dir, filename), "wb") as output_stream:
+                    output_stream.write(pdf_bytes)
+            files[index] = filename
+    finally:
+        if archive is not None:
+            archive.close()
+
+    return {'files': files, 'errors': errors, 'zip_path': zip_path}
+
 def generate_lease_content(form_data):
     """
     Generates a text-based lease content from form data.
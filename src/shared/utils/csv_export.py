@@ -0,0 +1,109 @@
+"""
+Streaming CSV exports
+
+csv_response() turns a header and an iterable of rows into a Response that
+writes CSV as rows arrive:
+- stream_query() executes a column projection with yield_per, so the driver
+  uses a server-side cursor (PostgreSQL) and only one batch of rows is in
+  memory at a time
+- the header goes out before the query runs, so the first byte is sent
+  immediately whatever the export size
+- rows are written in chunks of CSV_CHUNK_ROWS to keep per-yield overhead low
+- with compress=True the stream is gzipped on the fly and served as .csv.gz
+
+Because the body is produced after the view returns, errors while streaming
+can no longer become a JSON error response; they are logged and end the
+download early.
+"""
+
+import csv
+import io
+import logging
+import zlib
+
+from flask import Response, stream_with_context
+
+from config import db
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the database per round trip
+YIELD_PER = 1000
+
+# Rows written per chunk of the response body
+CSV_CHUNK_ROWS = 500
+
+
+def stream_query(statement, batch_size=YIELD_PER):
+    """Rows of a select() fetched batch_size at a time from a server-side cursor"""
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for row in result:
+            yield row
+    finally:
+        result.close()
+
+
+def iter_csv(header, rows, format_row=None, chunk_rows=CSV_CHUNK_ROWS):
+    """CSV text for header and rows, yielded in chunks of chunk_rows rows"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(header)
+    # The header is sent on its own so the client sees the download start right away
+    yield output.getvalue()
+    output.seek(0)
+    output.truncate(0)
+
+    pending = 0
+    for row in rows:
+        writer.writerow(format_row(row) if format_row else row)
+        pending += 1
+        if pending == chunk_rows:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            pending = 0
+    if pending:
+        yield output.getvalue()
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip-compress an iterable of text chunks on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _logged(chunks, filename):
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error(f"Error streaming {filename}: {e}")
+        raise
+
+
+def csv_response(header, rows, filename, format_row=None, compress=False):
+    """
+    Streamed CSV download. rows is any iterable, typically stream_query();
+    format_row maps each row to a list of cell values. filename is given
+    without extension.
+    """
+    chunks = iter_csv(header, rows, format_row)
+    if compress:
+        body, mimetype, filename = gzip_stream(chunks), 'application/gzip', f'{filename}.csv.gz'
+    else:
+        body, mimetype, filename = chunks, 'text/csv', f'{filename}.csv'
+
+    response = Response(stream_with_context(_logged(body, filename)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    # Keep proxies (nginx) from buffering the whole export before sending it on
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def wants_gzip(request):
+    """?gzip=1 (or true/yes) asks for a .csv.gz download"""
+    return request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
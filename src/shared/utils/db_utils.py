@@ -1,5 +1,9 @@
 from config import db
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
+from datetime import datetime, date
+import base64
+import json
 import logging
 from functools import wraps
 
@@ -62,3 +66,43 @@ def reset_db_connection():
     except Exception as e:
         logging.error(f"Error resetting database connection: {str(e)}")
         raise e
+
+def month_bucket(column):
+    """
+    SQL expression truncating a date column to the first day of its month.
+    Uses date_trunc on PostgreSQL and strftime on SQLite (local development).
+    """
+    if db.engine.dialect.name == 'postgresql':
+        return func.date_trunc('month', column)
+    return func.strftime('%Y-%m-01', column)
+
+def bucket_to_date(value):
+    """Normalize a month_bucket() result to a date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+def encode_cursor(*values):
+    """
+    Opaque keyset cursor for the sort key of the last row of a page.
+    Datetimes round-trip through decode_cursor.
+    """
+    payload = [{'dt': value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token, size):
+    """Sort-key values from encode_cursor; raises ValueError if the token is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError('Invalid cursor')
+    try:
+        return [datetime.fromisoformat(value['dt']) if isinstance(value, dict) else value for value in payload]
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('Invalid cursor')
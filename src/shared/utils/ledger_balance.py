@@ -0,0 +1,235 @@
+"""
+Incremental running-balance engine for the general ledger
+
+Ledger rows are ordered by id within a property and each row stores the
+running balance after it. Instead of reloading and recomputing the whole
+ledger on every edit, postings apply one signed delta to all later rows with
+a single set-based UPDATE.
+
+Writers for the same property serialize on a transaction-scoped advisory lock
+(PostgreSQL), so two concurrent postings can never read the same "last
+balance". Monthly checkpoints store the opening balance of each month, which
+lets balance_as_of() answer historical questions by scanning at most one
+month of rows.
+"""
+
+import logging
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import case, func
+
+from config import db
+from models.accountability import GeneralLedger, GeneralLedgerCheckpoint
+
+# First key of the two-key advisory lock; keeps ledger locks apart from any other
+# advisory locks taken on the same property ids
+LEDGER_LOCK_NAMESPACE = 4201
+
+ZERO = Decimal('0.00')
+
+
+def signed_amount(transaction_type, amount):
+    """Debits increase the balance, everything else decreases it"""
+    amount = Decimal(str(amount or 0))
+    return amount if transaction_type == GeneralLedger.TYPE_DEBIT else -amount
+
+
+def signed_amount_expr():
+    """SQL expression equivalent of signed_amount() over GeneralLedger rows"""
+    return case(
+        (GeneralLedger.transaction_type == GeneralLedger.TYPE_DEBIT, GeneralLedger.amount),
+        else_=-GeneralLedger.amount
+    )
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def lock_property_ledger(property_id):
+    """
+    Take the per-property ledger lock for the rest of the current transaction.
+    On databases without advisory locks (SQLite in development) writes are
+    already serialized, so this is a no-op.
+    """
+    bind = db.session.get_bind()
+    if bind.dialect.name == 'postgresql':
+        db.session.execute(
+            db.text("SELECT pg_advisory_xact_lock(:namespace, :property_id)"),
+            {'namespace': LEDGER_LOCK_NAMESPACE, 'property_id': property_id}
+        )
+
+
+def shift_balances_after(property_id, entry_id, delta):
+    """Add delta to the running balance of every row after entry_id in one UPDATE"""
+    if not delta:
+        return 0
+    return GeneralLedger.query.filter(
+        GeneralLedger.property_id == property_id,
+        GeneralLedger.id > entry_id
+    ).update(
+        {GeneralLedger.running_balance: GeneralLedger.running_balance + delta},
+        synchronize_session=False
+    )
+
+
+def shift_checkpoints_after(property_id, transaction_date, delta):
+    """Add delta to every checkpoint whose month starts after transaction_date"""
+    if not delta:
+        return 0
+    return GeneralLedgerCheckpoint.query.filter(
+        GeneralLedgerCheckpoint.property_id == property_id,
+        GeneralLedgerCheckpoint.period_start > transaction_date
+    ).update(
+        {GeneralLedgerCheckpoint.opening_balance: GeneralLedgerCheckpoint.opening_balance + delta},
+        synchronize_session=False
+    )
+
+
+def _sum_signed(property_id, start_date=None, end_date=None, end_inclusive=False):
+    query = db.session.query(func.coalesce(func.sum(signed_amount_expr()), 0)).filter(
+        GeneralLedger.property_id == property_id
+    )
+    if start_date is not None:
+        query = query.filter(GeneralLedger.transaction_date >= start_date)
+    if end_date is not None:
+        if end_inclusive:
+            query = query.filter(GeneralLedger.transaction_date <= end_date)
+        else:
+            query = query.filter(GeneralLedger.transaction_date < end_date)
+    return Decimal(str(query.scalar() or 0))
+
+
+def _latest_checkpoint(property_id, on_or_before):
+    return GeneralLedgerCheckpoint.query.filter(
+        GeneralLedgerCheckpoint.property_id == property_id,
+        GeneralLedgerCheckpoint.period_start <= on_or_before
+    ).order_by(GeneralLedgerCheckpoint.period_start.desc()).first()
+
+
+def ensure_checkpoint(property_id, period_start):
+    """
+    Create the checkpoint for a month if it does not exist yet. The opening
+    balance is derived from the previous checkpoint plus the rows in between,
+    so creating one never scans more than the gap since the last checkpoint.
+    Callers must hold the property ledger lock.
+    """
+    existing = GeneralLedgerCheckpoint.query.filter_by(
+        property_id=property_id, period_start=period_start
+    ).first()
+    if existing:
+        return existing
+
+    previous = _latest_checkpoint(property_id, period_start)
+    if previous:
+        opening = Decimal(str(previous.opening_balance)) + _sum_signed(property_id, previous.period_start, period_start)
+    else:
+        opening = _sum_signed(property_id, end_date=period_start)
+
+    checkpoint = GeneralLedgerCheckpoint(
+        property_id=property_id,
+        period_start=period_start,
+        opening_balance=opening
+    )
+    db.session.add(checkpoint)
+    db.session.flush()
+    return checkpoint
+
+
+def post_entry(entry):
+    """
+    Append a new ledger row: lock the property, read the last balance, set the
+    entry's running balance and keep checkpoints in step. Does not commit.
+    """
+    lock_property_ledger(entry.property_id)
+
+    last_balance = db.session.query(GeneralLedger.running_balance).filter(
+        GeneralLedger.property_id == entry.property_id
+    ).order_by(GeneralLedger.id.desc()).limit(1).scalar()
+
+    delta = signed_amount(entry.transaction_type, entry.amount)
+    entry.running_balance = Decimal(str(last_balance or ZERO)) + delta
+
+    # Checkpoint the posting month before the row exists so its opening balance excludes it
+    ensure_checkpoint(entry.property_id, month_start(entry.transaction_date))
+
+    db.session.add(entry)
+    db.session.flush()
+    shift_checkpoints_after(entry.property_id, entry.transaction_date, delta)
+    return entry
+
+
+def reprice_entry(entry, old_transaction_type, old_amount, old_transaction_date):
+    """
+    Propagate an edit of amount, type or date on an existing row. The row's own
+    balance and all later balances move by the same delta; checkpoints between
+    the old and new dates are adjusted. Does not commit.
+    """
+    lock_property_ledger(entry.property_id)
+    # Earlier rows may have been repriced while we waited for the lock
+    db.session.refresh(entry, attribute_names=['running_balance'])
+
+    old_signed = signed_amount(old_transaction_type, old_amount)
+    new_signed = signed_amount(entry.transaction_type, entry.amount)
+    delta = new_signed - old_signed
+
+    if delta:
+        entry.running_balance = Decimal(str(entry.running_balance)) + delta
+        shift_balances_after(entry.property_id, entry.id, delta)
+
+    if old_transaction_date != entry.transaction_date or delta:
+        shift_checkpoints_after(entry.property_id, old_transaction_date, -old_signed)
+        shift_checkpoints_after(entry.property_id, entry.transaction_date, new_signed)
+        # Created after the shifts so it is derived from already-adjusted checkpoints
+        ensure_checkpoint(entry.property_id, month_start(entry.transaction_date))
+    return entry
+
+
+def remove_entry(entry):
+    """Delete a row and pull its amount out of every later balance. Does not commit."""
+    lock_property_ledger(entry.property_id)
+
+    signed = signed_amount(entry.transaction_type, entry.amount)
+    shift_balances_after(entry.property_id, entry.id, -signed)
+    shift_checkpoints_after(entry.property_id, entry.transaction_date, -signed)
+    db.session.delete(entry)
+
+
+def balance_as_of(property_id, as_of_date):
+    """
+    Ledger balance including every entry dated on or before as_of_date.
+    Reads the nearest checkpoint and sums at most one month of rows.
+    """
+    checkpoint = _latest_checkpoint(property_id, as_of_date)
+    if checkpoint:
+        return Decimal(str(checkpoint.opening_balance)) + _sum_signed(
+            property_id, checkpoint.period_start, as_of_date, end_inclusive=True
+        )
+    return _sum_signed(property_id, end_date=as_of_date, end_inclusive=True)
+
+
+def rebuild_property_ledger(property_id):
+    """
+    Recompute every running balance and checkpoint for a property from scratch.
+    Maintenance tool for repairing ledgers written before this engine existed.
+    Does not commit.
+    """
+    lock_property_ledger(property_id)
+
+    running_balance = ZERO
+    for entry in GeneralLedger.query.filter_by(property_id=property_id).order_by(GeneralLedger.id).yield_per(1000):
+        running_balance += signed_amount(entry.transaction_type, entry.amount)
+        entry.running_balance = running_balance
+
+    GeneralLedgerCheckpoint.query.filter_by(property_id=property_id).delete(synchronize_session=False)
+    db.session.flush()
+
+    months = db.session.query(GeneralLedger.transaction_date).filter(
+        GeneralLedger.property_id == property_id
+    ).distinct().all()
+    for period_start in sorted({month_start(row.transaction_date) for row in months}):
+        ensure_checkpoint(property_id, period_start)
+
+    logging.info(f"Rebuilt general ledger balances for property {property_id}")
+    return running_balance
@@ -0,0 +1,237 @@
+"""
+Shared Ollama client
+
+Every LLM call in the app goes through ollama_client:
+- one requests.Session with a keep-alive connection pool, so calls reuse TCP
+  connections instead of opening one per request
+- a bulkhead: at most max_concurrent calls (streams included) are in flight;
+  callers wait up to queue_timeout seconds for a slot and then fail fast, so a
+  slow model cannot tie up every WSGI worker
+- a circuit breaker: after failure_threshold consecutive failures the circuit
+  opens and calls fail immediately for reset_timeout seconds, then a single
+  trial call decides whether it closes again
+
+Calls that are refused (bulkhead full, circuit open) raise LLMUnavailable, a
+requests ConnectionError, so existing `except requests.exceptions...`
+handlers fall back exactly as they do when Ollama is down. Calls that reach
+Ollama raise the usual requests exceptions; a slow model still surfaces as
+requests.exceptions.Timeout.
+
+stream_generate() yields tokens as Ollama produces them; sse_response() turns
+any token iterator into a Server-Sent Events response. To try all of this
+without a model, point OLLAMA_BASE_URL at benchmarks.fake_ollama.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from flask import Response, stream_with_context
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "llama3.2:latest"
+
+
+class LLMUnavailable(requests.exceptions.ConnectionError):
+    """The call was refused without reaching Ollama (circuit open or bulkhead full)"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker: closed -> open -> half-open -> closed"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self):
+        """Whether a call may go out now; in half-open state only one trial call is let through"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def cancel_trial(self):
+        """The call allow() let through never went out; let the next caller be the trial"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    logger.warning(f"Ollama circuit opened after {self._failures} consecutive failures")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class OllamaClient:
+    """Pooled, concurrency-limited, circuit-broken client for Ollama's /api/generate"""
+
+    def __init__(self, base_url="http://localhost:11434", pool_size=10, max_concurrent=4, queue_timeout=2.0,
+                 failure_threshold=5, reset_timeout=30):
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._counters = {'calls': 0, 'failures': 0, 'rejected_open': 0, 'rejected_busy': 0, 'in_flight': 0}
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _acquire(self):
+        if not self.breaker.allow():
+            self._count('rejected_open')
+            raise LLMUnavailable("Ollama circuit is open")
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.breaker.cancel_trial()
+            self._count('rejected_busy')
+            raise LLMUnavailable(f"All {self.max_concurrent} Ollama slots are busy")
+        self._count('calls')
+        self._count('in_flight')
+
+    def _release(self, failed):
+        self._count('in_flight', -1)
+        self._slots.release()
+        if failed:
+            self._count('failures')
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def _payload(self, prompt, model, stream, context, options):
+        payload = {"model": model or DEFAULT_MODEL, "prompt": prompt, "stream": stream}
+        if context:
+            payload["context"] = context
+        if options:
+            payload["options"] = options
+        return payload
+
+    def generate(self, prompt, model=None, timeout=30, context=None, options=None):
+        """
+        Non-streaming /api/generate; returns Ollama's JSON body. Raises
+        LLMUnavailable when refused and requests exceptions on failure.
+        """
+        self._acquire()
+        failed = True
+        try:
+            response = self._session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, model, False, context, options),
+                timeout=timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+            failed = False
+            return result
+        finally:
+            self._release(failed)
+
+    def stream_generate(self, prompt, model=None, timeout=30, context=None, options=None):
+        """
+        Streaming /api/generate: yields each chunk Ollama sends ({"response":
+        token, "done": bool, ...}; the last one carries "context"). The slot is
+        held until the generator is exhausted or closed. timeout bounds the
+        wait for each chunk, not the whole answer.
+        """
+        self._acquire()
+        failed = True
+        try:
+            with self._session.post(
+                f"{self.base_url}/api/generate",
+                json=self._payload(prompt, model, True, context, options),
+                timeout=timeout,
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get('error'):
+                        raise requests.exceptions.RequestException(chunk['error'])
+                    yield chunk
+                    if chunk.get('done'):
+                        break
+            failed = False
+        except GeneratorExit:
+            # Client went away mid-stream; not Ollama's fault
+            failed = False
+            raise
+        finally:
+            self._release(failed)
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self._counters)
+        counters.update({
+            'circuit_state': self.breaker.state,
+            'max_concurrent': self.max_concurrent,
+            'base_url': self.base_url,
+        })
+        return counters
+
+
+def sse_event(data, event=None):
+    """One Server-Sent Events frame with a JSON payload"""
+    frame = f"event: {event}\n" if event else ""
+    return f"{frame}data: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events):
+    """Stream an iterable of sse_event() frames to the browser"""
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Keep proxies (nginx) from buffering tokens until the answer is complete
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+ollama_client = OllamaClient(
+    base_url=os.environ.get('OLLAMA_BASE_URL', 'http://localhost:11434'),
+    pool_size=int(os.environ.get('OLLAMA_POOL_SIZE', 10)),
+    max_concurrent=int(os.environ.get('OLLAMA_MAX_CONCURRENT', 4)),
+    queue_timeout=float(os.environ.get('OLLAMA_QUEUE_TIMEOUT', 2)),
+    failure_threshold=int(os.environ.get('OLLAMA_FAILURE_THRESHOLD', 5)),
+    reset_timeout=int(os.environ.get('OLLAMA_RESET_TIMEOUT', 30))
+)
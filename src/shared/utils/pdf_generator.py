@@ -3,73 +3,18 @@ import os
 from datetime import datetime, date
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
 from reportlab.platypus.frames import Frame
 from reportlab.platypus.doctemplate import PageTemplate, BaseDocTemplate
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
+from utils.pdf_styles import PARAGRAPH_STYLES, build_table
 
 class PropertyReportPDFGenerator:
     """Generate professional PDF reports for property management"""
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
-    
-    def setup_custom_styles(self):
-        """Setup custom styles for the PDF"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-            textColor=colors.HexColor('#2563eb'),
-            alignment=TA_CENTER
-        ))
-        
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=16,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=colors.HexColor('#1f2937'),
-            borderWidth=0,
-            borderColor=colors.HexColor('#e5e7eb'),
-            borderPadding=5
-        ))
-        
-        # Subsection style
-        self.styles.add(ParagraphStyle(
-            name='Subsection',
-            parent=self.styles['Heading3'],
-            fontSize=14,
-            spaceAfter=8,
-            spaceBefore=12,
-            textColor=colors.HexColor('#374151')
-        ))
-        
-        # Info style
-        self.styles.add(ParagraphStyle(
-            name='InfoText',
-            parent=self.styles['Normal'],
-            fontSize=11,
-            spaceAfter=6,
-            textColor=colors.HexColor('#4b5563')
-        ))
-        
-        # Highlight style
-        self.styles.add(ParagraphStyle(
-            name='Highlight',
-            parent=self.styles['Normal'],
-            fontSize=12,
-            spaceAfter=6,
-            textColor=colors.HexColor('#059669'),
-            fontName='Helvetica-Bold'
-        ))
+        self.styles = PARAGRAPH_STYLES
     
     def create_header_footer(self, canvas, doc):
         """Create header and footer for each page"""
@@ -116,17 +61,7 @@ class PropertyReportPDFGenerator:
             ['Tenant ID', str(tenant_info.get('tenant_id', 'N/A'))]
         ]
         
-        tenant_table = Table(tenant_data, colWidths=[2*inch, 4*inch])
-        tenant_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(tenant_table)
+        story.extend(build_table(tenant_data, 'detail', [2*inch, 4*inch]))
         story.append(Spacer(1, 20))
         
         # Property Information Section
@@ -140,17 +75,7 @@ class PropertyReportPDFGenerator:
             ['Unit', property_info.get('unit', 'N/A')]
         ]
         
-        property_table = Table(property_data, colWidths=[2*inch, 4*inch])
-        property_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(property_table)
+        story.extend(build_table(property_data, 'detail', [2*inch, 4*inch]))
         story.append(Spacer(1, 20))
         
         # Lease Information Section
@@ -167,17 +92,7 @@ class PropertyReportPDFGenerator:
             ['Lease Duration', f"{lease_info.get('duration_days', 0)} days"]
         ]
         
-        lease_table = Table(lease_data, colWidths=[2*inch, 4*inch])
-        lease_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(lease_table)
+        story.extend(build_table(lease_data, 'detail', [2*inch, 4*inch]))
         story.append(Spacer(1, 20))
         
         # Financial Summary Section
@@ -194,17 +109,7 @@ class PropertyReportPDFGenerator:
             ['Outstanding Balance', f"${financial_info.get('outstanding_balance', 0):,.2f}"]
         ]
         
-        financial_table = Table(financial_data, colWidths=[2.5*inch, 3.5*inch])
-        financial_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(financial_table)
+        story.extend(build_table(financial_data, 'detail', [2.5*inch, 3.5*inch]))
         story.append(Spacer(1, 20))
         
         # Recent Payments Section
@@ -221,17 +126,7 @@ class PropertyReportPDFGenerator:
                     payment.get('status', 'N/A')
                 ])
             
-            payment_table = Table(payment_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch])
-            payment_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-            ]))
-            story.append(payment_table)
+            story.extend(build_table(payment_data, 'detail_centered', [1.5*inch, 1.5*inch, 1.5*inch, 1.5*inch]))
         else:
             story.append(Paragraph("No payment history available.", self.styles['InfoText']))
         
@@ -248,17 +143,7 @@ class PropertyReportPDFGenerator:
             ['Completed Requests', str(maintenance_info.get('completed_requests', 0))]
         ]
         
-        maintenance_table = Table(maintenance_data, colWidths=[3*inch, 3*inch])
-        maintenance_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(maintenance_table)
+        story.extend(build_table(maintenance_data, 'detail', [3*inch, 3*inch]))
         
         # Recent maintenance requests
         recent_requests = maintenance_info.get('recent_requests', [])
@@ -275,17 +160,7 @@ class PropertyReportPDFGenerator:
                     req.get('priority', 'N/A')
                 ])
             
-            request_table = Table(request_data, colWidths=[1.2*inch, 2.5*inch, 1*inch, 1.3*inch])
-            request_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-            ]))
-            story.append(request_table)
+            story.extend(build_table(request_data, 'detail_small', [1.2*inch, 2.5*inch, 1*inch, 1.3*inch]))
         
         # Build PDF
         doc.build(story, onFirstPage=self.create_header_footer, onLaterPages=self.create_header_footer)
@@ -327,17 +202,7 @@ class PropertyReportPDFGenerator:
                     lease.get('phone', 'N/A')
                 ])
             
-            lease_table = Table(lease_data, colWidths=[1.2*inch, 1.3*inch, 1*inch, 0.8*inch, 1*inch, 1.2*inch])
-            lease_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-            ]))
-            story.append(lease_table)
+            story.extend(build_table(lease_data, 'listing', [1.2*inch, 1.3*inch, 1*inch, 0.8*inch, 1*inch, 1.2*inch]))
         else:
             story.append(Paragraph("No leases expiring in the specified period.", self.styles['InfoText']))
         
@@ -376,17 +241,7 @@ class PropertyReportPDFGenerator:
             ['Actual Monthly Income', f"${portfolio.get('actual_monthly_income', 0):,.2f}"]
         ]
         
-        portfolio_table = Table(portfolio_data, colWidths=[3*inch, 3*inch])
-        portfolio_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(portfolio_table)
+        story.extend(build_table(portfolio_data, 'detail', [3*inch, 3*inch]))
         story.append(Spacer(1, 30))
         
         # Property Breakdown
@@ -406,17 +261,7 @@ class PropertyReportPDFGenerator:
                     str(prop.get('tenant_count', 0))
                 ])
             
-            prop_table = Table(prop_data, colWidths=[1.2*inch, 1.5*inch, 0.8*inch, 1*inch, 1*inch, 0.5*inch])
-            prop_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 8),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-            ]))
-            story.append(prop_table)
+            story.extend(build_table(prop_data, 'listing', [1.2*inch, 1.5*inch, 0.8*inch, 1*inch, 1*inch, 0.5*inch]))
         
         # Build PDF
         doc.build(story, onFirstPage=self.create_header_footer, onLaterPages=self.create_header_footer)
@@ -455,17 +300,7 @@ class PropertyReportPDFGenerator:
             ['Total Maintenance Requests', str(summary.get('total_maintenance_requests', 0))]
         ]
         
-        summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-        ]))
-        story.append(summary_table)
+        story.extend(build_table(summary_data, 'detail', [3*inch, 3*inch]))
         story.append(Spacer(1, 30))
         
         # Individual Tenant Details
@@ -491,17 +326,7 @@ class PropertyReportPDFGenerator:
                     ['Property Address', tenant.get('property_address', 'N/A')]
                 ]
                 
-                basic_table = Table(basic_data, colWidths=[2*inch, 4*inch])
-                basic_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f3f4f6')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                ]))
-                story.append(basic_table)
+                story.extend(build_table(basic_data, 'tenant_basic', [2*inch, 4*inch]))
                 story.append(Spacer(1, 15))
                 
                 # Lease Info Table
@@ -515,17 +340,7 @@ class PropertyReportPDFGenerator:
                     ['Payment Status', tenant.get('payment_status', 'N/A')]
                 ]
                 
-                lease_table = Table(lease_data, colWidths=[2*inch, 4*inch])
-                lease_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e0f2fe')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                ]))
-                story.append(lease_table)
+                story.extend(build_table(lease_data, 'tenant_lease', [2*inch, 4*inch]))
                 story.append(Spacer(1, 15))
                 
                 # Financial Info Table
@@ -535,17 +350,7 @@ class PropertyReportPDFGenerator:
                     ['Maintenance Requests', str(tenant.get('maintenance_requests_count', 0))]
                 ]
                 
-                financial_table = Table(financial_data, colWidths=[2*inch, 4*inch])
-                financial_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f0fdf4')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 9),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                ]))
-                story.append(financial_table)
+                story.extend(build_table(financial_data, 'tenant_financial', [2*inch, 4*inch]))
                 story.append(Spacer(1, 15))
                 
                 # Emergency Contact
@@ -556,17 +361,7 @@ class PropertyReportPDFGenerator:
                         ['Phone', tenant.get('emergency_phone', 'N/A')]
                     ]
                     
-                    emergency_table = Table(emergency_data, colWidths=[2*inch, 4*inch])
-                    emergency_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fef2f2')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 9),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                    ]))
-                    story.append(emergency_table)
+                    story.extend(build_table(emergency_data, 'tenant_emergency', [2*inch, 4*inch]))
                     story.append(Spacer(1, 15))
                 
                 # Recent Maintenance Requests
@@ -585,17 +380,7 @@ class PropertyReportPDFGenerator:
                             req.get('date', 'N/A')
                         ])
                     
-                    req_table = Table(req_data, colWidths=[0.8*inch, 2.7*inch, 1*inch, 1.5*inch])
-                    req_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#fefce8')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#1f2937')),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 8),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                    ]))
-                    story.append(req_table)
+                    story.extend(build_table(req_data, 'tenant_requests', [0.8*inch, 2.7*inch, 1*inch, 1.5*inch]))
                 
                 story.append(Spacer(1, 20))
         else:
@@ -646,17 +431,7 @@ class PropertyReportPDFGenerator:
                 ['Occupancy Rate', f"{overview.get('occupancy_rate', 0):.1f}%"]
             ]
             
-            overview_table = Table(overview_data, colWidths=[2.5*inch, 3.5*inch])
-            overview_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2563eb')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-            ]))
-            story.append(overview_table)
+            story.extend(build_table(overview_data, 'overview', [2.5*inch, 3.5*inch]))
             story.append(Spacer(1, 20))
         
         # Sections
@@ -679,29 +454,7 @@ class PropertyReportPDFGenerator:
                         prop.get('tenant_name', 'Vacant')
                     ])
                 
-                prop_table = Table(prop_data, colWidths=[1.8*inch, 2.8*inch, 1*inch, 1*inch, 1.2*inch, 1.4*inch])
-                prop_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (1, -1), 'LEFT'),
-                    ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-                    ('ALIGN', (3, 0), (3, -1), 'CENTER'),
-                    ('ALIGN', (4, 0), (4, -1), 'RIGHT'),
-                    ('ALIGN', (5, 0), (5, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8fafc')),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8fafc')]),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                    ('TOPPADDING', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-                ]))
-                story.append(prop_table)
+                story.extend(build_table(prop_data, 'portfolio_properties', [1.8*inch, 2.8*inch, 1*inch, 1*inch, 1.2*inch, 1.4*inch]))
             else:
                 story.append(Paragraph("No properties found.", self.styles['InfoText']))
             
@@ -723,28 +476,7 @@ class PropertyReportPDFGenerator:
                         'Active' if tenant.get('is_active') else 'Inactive'
                     ])
                 
-                tenant_table = Table(tenant_data, colWidths=[2*inch, 2.2*inch, 1.2*inch, 1.2*inch, 1.2*inch])
-                tenant_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#059669')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (1, -1), 'LEFT'),
-                    ('ALIGN', (2, 0), (2, -1), 'RIGHT'),
-                    ('ALIGN', (3, 0), (3, -1), 'CENTER'),
-                    ('ALIGN', (4, 0), (4, -1), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('FONTSIZE', (0, 1), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f0fdf4')),
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#d1fae5')),
-                    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0fdf4')]),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                    ('TOPPADDING', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
-                ]))
-                story.append(tenant_table)
+                story.extend(build_table(tenant_data, 'portfolio_tenants', [2*inch, 2.2*inch, 1.2*inch, 1.2*inch, 1.2*inch]))
             else:
                 story.append(Paragraph("No tenants found.", self.styles['InfoText']))
             
@@ -765,17 +497,7 @@ class PropertyReportPDFGenerator:
                     ['Total Transactions', str(financial_summary.get('total_transactions', 0))]
                 ]
                 
-                fin_table = Table(fin_data, colWidths=[2.5*inch, 3.5*inch])
-                fin_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                ]))
-                story.append(fin_table)
+                story.extend(build_table(fin_data, 'financial_overview', [2.5*inch, 3.5*inch]))
             else:
                 story.append(Paragraph("No financial data available.", self.styles['InfoText']))
             
@@ -797,17 +519,7 @@ class PropertyReportPDFGenerator:
                     ['Average Cost', f"${maintenance_summary.get('average_cost', 0):,.2f}"]
                 ]
                 
-                maint_table = Table(maint_data, colWidths=[2.5*inch, 3.5*inch])
-                maint_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f59e0b')),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, -1), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
-                ]))
-                story.append(maint_table)
+                story.extend(build_table(maint_data, 'maintenance_overview', [2.5*inch, 3.5*inch]))
             else:
                 story.append(Paragraph("No maintenance data available.", self.styles['InfoText']))
         
@@ -0,0 +1,86 @@
+"""
+Streaming tables for report PDFs
+
+A report with every row of a large portfolio cannot build its whole story up
+front: each row becomes Table cells, and the tables for tens of thousands of
+rows outweigh the data many times over. A StreamedTable stands in the story
+for such a table and is fed chunks of rows (a RowStream's chunks(), say).
+StreamingDocTemplate expands it one chunk at a time as layout reaches it:
+the chunk becomes LongTables through build_table(), which are laid out,
+drawn and released before the next chunk is read. Memory holds one chunk of
+rows and its tables, plus the PDF being written.
+
+Rows carry on across chunks as one table: only the first chunk has the
+header, and a chunk with an odd number of rows passes its last row on to the
+next so the banded row colours keep alternating.
+"""
+
+from reportlab.platypus import Flowable, LongTable, SimpleDocTemplate
+
+from utils.pdf_styles import build_table
+
+
+class StreamedTable(Flowable):
+    """
+    A table laid out from chunks of rows as the document reaches it; cells
+    turns one row into its list of cell values. Only StreamingDocTemplate can
+    lay it out.
+    """
+
+    def __init__(self, chunks, header, cells, template, col_widths=None, paragraph_columns=()):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._header = header
+        self._cells = cells
+        self._template = template
+        self._col_widths = col_widths
+        self._paragraph_columns = paragraph_columns
+        self._started = False
+        self._carry = []
+
+    def next_flowables(self):
+        """Tables for the next chunk of rows; empty once every row has been handed out"""
+        for chunk in self._chunks:
+            body = self._carry + [self._cells(row) for row in chunk]
+            self._carry = body[-1:] if len(body) % 2 else []
+            body = body[:len(body) - len(self._carry)]
+            if body or not self._started:
+                return self._tables(body)
+        if self._carry or not self._started:
+            body, self._carry = self._carry, []
+            return self._tables(body)
+        return []
+
+    def _tables(self, body):
+        continued = self._started
+        self._started = True
+        rows = body if continued else [self._header] + body
+        return build_table(rows, self._template, self._col_widths, self._paragraph_columns,
+                           continued=continued, table_class=LongTable)
+
+    def wrap(self, available_width, available_height):
+        raise TypeError('StreamedTable must be laid out by a StreamingDocTemplate')
+
+
+class StreamingDocTemplate(SimpleDocTemplate):
+    """A SimpleDocTemplate that expands StreamedTables a chunk at a time as layout reaches them"""
+
+    def filterFlowables(self, flowables):
+        # handle_keepWithNext groups a run of keep-with-next flowables with the
+        # one after it, so anything in that run must already be expanded
+        index = 0
+        while index < len(flowables):
+            flowable = flowables[index]
+            if isinstance(flowable, StreamedTable):
+                tables = flowable.next_flowables()
+                if tables:
+                    flowables[index:index] = tables
+                else:
+                    del flowables[index]
+                continue
+            if flowable is None or not flowable.getKeepWithNext():
+                break
+            index += 1
+        if not flowables:
+            # handle_flowable always takes the first entry; None is skipped
+            flowables.append(None)
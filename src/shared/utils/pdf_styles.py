@@ -0,0 +1,378 @@
+"""
+Shared ReportLab styles and table templates for report PDFs
+
+PropertyReportPDFGenerator and the reporting routes' PDF builders used to
+rebuild getSampleStyleSheet(), their ParagraphStyles and a TableStyle for
+every table on every request. Everything here is built once at import and
+exposed read-only:
+
+- PARAGRAPH_STYLES: the sample stylesheet plus the custom report styles
+- TABLE_STYLES: a TableStyle per kind of report table, with the header row
+  as row 0
+
+build_table() is the fast path for data tables. Cells are drawn as plain
+strings unless their column is listed in paragraph_columns (status badges
+and other markup); even there, plain numeric cells skip the Paragraph, so
+no cell pays for markup parsing and line wrapping it does not need.
+Tables with more than TABLE_CHUNK_ROWS body rows are emitted as consecutive
+tables of that many rows. ReportLab re-measures every remaining row each
+time a table splits across a page, so one long table costs quadratic time
+in its length; chunks keep it linear. Continuation chunks have no header
+row and use the template with its header commands dropped, so the result
+looks like one table.
+"""
+
+import os
+import re
+from types import MappingProxyType
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Flowable, Paragraph, Table, TableStyle
+
+# Kept even so banded rows alternate the same way across chunks
+TABLE_CHUNK_ROWS = max(2, int(os.environ.get('REPORT_PDF_TABLE_CHUNK_ROWS', 100)) // 2 * 2)
+
+_PLAIN_NUMBER = re.compile(r'^\s*[-+(]?[$€£]?[\d,]*\.?\d+%?\)?\s*$')
+
+
+def _paragraph_styles():
+    styles = getSampleStyleSheet()
+
+    # PropertyReportPDFGenerator
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+        textColor=colors.HexColor('#2563eb'),
+        alignment=TA_CENTER
+    ))
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.HexColor('#1f2937'),
+        borderWidth=0,
+        borderColor=colors.HexColor('#e5e7eb'),
+        borderPadding=5
+    ))
+    styles.add(ParagraphStyle(
+        name='Subsection',
+        parent=styles['Heading3'],
+        fontSize=14,
+        spaceAfter=8,
+        spaceBefore=12,
+        textColor=colors.HexColor('#374151')
+    ))
+    styles.add(ParagraphStyle(
+        name='InfoText',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        textColor=colors.HexColor('#4b5563')
+    ))
+    styles.add(ParagraphStyle(
+        name='Highlight',
+        parent=styles['Normal'],
+        fontSize=12,
+        spaceAfter=6,
+        textColor=colors.HexColor('#059669'),
+        fontName='Helvetica-Bold'
+    ))
+
+    # Generic report PDF
+    styles.add(ParagraphStyle(
+        name='EnhancedTitle',
+        parent=styles['Heading1'],
+        fontSize=16,
+        spaceAfter=10,
+        spaceBefore=5,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#1e40af'),
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='EnhancedSection',
+        parent=styles['Heading2'],
+        fontSize=12,
+        spaceAfter=8,
+        spaceBefore=12,
+        textColor=colors.HexColor('#1e40af'),
+        fontName='Helvetica-Bold',
+        borderWidth=1,
+        borderColor=colors.HexColor('#3b82f6'),
+        borderPadding=4,
+        backColor=colors.HexColor('#eff6ff'),
+        borderRadius=4
+    ))
+
+    # Comprehensive report PDF
+    styles.add(ParagraphStyle(
+        name='ProfessionalTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=12,
+        spaceBefore=8,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#1e40af'),
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='ProfessionalSubtitle',
+        parent=styles['Normal'],
+        fontSize=14,
+        spaceAfter=20,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#64748b'),
+        fontName='Helvetica'
+    ))
+    styles.add(ParagraphStyle(
+        name='ProfessionalSection',
+        parent=styles['Heading2'],
+        fontSize=16,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=colors.HexColor('#1e40af'),
+        fontName='Helvetica-Bold',
+        borderWidth=2,
+        borderColor=colors.HexColor('#3b82f6'),
+        borderPadding=8,
+        backColor=colors.HexColor('#eff6ff'),
+        borderRadius=6
+    ))
+    styles.add(ParagraphStyle(
+        name='KPITitle',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=4,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#64748b'),
+        fontName='Helvetica'
+    ))
+    styles.add(ParagraphStyle(
+        name='KPIValue',
+        parent=styles['Normal'],
+        fontSize=20,
+        spaceAfter=0,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#1e40af'),
+        fontName='Helvetica-Bold'
+    ))
+    styles.add(ParagraphStyle(
+        name='Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        spaceBefore=10,
+        alignment=TA_CENTER,
+        textColor=colors.HexColor('#64748b'),
+        fontName='Helvetica'
+    ))
+    return MappingProxyType({name: styles[name] for name in styles.byName})
+
+
+def _grid_style(header_background='#f3f4f6', header_text='#1f2937', align='LEFT', font_size=10,
+                header_padding=12):
+    """Light header row over a plain 1pt grid"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_background)),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor(header_text)),
+        ('ALIGN', (0, 0), (-1, -1), align),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), font_size),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), header_padding),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e5e7eb'))
+    ])
+
+
+def _banded_style(header_background, body_background, grid, header_font_size=11, body_font_size=9,
+                  header_padding=12, padding=8, vertical_padding=6, aligns=((0, -1, 'LEFT'),)):
+    """Coloured header row over alternating body rows; aligns is (first column, last column, alignment)"""
+    return TableStyle(
+        [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_background)),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ]
+        + [('ALIGN', (first, 0), (last, -1), align) for first, last, align in aligns]
+        + [
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), header_font_size),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), header_padding),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor(body_background)),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor(grid)),
+            ('FONTSIZE', (0, 1), (-1, -1), body_font_size),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor(body_background)]),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), padding),
+            ('RIGHTPADDING', (0, 0), (-1, -1), padding),
+            ('TOPPADDING', (0, 0), (-1, -1), vertical_padding),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), vertical_padding)
+        ]
+    )
+
+
+def _kpi_card_style(header_background, border):
+    """One-column KPI card: title row over a value row"""
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor(header_background)),
+        ('BACKGROUND', (0, 1), (-1, 1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(border)),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('LEFTPADDING', (0, 0), (-1, -1), 12),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+        ('TOPPADDING', (0, 0), (-1, -1), 8),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
+    ])
+
+
+def _table_styles():
+    comprehensive = dict(header_font_size=12, body_font_size=10, padding=10, vertical_padding=8)
+    return MappingProxyType({
+        # PropertyReportPDFGenerator
+        'detail': _grid_style(),
+        'detail_centered': _grid_style(align='CENTER', font_size=9),
+        'detail_small': _grid_style(font_size=8),
+        'listing': _grid_style(align='CENTER', font_size=8),
+        'tenant_basic': _grid_style(font_size=9, header_padding=8),
+        'tenant_lease': _grid_style('#e0f2fe', font_size=9, header_padding=8),
+        'tenant_financial': _grid_style('#f0fdf4', font_size=9, header_padding=8),
+        'tenant_emergency': _grid_style('#fef2f2', font_size=9, header_padding=8),
+        'tenant_requests': _grid_style('#fefce8', font_size=8, header_padding=8),
+        'overview': _grid_style('#2563eb', '#ffffff'),
+        'financial_overview': _grid_style('#10b981', '#ffffff'),
+        'maintenance_overview': _grid_style('#f59e0b', '#ffffff'),
+        'portfolio_properties': _banded_style(
+            '#1e40af', '#f8fafc', '#e2e8f0',
+            aligns=((0, 1, 'LEFT'), (2, 2, 'CENTER'), (3, 3, 'CENTER'), (4, 4, 'RIGHT'), (5, 5, 'LEFT')),
+            **comprehensive
+        ),
+        'portfolio_tenants': _banded_style(
+            '#059669', '#f0fdf4', '#d1fae5',
+            aligns=((0, 1, 'LEFT'), (2, 2, 'RIGHT'), (3, 3, 'CENTER'), (4, 4, 'CENTER')),
+            **comprehensive
+        ),
+
+        # Generic report PDF
+        'report_properties': _banded_style('#1e40af', '#f8fafc', '#e2e8f0'),
+        'report_tenants': _banded_style('#059669', '#f0fdf4', '#d1fae5'),
+        'report_maintenance': _banded_style('#ea580c', '#fff7ed', '#fed7aa'),
+        'report_transactions': _banded_style('#7c3aed', '#faf5ff', '#e9d5ff'),
+        'metric_card': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#f1f5f9')),
+            ('BACKGROUND', (0, 1), (-1, 1), colors.HexColor('#ffffff')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#64748b')),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, 1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, 1), 14),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 10),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8)
+        ]),
+        'report_footer': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#f1f5f9')),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#64748b')),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+            ('FONTNAME', (0, 0), (0, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 15),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 15),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0'))
+        ]),
+
+        # Comprehensive report PDF
+        'comprehensive_properties': _banded_style(
+            '#1e40af', '#f8fafc', '#e2e8f0',
+            aligns=((0, 1, 'LEFT'), (2, 2, 'CENTER'), (3, 3, 'RIGHT'), (4, 4, 'LEFT')),
+            **comprehensive
+        ),
+        'comprehensive_maintenance': _banded_style('#ea580c', '#fff7ed', '#fed7aa', header_padding=15,
+                                                   **comprehensive),
+        'comprehensive_transactions': _banded_style('#7c3aed', '#faf5ff', '#e9d5ff', header_padding=15,
+                                                    **comprehensive),
+        'kpi_properties': _kpi_card_style('#eff6ff', '#3b82f6'),
+        'kpi_tenants': _kpi_card_style('#f0fdf4', '#059669'),
+        'kpi_income': _kpi_card_style('#faf5ff', '#7c3aed'),
+        'kpi_occupancy': _kpi_card_style('#fff7ed', '#ea580c'),
+        'kpi_grid': TableStyle([
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 0),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+            ('TOPPADDING', (0, 0), (-1, -1), 0),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 0)
+        ]),
+    })
+
+
+def _continuation_style(style):
+    """The style for a chunk without the header row: header-only commands dropped, body rows shifted up"""
+    commands = []
+    for command in style.getCommands():
+        operation, (first_column, first_row), (last_column, last_row) = command[:3]
+        if first_row == 0 and last_row == 0:
+            continue
+        if first_row > 0:
+            first_row -= 1
+        if last_row > 0:
+            last_row -= 1
+        commands.append((operation, (first_column, first_row), (last_column, last_row)) + tuple(command[3:]))
+    return TableStyle(commands)
+
+
+PARAGRAPH_STYLES = _paragraph_styles()
+TABLE_STYLES = _table_styles()
+_CONTINUATION_STYLES = MappingProxyType({name: _continuation_style(style) for name, style in TABLE_STYLES.items()})
+
+
+def table_cell(value, style=None):
+    """A table cell: text becomes a Paragraph in style, numbers and anything without a style stay plain strings"""
+    if isinstance(value, Flowable):
+        return value
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        return str(value)
+    if style is None or _PLAIN_NUMBER.match(value):
+        return value
+    return Paragraph(value, style)
+
+
+def build_table(rows, template, col_widths=None, paragraph_columns=(), cell_style=None, continued=False,
+                table_class=Table):
+    """
+    Flowables for a table whose first row is the header, styled with
+    TABLE_STYLES[template]. Body cells in paragraph_columns become
+    Paragraphs in cell_style (Normal by default); long tables come back in
+    chunks. With continued, rows has no header and carries on a table begun
+    by an earlier call.
+    """
+    header, body = ([], rows) if continued else (rows[:1], rows[1:])
+    if paragraph_columns:
+        style = cell_style or PARAGRAPH_STYLES['Normal']
+        body = [
+            [table_cell(value, style if column in paragraph_columns else None) for column, value in enumerate(row)]
+            for row in body
+        ]
+
+    tables = []
+    for start in range(0, max(len(body), len(header)), TABLE_CHUNK_ROWS):
+        chunk = body[start:start + TABLE_CHUNK_ROWS]
+        if start == 0 and header:
+            table = table_class(header + chunk, colWidths=col_widths)
+            table.setStyle(TABLE_STYLES[template])
+        else:
+            table = table_class(chunk, colWidths=col_widths)
+            table.setStyle(_CONTINUATION_STYLES[template])
+        tables.append(table)
+    return tables
@@ -0,0 +1,372 @@
+"""
+Authenticated-principal cache used by token_required
+
+Every protected endpoint resolves the JWT's user_id to a User row. This module
+keeps a snapshot of that row so repeated requests with the same token skip the
+primary-key lookup. There are two tiers:
+
+- a bounded in-process LRU with TTL, a TTLCache (always on)
+- an optional shared tier (Redis when PRINCIPAL_CACHE_REDIS_URL is set, or the
+  in-memory stand-in for local runs) so workers can share warm entries
+
+Entries are keyed on (user_id, token issue time) and are dropped whenever a
+user's role, is_active flag or password changes, or the user is deleted.
+With Redis the eviction is also published, and every worker that called
+start_listening() (the auth blueprint does when it is registered) drops its
+local entries for the user; without it the local tier's TTL defaults to a
+few seconds, since other workers cannot hear about the change.
+
+Snapshots leave out credential columns (the password hash, the email
+verification token); a restored User loads them from the database if a
+caller reads them.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from datetime import datetime, date
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from utils.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Columns whose change must evict every cached principal for the user
+INVALIDATING_FIELDS = ('role', 'is_active', 'password')
+
+# Columns never written to a cache tier
+CREDENTIAL_FIELDS = ('password', 'email_verification_token', 'email_verification_expires')
+
+# Local tier TTL when invalidations reach every worker through Redis, and when they do not
+LOCAL_TTL_WITH_PUBSUB = 60
+LOCAL_TTL_WITHOUT_PUBSUB = 5
+
+_PENDING_KEY = 'principal_cache_pending_invalidations'
+
+
+class LocalPrincipalBackend:
+    """Bounded in-process LRU with a per-entry TTL, keyed on (user_id, issued_at)"""
+
+    def __init__(self, max_entries=2048, ttl_seconds=60):
+        self._cache = TTLCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+    @property
+    def ttl_seconds(self):
+        return self._cache.ttl_seconds
+
+    def get(self, user_id, issued_at):
+        return self._cache.get((user_id, issued_at))
+
+    def set(self, user_id, issued_at, snapshot):
+        self._cache.set((user_id, issued_at), snapshot)
+
+    def invalidate(self, user_id):
+        self._cache.invalidate(lambda key: key[0] == user_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self):
+        return len(self._cache)
+
+
+class InMemorySharedBackend:
+    """Process-local stand-in for the shared tier (tests and single-worker runs)"""
+
+    def __init__(self, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id, issued_at):
+        with self._lock:
+            entry = self._users.get(user_id, {}).get(str(issued_at))
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.time():
+                self._users[user_id].pop(str(issued_at), None)
+                return None
+            return json.loads(payload)
+
+    def set(self, user_id, issued_at, snapshot):
+        payload = json.dumps(snapshot)
+        with self._lock:
+            self._users.setdefault(user_id, {})[str(issued_at)] = (time.time() + self.ttl_seconds, payload)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+
+class RedisSharedBackend:
+    """
+    Shared tier backed by Redis: one hash per user, one field per token issue
+    time. Invalidations delete the user's hash and are published on a channel
+    that every process subscribes to, so their local tiers drop the user too.
+    """
+
+    def __init__(self, url, ttl_seconds=300, prefix='ownexa:principal:'):
+        import redis  # optional dependency, only needed when a Redis URL is configured
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self.channel = f"{prefix}invalidations"
+        self._listener = None
+
+    def _key(self, user_id):
+        return f"{self.prefix}{user_id}"
+
+    def get(self, user_id, issued_at):
+        payload = self.client.hget(self._key(user_id), str(issued_at))
+        return json.loads(payload) if payload else None
+
+    def set(self, user_id, issued_at, snapshot):
+        key = self._key(user_id)
+        pipe = self.client.pipeline()
+        pipe.hset(key, str(issued_at), json.dumps(snapshot))
+        pipe.expire(key, self.ttl_seconds)
+        pipe.execute()
+
+    def invalidate(self, user_id):
+        pipe = self.client.pipeline()
+        pipe.delete(self._key(user_id))
+        pipe.publish(self.channel, str(user_id))
+        pipe.execute()
+
+    def clear(self):
+        for key in self.client.scan_iter(f"{self.prefix}*"):
+            self.client.delete(key)
+
+    def subscribe(self, on_invalidate, on_reconnect):
+        """
+        Call on_invalidate(user_id) for every published invalidation, from a
+        daemon thread; on_reconnect() runs after the subscription is (re)made,
+        since invalidations published while it was down were missed
+        """
+        if self._listener is not None:
+            return
+        self._listener = threading.Thread(
+            target=self._listen, args=(on_invalidate, on_reconnect), name='principal-cache-invalidations', daemon=True
+        )
+        self._listener.start()
+
+    def _listen(self, on_invalidate, on_reconnect):
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                on_reconnect()
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message['type'] == 'message':
+                        on_invalidate(int(message['data']))
+            except Exception as e:
+                logger.warning(f"Principal cache invalidation subscription lost, retrying: {e}")
+                time.sleep(1)
+            finally:
+                pubsub.close()
+
+
+def _to_jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def snapshot_user(user):
+    """Serialize a User row's columns, except credentials, into a JSON-safe dict"""
+    return {column.name: _to_jsonable(getattr(user, column.name))
+            for column in user.__table__.columns if column.name not in CREDENTIAL_FIELDS}
+
+
+def restore_user(user_model, snapshot):
+    """
+    Build a detached User from a snapshot without touching the database; the
+    credential columns are left unloaded, so reading one issues a SELECT
+    """
+    values = {}
+    for column in user_model.__table__.columns:
+        if column.name in CREDENTIAL_FIELDS:
+            continue
+        value = snapshot.get(column.name)
+        if isinstance(value, str) and value:
+            python_type = None
+            try:
+                python_type = column.type.python_type
+            except NotImplementedError:
+                pass
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+        values[column.name] = value
+    user = user_model(**values)
+    # Reset attribute history so the instance looks freshly loaded
+    make_transient_to_detached(user)
+    return user
+
+
+class PrincipalCache:
+    """Two-tier principal cache with hit/miss accounting"""
+
+    def __init__(self, local=None, shared=None):
+        self.local = local if local is not None else LocalPrincipalBackend()
+        self.shared = shared
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'local_hits': 0,
+            'shared_hits': 0,
+            'misses': 0,
+            'invalidations': 0,
+            'shared_errors': 0,
+        }
+
+    def start_listening(self):
+        """
+        Subscribe to invalidations published by other processes, when the
+        shared tier publishes them; called once the app is set up
+        """
+        if hasattr(self.shared, 'subscribe'):
+            self.shared.subscribe(self.local.invalidate, self.local.clear)
+
+    def _count(self, name):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get_snapshot(self, user_id, issued_at):
+        snapshot = self.local.get(user_id, issued_at)
+        if snapshot is not None:
+            self._count('local_hits')
+            return snapshot
+
+        if self.shared is not None:
+            try:
+                snapshot = self.shared.get(user_id, issued_at)
+            except Exception as e:
+                logger.warning(f"Shared principal cache read failed: {e}")
+                self._count('shared_errors')
+                snapshot = None
+            if snapshot is not None:
+                self._count('shared_hits')
+                self.local.set(user_id, issued_at, snapshot)
+                return snapshot
+
+        self._count('misses')
+        return None
+
+    def put(self, user_id, issued_at, user):
+        snapshot = snapshot_user(user)
+        self.local.set(user_id, issued_at, snapshot)
+        if self.shared is not None:
+            try:
+                self.shared.set(user_id, issued_at, snapshot)
+            except Exception as e:
+                logger.warning(f"Shared principal cache write failed: {e}")
+                self._count('shared_errors')
+
+    def invalidate(self, user_id):
+        self.local.invalidate(user_id)
+        if self.shared is not None:
+            try:
+                self.shared.invalidate(user_id)
+            except Exception as e:
+                logger.warning(f"Shared principal cache invalidation failed: {e}")
+                self._count('shared_errors')
+        self._count('invalidations')
+
+    def clear(self):
+        self.local.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def load_user(self, session, user_model, user_id, issued_at):
+        """
+        Return the User for a decoded token, hitting the database only on a miss.
+        Cached snapshots are merged into the session with load=False, so no SELECT
+        is issued and the instance behaves like one returned by query.get().
+        """
+        snapshot = self.get_snapshot(user_id, issued_at)
+        if snapshot is not None:
+            return session.merge(restore_user(user_model, snapshot), load=False)
+
+        user = session.get(user_model, user_id)
+        if user is not None:
+            self.put(user_id, issued_at, user)
+        return user
+
+    def stats(self):
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+        stats['lookups'] = lookups
+        stats['hit_rate'] = round((stats['local_hits'] + stats['shared_hits']) / lookups, 4) if lookups else 0.0
+        stats['local_entries'] = len(self.local)
+        stats['shared_backend'] = type(self.shared).__name__ if self.shared is not None else None
+        return stats
+
+
+def _build_default_cache():
+    shared = None
+    shared_ttl = int(os.environ.get('PRINCIPAL_CACHE_SHARED_TTL', 300))
+    redis_url = os.environ.get('PRINCIPAL_CACHE_REDIS_URL')
+    if redis_url:
+        try:
+            shared = RedisSharedBackend(redis_url, ttl_seconds=shared_ttl)
+        except Exception as e:
+            logger.warning(f"Redis principal cache unavailable, using local tier only: {e}")
+    elif os.environ.get('PRINCIPAL_CACHE_SHARED') == 'memory':
+        shared = InMemorySharedBackend(ttl_seconds=shared_ttl)
+    # Without Redis an eviction only reaches this process; keep other workers' copies short-lived
+    default_ttl = LOCAL_TTL_WITH_PUBSUB if isinstance(shared, RedisSharedBackend) else LOCAL_TTL_WITHOUT_PUBSUB
+    local = LocalPrincipalBackend(
+        max_entries=int(os.environ.get('PRINCIPAL_CACHE_MAX_ENTRIES', 2048)),
+        ttl_seconds=int(os.environ.get('PRINCIPAL_CACHE_TTL', default_ttl)),
+    )
+    return PrincipalCache(local=local, shared=shared)
+
+
+principal_cache = _build_default_cache()
+
+
+def register_invalidation_listeners(user_model, cache=None):
+    """
+    Evict cached principals when a user's role, is_active or password changes,
+    or when the user is deleted. Evictions run after commit so a concurrent
+    request cannot re-cache the pre-change row; they are also applied at flush
+    time to shrink the stale window inside long transactions.
+    """
+    cache = cache or principal_cache
+
+    def _queue(target):
+        session = Session.object_session(target)
+        if session is not None:
+            session.info.setdefault(_PENDING_KEY, set()).add(target.id)
+        cache.invalidate(target.id)
+
+    @event.listens_for(user_model, 'after_update')
+    def _user_updated(mapper, connection, target):
+        state = inspect(target)
+        if any(state.attrs[field].history.has_changes() for field in INVALIDATING_FIELDS):
+            _queue(target)
+
+    @event.listens_for(user_model, 'after_delete')
+    def _user_deleted(mapper, connection, target):
+        _queue(target)
+
+    @event.listens_for(Session, 'after_commit')
+    def _flush_pending(session):
+        for user_id in session.info.pop(_PENDING_KEY, ()):
+            cache.invalidate(user_id)
+
+    @event.listens_for(Session, 'after_rollback')
+    def _discard_pending(session):
+        session.info.pop(_PENDING_KEY, None)
@@ -0,0 +1,17 @@
+"""
+Private data directories
+
+Files the app writes for itself (rendered report caches, report job results,
+the search index) hold tenant and financial data and must only leave through
+routes that check who is asking. UPLOAD_FOLDER is served at /uploads/
+without authentication, so these directories default to the Flask instance
+path instead, which is never served; an environment variable can point one
+elsewhere, e.g. at a volume shared by several hosts.
+"""
+
+import os
+
+
+def private_data_dir(app, name, env_var=None):
+    """The directory for name: env_var's value when set, else name under app's instance path"""
+    return (env_var and os.environ.get(env_var)) or os.path.join(app.instance_path, name)
@@ -0,0 +1,665 @@
+"""
+Admin bot RAG context
+
+Builds the data the admin bot hands to the model for an intent:
+- every query goes through the caller's scoping function (admin_bot_routes
+  _get_base_query), so the bot only sees what the user may see
+- totals and breakdowns are computed in SQL (counts, sums, GROUP BY), never by
+  loading whole tables
+- only the top_n most relevant rows are fetched: rows whose text matches the
+  words of the question first, then the intent's natural order (soonest lease
+  end, most urgent request, ...)
+- the result is trimmed to a token budget, dropping rows (never the summary)
+  until it fits
+
+Prompt size and database load therefore stay bounded whatever the portfolio
+size. Row lists keep the keys the bot used before; totals (total_tenants,
+count, ...) always describe the full scoped set, not just the rows shown.
+"""
+
+import os
+import json
+import re
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy import case, func, literal, or_, select
+
+from config import db
+from models.tenant import Tenant
+from models.property import Property
+from models.maintenance import MaintenanceRequest
+from models.vendor import Vendor, VendorCategory
+from models.rental_owner import RentalOwner
+from models.association import Association, AssociationPropertyAssignment
+
+logger = logging.getLogger(__name__)
+
+# Rough size of the data part of the prompt, in tokens (~4 characters each)
+DEFAULT_TOKEN_BUDGET = int(os.environ.get('ADMIN_BOT_CONTEXT_TOKENS', 1500))
+
+# Rows fetched per list before the budget is applied
+DEFAULT_TOP_N = int(os.environ.get('ADMIN_BOT_CONTEXT_ROWS', 10))
+
+# Long free-text fields are cut to this many characters
+TEXT_LIMIT = 160
+
+LEASE_EXPIRY_WINDOW_DAYS = 60
+
+# Search index candidates fetched per row shown; scoping may drop some of them
+SEARCH_CANDIDATE_FACTOR = 5
+
+PRIORITY_ORDER = {'urgent': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+OPEN_MAINTENANCE_STATUSES = ('pending', 'assigned', 'in_progress')
+
+# Words that say what to list rather than which rows are relevant
+STOP_WORDS = frozenset((
+    'a', 'an', 'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'from', 'is', 'are', 'was',
+    'be', 'me', 'my', 'our', 'your', 'i', 'we', 'you', 'show', 'list', 'all', 'give', 'get', 'find', 'search',
+    'look', 'locate', 'where', 'who', 'what', 'which', 'how', 'many', 'much', 'number', 'count', 'total', 'please',
+    'can', 'do', 'does', 'have', 'has', 'any', 'about', 'tell', 'display', 'only', 'filter', 'current',
+    'tenant', 'tenants', 'property', 'properties', 'maintenance', 'request', 'requests', 'repair', 'repairs',
+    'vendor', 'vendors', 'contractor', 'contractors', 'work', 'order', 'orders', 'owner', 'owners', 'rental',
+    'association', 'associations', 'hoa', 'report', 'summary', 'financial', 'analytics', 'active', 'inactive',
+    'expired', 'vacant', 'occupied', 'pending', 'open', 'status', 'lease', 'leases', 'rent',
+))
+
+
+def estimate_tokens(value):
+    """Approximate prompt tokens for value serialized as compact JSON"""
+    return len(json.dumps(value, default=str, separators=(',', ':'))) // 4 + 1
+
+
+def _row_lists(context):
+    """Every list of row dicts in context, including those nested one level down"""
+    lists = []
+    for value in context.values():
+        if isinstance(value, list) and value and isinstance(value[0], dict):
+            lists.append(value)
+        elif isinstance(value, dict):
+            lists.extend(_row_lists(value))
+    return lists
+
+
+def fit_to_budget(context, token_budget):
+    """
+    Drop rows, from the end of the longest list first, until context fits
+    token_budget. Adds rows_omitted when anything was dropped.
+    """
+    omitted = 0
+    while estimate_tokens(context) > token_budget:
+        lists = [rows for rows in _row_lists(context) if rows]
+        if not lists:
+            break
+        max(lists, key=len).pop()
+        omitted += 1
+    if omitted:
+        context['rows_omitted'] = omitted
+    return context
+
+
+def query_terms(query, limit=5):
+    """Words of the question that can identify rows (names, cities, ...)"""
+    words = re.findall(r"[a-z0-9@.'-]+", (query or '').lower())
+    terms = []
+    for word in words:
+        word = word.strip(".'-")
+        if len(word) >= 3 and word not in STOP_WORDS and word not in terms:
+            terms.append(word)
+    return terms[:limit]
+
+
+def _clip(text):
+    if text and len(text) > TEXT_LIMIT:
+        return text[:TEXT_LIMIT - 3] + '...'
+    return text
+
+
+def _money(value):
+    return round(float(value or 0), 2)
+
+
+def _address(street, city, state, zip_code=None):
+    parts = [part for part in (street, city, state) if part]
+    address = ', '.join(parts) or 'No Address'
+    return f"{address} {zip_code}" if zip_code and parts else address
+
+
+class RagContextBuilder:
+    """
+    Scoped, summarized context for one user. base_query(model, user) returns
+    the user's visible rows of model as a Query (admin_bot_routes._get_base_query).
+    """
+
+    def __init__(self, current_user, base_query, token_budget=DEFAULT_TOKEN_BUDGET, top_n=DEFAULT_TOP_N,
+                 today=None):
+        self.current_user = current_user
+        self.base_query = base_query
+        self.token_budget = token_budget
+        self.top_n = top_n
+        self.today = today or date.today()
+
+    def build(self, intent, query=''):
+        """Context dict for intent, within the token budget"""
+        self.terms = query_terms(query)
+        # The intent comes from the LLM, so only the listed handlers can be reached
+        handler = self.INTENT_HANDLERS.get(intent, RagContextBuilder._summary)
+        context = handler(self, query.lower())
+        return fit_to_budget(context, self.token_budget)
+
+    # --- scoping helpers ---
+
+    def _scoped(self, model):
+        return self.base_query(model, self.current_user)
+
+    def _scoped_ids(self, model):
+        """Select of the ids of model rows the user can see, for IN filters"""
+        return select(self._scoped(model).with_entities(model.id).subquery().c.id)
+
+    def _relevance(self, *columns):
+        """Number of (column, term) matches; 0 when the question names nothing specific"""
+        if not self.terms:
+            return literal(0)
+        score = literal(0)
+        for column in columns:
+            for term in self.terms:
+                score = score + case((column.ilike(f'%{term}%'), 1), else_=0)
+        return score
+
+    def _matches(self, *columns):
+        """Filter for rows whose columns contain every search term"""
+        return [or_(*[column.ilike(f'%{term}%') for column in columns]) for term in self.terms]
+
+    # --- intents ---
+
+    def _tenant_summary(self):
+        expiring_by = self.today + timedelta(days=LEASE_EXPIRY_WINDOW_DAYS)
+        total, total_rent, active, expiring = self._scoped(Tenant).with_entities(
+            func.count(Tenant.id),
+            func.coalesce(func.sum(Tenant.rent_amount), 0),
+            func.coalesce(func.sum(case((Tenant.lease_end > self.today, 1), else_=0)), 0),
+            func.coalesce(func.sum(case(
+                (Tenant.lease_end.between(self.today, expiring_by), 1), else_=0
+            )), 0)
+        ).one()
+        payment_statuses = dict(self._scoped(Tenant).with_entities(
+            func.coalesce(Tenant.payment_status, 'unknown'), func.count(Tenant.id)
+        ).group_by(func.coalesce(Tenant.payment_status, 'unknown')).all())
+        return {
+            'total_tenants': total,
+            'tenant_count': total,
+            'count': total,
+            'total_monthly_rent': _money(total_rent),
+            'active_tenants': int(active),
+            f'leases_ending_in_{LEASE_EXPIRY_WINDOW_DAYS}_days': int(expiring),
+            'payment_status_breakdown': payment_statuses,
+        }
+
+    def _ordering(self, id_column, ranks, relevance, *natural):
+        """ORDER BY for row queries: the search index ranking (id -> rank) when given, else relevance then natural"""
+        if ranks:
+            return (case(ranks, value=id_column, else_=len(ranks)),)
+        return (relevance.desc(),) + natural
+
+    def _tenant_rows(self, *conditions, order_by=None, ranks=None):
+        query = select(
+            Tenant.id, Tenant.full_name, Tenant.email, Tenant.phone_number, Tenant.rent_amount,
+            Tenant.lease_start, Tenant.lease_end, Tenant.payment_status,
+            Property.title, Property.street_address_1, Property.city, Property.state
+        ).outerjoin(
+            Property, Tenant.property_id == Property.id
+        ).where(
+            Tenant.id.in_(self._scoped_ids(Tenant)), *conditions
+        ).order_by(*self._ordering(
+            Tenant.id, ranks,
+            self._relevance(Tenant.full_name, Tenant.email, Property.title, Property.city),
+            *(order_by if order_by is not None else (Tenant.lease_end.is_(None), Tenant.lease_end, Tenant.id))
+        )).limit(self.top_n)
+
+        rows = []
+        for (tenant_id, name, email, phone, rent, lease_start, lease_end, payment_status,
+             property_title, street, city, state) in self._execute(query):
+            rows.append({
+                'id': tenant_id,
+                'name': name,
+                'email': email,
+                'phone': phone,
+                'rent_amount': _money(rent),
+                'lease_start': lease_start.isoformat() if lease_start else None,
+                'lease_end': lease_end.isoformat() if lease_end else None,
+                'payment_status': payment_status,
+                'property_title': property_title or 'No Property Assigned',
+                'property_address': _address(street, city, state) if property_title else 'No Address',
+                'lease_active': bool(lease_end and lease_end > self.today),
+            })
+        return rows
+
+    def _tenant_list(self, query):
+        context = self._tenant_summary()
+        # Soonest ending active leases first: those are what an admin acts on
+        context['tenants'] = self._tenant_rows(order_by=(
+            (Tenant.lease_end < self.today), Tenant.lease_end.is_(None), Tenant.lease_end, Tenant.id
+        ))
+        return context
+
+    def _property_summary(self):
+        total, total_rent = self._scoped(Property).with_entities(
+            func.count(Property.id), func.coalesce(func.sum(Property.rent_amount), 0)
+        ).one()
+        statuses = dict(self._scoped(Property).with_entities(
+            Property.status, func.count(Property.id)
+        ).group_by(Property.status).all())
+        occupied = statuses.get('occupied', 0)
+        return {
+            'total_properties': total,
+            'count': total,
+            'status_breakdown': statuses,
+            'occupied_properties': occupied,
+            'vacant_properties': statuses.get('vacant', 0),
+            'occupancy_rate': round(occupied / total * 100, 2) if total else 0,
+            'total_listed_rent': _money(total_rent),
+            'average_rent': _money(total_rent / total) if total else 0,
+        }
+
+    def _property_rows(self, *conditions, ranks=None):
+        query = self._scoped(Property).with_entities(
+            Property.id, Property.title, Property.street_address_1, Property.city, Property.state,
+            Property.zip_code, Property.rent_amount, Property.status, Property.description
+        ).filter(*conditions).order_by(*self._ordering(
+            Property.id, ranks,
+            self._relevance(Property.title, Property.street_address_1, Property.city),
+            Property.title, Property.id
+        )).limit(self.top_n)
+
+        return [{
+            'id': property_id,
+            'title': title,
+            'address': _address(street, city, state, zip_code),
+            'rent_amount': _money(rent),
+            'status': status,
+            'description': _clip(description),
+        } for property_id, title, street, city, state, zip_code, rent, status, description in query]
+
+    def _property_list(self, query):
+        context = self._property_summary()
+        context['properties'] = self._property_rows()
+        return context
+
+    def _maintenance_summary(self):
+        open_filter = MaintenanceRequest.status.in_(OPEN_MAINTENANCE_STATUSES)
+        total, open_count, open_cost = self._scoped(MaintenanceRequest).with_entities(
+            func.count(MaintenanceRequest.id),
+            func.coalesce(func.sum(case((open_filter, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((open_filter, MaintenanceRequest.estimated_cost), else_=0)), 0)
+        ).one()
+        statuses = dict(self._scoped(MaintenanceRequest).with_entities(
+            MaintenanceRequest.status, func.count(MaintenanceRequest.id)
+        ).group_by(MaintenanceRequest.status).all())
+        priorities = dict(self._scoped(MaintenanceRequest).with_entities(
+            MaintenanceRequest.priority, func.count(MaintenanceRequest.id)
+        ).filter(open_filter).group_by(MaintenanceRequest.priority).all())
+        return {
+            'total_maintenance': total,
+            'count': total,
+            'open_requests': int(open_count),
+            'open_estimated_cost': _money(open_cost),
+            'status_breakdown': statuses,
+            'open_priority_breakdown': priorities,
+        }
+
+    def _maintenance_rows(self, *conditions, ranks=None):
+        priority_rank = case(PRIORITY_ORDER, value=MaintenanceRequest.priority, else_=len(PRIORITY_ORDER))
+        query = select(
+            MaintenanceRequest.id, MaintenanceRequest.request_title, MaintenanceRequest.request_description,
+            MaintenanceRequest.status, MaintenanceRequest.priority, MaintenanceRequest.request_date,
+            MaintenanceRequest.estimated_cost, MaintenanceRequest.assigned_vendor_id,
+            Property.title, Property.street_address_1, Property.city, Property.state
+        ).outerjoin(
+            Property, MaintenanceRequest.property_id == Property.id
+        ).where(
+            MaintenanceRequest.id.in_(self._scoped_ids(MaintenanceRequest)), *conditions
+        ).order_by(*self._ordering(
+            MaintenanceRequest.id, ranks,
+            self._relevance(MaintenanceRequest.request_title, MaintenanceRequest.request_description,
+                            Property.title),
+            # Open, most urgent, most recent first
+            MaintenanceRequest.status.notin_(OPEN_MAINTENANCE_STATUSES),
+            priority_rank,
+            MaintenanceRequest.request_date.desc(),
+            MaintenanceRequest.id.desc()
+        )).limit(self.top_n)
+
+        rows = []
+        for (request_id, title, description, status, priority, request_date, estimated_cost, vendor_id,
+             property_title, street, city, state) in self._execute(query):
+            rows.append({
+                'id': request_id,
+                'title': title,
+                'description': _clip(description),
+                'status': status,
+                'priority': priority,
+                'request_date': request_date.isoformat() if request_date else None,
+                'estimated_cost': _money(estimated_cost),
+                'assigned_vendor_id': vendor_id,
+                'property_title': property_title or 'No Property Assigned',
+                'property_address': _address(street, city, state) if property_title else 'No Address',
+            })
+        return rows
+
+    def _maintenance_list(self, query):
+        context = self._maintenance_summary()
+        context['maintenance_requests'] = self._maintenance_rows()
+        return context
+
+    def _work_order_list(self, query):
+        # There is no separate work order table: a work order is a maintenance
+        # request that has been assigned to a vendor
+        assigned = MaintenanceRequest.assigned_vendor_id.isnot(None)
+        total = self._scoped(MaintenanceRequest).with_entities(
+            func.count(MaintenanceRequest.id)
+        ).filter(assigned).scalar()
+        statuses = dict(self._scoped(MaintenanceRequest).with_entities(
+            MaintenanceRequest.status, func.count(MaintenanceRequest.id)
+        ).filter(assigned).group_by(MaintenanceRequest.status).all())
+        return {
+            'total_work_orders': total,
+            'count': total,
+            'status_breakdown': statuses,
+            'work_orders': self._maintenance_rows(assigned),
+        }
+
+    def _vendor_list(self, query):
+        total, active = self._scoped(Vendor).with_entities(
+            func.count(Vendor.id), func.coalesce(func.sum(case((Vendor.is_active.is_(True), 1), else_=0)), 0)
+        ).one()
+        categories = dict(self._scoped(Vendor).with_entities(
+            func.coalesce(VendorCategory.name, 'Uncategorized'), func.count(Vendor.id)
+        ).outerjoin(
+            VendorCategory, Vendor.category_id == VendorCategory.id
+        ).group_by(func.coalesce(VendorCategory.name, 'Uncategorized')).all())
+
+        rows = self._scoped(Vendor).with_entities(
+            Vendor.id, Vendor.first_name, Vendor.last_name, Vendor.company_name, Vendor.primary_email,
+            Vendor.phone_1, VendorCategory.name, Vendor.is_active
+        ).outerjoin(
+            VendorCategory, Vendor.category_id == VendorCategory.id
+        ).order_by(
+            self._relevance(Vendor.first_name, Vendor.last_name, Vendor.company_name, VendorCategory.name).desc(),
+            Vendor.is_active.is_(True).desc(), Vendor.company_name, Vendor.last_name, Vendor.id
+        ).limit(self.top_n)
+
+        return {
+            'total_vendors': total,
+            'count': total,
+            'active_vendors': int(active),
+            'category_breakdown': categories,
+            'vendors': [{
+                'id': vendor_id,
+                'name': f"{first_name or ''} {last_name or ''}".strip() or company_name,
+                'company': company_name,
+                'email': email,
+                'phone': phone,
+                'category': category,
+                'is_active': is_active,
+            } for vendor_id, first_name, last_name, company_name, email, phone, category, is_active in rows],
+        }
+
+    def _rental_owner_list(self, query):
+        total, active = self._scoped(RentalOwner).with_entities(
+            func.count(RentalOwner.id),
+            func.coalesce(func.sum(case((RentalOwner.is_active.is_(True), 1), else_=0)), 0)
+        ).one()
+        property_counts = select(
+            Property.rental_owner_id, func.count(Property.id).label('properties')
+        ).group_by(Property.rental_owner_id).subquery()
+
+        rows = self._scoped(RentalOwner).with_entities(
+            RentalOwner.id, RentalOwner.company_name, RentalOwner.contact_person, RentalOwner.email,
+            RentalOwner.phone_number, RentalOwner.city, RentalOwner.state, RentalOwner.is_active,
+            func.coalesce(property_counts.c.properties, 0)
+        ).outerjoin(
+            property_counts, property_counts.c.rental_owner_id == RentalOwner.id
+        ).order_by(
+            self._relevance(RentalOwner.company_name, RentalOwner.contact_person, RentalOwner.city).desc(),
+            func.coalesce(property_counts.c.properties, 0).desc(), RentalOwner.company_name, RentalOwner.id
+        ).limit(self.top_n)
+
+        return {
+            'total_rental_owners': total,
+            'count': total,
+            'active_rental_owners': int(active),
+            'rental_owners': [{
+                'id': owner_id,
+                'company_name': company_name,
+                'contact_name': contact,
+                'email': email,
+                'phone': phone,
+                'address': _address(None, city, state),
+                'is_active': is_active,
+                'property_count': properties,
+            } for owner_id, company_name, contact, email, phone, city, state, is_active, properties in rows],
+        }
+
+    def _association_list(self, query):
+        total = self._scoped(Association).with_entities(func.count(Association.id)).scalar()
+        property_counts = select(
+            AssociationPropertyAssignment.association_id, func.count(AssociationPropertyAssignment.id).label('properties')
+        ).group_by(AssociationPropertyAssignment.association_id).subquery()
+
+        rows = self._scoped(Association).with_entities(
+            Association.id, Association.name, Association.street_address_1, Association.city, Association.state,
+            Association.zip_code, Association.manager, func.coalesce(property_counts.c.properties, 0)
+        ).outerjoin(
+            property_counts, property_counts.c.association_id == Association.id
+        ).order_by(
+            self._relevance(Association.name, Association.city).desc(), Association.name, Association.id
+        ).limit(self.top_n)
+
+        return {
+            'total_associations': total,
+            'count': total,
+            'associations': [{
+                'id': association_id,
+                'name': name,
+                'address': _address(street, city, state, zip_code),
+                'manager': manager,
+                'property_count': properties,
+            } for association_id, name, street, city, state, zip_code, manager, properties in rows],
+        }
+
+    def _count(self, query):
+        if 'tenant' in query:
+            count_type, model = 'tenants', Tenant
+        elif 'property' in query or 'properties' in query:
+            count_type, model = 'properties', Property
+        elif 'maintenance' in query or 'repair' in query:
+            count_type, model = 'maintenance_requests', MaintenanceRequest
+        elif 'vendor' in query:
+            count_type, model = 'vendors', Vendor
+        elif 'work order' in query:
+            count = self._scoped(MaintenanceRequest).with_entities(func.count(MaintenanceRequest.id)).filter(
+                MaintenanceRequest.assigned_vendor_id.isnot(None)
+            ).scalar()
+            return {'count': count, 'type': 'work_orders'}
+        else:
+            # Default to tenant count if unclear
+            count_type, model = 'tenants', Tenant
+        return {'count': self._scoped(model).with_entities(func.count(model.id)).scalar(), 'type': count_type}
+
+    def _financial_summary(self, query):
+        tenants = self._tenant_summary()
+        properties = self._property_summary()
+        return {
+            'total_monthly_rent': tenants['total_monthly_rent'],
+            'total_tenants': tenants['total_tenants'],
+            'total_properties': properties['total_properties'],
+            'occupied_properties': properties['occupied_properties'],
+            'vacant_properties': properties['vacant_properties'],
+            'occupancy_rate': properties['occupancy_rate'],
+            'payment_status_breakdown': tenants['payment_status_breakdown'],
+        }
+
+    def _analytics(self, query):
+        tenants = self._tenant_summary()
+        properties = self._property_summary()
+        maintenance = self._maintenance_summary()
+        total_rent = tenants['total_monthly_rent']
+        return {
+            'total_properties': properties['total_properties'],
+            'total_tenants': tenants['total_tenants'],
+            'total_monthly_rent': total_rent,
+            'occupancy_rate': properties['occupancy_rate'],
+            'pending_maintenance': maintenance['status_breakdown'].get('pending', 0),
+            'completed_maintenance': maintenance['status_breakdown'].get('completed', 0),
+            'open_maintenance_cost': maintenance['open_estimated_cost'],
+            'occupied_properties': properties['occupied_properties'],
+            'vacant_properties': properties['vacant_properties'],
+            'average_rent': round(total_rent / tenants['total_tenants'], 2) if tenants['total_tenants'] else 0,
+            f'leases_ending_in_{LEASE_EXPIRY_WINDOW_DAYS}_days':
+                tenants[f'leases_ending_in_{LEASE_EXPIRY_WINDOW_DAYS}_days'],
+        }
+
+    def _index_hits(self, query):
+        """Search index hits as {kind: {id: rank}}, or None when the index can't be used"""
+        try:
+            from utils.search_index import ensure_search_index
+        except ImportError as e:
+            logger.warning(f"Search index unavailable, using substring search: {e}")
+            return None
+        try:
+            index = ensure_search_index()
+            if index is None:
+                # numpy is missing, or the index is still being built
+                return None
+            hits = index.search(' '.join(query_terms(query, limit=20)), k=self.top_n * SEARCH_CANDIDATE_FACTOR)
+        except Exception as e:
+            logger.error(f"Search index query failed, using substring search: {e}")
+            return None
+        return {kind: {record_id: rank for rank, (record_id, _) in enumerate(kind_hits)}
+                for kind, kind_hits in hits.items()}
+
+    def _search(self, query):
+        results = {'tenants': [], 'properties': [], 'vendors': [], 'maintenance_requests': []}
+        if self.terms:
+            hits = self._index_hits(query)
+            if hits is None:
+                conditions = {
+                    'tenants': self._matches(Tenant.full_name, Tenant.email),
+                    'properties': self._matches(Property.title, Property.street_address_1, Property.city),
+                    'vendors': self._matches(Vendor.first_name, Vendor.last_name, Vendor.company_name),
+                    'maintenance_requests': self._matches(MaintenanceRequest.request_title,
+                                                          MaintenanceRequest.request_description),
+                }
+                hits = {}
+            else:
+                # Candidates come from the index; scoping below drops what the user may not see
+                conditions = {
+                    'tenants': [Tenant.id.in_(list(hits['tenants']))],
+                    'properties': [Property.id.in_(list(hits['properties']))],
+                    'vendors': [Vendor.id.in_(list(hits['vendors']))],
+                    'maintenance_requests': [MaintenanceRequest.id.in_(list(hits['maintenance_requests']))],
+                }
+
+            results['tenants'] = [
+                {key: row[key] for key in ('id', 'name', 'email', 'property_title')}
+                for row in self._tenant_rows(*conditions['tenants'], ranks=hits.get('tenants'))
+            ]
+            results['properties'] = [
+                {key: row[key] for key in ('id', 'title', 'address', 'status')}
+                for row in self._property_rows(*conditions['properties'], ranks=hits.get('properties'))
+            ]
+            vendors = self._scoped(Vendor).with_entities(
+                Vendor.id, Vendor.first_name, Vendor.last_name, Vendor.company_name, Vendor.primary_email
+            ).filter(
+                *conditions['vendors']
+            ).order_by(*self._ordering(
+                Vendor.id, hits.get('vendors'),
+                self._relevance(Vendor.first_name, Vendor.last_name, Vendor.company_name), Vendor.id
+            )).limit(self.top_n)
+            results['vendors'] = [{
+                'id': vendor_id,
+                'name': f"{first_name or ''} {last_name or ''}".strip() or company_name,
+                'company': company_name,
+                'email': email,
+            } for vendor_id, first_name, last_name, company_name, email in vendors]
+            results['maintenance_requests'] = [
+                {key: row[key] for key in ('id', 'title', 'status', 'priority', 'property_title')}
+                for row in self._maintenance_rows(*conditions['maintenance_requests'],
+                                                  ranks=hits.get('maintenance_requests'))
+            ]
+        return {
+            'search_results': results,
+            'search_term': ' '.join(self.terms) if self.terms else query,
+            'total_results': sum(len(rows) for rows in results.values()),
+        }
+
+    def _filter(self, query):
+        results = {}
+        totals = {}
+        if 'tenant' in query:
+            if 'inactive' in query or 'expired' in query:
+                condition = Tenant.lease_end <= self.today
+            elif 'active' in query:
+                condition = Tenant.lease_end > self.today
+            else:
+                condition = literal(True)
+            totals['tenants'] = self._scoped(Tenant).with_entities(func.count(Tenant.id)).filter(condition).scalar()
+            results['tenants'] = [
+                {key: row[key] for key in ('id', 'name', 'email', 'lease_end', 'property_title')}
+                for row in self._tenant_rows(condition)
+            ]
+        elif 'property' in query or 'properties' in query:
+            if 'vacant' in query:
+                condition = Property.status == 'vacant'
+            elif 'occupied' in query:
+                condition = Property.status == 'occupied'
+            else:
+                condition = literal(True)
+            totals['properties'] = self._scoped(Property).with_entities(
+                func.count(Property.id)
+            ).filter(condition).scalar()
+            results['properties'] = [
+                {key: row[key] for key in ('id', 'title', 'address', 'status', 'rent_amount')}
+                for row in self._property_rows(condition)
+            ]
+        return {
+            'filter_results': results,
+            'filter_totals': totals,
+            'filter_criteria': query,
+            'total_filtered': sum(totals.values()),
+        }
+
+    def _summary(self, query):
+        # Counts only: general questions don't need rows
+        return {
+            'summary': {
+                'total_properties': self._scoped(Property).with_entities(func.count(Property.id)).scalar(),
+                'total_tenants': self._scoped(Tenant).with_entities(func.count(Tenant.id)).scalar(),
+                'total_maintenance': self._scoped(MaintenanceRequest).with_entities(
+                    func.count(MaintenanceRequest.id)
+                ).scalar(),
+            },
+            'message': "I'm here to help you with property management! You can ask me about tenants, "
+                       "properties, maintenance, and financial reports.",
+        }
+
+    def _execute(self, statement):
+        return db.session.execute(statement).all()
+
+    # Intent -> handler; any other intent gets the summary
+    INTENT_HANDLERS = {
+        'tenant_list': _tenant_list,
+        'property_list': _property_list,
+        'maintenance_list': _maintenance_list,
+        'work_order_list': _work_order_list,
+        'vendor_list': _vendor_list,
+        'rental_owner_list': _rental_owner_list,
+        'association_list': _association_list,
+        'count': _count,
+        'financial_summary': _financial_summary,
+        'analytics': _analytics,
+        'search': _search,
+        'filter': _filter,
+        'summary': _summary,
+    }
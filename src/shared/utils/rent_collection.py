@@ -0,0 +1,275 @@
+"""
+Monthly rent collection rollup
+
+rent_collection_monthly holds, per property and calendar month:
+- collected: rent_roll.amount_paid by payment_date
+- due: outstanding_balances.due_amount by due_date
+- outstanding: the part of due whose balance is marked unresolved
+  (is_resolved false; NULL counts as neither, as in the balance listings)
+- payment_count: rent_roll rows in the month
+
+Writers that add, edit or delete rent_roll / outstanding_balances rows call
+record_payment_change() / record_balance_change() with snapshots of the row
+before and after, in the same transaction. Each change becomes one additive
+upsert per affected month, so concurrent writers never overwrite each other.
+Rows written outside the API are picked up by rebuild_rent_collection(), also
+available as `flask rebuild-rent-collection`: the add_rent_collection_monthly
+migration backfills the table the same way, and the CSV migration pipeline
+rebuilds the properties it loaded balances for at the end of a run.
+
+Statistics read O(months) rollup rows instead of scanning the payment history.
+Rows without a property, payment date or due date belong to no month and are
+left out of the rollup; total_outstanding() therefore sums the unresolved
+balances themselves, so a balance without a due date still counts.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime
+from decimal import Decimal
+
+import click
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+from config import db
+from models.tenant import RentRoll, OutstandingBalance, RentCollectionMonthly
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal('0.00')
+
+# Rollup rows inserted per statement during a rebuild
+REBUILD_BATCH_SIZE = 5000
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """First day of the month `months` after (or before, if negative) value's month"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def payment_snapshot(payment):
+    """The rollup-relevant fields of a RentRoll row; take it before editing the row"""
+    return (payment.property_id, payment.payment_date, payment.amount_paid)
+
+
+def balance_snapshot(balance):
+    """The rollup-relevant fields of an OutstandingBalance row; take it before editing the row"""
+    return (balance.property_id, balance.due_date, balance.due_amount, balance.is_resolved)
+
+
+def _payment_deltas(deltas, snapshot, sign):
+    property_id, payment_date, amount_paid = snapshot
+    if property_id is None or payment_date is None:
+        return
+    totals = deltas[(property_id, month_start(payment_date))]
+    totals['collected'] += sign * Decimal(str(amount_paid or 0))
+    totals['payment_count'] += sign
+
+
+def _balance_deltas(deltas, snapshot, sign):
+    property_id, due_date, due_amount, is_resolved = snapshot
+    if property_id is None or due_date is None:
+        return
+    amount = sign * Decimal(str(due_amount or 0))
+    totals = deltas[(property_id, month_start(due_date))]
+    totals['due'] += amount
+    if is_resolved is not None and not is_resolved:
+        totals['outstanding'] += amount
+
+
+def _new_deltas():
+    return defaultdict(lambda: {'collected': ZERO, 'due': ZERO, 'outstanding': ZERO, 'payment_count': 0})
+
+
+def _apply(property_id, year_month, totals):
+    """Add totals to one rollup row, creating it if needed, with a single upsert"""
+    table = RentCollectionMonthly.__table__
+    now = datetime.utcnow()
+    values = dict(totals, property_id=property_id, year_month=year_month, created_at=now, updated_at=now)
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+        statement = dialect_insert(table).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=['property_id', 'year_month'],
+            set_={
+                'collected': table.c.collected + statement.excluded.collected,
+                'due': table.c.due + statement.excluded.due,
+                'outstanding': table.c.outstanding + statement.excluded.outstanding,
+                'payment_count': table.c.payment_count + statement.excluded.payment_count,
+                'updated_at': statement.excluded.updated_at,
+            }
+        )
+        db.session.execute(statement)
+        return
+
+    updated = db.session.execute(
+        update(table).where(
+            table.c.property_id == property_id,
+            table.c.year_month == year_month
+        ).values(
+            collected=table.c.collected + totals['collected'],
+            due=table.c.due + totals['due'],
+            outstanding=table.c.outstanding + totals['outstanding'],
+            payment_count=table.c.payment_count + totals['payment_count'],
+            updated_at=now
+        )
+    ).rowcount
+    if not updated:
+        db.session.execute(insert(table).values(**values))
+
+
+def _apply_all(deltas):
+    for (property_id, year_month), totals in deltas.items():
+        if any(totals.values()):
+            _apply(property_id, year_month, totals)
+
+
+def record_payment_change(before=None, after=None):
+    """
+    Move a rent payment in the rollup. before/after are payment_snapshot()s of
+    the row; pass only after for a new row and only before for a deleted one.
+    Does not commit.
+    """
+    deltas = _new_deltas()
+    if before is not None:
+        _payment_deltas(deltas, before, -1)
+    if after is not None:
+        _payment_deltas(deltas, after, 1)
+    _apply_all(deltas)
+
+
+def record_balance_change(before=None, after=None):
+    """Same as record_payment_change() for balance_snapshot()s of an OutstandingBalance. Does not commit."""
+    deltas = _new_deltas()
+    if before is not None:
+        _balance_deltas(deltas, before, -1)
+    if after is not None:
+        _balance_deltas(deltas, after, 1)
+    _apply_all(deltas)
+
+
+def rebuild_rent_collection(property_ids=None):
+    """
+    Recompute the rollup from rent_roll and outstanding_balances, for the given
+    properties or for all of them. Source rows are pre-aggregated per day in
+    SQL, so this reads one row per property and day rather than per payment.
+    Does not commit.
+    """
+    stale = RentCollectionMonthly.query
+    payments = db.session.query(
+        RentRoll.property_id,
+        RentRoll.payment_date,
+        func.coalesce(func.sum(RentRoll.amount_paid), 0),
+        func.count(RentRoll.id)
+    ).filter(
+        RentRoll.property_id.isnot(None),
+        RentRoll.payment_date.isnot(None)
+    ).group_by(RentRoll.property_id, RentRoll.payment_date)
+    balances = db.session.query(
+        OutstandingBalance.property_id,
+        OutstandingBalance.due_date,
+        OutstandingBalance.is_resolved,
+        func.coalesce(func.sum(OutstandingBalance.due_amount), 0)
+    ).filter(
+        OutstandingBalance.property_id.isnot(None),
+        OutstandingBalance.due_date.isnot(None)
+    ).group_by(OutstandingBalance.property_id, OutstandingBalance.due_date, OutstandingBalance.is_resolved)
+
+    if property_ids is not None:
+        stale = stale.filter(RentCollectionMonthly.property_id.in_(property_ids))
+        payments = payments.filter(RentRoll.property_id.in_(property_ids))
+        balances = balances.filter(OutstandingBalance.property_id.in_(property_ids))
+
+    stale.delete(synchronize_session=False)
+
+    totals = _new_deltas()
+    for property_id, payment_date, amount_paid, payment_count in payments:
+        month = totals[(property_id, month_start(payment_date))]
+        month['collected'] += Decimal(str(amount_paid))
+        month['payment_count'] += payment_count
+    for property_id, due_date, is_resolved, due_amount in balances:
+        month = totals[(property_id, month_start(due_date))]
+        month['due'] += Decimal(str(due_amount))
+        if is_resolved is not None and not is_resolved:
+            month['outstanding'] += Decimal(str(due_amount))
+
+    now = datetime.utcnow()
+    rows = [
+        dict(month, property_id=property_id, year_month=year_month, created_at=now, updated_at=now)
+        for (property_id, year_month), month in totals.items()
+    ]
+    table = RentCollectionMonthly.__table__
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        db.session.execute(insert(table), rows[start:start + REBUILD_BATCH_SIZE])
+
+    logger.info(f"Rebuilt rent collection rollup: {len(rows)} property-months")
+    return len(rows)
+
+
+def monthly_totals(property_ids, first_month, last_month):
+    """
+    Rollup totals per month between first_month and last_month (inclusive),
+    summed over property_ids (a list or a select of ids). Every month in the
+    range is present, zero-filled, oldest first.
+    """
+    rows = db.session.query(
+        RentCollectionMonthly.year_month,
+        func.sum(RentCollectionMonthly.collected),
+        func.sum(RentCollectionMonthly.due),
+        func.sum(RentCollectionMonthly.outstanding),
+        func.sum(RentCollectionMonthly.payment_count)
+    ).filter(
+        RentCollectionMonthly.property_id.in_(property_ids),
+        RentCollectionMonthly.year_month >= first_month,
+        RentCollectionMonthly.year_month <= last_month
+    ).group_by(RentCollectionMonthly.year_month).all()
+    found = {row[0]: row[1:] for row in rows}
+
+    months = []
+    month = month_start(first_month)
+    while month <= last_month:
+        collected, due, outstanding, payment_count = found.get(month, (0, 0, 0, 0))
+        months.append({
+            'year_month': month,
+            'collected': float(collected or 0),
+            'due': float(due or 0),
+            'outstanding': float(outstanding or 0),
+            'payment_count': int(payment_count or 0)
+        })
+        month = add_months(month, 1)
+    return months
+
+
+def total_outstanding(property_ids):
+    """
+    Unresolved balances for property_ids (a list or a select of ids), summed
+    from outstanding_balances rather than the rollup so balances without a
+    due date are included
+    """
+    return float(db.session.query(
+        func.coalesce(func.sum(OutstandingBalance.due_amount), 0)
+    ).filter(
+        OutstandingBalance.property_id.in_(property_ids),
+        OutstandingBalance.is_resolved == False
+    ).scalar() or 0)
+
+
+def init_rent_collection_commands(app):
+    """Register `flask rebuild-rent-collection` on app"""
+
+    @app.cli.command('rebuild-rent-collection')
+    @click.option('--property-id', 'property_ids', type=int, multiple=True,
+                  help='Only rebuild these properties (repeatable); default is all')
+    def rebuild_rent_collection_command(property_ids):
+        """Recompute rent_collection_monthly from rent_roll and outstanding_balances"""
+        count = rebuild_rent_collection(list(property_ids) or None)
+        db.session.commit()
+        click.echo(f"Rebuilt {count} property-months")
@@ -0,0 +1,237 @@
+"""
+Rent roll engine
+
+Computes the rent roll (lease status, next payment date, days until due and
+the prorated first payment) for a whole set of tenants at once:
+- one projected query for the tenant and property columns, so no Tenant or
+  Property objects are built and nothing is lazy-loaded per row
+- the next payment date only depends on the rent payment day, so it is worked
+  out once per distinct payment day (at most 31) for the whole set
+- proration only applies to leases starting in the month of, or the month
+  before, the next payment; it is computed for those tenants only, once per
+  (rent, lease start, payment day)
+
+Output matches the previous per-tenant loop in rental_routes.get_rent_roll
+field for field.
+"""
+
+import io
+from calendar import monthrange
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import select
+
+from config import db
+from models.tenant import Tenant
+from models.property import Property
+from utils.tenant_utils import calculate_prorated_rent
+
+# (header, item key) for CSV and Parquet exports
+RENT_ROLL_EXPORT_FIELDS = [
+    ('Lease ID', 'leaseId'),
+    ('Tenant', 'tenant_name'),
+    ('Email', 'email'),
+    ('Phone', 'phone'),
+    ('Property', 'property_title'),
+    ('Address', 'address'),
+    ('Status', 'status'),
+    ('Lease Dates', 'leaseDates'),
+    ('Rent Payment Day', 'rentPaymentDay'),
+    ('Next Payment Date', 'nextPaymentDate'),
+    ('Next Payment', 'daysLeft'),
+    ('Next Payment Amount', 'rent'),
+    ('Monthly Rent', 'monthlyRent'),
+]
+
+def rent_roll_query(owner_id=None, after_id=None, limit=None):
+    """
+    Projected rent roll rows, ordered by tenant id. RentRollCalculator.build
+    unpacks them positionally, so keep the column order in step.
+    owner_id=None covers every property (admins); after_id/limit give a keyset page.
+    """
+    query = select(
+        Tenant.id,
+        Tenant.full_name,
+        Tenant.email,
+        Tenant.phone_number,
+        Tenant.lease_start,
+        Tenant.lease_end,
+        Tenant.rent_amount,
+        Tenant.rent_payment_day,
+        Property.title.label('property_title'),
+        Property.street_address_1,
+        Property.city,
+        Property.state,
+        Property.rent_amount.label('property_rent')
+    ).join(
+        Property, Tenant.property_id == Property.id
+    )
+    if owner_id is not None:
+        query = query.where(Property.owner_id == owner_id)
+    if after_id is not None:
+        query = query.where(Tenant.id > after_id)
+    query = query.order_by(Tenant.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query
+
+
+def count_rent_roll(owner_id=None):
+    query = select(db.func.count(Tenant.id)).join(Property, Tenant.property_id == Property.id)
+    if owner_id is not None:
+        query = query.where(Property.owner_id == owner_id)
+    return db.session.execute(query).scalar()
+
+
+def _month_index(value):
+    return value.year * 12 + value.month
+
+
+class RentRollCalculator:
+    """Rent roll fields for tenant rows as of one day, with per-key lookups shared across rows"""
+
+    def __init__(self, today=None):
+        self.today = today or date.today()
+        self._next_payments = {}
+        self._prorated = {}
+        self._formatted_dates = {}
+
+    def next_payment(self, payment_day):
+        """(next payment date, label) for a rent payment day; the date is None if it can't be built"""
+        cached = self._next_payments.get(payment_day)
+        if cached is None:
+            cached = self._next_payments[payment_day] = self._compute_next_payment(payment_day)
+        return cached
+
+    def _compute_next_payment(self, payment_day):
+        today = self.today
+        try:
+            # Clamp to the last day of the month so the 31st is due on the 30th, 28th or 29th
+            _, last_day = monthrange(today.year, today.month)
+            due = today.replace(day=min(payment_day, last_day))
+            if due < today:
+                year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+                _, last_day = monthrange(year, month)
+                due = today.replace(year=year, month=month, day=min(payment_day, last_day))
+        except ValueError:
+            return None, "PAYMENT DATE ERROR"
+
+        days = (due - today).days
+        if days == 0:
+            return due, "DUE TODAY"
+        if days == 1:
+            return due, "DUE TOMORROW"
+        return due, f"DUE IN {days} DAYS"
+
+    def prorated_amount(self, rent_amount, lease_start, payment_day):
+        """Prorated first payment, or None if the rent can't be prorated"""
+        key = (rent_amount, lease_start, payment_day)
+        if key not in self._prorated:
+            try:
+                prorated_info = calculate_prorated_rent(Decimal(str(rent_amount)), lease_start, payment_day)
+                self._prorated[key] = float(prorated_info['prorated_amount'])
+            except (InvalidOperation, TypeError, ValueError) as e:
+                print(f"Error calculating prorated amount for lease starting {lease_start}: {e}")
+                self._prorated[key] = None
+        return self._prorated[key]
+
+    def format_date(self, value):
+        """MM/DD/YYYY, cached: a portfolio shares few distinct lease dates"""
+        formatted = self._formatted_dates.get(value)
+        if formatted is None:
+            formatted = self._formatted_dates[value] = value.strftime('%m/%d/%Y') if value else 'N/A'
+        return formatted
+
+    def build(self, rows):
+        """Rent roll items for rows from rent_roll_query"""
+        today = self.today
+        items = []
+        # Rows are unpacked positionally; attribute access on Row costs several times more
+        for (tenant_id, full_name, email, phone_number, lease_start, lease_end, rent_amount, payment_day,
+             property_title, street_address, city, state, property_rent) in rows:
+            if lease_start and lease_end:
+                if lease_start <= today <= lease_end:
+                    status = 'Active'
+                elif lease_start > today:
+                    status = 'Future'
+                else:
+                    status = 'Expired'
+            else:
+                status = 'No Lease'
+
+            next_payment_date = None
+            if payment_day:
+                next_payment_date, next_payment_label = self.next_payment(payment_day)
+            elif lease_end and lease_end > today:
+                next_payment_label = f"{(lease_end - today).days} DAYS LEFT"
+            else:
+                next_payment_label = "LEASE EXPIRED"
+
+            # Use the current property rent, falling back to the tenant's stored rent
+            if property_rent:
+                monthly_rent = float(property_rent)
+            elif rent_amount:
+                monthly_rent = float(rent_amount)
+            else:
+                monthly_rent = 0
+            next_payment_amount = monthly_rent
+
+            # Prorate when the lease starts in the month of the next payment, or in the
+            # month before it after the payment day
+            if next_payment_date and lease_start:
+                months_before = _month_index(next_payment_date) - _month_index(lease_start)
+                if months_before == 0 or (months_before == 1 and lease_start.day > payment_day):
+                    prorated = self.prorated_amount(rent_amount, lease_start, payment_day)
+                    if prorated is not None:
+                        if prorated != float(rent_amount):
+                            next_payment_amount = prorated
+                            if next_payment_label.startswith('DUE'):
+                                next_payment_label = f"{next_payment_label} (Prorated)"
+                        else:
+                            next_payment_amount = float(rent_amount)
+
+            if street_address and city and state:
+                address = f"{street_address}, {city}, {state}"
+            else:
+                address = "Address not available"
+
+            items.append({
+                'id': tenant_id,
+                'lease': f"{full_name} - {property_title}",
+                'leaseId': f"LEASE-{tenant_id:04d}",
+                'status': status,
+                'type': 'Residential',
+                'leaseDates': f"{self.format_date(lease_start)} - {self.format_date(lease_end)}",
+                'daysLeft': next_payment_label,
+                'nextPaymentDate': next_payment_date.isoformat() if next_payment_date else None,
+                'rentPaymentDay': payment_day,
+                'rent': next_payment_amount,
+                'monthlyRent': monthly_rent,
+                'tenant_name': full_name,
+                'property_title': property_title,
+                'address': address,
+                'email': email,
+                'phone': phone_number
+            })
+        return items
+
+
+def build_rent_roll(owner_id=None, after_id=None, limit=None, today=None):
+    """Rent roll items for owner_id's properties (all properties when None)"""
+    rows = db.session.execute(rent_roll_query(owner_id, after_id, limit)).all()
+    return RentRollCalculator(today).build(rows)
+
+
+def rent_roll_parquet(items):
+    """Parquet bytes for rent roll items; needs pyarrow, raises ImportError otherwise"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = {key: [item[key] for item in items] for _, key in RENT_ROLL_EXPORT_FIELDS}
+    columns['nextPaymentDate'] = [
+        date.fromisoformat(value) if value else None for value in columns['nextPaymentDate']
+    ]
+    buffer = io.BytesIO()
+    pq.write_table(pa.table(columns), buffer)
+    return buffer.getvalue()
@@ -0,0 +1,140 @@
+"""
+Content-addressed cache for rendered report files
+
+Downloading the same report for the same date range re-ran every query and
+the whole ReportLab layout each time. ReportCache keeps rendered files in a
+private directory (REPORT_CACHE_DIR, by default a private_data_dir named
+report_cache), named by a key hashed from
+everything the file depends on:
+
+- the report type and format
+- who it is for (reports are scoped to the user and carry their name)
+- the date range, and the day it was rendered (lease countdowns move daily)
+- the data version of the tables the report reads
+
+data_version() is a single query returning COUNT(*), MAX(id) and
+MAX(updated_at) per table. Every model stamps updated_at on insert and
+update and a delete changes the count, so any write gives the report a new
+key; stale files are never looked up again and age out of the cache. The
+key doubles as the file's ETag.
+
+Files are evicted least recently used first once the directory holds more
+than REPORT_CACHE_MAX_BYTES (512 MB by default; 0 disables the cache). A hit
+touches the file's mtime, so every process sharing the directory sees the
+same recency.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+
+from sqlalchemy import func, literal, select, union_all
+
+from config import db
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Bump when report layout changes so files rendered by older code stop matching
+REPORT_CACHE_FORMAT = 1
+
+_TEMP_PREFIX = '.tmp-'
+
+
+def data_version(*models):
+    """Fingerprint of the given tables; changes whenever a row is added, updated or deleted"""
+    models = sorted(set(models), key=lambda model: model.__tablename__)
+    statements = [
+        select(literal(model.__tablename__), func.count(), func.max(model.id), func.max(model.updated_at))
+        for model in models
+    ]
+    statement = statements[0] if len(statements) == 1 else union_all(*statements)
+    rows = sorted(tuple(row) for row in db.session.execute(statement).all())
+    return hashlib.sha256(json.dumps(rows, default=str).encode('utf-8')).hexdigest()
+
+
+def cache_key(*parts):
+    """Stable key for a rendered report from the values it depends on"""
+    payload = json.dumps([REPORT_CACHE_FORMAT, *parts], default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """Rendered report files on disk, evicted LRU by total size"""
+
+    def __init__(self, directory, max_bytes=REPORT_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def path_for(self, key, extension):
+        return os.path.join(self.directory, f"{key}.{extension}")
+
+    def get(self, key, extension):
+        """Path of the cached file for key, or None; marks it as recently used"""
+        if not self.enabled:
+            return None
+        path = self.path_for(key, extension)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, extension, data):
+        """Store data under key and return its path, evicting older files past the budget"""
+        path = self.path_for(key, extension)
+        # Written aside and renamed so concurrent readers never see a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=_TEMP_PREFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Delete least recently used files until the cache fits max_bytes; returns how many went"""
+        with self._lock:
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if entry.name.startswith(_TEMP_PREFIX) or not entry.is_file():
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                # The file just stored is about to be served, even if it alone is over budget
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    pass  # Another process evicted it first
+                total -= size
+
+            if removed:
+                logger.info("Evicted %d cached report(s) from %s", removed, self.directory)
+            return removed
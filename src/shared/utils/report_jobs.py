@@ -0,0 +1,297 @@
+"""
+Background job queue for report generation
+
+Report generation (and especially comprehensive PDF rendering) can outlive the
+gunicorn/nginx request timeout, so the reporting routes hand the work to a
+worker pool and return a job id straight away. Clients poll the job for status
+and progress and download the result once it is complete.
+
+The job store is pluggable:
+- SQLiteJobStore (default): a small SQLite file in the results directory,
+  shared by every gunicorn worker and by the pool's child processes
+- InMemoryJobStore: process-local, paired with the thread worker mode for
+  tests and single-process development
+
+Results are written to the results directory (REPORT_JOB_DIR, by default a
+private_data_dir named report_jobs) and expire after REPORT_JOB_TTL seconds
+(24h by default); expired files are purged lazily. The store records every
+job's result path, and results are only meant to leave through the
+owner-checked download route.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import sqlite3
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Job status constants
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+STATUS_EXPIRED = 'expired'
+
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_EXPIRED)
+
+JOB_FIELDS = (
+    'id', 'user_id', 'report_type', 'params', 'status', 'progress', 'message',
+    'result_path', 'result_mimetype', 'result_filename', 'error',
+    'created_at', 'started_at', 'finished_at', 'expires_at'
+)
+
+
+class InMemoryJobStore:
+    """Process-local job store; only usable with the thread worker mode"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job):
+        with self._lock:
+            self._jobs[job['id']] = dict(job)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def expired(self, now):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()
+                    if job.get('expires_at') and job['expires_at'] <= now and job['status'] != STATUS_EXPIRED]
+
+
+class SQLiteJobStore:
+    """Job store backed by a local SQLite file, safe across processes"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS report_jobs (
+                    id TEXT PRIMARY KEY,
+                    user_id INTEGER,
+                    report_type TEXT,
+                    params TEXT,
+                    status TEXT,
+                    progress INTEGER,
+                    message TEXT,
+                    result_path TEXT,
+                    result_mimetype TEXT,
+                    result_filename TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    started_at REAL,
+                    finished_at REAL,
+                    expires_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_report_jobs_expires_at ON report_jobs(expires_at)")
+
+    def _connect(self):
+        # A fresh connection per call keeps the store fork-safe
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _row_to_job(self, row):
+        if row is None:
+            return None
+        job = dict(row)
+        job['params'] = json.loads(job['params']) if job['params'] else {}
+        return job
+
+    def create(self, job):
+        values = dict(job)
+        values['params'] = json.dumps(values.get('params') or {})
+        columns = [field for field in JOB_FIELDS if field in values]
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO report_jobs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [values[column] for column in columns]
+            )
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM report_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row)
+
+    def update(self, job_id, **fields):
+        if not fields:
+            return
+        if 'params' in fields:
+            fields['params'] = json.dumps(fields['params'])
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE report_jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id])
+
+    def expired(self, now):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM report_jobs WHERE expires_at IS NOT NULL AND expires_at <= ? AND status != ?",
+                (now, STATUS_EXPIRED)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+
+def build_job_store(backend, results_dir):
+    """Create the job store named by REPORT_JOB_BACKEND ('sqlite' or 'memory')"""
+    if backend == 'memory':
+        return InMemoryJobStore()
+    return SQLiteJobStore(os.path.join(results_dir, 'report_jobs.sqlite3'))
+
+
+class ReportJobQueue:
+    """
+    Submits report jobs to a worker pool and tracks their lifecycle.
+
+    `runner` is a module-level callable taking a job id; it runs inside the
+    worker (a child process in 'process' mode) and reports back through
+    progress(), complete() and fail().
+    """
+
+    def __init__(self, store, results_dir, runner, worker_mode='process', max_workers=2,
+                 ttl_seconds=86400, start_method='spawn'):
+        self.store = store
+        self.results_dir = results_dir
+        self.runner = runner
+        self.worker_mode = worker_mode
+        self.max_workers = max_workers
+        self.ttl_seconds = ttl_seconds
+        self.start_method = start_method
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        os.makedirs(results_dir, exist_ok=True)
+
+    def _get_executor(self):
+        # Created lazily so child processes that import this module never start a pool
+        with self._executor_lock:
+            if self._executor is None:
+                if self.worker_mode == 'thread':
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='report-job')
+                else:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context(self.start_method)
+                    )
+            return self._executor
+
+    def submit(self, user_id, report_type, params):
+        self.purge_expired()
+
+        now = time.time()
+        job = {
+            'id': uuid.uuid4().hex,
+            'user_id': user_id,
+            'report_type': report_type,
+            'params': params,
+            'status': STATUS_QUEUED,
+            'progress': 0,
+            'message': 'Queued',
+            'created_at': now,
+        }
+        self.store.create(job)
+
+        future = self._get_executor().submit(self.runner, job['id'])
+        future.add_done_callback(lambda f, job_id=job['id']: self._on_done(job_id, f))
+        return job
+
+    def _on_done(self, job_id, future):
+        # Catches workers that died before they could record their own failure
+        error = future.exception()
+        if error is None:
+            return
+        job = self.store.get(job_id)
+        if job and job['status'] not in FINISHED_STATUSES:
+            self.fail(job_id, f"Worker crashed: {error}")
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def start(self, job_id):
+        self.store.update(job_id, status=STATUS_RUNNING, started_at=time.time(), message='Running')
+
+    def progress(self, job_id, progress, message=None):
+        fields = {'progress': max(0, min(100, int(progress)))}
+        if message:
+            fields['message'] = message
+        self.store.update(job_id, **fields)
+
+    def result_path_for(self, job_id, extension):
+        return os.path.join(self.results_dir, f"{job_id}.{extension}")
+
+    def complete(self, job_id, result_path, mimetype, filename):
+        now = time.time()
+        self.store.update(
+            job_id,
+            status=STATUS_COMPLETED,
+            progress=100,
+            message='Completed',
+            result_path=result_path,
+            result_mimetype=mimetype,
+            result_filename=filename,
+            finished_at=now,
+            expires_at=now + self.ttl_seconds
+        )
+
+    def fail(self, job_id, error):
+        now = time.time()
+        self.store.update(
+            job_id,
+            status=STATUS_FAILED,
+            message='Failed',
+            error=str(error),
+            finished_at=now,
+            expires_at=now + self.ttl_seconds
+        )
+
+    def purge_expired(self):
+        """Delete result files whose TTL has passed and mark their jobs expired"""
+        purged = 0
+        for job in self.store.expired(time.time()):
+            path = job.get('result_path')
+            if path and os.path.exists(path):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.warning(f"Could not remove expired report {path}: {e}")
+                    continue
+            self.store.update(job['id'], status=STATUS_EXPIRED, result_path=None)
+            purged += 1
+        return purged
+
+
+def _timestamp(value):
+    return datetime.utcfromtimestamp(value).isoformat() if value else None
+
+
+def job_to_dict(job):
+    """Public view of a job for API responses"""
+    return {
+        'job_id': job['id'],
+        'report_type': job['report_type'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'message': job['message'],
+        'error': job['error'] if job.get('error') else None,
+        'created_at': _timestamp(job.get('created_at')),
+        'started_at': _timestamp(job.get('started_at')),
+        'finished_at': _timestamp(job.get('finished_at')),
+        'expires_at': _timestamp(job.get('expires_at')),
+    }
@@ -0,0 +1,566 @@
+"""
+Batched data loaders for the reporting module
+
+The report generators used to walk the user's properties and vendors and
+issue one or more queries per row (first tenant, last maintenance date,
+vacancy, last service date), and the vendor report filtered the full request
+list in Python once per vendor. ReportDataLoader replaces all of that with a
+handful of grouped queries over the user's scope:
+
+- first tenant per property: ROW_NUMBER() OVER (PARTITION BY property_id)
+- last maintenance date per property: MAX(request_date) ... GROUP BY
+- request count, completions and cost per vendor: one GROUP BY over the
+  date range, plus MAX(completion_date) per vendor for the last service date
+- requests, tenants and transactions come back with the property, tenant
+  and vendor names joined in, so nothing is lazy-loaded per row
+- associations come back with their property count, HOA fees and dues
+  totals grouped in one statement
+
+Every lookup runs at most once per loader; a comprehensive report passes one
+loader to every section, so it issues a fixed number of queries whatever the
+size of the portfolio. Rows are projected named tuples, read by attribute
+like the ORM objects they replace.
+
+ReportContext is a loader whose lookups all read a single REPEATABLE READ
+snapshot, so every section of a comprehensive report describes the same
+data. On PostgreSQL the snapshot is exported (pg_export_snapshot) and
+imported by each worker connection, which lets independent sections run
+their queries concurrently; elsewhere the sections run one after another in
+one transaction. Each worker holds a pool connection on top of the lead
+connection and the request's own session, so the workers are capped to what
+the pool holds without overflow; falling back to one section at a time is
+logged with the reason.
+
+A loader built with stream_chunk_rows returns the row lookups (properties,
+tenants, maintenance requests, transactions) as RowStreams instead of
+lists. A RowStream reads its rows through a server-side cursor that many at
+a time and re-runs the query each time it is iterated, so a report can
+total a large portfolio in one pass and lay out every row in another while
+holding one chunk. Run both passes in one ReportContext so they read the
+same snapshot. The keyed lookups (first tenant and last maintenance date per
+property, vendor statistics) are still loaded whole; they hold a few values
+per property rather than a report row.
+"""
+
+import os
+import re
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import current_app
+from sqlalchemy import and_, case, func, select, text
+
+from config import db
+from models.property import Property
+from models.tenant import Tenant
+from models.maintenance import MaintenanceRequest
+from models.vendor import Vendor, VendorCategory
+from models.financial import FinancialTransaction
+from models.association import (
+    Association, AssociationPropertyAssignment, AssociationMembership, AssociationBalance
+)
+
+logger = logging.getLogger(__name__)
+
+# Scopes: every property, the user's own properties, requests assigned to the user, nothing
+SCOPE_ALL = 'all'
+SCOPE_OWNER = 'owner'
+SCOPE_VENDOR = 'vendor'
+
+# Threads (each with its own snapshot connection) computing comprehensive report sections;
+# capped by the connection pool size, see ReportContext.section_workers
+REPORT_CONTEXT_WORKERS = int(os.environ.get('REPORT_CONTEXT_WORKERS', 4))
+
+# Rows fetched per server-side cursor round trip when lookups stream
+REPORT_STREAM_CHUNK_ROWS = int(os.environ.get('REPORT_STREAM_CHUNK_ROWS', 500))
+
+_SNAPSHOT_ID = re.compile(r'^[0-9A-Fa-f]+-[0-9A-Fa-f]+(-[0-9]+)?$')
+
+
+def report_scope(user):
+    """The portfolio a user's reports cover"""
+    if user.role == 'ADMIN' or user.username == 'admin':
+        return SCOPE_ALL
+    if user.role == 'OWNER':
+        return SCOPE_OWNER
+    if user.role == 'AGENT':
+        # Note: Property model doesn't have agent_id field, so agents see all properties for now
+        return SCOPE_ALL
+    if user.role == 'VENDOR':
+        return SCOPE_VENDOR
+    return None
+
+
+def format_address(row):
+    """'street, street 2, Apt n, city, state, zip' for a property row"""
+    address_parts = [row.street_address_1]
+    if row.street_address_2:
+        address_parts.append(row.street_address_2)
+    if row.apt_number:
+        address_parts.append(f"Apt {row.apt_number}")
+    address_parts.extend([row.city, row.state, row.zip_code])
+    return ", ".join(part for part in address_parts if part)
+
+
+def vendor_display_name(first_name, last_name, company_name):
+    return company_name or f"{first_name or ''} {last_name or ''}".strip() or 'N/A'
+
+
+def lookup(method):
+    """
+    A memoized loader lookup: the query runs once per loader, and sections
+    asking for it concurrently wait for that one run
+    """
+    name = method.__name__
+
+    def get(self):
+        with self._lock:
+            lookup_lock = self._lookup_locks.setdefault(name, threading.Lock())
+        with lookup_lock:
+            if name not in self._results:
+                self._results[name] = method(self)
+        return self._results[name]
+
+    get.__doc__ = method.__doc__
+    return property(get)
+
+
+class RowStream:
+    """
+    The rows of a lookup, read chunk_size at a time through a server-side
+    cursor. Every iteration runs the query again; len() runs a COUNT once.
+    """
+
+    def __init__(self, loader, statement, chunk_size, convert=None):
+        self.loader = loader
+        self.statement = statement
+        self.chunk_size = chunk_size
+        self.convert = convert
+        self._count = None
+
+    def map(self, convert):
+        """The same rows passed through convert"""
+        inner = self.convert
+        if inner is not None:
+            outer = convert
+            convert = lambda row: outer(inner(row))
+        return RowStream(self.loader, self.statement, self.chunk_size, convert)
+
+    def chunks(self):
+        """Lists of at most chunk_size rows"""
+        result = self.loader._stream(self.statement, self.chunk_size)
+        try:
+            for partition in result.partitions():
+                yield partition if self.convert is None else [self.convert(row) for row in partition]
+        finally:
+            result.close()
+
+    def __iter__(self):
+        for chunk in self.chunks():
+            yield from chunk
+
+    def __len__(self):
+        if self._count is None:
+            self._count = self.loader._count(self.statement)
+        return self._count
+
+    def __bool__(self):
+        return len(self) > 0
+
+
+class ReportDataLoader:
+    """Scoped, memoized report lookups for one user and date range"""
+
+    def __init__(self, user, start_date, end_date, stream_chunk_rows=None):
+        self.user = user
+        self.start_date = start_date
+        self.end_date = end_date
+        self.scope = report_scope(user)
+        self.stream_chunk_rows = stream_chunk_rows
+        self._results = {}
+        self._lookup_locks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def sees_portfolio(self):
+        """Whether the user gets property, tenant, rental, financial and vendor data"""
+        return self.scope in (SCOPE_ALL, SCOPE_OWNER)
+
+    def _execute(self, statement):
+        return db.session.execute(statement).all()
+
+    def _stream(self, statement, chunk_size):
+        return db.session.execute(statement.execution_options(yield_per=chunk_size))
+
+    def _count(self, statement):
+        return self._execute(select(func.count()).select_from(statement.order_by(None).subquery()))[0][0]
+
+    def _rows(self, statement):
+        """A row lookup's result: the rows, or a RowStream over them when the loader streams"""
+        if self.stream_chunk_rows:
+            return RowStream(self, statement, self.stream_chunk_rows)
+        return self._execute(statement)
+
+    def map_rows(self, rows, convert):
+        """convert applied to each row of a lookup result, lazily if it streams"""
+        if isinstance(rows, RowStream):
+            return rows.map(convert)
+        return [convert(row) for row in rows]
+
+    def _owned(self, statement, property_id_column):
+        """Restrict statement to the user's properties when they only see their own"""
+        if self.scope == SCOPE_OWNER:
+            owned_ids = select(Property.id).where(Property.owner_id == self.user.id)
+            statement = statement.where(property_id_column.in_(owned_ids))
+        return statement
+
+    # --- properties and tenants ---
+
+    @lookup
+    def properties(self):
+        if not self.sees_portfolio:
+            return []
+        statement = select(
+            Property.id, Property.title, Property.street_address_1, Property.street_address_2,
+            Property.apt_number, Property.city, Property.state, Property.zip_code, Property.status,
+            Property.rent_amount
+        ).order_by(Property.id)
+        return self._rows(self._owned(statement, Property.id))
+
+    @lookup
+    def first_tenants(self):
+        """property_id -> that property's first tenant (lowest id)"""
+        if not self.sees_portfolio:
+            return {}
+        ranked = self._owned(select(
+            Tenant.property_id, Tenant.full_name, Tenant.rent_amount, Tenant.lease_start, Tenant.lease_end,
+            func.row_number().over(partition_by=Tenant.property_id, order_by=Tenant.id).label('position')
+        ).where(Tenant.property_id.isnot(None)), Tenant.property_id).subquery()
+        rows = self._execute(select(
+            ranked.c.property_id, ranked.c.full_name, ranked.c.rent_amount, ranked.c.lease_start,
+            ranked.c.lease_end
+        ).where(ranked.c.position == 1))
+        return {row.property_id: row for row in rows}
+
+    @lookup
+    def last_maintenance_dates(self):
+        """property_id -> date of the property's latest maintenance request"""
+        if not self.sees_portfolio:
+            return {}
+        statement = select(
+            MaintenanceRequest.property_id, func.max(MaintenanceRequest.request_date)
+        ).group_by(MaintenanceRequest.property_id)
+        return dict(self._execute(self._owned(statement, MaintenanceRequest.property_id)))
+
+    @lookup
+    def tenants(self):
+        """Tenants of the user's properties, with the property title"""
+        if not self.sees_portfolio:
+            return []
+        statement = select(
+            Tenant.id, Tenant.full_name, Tenant.email, Tenant.phone_number, Tenant.rent_amount,
+            Tenant.lease_start, Tenant.lease_end, Tenant.payment_status,
+            Property.title.label('property_title')
+        ).join(Property, Tenant.property_id == Property.id).order_by(Tenant.id)
+        return self._rows(self._owned(statement, Property.id))
+
+    # --- maintenance ---
+
+    def _request_conditions(self):
+        conditions = [
+            MaintenanceRequest.request_date >= self.start_date,
+            MaintenanceRequest.request_date <= self.end_date,
+        ]
+        if self.scope == SCOPE_VENDOR:
+            conditions.append(MaintenanceRequest.assigned_vendor_id == self.user.id)
+        return conditions
+
+    @lookup
+    def maintenance_requests(self):
+        """Requests in the date range, with property title, tenant name and vendor name"""
+        if self.scope is None:
+            return []
+        statement = select(
+            MaintenanceRequest.id, MaintenanceRequest.request_title, MaintenanceRequest.request_description,
+            MaintenanceRequest.priority, MaintenanceRequest.status, MaintenanceRequest.request_date,
+            MaintenanceRequest.completion_date, MaintenanceRequest.actual_cost,
+            Property.title.label('property_title'),
+            Tenant.full_name.label('tenant_name'),
+            Vendor.first_name.label('vendor_first_name'), Vendor.last_name.label('vendor_last_name'),
+            Vendor.company_name.label('vendor_company_name'),
+            MaintenanceRequest.assigned_vendor_id
+        ).outerjoin(
+            Property, MaintenanceRequest.property_id == Property.id
+        ).outerjoin(
+            Tenant, MaintenanceRequest.tenant_id == Tenant.id
+        ).outerjoin(
+            Vendor, MaintenanceRequest.assigned_vendor_id == Vendor.id
+        ).where(
+            and_(*self._request_conditions())
+        ).order_by(MaintenanceRequest.id)
+        return self._rows(self._owned(statement, MaintenanceRequest.property_id))
+
+    # --- vendors ---
+
+    @lookup
+    def vendors(self):
+        if not self.sees_portfolio:
+            return []
+        return self._execute(select(
+            Vendor.id, Vendor.first_name, Vendor.last_name, Vendor.company_name, Vendor.primary_email,
+            Vendor.phone_1, VendorCategory.name.label('category_name')
+        ).outerjoin(
+            VendorCategory, Vendor.category_id == VendorCategory.id
+        ).order_by(Vendor.id))
+
+    @lookup
+    def vendor_stats(self):
+        """
+        assigned_vendor_id -> (requests, completed, cost) for the requests in
+        the date range; unassigned requests are grouped under None
+        """
+        if not self.sees_portfolio:
+            return {}
+        statement = select(
+            MaintenanceRequest.assigned_vendor_id,
+            func.count(MaintenanceRequest.id),
+            func.coalesce(func.sum(case((MaintenanceRequest.status == 'completed', 1), else_=0)), 0),
+            func.coalesce(func.sum(MaintenanceRequest.actual_cost), 0)
+        ).where(
+            and_(*self._request_conditions())
+        ).group_by(MaintenanceRequest.assigned_vendor_id)
+        rows = self._execute(self._owned(statement, MaintenanceRequest.property_id))
+        return {vendor_id: (total, completed, cost) for vendor_id, total, completed, cost in rows}
+
+    @lookup
+    def last_service_dates(self):
+        """vendor id -> latest completion date of a request assigned to the vendor"""
+        if not self.sees_portfolio:
+            return {}
+        return dict(self._execute(select(
+            MaintenanceRequest.assigned_vendor_id, func.max(MaintenanceRequest.completion_date)
+        ).where(
+            MaintenanceRequest.assigned_vendor_id.isnot(None)
+        ).group_by(MaintenanceRequest.assigned_vendor_id)))
+
+    # --- financial ---
+
+    @lookup
+    def transactions(self):
+        """Transactions in the date range, with the property title"""
+        if not self.sees_portfolio:
+            return []
+        statement = select(
+            FinancialTransaction.id, FinancialTransaction.transaction_type, FinancialTransaction.amount,
+            FinancialTransaction.description, FinancialTransaction.transaction_date,
+            FinancialTransaction.category, Property.title.label('property_title')
+        ).outerjoin(
+            Property, FinancialTransaction.property_id == Property.id
+        ).where(
+            FinancialTransaction.transaction_date >= self.start_date,
+            FinancialTransaction.transaction_date <= self.end_date
+        ).order_by(FinancialTransaction.id)
+        return self._rows(self._owned(statement, FinancialTransaction.property_id))
+
+    # --- associations ---
+
+    @lookup
+    def associations(self):
+        """
+        Associations with their properties' HOA fees and their members' dues;
+        an owner sees the associations of their properties, and only their
+        own properties and the memberships of themselves and their tenants
+        """
+        if not self.sees_portfolio:
+            return []
+        assignments = self._owned(select(
+            AssociationPropertyAssignment.association_id,
+            func.count(AssociationPropertyAssignment.id).label('property_count'),
+            func.min(Property.title).label('property_title'),
+            func.coalesce(func.sum(AssociationPropertyAssignment.hoa_fees), 0).label('monthly_dues')
+        ).join(
+            Property, AssociationPropertyAssignment.property_id == Property.id
+        ).group_by(AssociationPropertyAssignment.association_id), Property.id).subquery()
+
+        resolved = AssociationBalance.is_resolved.is_(True)
+        dues = select(
+            AssociationMembership.association_id,
+            func.coalesce(func.sum(AssociationBalance.amount_due), 0).label('total_dues'),
+            func.coalesce(func.sum(case((resolved, AssociationBalance.amount_due), else_=0)), 0).label('amount_paid'),
+            # Balances have no payment date; a resolved one was last touched when it was paid
+            func.max(case((resolved, AssociationBalance.updated_at))).label('last_payment_date')
+        ).join(
+            AssociationBalance, AssociationBalance.membership_id == AssociationMembership.id
+        ).group_by(AssociationMembership.association_id)
+        if self.scope == SCOPE_OWNER:
+            owned_ids = select(Property.id).where(Property.owner_id == self.user.id)
+            tenant_ids = select(Tenant.id).where(Tenant.property_id.in_(owned_ids))
+            dues = dues.where((AssociationMembership.owner_id == self.user.id)
+                              | AssociationMembership.tenant_id.in_(tenant_ids))
+        dues = dues.subquery()
+
+        statement = select(
+            Association.id, Association.name,
+            assignments.c.property_title, func.coalesce(assignments.c.property_count, 0).label('property_count'),
+            func.coalesce(assignments.c.monthly_dues, 0).label('monthly_dues'),
+            func.coalesce(dues.c.total_dues, 0).label('total_dues'),
+            func.coalesce(dues.c.amount_paid, 0).label('amount_paid'),
+            dues.c.last_payment_date
+        ).outerjoin(
+            assignments, assignments.c.association_id == Association.id
+        ).outerjoin(
+            dues, dues.c.association_id == Association.id
+        ).order_by(Association.id)
+        if self.scope == SCOPE_OWNER:
+            statement = statement.where(assignments.c.association_id.isnot(None))
+        return self._execute(statement)
+
+
+class ReportContext(ReportDataLoader):
+    """
+    A ReportDataLoader reading one consistent snapshot; use it as a context
+    manager around everything the report reads:
+
+        with ReportContext(user, start_date, end_date) as context:
+            outcomes = context.run_sections({'tenants': build_tenants, ...})
+    """
+
+    def __init__(self, user, start_date, end_date, max_workers=REPORT_CONTEXT_WORKERS, stream_chunk_rows=None):
+        super().__init__(user, start_date, end_date, stream_chunk_rows)
+        self.max_workers = max_workers
+        self.snapshot_id = None
+        # Why sections cannot share the snapshot, when they cannot
+        self.sequential_reason = None
+        self._app = None
+        self._engine = None
+        self._lead = None
+        self._local = threading.local()
+        self._connections = []
+
+    def __enter__(self):
+        # Captured here: worker threads have no app context to resolve db.engine in
+        self._app = current_app._get_current_object()
+        self._engine = db.engine
+        connection = self._engine.connect()
+        try:
+            if self._engine.dialect.name == 'postgresql':
+                connection.execution_options(isolation_level='REPEATABLE READ')
+                connection.begin()
+                try:
+                    snapshot_id = connection.execute(text('SELECT pg_export_snapshot()')).scalar()
+                except Exception as e:
+                    # A standby cannot export snapshots; read on this one connection instead
+                    connection.rollback()
+                    connection.begin()
+                    snapshot_id = None
+                    self.sequential_reason = f"pg_export_snapshot failed: {e}"
+                if _SNAPSHOT_ID.match(snapshot_id or ''):
+                    self.snapshot_id = snapshot_id
+                elif self.sequential_reason is None:
+                    self.sequential_reason = f"pg_export_snapshot returned an unexpected id {snapshot_id!r}"
+            else:
+                connection.begin()
+                self.sequential_reason = f"{self._engine.dialect.name} cannot share a snapshot between connections"
+        except Exception:
+            connection.close()
+            raise
+        self._lead = connection
+        self._local.connection = connection
+        self._connections.append(connection)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Read-only: closing rolls each transaction back
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        return False
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # A worker thread: open a connection on the exported snapshot
+            connection = self._engine.connect()
+            connection.execution_options(isolation_level='REPEATABLE READ')
+            connection.begin()
+            # Utility statement, so no bind parameters; the id was validated against _SNAPSHOT_ID
+            connection.exec_driver_sql(f"SET TRANSACTION SNAPSHOT '{self.snapshot_id}'")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _execute(self, statement):
+        return self._connection().execute(statement).all()
+
+    def _stream(self, statement, chunk_size):
+        return self._connection().execute(statement.execution_options(yield_per=chunk_size))
+
+    def _reset_connection(self):
+        # A failed statement aborts the transaction; later sections on this thread need a usable one
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            return
+        if connection is self._lead:
+            connection.rollback()
+            connection.begin()
+        else:
+            self._local.connection = None
+            connection.close()
+
+    def _run_section(self, build):
+        try:
+            return build(self), None
+        except Exception as e:
+            self._reset_connection()
+            return None, e
+
+    def _run_worker_section(self, build):
+        # Generators may still touch models or config outside the loader
+        with self._app.app_context():
+            return self._run_section(build)
+
+    def section_workers(self, sections):
+        """
+        Worker threads for sections: at most max_workers, and no more than the
+        pool holds besides the lead connection and the request's session
+        """
+        workers = min(self.max_workers, sections)
+        if workers <= 1:
+            return workers
+        if not self.snapshot_id:
+            logger.warning(f"Report sections run one at a time: {self.sequential_reason}")
+            return 1
+        pool_size = getattr(self._engine.pool, 'size', None)
+        if callable(pool_size):
+            spare = pool_size() - 2
+            if spare < workers:
+                logger.warning(f"Report section workers capped at {max(spare, 1)} of {workers}: "
+                               f"the connection pool holds {pool_size()}")
+                workers = max(spare, 1)
+        return workers
+
+    def run_sections(self, sections, progress=None):
+        """
+        Build each section with build(context); returns {name: (result,
+        error)}. Sections run concurrently when the snapshot can be shared.
+        progress(percent, name) is called as each section finishes.
+        """
+        outcomes = {}
+        workers = self.section_workers(len(sections))
+        if workers <= 1:
+            for done, (name, build) in enumerate(sections.items(), 1):
+                outcomes[name] = self._run_section(build)
+                if progress:
+                    progress(done * 100 / len(sections), name)
+            return outcomes
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-section') as executor:
+            futures = {executor.submit(self._run_worker_section, build): name for name, build in sections.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                outcomes[futures[future]] = future.result()
+                if progress:
+                    progress(done * 100 / len(sections), futures[future])
+        return outcomes
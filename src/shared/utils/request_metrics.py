@@ -0,0 +1,278 @@
+"""
+Request-level performance instrumentation
+
+init_request_metrics(app) wires up, for every request:
+- wall time, and time spent in the database, measured with SQLAlchemy's
+  before_cursor_execute / after_cursor_execute events
+- query count and rows returned (cursor.rowcount, where the driver reports it)
+- an N+1 detector: SQL text executed N_PLUS_ONE_THRESHOLD or more times in
+  one request is logged and counted; statements are compared by text only,
+  so the per-row lookups of an N+1 match whatever their parameters
+- a Server-Timing header (app, db) outside production, so browser dev tools
+  show the cost of each API call
+
+Requests are recorded at teardown, so ones that end in an unhandled
+exception are counted as 500s. A statement that raises is still timed: the
+handle_error listener closes its timing like after_cursor_execute would.
+
+Per-blueprint, per-endpoint histograms are served at /metrics in the
+Prometheus text format. The registry is per process; with several gunicorn
+workers each one reports its own series. With METRICS_TOKEN set a scrape
+must send it as a bearer token; otherwise only METRICS_ALLOWED_ADDRESSES
+(loopback by default) may scrape.
+"""
+
+import os
+import hmac
+import time
+import bisect
+import logging
+import threading
+from collections import Counter
+
+from flask import Response, g, has_app_context, jsonify, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Not measured: scraping /metrics should not show up in /metrics
+EXCLUDED_ENDPOINTS = ('metrics', 'static')
+
+# Bearer token a scraper must send to /metrics; unset means scrapes are allowed by address
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Client addresses allowed to scrape /metrics when METRICS_TOKEN is unset
+METRICS_ALLOWED_ADDRESSES = frozenset(
+    address.strip() for address in os.environ.get('METRICS_ALLOWED_ADDRESSES', '127.0.0.1,::1').split(',')
+    if address.strip()
+)
+
+
+class Histogram:
+    """Prometheus-style histogram keyed by a tuple of label values"""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+        position = bisect.bisect_left(self.buckets, value)
+        if position < len(self.buckets):
+            series['buckets'][position] += 1
+        series['sum'] += value
+        series['count'] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            label_text = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['buckets']):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{label_text},le="+Inf"}} {series["count"]}')
+            lines.append(f"{self.name}_sum{{{label_text}}} {series['sum']:.6f}")
+            lines.append(f"{self.name}_count{{{label_text}}} {series['count']}")
+        return lines
+
+
+class CounterMetric:
+    """Prometheus-style counter keyed by a tuple of label values"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values = Counter()
+
+    def inc(self, labels, amount=1):
+        self._values[labels] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class RequestMetrics:
+    """Process-wide registry of request and SQL metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        endpoint_labels = ('blueprint', 'endpoint', 'method')
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', 'Request wall time', endpoint_labels, DURATION_BUCKETS)
+        self.db_duration = Histogram(
+            'http_request_db_duration_seconds', 'Time spent in SQL per request', endpoint_labels, DURATION_BUCKETS)
+        self.db_queries = Histogram(
+            'http_request_db_queries', 'SQL statements per request', endpoint_labels, QUERY_COUNT_BUCKETS)
+        self.requests = CounterMetric(
+            'http_requests_total', 'Requests by status code', endpoint_labels + ('status',))
+        self.db_rows = CounterMetric(
+            'http_request_db_rows_total', 'Rows returned or affected by SQL', endpoint_labels)
+        self.n_plus_one = CounterMetric(
+            'http_request_n_plus_one_total', 'Requests that repeated one statement N_PLUS_ONE_THRESHOLD+ times',
+            endpoint_labels)
+
+    def record(self, labels, status, stats, duration, n_plus_one):
+        with self._lock:
+            self.request_duration.observe(labels, duration)
+            self.db_duration.observe(labels, stats.db_time)
+            self.db_queries.observe(labels, stats.queries)
+            self.requests.inc(labels + (str(status),))
+            self.db_rows.inc(labels, stats.rows)
+            if n_plus_one:
+                self.n_plus_one.inc(labels)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (self.requests, self.request_duration, self.db_duration,
+                           self.db_queries, self.db_rows, self.n_plus_one):
+                lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class QueryStats:
+    """SQL accounting for the request in flight, kept on flask.g"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.rows = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def repeated_statements(self, threshold):
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+request_metrics = RequestMetrics()
+
+
+def _current_stats():
+    if not has_app_context():
+        return None
+    return g.get('_query_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+
+def _finish_query(conn, statement, rows):
+    started = conn.info.get('_query_started')
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current_stats()
+    if stats is None:
+        return
+    stats.queries += 1
+    stats.db_time += elapsed
+    stats.rows += rows
+    stats.statements[statement] += 1
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    _finish_query(conn, statement, max(cursor.rowcount or 0, 0))
+
+
+def _handle_error(exception_context):
+    # after_cursor_execute does not fire for a failed statement; without this its
+    # start time stays on the stack and is paired with the connection's next query
+    conn = exception_context.connection
+    if conn is not None and exception_context.statement is not None:
+        _finish_query(conn, exception_context.statement, 0)
+
+
+def _register_cursor_listeners():
+    # Listening on the Engine class covers every engine, including ones created after startup
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+
+def _scrape_allowed():
+    if METRICS_TOKEN:
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode())
+    return request.remote_addr in METRICS_ALLOWED_ADDRESSES
+
+
+def init_request_metrics(app):
+    """Register the timing hooks, the SQL listeners and the /metrics endpoint on app"""
+    threshold = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 10))
+    server_timing = os.environ.get('FLASK_ENV', 'production') != 'production'
+
+    _register_cursor_listeners()
+
+    @app.before_request
+    def start_request_metrics():
+        if request.endpoint not in EXCLUDED_ENDPOINTS:
+            g._query_stats = QueryStats()
+
+    @app.after_request
+    def add_server_timing(response):
+        stats = g.get('_query_stats')
+        if stats is None:
+            return response
+        g._response_status = response.status_code
+
+        if server_timing:
+            duration = time.perf_counter() - stats.started
+            response.headers.add(
+                'Server-Timing',
+                f'app;dur={duration * 1000:.1f}, '
+                f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries, {stats.rows} rows"'
+            )
+            # The frontend is served from another origin; let its Performance API read the header
+            response.headers['Timing-Allow-Origin'] = '*'
+        return response
+
+    @app.teardown_request
+    def record_request_metrics(exc):
+        stats = g.pop('_query_stats', None)
+        if stats is None:
+            return
+
+        duration = time.perf_counter() - stats.started
+        labels = (request.blueprint or '', request.endpoint or 'unmatched', request.method)
+        # No response reached after_request: the request ended in an unhandled exception
+        status = g.pop('_response_status', 500)
+
+        repeated = stats.repeated_statements(threshold)
+        for statement, count in repeated:
+            logger.warning(f"Possible N+1 in {labels[1]}: statement ran {count} times in one request: "
+                           f"{' '.join(statement.split())[:200]}")
+
+        request_metrics.record(labels, status, stats, duration, bool(repeated))
+
+    @app.route('/metrics')
+    def metrics():
+        """Prometheus scrape endpoint"""
+        if not _scrape_allowed():
+            return jsonify({'error': 'Not allowed to read metrics'}), 403
+        return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    return request_metrics
@@ -0,0 +1,603 @@
+"""
+Local search index for the admin bot
+
+A vector index over tenants, properties, vendors and maintenance requests
+that replaces `ilike '%term%'` scans for the search intent:
+- each record becomes a unit vector of hashed, sublinear term frequencies
+  (words, light stemming, and character trigrams so partial names still
+  match) in DIMENSIONS buckets; only a record's non-zero buckets are stored
+  (rows of a compressed sparse matrix), so memory follows the amount of text
+  indexed rather than records * DIMENSIONS
+- domain words are also mapped to a shared concept feature ("leak", "pipe",
+  "burst" all add concept:plumbing), which is what lets "water leak" find a
+  "pipe burst" request; plain TF-IDF cannot do that
+- queries are weighted by bucket IDF and scored with one sparse
+  matrix-vector product; argpartition picks the top k. That is a few
+  milliseconds even at 100k records, and the database only sees a
+  primary-key lookup for the hits
+- commits that insert, update or delete indexed rows update the index in
+  place (register_index_listeners); it is saved to SEARCH_INDEX_DIR (by
+  default a private_data_dir named search_index) at most every
+  SAVE_INTERVAL seconds
+- bulk writes that bypass the ORM session (the migration pipeline's Core
+  inserts and COPY) fire no listeners; the pipeline calls
+  rebuild_search_index() at the end of a run instead, and the web workers
+  pick up the saved file on their next search
+- `flask rebuild-search-index` builds it from scratch. Without a saved index
+  the first search starts that build in a background thread and callers
+  use substring search until it is done
+
+The index holds no permissions: callers filter the hits through their own
+scoping before showing anything. Each worker process keeps its own copy in
+memory and reloads the file when another process has saved a newer one.
+numpy is optional: without it ensure_search_index() returns None and the
+listeners are not registered.
+"""
+
+import os
+import re
+import json
+import time
+import zlib
+import atexit
+import logging
+import threading
+
+import click
+from flask import current_app
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from config import db
+from utils.private_data import private_data_dir
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Unset means search_index under the app's instance path (see init_search_index)
+SEARCH_INDEX_DIR = os.environ.get('SEARCH_INDEX_DIR')
+
+# Hash buckets per vector (at most 65536); each non-zero bucket of a record takes 6 bytes
+DIMENSIONS = int(os.environ.get('SEARCH_INDEX_DIMENSIONS', 512))
+
+# Seconds between saves of an index that has changed
+SAVE_INTERVAL = int(os.environ.get('SEARCH_INDEX_SAVE_INTERVAL', 60))
+
+# Rows read per round trip during a rebuild
+REBUILD_BATCH_SIZE = 2000
+
+FORMAT_VERSION = 2
+
+TRIGRAM_WEIGHT = 0.3
+# Matches scoring below this share of a perfect match are hash-collision noise, not hits
+MIN_SCORE = float(os.environ.get('SEARCH_INDEX_MIN_SCORE', 0.2))
+CONCEPT_WEIGHT = 0.7
+
+STOP_WORDS = frozenset((
+    'a', 'an', 'the', 'and', 'or', 'of', 'in', 'on', 'at', 'to', 'for', 'with', 'by', 'from', 'is', 'are',
+    'was', 'be', 'it', 'its', 'this', 'that', 'there', 'not', 'no', 'has', 'have', 'had', 'my', 'me', 'our',
+))
+
+# Concept -> words that imply it (stemmed as tokenize() does)
+CONCEPTS = {
+    'plumbing': ('water', 'leak', 'pipe', 'burst', 'drain', 'clog', 'clogged', 'faucet', 'toilet', 'sink',
+                 'shower', 'bath', 'bathtub', 'sewage', 'sewer', 'flood', 'drip', 'plumber', 'plumbing',
+                 'heater', 'tap'),
+    'electrical': ('electric', 'electrical', 'wiring', 'wire', 'outlet', 'switch', 'light', 'power', 'spark',
+                   'circuit', 'breaker', 'electrician', 'fuse', 'bulb'),
+    'hvac': ('heating', 'heat', 'cooling', 'hvac', 'furnace', 'thermostat', 'air', 'conditioning',
+             'conditioner', 'ventilation', 'vent', 'boiler', 'radiator'),
+    'pest': ('pest', 'bug', 'insect', 'rodent', 'mouse', 'mice', 'rat', 'ant', 'cockroach', 'roach', 'termite',
+             'exterminate', 'exterminator', 'infestation', 'bedbug'),
+    'carpentry': ('door', 'window', 'floor', 'cabinet', 'wood', 'drywall', 'wall', 'ceiling', 'carpenter',
+                  'hinge', 'lock', 'stair'),
+    'appliance': ('fridge', 'refrigerator', 'stove', 'oven', 'dishwasher', 'washer', 'dryer', 'microwave',
+                  'appliance', 'freezer'),
+}
+
+
+def _stem(word):
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+_CONCEPT_OF = {_stem(word): concept for concept, words in CONCEPTS.items() for word in words}
+
+
+def tokenize(text):
+    """Weighted features of text: {feature: weight}"""
+    features = {}
+    for word in re.findall(r'[a-z0-9]+', (text or '').lower()):
+        if word in STOP_WORDS or len(word) < 2:
+            continue
+        word = _stem(word)
+        features[word] = features.get(word, 0.0) + 1.0
+        concept = _CONCEPT_OF.get(word)
+        if concept:
+            key = f'concept:{concept}'
+            features[key] = features.get(key, 0.0) + CONCEPT_WEIGHT
+        if len(word) >= 4:
+            padded = f'^{word}$'
+            for start in range(len(padded) - 2):
+                key = f'#{padded[start:start + 3]}'
+                features[key] = features.get(key, 0.0) + TRIGRAM_WEIGHT
+    return features
+
+
+def _bucket(feature, dimensions):
+    """(bucket, sign) for a feature; crc32 is stable across processes, unlike hash()"""
+    value = zlib.crc32(feature.encode('utf-8'))
+    return value % dimensions, (1.0 if value & 0x80000000 else -1.0)
+
+
+def vectorize(text, dimensions=DIMENSIONS):
+    """Unit-length hashed vector of sublinear term frequencies, or None for empty text"""
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature, weight in tokenize(text).items():
+        bucket, sign = _bucket(feature, dimensions)
+        vector[bucket] += sign * (1.0 + np.log(weight)) if weight >= 1 else sign * weight
+    norm = np.linalg.norm(vector)
+    if not norm:
+        return None
+    return vector / norm
+
+
+# --- what gets indexed ---
+
+def _join(*parts):
+    return ' '.join(str(part) for part in parts if part)
+
+
+def _tenant_text(row):
+    full_name, email, phone_number = row
+    return _join(full_name, email, phone_number)
+
+
+def _property_text(row):
+    title, street_address_1, city, state, zip_code, status, description = row
+    return _join(title, street_address_1, city, state, zip_code, status, description)
+
+
+def _vendor_text(row):
+    first_name, last_name, company_name, primary_email, city, state, comments = row
+    return _join(first_name, last_name, company_name, primary_email, city, state, comments)
+
+
+def _maintenance_text(row):
+    request_title, request_description, vendor_type_needed, status, priority = row
+    return _join(request_title, request_description, vendor_type_needed, status, priority)
+
+
+def _indexed_kinds():
+    """kind -> (model, indexed columns, text builder); kinds are table names"""
+    from models.tenant import Tenant
+    from models.property import Property
+    from models.vendor import Vendor
+    from models.maintenance import MaintenanceRequest
+
+    return {
+        'tenants': (Tenant, ('full_name', 'email', 'phone_number'), _tenant_text),
+        'properties': (Property, ('title', 'street_address_1', 'city', 'state', 'zip_code', 'status',
+                                  'description'), _property_text),
+        'vendors': (Vendor, ('first_name', 'last_name', 'company_name', 'primary_email', 'city', 'state',
+                             'comments'), _vendor_text),
+        'maintenance_requests': (MaintenanceRequest, ('request_title', 'request_description',
+                                                      'vendor_type_needed', 'status', 'priority'),
+                                 _maintenance_text),
+    }
+
+
+KINDS = ('tenants', 'properties', 'vendors', 'maintenance_requests')
+_KIND_CODES = {kind: code for code, kind in enumerate(KINDS)}
+
+
+class SearchIndex:
+    """In-memory sparse vector index with on-disk persistence; all methods are thread-safe"""
+
+    def __init__(self, directory=SEARCH_INDEX_DIR, dimensions=DIMENSIONS):
+        self.directory = directory
+        self.dimensions = dimensions
+        self._lock = threading.RLock()
+        self._reset()
+        self._loaded_mtime = None
+        self._last_save = 0.0
+        # Whether the index has been loaded or built; changes are not saved before that
+        self.ready = False
+        self.building = False
+
+    def _reset(self):
+        self._document_frequency = np.zeros(self.dimensions, dtype=np.float64)
+        self._set_rows(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.uint16),
+                       np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int64))
+        # (kind, id) -> text (None for deleted) changed since the last save or load
+        self._changes = {}
+
+    def _set_rows(self, offsets, buckets, values, kinds, ids):
+        """Replace the stored rows with live ones, leaving room to append"""
+        rows = len(ids)
+        entries = int(offsets[rows])
+        capacity = max(1024, rows * 2)
+        entry_capacity = max(65536, entries * 2)
+        # Row r holds buckets[offsets[r]:offsets[r + 1]] with their values
+        self._offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self._offsets[:rows + 1] = offsets
+        self._buckets = np.zeros(entry_capacity, dtype=np.uint16)
+        self._buckets[:entries] = buckets
+        self._values = np.zeros(entry_capacity, dtype=np.float32)
+        self._values[:entries] = values
+        # Kind code per row; -1 marks a row that was replaced or deleted
+        self._kinds = np.full(capacity, -1, dtype=np.int8)
+        self._kinds[:rows] = kinds
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._ids[:rows] = ids
+        self._positions = {(KINDS[kind], int(record_id)): position
+                           for position, (kind, record_id) in enumerate(zip(kinds, ids))}
+        self._rows = rows
+        self._size = rows
+
+    def _live_rows(self):
+        """(offsets, buckets, values, kinds, ids) of the live rows only"""
+        rows = self._rows
+        live = self._kinds[:rows] >= 0
+        lengths = np.diff(self._offsets[:rows + 1])
+        entries = np.repeat(live, lengths)
+        end = int(self._offsets[rows])
+        offsets = np.zeros(int(live.sum()) + 1, dtype=np.int64)
+        np.cumsum(lengths[live], out=offsets[1:])
+        return (offsets, self._buckets[:end][entries], self._values[:end][entries],
+                self._kinds[:rows][live], self._ids[:rows][live])
+
+    def _adopt(self, other):
+        self._document_frequency = other._document_frequency
+        self._set_rows(*other._live_rows())
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def _dirty(self):
+        return self.ready and bool(self._changes)
+
+    # --- updates ---
+
+    def upsert(self, kind, record_id, text):
+        """Add or replace one record; empty text removes it"""
+        with self._lock:
+            self._changes[(kind, record_id)] = text
+            self._upsert(kind, record_id, text)
+
+    def delete(self, kind, record_id):
+        with self._lock:
+            self._changes[(kind, record_id)] = None
+            self._remove(kind, record_id)
+
+    def _upsert(self, kind, record_id, text):
+        vector = vectorize(text, self.dimensions)
+        with self._lock:
+            self._remove(kind, record_id)
+            if vector is None:
+                return
+            buckets = np.flatnonzero(vector)
+            position = self._rows
+            start = int(self._offsets[position])
+            end = start + len(buckets)
+            if position == len(self._ids):
+                capacity = position * 2
+                self._offsets = np.resize(self._offsets, capacity + 1)
+                self._kinds = np.resize(self._kinds, capacity)
+                self._ids = np.resize(self._ids, capacity)
+            if end > len(self._buckets):
+                entry_capacity = max(end, len(self._buckets) * 2)
+                self._buckets = np.resize(self._buckets, entry_capacity)
+                self._values = np.resize(self._values, entry_capacity)
+            self._buckets[start:end] = buckets
+            self._values[start:end] = vector[buckets]
+            self._offsets[position + 1] = end
+            self._kinds[position] = _KIND_CODES[kind]
+            self._ids[position] = record_id
+            self._document_frequency[buckets] += 1
+            self._positions[(kind, record_id)] = position
+            self._rows += 1
+            self._size += 1
+
+    def _remove(self, kind, record_id):
+        position = self._positions.pop((kind, record_id), None)
+        if position is None:
+            return
+        start, end = self._offsets[position], self._offsets[position + 1]
+        self._document_frequency[self._buckets[start:end]] -= 1
+        self._kinds[position] = -1
+        self._size -= 1
+        # Replaced and deleted rows keep their entries until they outnumber the live ones
+        if self._rows - self._size > max(1024, self._size):
+            self._set_rows(*self._live_rows())
+
+    # --- queries ---
+
+    def search(self, query, kinds=None, k=10):
+        """
+        Best matches for query as {kind: [(id, score), ...]}, best first, at
+        most k per kind; only records scoring at least MIN_SCORE of a
+        perfect match are returned
+        """
+        self._reload_if_stale()
+        vector = vectorize(query, self.dimensions)
+        results = {kind: [] for kind in (kinds or KINDS)}
+        if vector is None:
+            return results
+
+        with self._lock:
+            rows = self._rows
+            if not self._size:
+                return results
+            # Rare buckets count for more, as IDF does for terms
+            idf = np.log((self._size + 1) / (self._document_frequency + 1)).astype(np.float32) + 1
+            weighted = vector * idf
+            end = self._offsets[rows]
+            # Every row has at least one entry, so reduceat sums exactly each row's products
+            products = self._values[:end] * weighted[self._buckets[:end]]
+            scores = np.add.reduceat(products, self._offsets[:rows])
+            floor = MIN_SCORE * float(vector @ weighted)
+            kind_codes = self._kinds[:rows]
+            ids = self._ids[:rows]
+
+            for kind in results:
+                kind_scores = np.where(kind_codes == _KIND_CODES[kind], scores, -np.inf)
+                count = min(k, rows)
+                top = np.argpartition(-kind_scores, count - 1)[:count]
+                top = top[np.argsort(-kind_scores[top])]
+                results[kind] = [(int(ids[i]), float(kind_scores[i])) for i in top if kind_scores[i] >= floor]
+        return results
+
+    # --- persistence ---
+
+    def _path(self, name):
+        if not self.directory:
+            raise OSError("search index directory is not configured; call init_search_index(app)")
+        return os.path.join(self.directory, name)
+
+    def save(self):
+        """
+        Write the index to directory; files are replaced atomically. If another
+        process saved since this copy was loaded, its file is loaded first and
+        this copy's unsaved changes are replayed on top, so neither is lost.
+        """
+        with self._lock:
+            try:
+                newer_on_disk = os.path.getmtime(self._path('index.npz')) > (self._loaded_mtime or 0)
+            except OSError:
+                newer_on_disk = False
+            if newer_on_disk:
+                changes = self._changes
+                if self.load():
+                    for (kind, record_id), text in changes.items():
+                        if text is None:
+                            self._remove(kind, record_id)
+                        else:
+                            self._upsert(kind, record_id, text)
+            self._write()
+
+    def _write(self):
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            offsets, buckets, values, kinds, ids = self._live_rows()
+            temporary = self._path(f'index.{os.getpid()}.tmp.npz')
+            with open(temporary, 'wb') as handle:
+                np.savez(handle, offsets=offsets, buckets=buckets, values=values, kinds=kinds, ids=ids,
+                         document_frequency=self._document_frequency)
+            os.replace(temporary, self._path('index.npz'))
+            with open(self._path('manifest.json'), 'w') as handle:
+                json.dump({'version': FORMAT_VERSION, 'dimensions': self.dimensions, 'size': self._size,
+                           'saved_at': time.time()}, handle)
+            self._loaded_mtime = os.path.getmtime(self._path('index.npz'))
+            self._last_save = time.monotonic()
+            self._changes = {}
+            self.ready = True
+
+    def load(self):
+        """Read the index from directory; returns False when there is none or it has another layout"""
+        try:
+            with open(self._path('manifest.json')) as handle:
+                manifest = json.load(handle)
+            if manifest.get('version') != FORMAT_VERSION or manifest.get('dimensions') != self.dimensions:
+                logger.warning("Search index on disk has a different layout; rebuild it")
+                return False
+            mtime = os.path.getmtime(self._path('index.npz'))
+            with np.load(self._path('index.npz')) as arrays:
+                rows = [arrays[name] for name in ('offsets', 'buckets', 'values', 'kinds', 'ids')]
+                document_frequency = arrays['document_frequency']
+        except (OSError, ValueError, KeyError) as e:
+            logger.info(f"No usable search index in {self.directory}: {e}")
+            return False
+
+        with self._lock:
+            self._set_rows(*rows)
+            self._document_frequency = document_frequency
+            self._changes = {}
+            self._loaded_mtime = mtime
+            self.ready = True
+        return True
+
+    def _reload_if_stale(self):
+        """Pick up a newer file saved by another process, unless this copy has unsaved changes"""
+        if self._dirty:
+            return
+        try:
+            mtime = os.path.getmtime(self._path('index.npz'))
+        except OSError:
+            return
+        if self._loaded_mtime is None or mtime > self._loaded_mtime:
+            self.load()
+
+    def save_if_due(self):
+        if self._dirty and time.monotonic() - self._last_save >= SAVE_INTERVAL:
+            try:
+                self.save()
+            except OSError as e:
+                logger.error(f"Could not save search index: {e}")
+
+    def save_if_dirty(self):
+        if self._dirty:
+            try:
+                self.save()
+            except OSError as e:
+                logger.error(f"Could not save search index: {e}")
+
+    def rebuild(self):
+        """
+        Index every record from the database and save. Returns the record count.
+
+        The records are indexed into a separate copy, so searches keep using
+        this one meanwhile; changes committed during the build are replayed
+        onto the copy before it replaces this one.
+        """
+        kinds = _indexed_kinds()
+        fresh = SearchIndex(self.directory, self.dimensions)
+        with self._lock:
+            self.building = True
+            self._changes = {}
+        try:
+            for kind, (model, columns, build_text) in kinds.items():
+                statement = select(model.id, *[getattr(model, column) for column in columns])
+                result = db.session.execute(statement.execution_options(yield_per=REBUILD_BATCH_SIZE))
+                for row in result:
+                    fresh._upsert(kind, row[0], build_text(tuple(row[1:])))
+            with self._lock:
+                for (kind, record_id), text in self._changes.items():
+                    if text is None:
+                        fresh._remove(kind, record_id)
+                    else:
+                        fresh._upsert(kind, record_id, text)
+                self._adopt(fresh)
+                self._write()
+                logger.info(f"Rebuilt search index: {self._size} records")
+                return self._size
+        finally:
+            self.building = False
+
+    def rebuild_in_background(self, app):
+        """Run rebuild() in a daemon thread with an app context, unless a build is already running"""
+        with self._lock:
+            if self.building:
+                return
+            self.building = True
+
+        def build():
+            with app.app_context():
+                try:
+                    self.rebuild()
+                except Exception as e:
+                    logger.error(f"Search index build failed: {e}")
+                finally:
+                    self.building = False
+                    db.session.remove()
+
+        threading.Thread(target=build, name='search-index-build', daemon=True).start()
+
+
+search_index = SearchIndex() if np is not None else None
+if search_index is not None:
+    atexit.register(search_index.save_if_dirty)
+
+
+def ensure_search_index():
+    """
+    The shared index once it is loaded or built, else None. Without a saved
+    index this starts a build in the background; callers fall back to
+    substring search until it is ready.
+    """
+    if search_index is None:
+        return None
+    app = current_app._get_current_object()
+    _use_private_dir(search_index, app)
+    if search_index.ready or (not search_index.building and search_index.load()):
+        return search_index
+    search_index.rebuild_in_background(app)
+    return None
+
+
+def rebuild_search_index(app):
+    """Rebuild the shared index from app's database and save it; returns the record count, or None without numpy"""
+    if search_index is None:
+        return None
+    _use_private_dir(search_index, app)
+    return search_index.rebuild()
+
+
+def _use_private_dir(index, app):
+    if not index.directory:
+        index.directory = private_data_dir(app, 'search_index')
+
+
+_PENDING_KEY = 'search_index_pending'
+
+
+def register_index_listeners(index=None):
+    """Apply committed inserts, updates and deletes of indexed rows to the index"""
+    index = index or search_index
+    if index is None or getattr(index, '_listening', False):
+        return
+    index._listening = True
+    kinds_by_table = {}
+
+    def _kinds():
+        if not kinds_by_table:
+            kinds_by_table.update(_indexed_kinds())
+        return kinds_by_table
+
+    @event.listens_for(Session, 'after_flush')
+    def _collect(session, flush_context):
+        kinds = None
+        for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+            kind = getattr(instance, '__tablename__', None)
+            if kind not in _KIND_CODES:
+                continue
+            kinds = kinds or _kinds()
+            _, columns, build_text = kinds[kind]
+            if instance in session.deleted:
+                text = None
+            else:
+                text = build_text(tuple(getattr(instance, column, None) for column in columns))
+            session.info.setdefault(_PENDING_KEY, {})[(kind, instance.id)] = text
+
+    @event.listens_for(Session, 'after_commit')
+    def _apply(session):
+        pending = session.info.pop(_PENDING_KEY, None)
+        if not pending:
+            return
+        # Changes applied to an index that was never loaded would be saved over the full one;
+        # without a file on disk, the first search builds the index from the database anyway.
+        # During a build they are kept and replayed onto the new index.
+        if not (index.ready or index.building or index.load()):
+            return
+        for (kind, record_id), text in pending.items():
+            if text is None:
+                index.delete(kind, record_id)
+            else:
+                index.upsert(kind, record_id, text)
+        index.save_if_due()
+
+    @event.listens_for(Session, 'after_rollback')
+    def _discard(session):
+        session.info.pop(_PENDING_KEY, None)
+
+
+def init_search_index(app):
+    """Keep the shared index under app's instance path and register `flask rebuild-search-index`"""
+    if search_index is not None:
+        _use_private_dir(search_index, app)
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Rebuild the admin bot search index from the database"""
+        if search_index is None:
+            raise click.ClickException("The search index needs numpy; install it to build the index")
+        count = rebuild_search_index(app)
+        click.echo(f"Indexed {count} records into {search_index.directory}")
@@ -1,4 +1,6 @@
-from datetime import date
+from datetime import date, datetime
+from calendar import monthrange
+from decimal import Decimal
 
 def get_tenant_lease_status(tenant):
     """Determine if tenant's lease is active based on lease dates"""
@@ -57,3 +59,87 @@ def get_comprehensive_tenant_info(tenant):
         }
     
     return tenant_info
+
+def calculate_prorated_rent(monthly_rent, lease_start_date, rent_payment_day=1):
+    """
+    Calculate prorated rent for a tenant joining mid-month
+    
+    Args:
+        monthly_rent (Decimal): Full monthly rent amount
+        lease_start_date (date): Date when tenant moves in
+        rent_payment_day (int): Day of month when rent is due (1-31)
+    
+    Returns:
+        dict: {
+            'prorated_amount': Decimal,
+            'days_in_month': int,
+            'days_tenant_stays': int,
+            'daily_rate': Decimal,
+            'next_full_payment_date': date
+        }
+    """
+    if not isinstance(lease_start_date, date):
+        lease_start_date = datetime.strptime(lease_start_date, '%Y-%m-%d').date()
+    
+    # Get the total days in the move-in month
+    year = lease_start_date.year
+    month = lease_start_date.month
+    _, days_in_month = monthrange(year, month)
+    
+    # Calculate daily rent rate
+    daily_rate = Decimal(str(monthly_rent)) / Decimal(str(days_in_month))
+    
+    # Determine the billing period for the first month
+    # If lease starts before or on payment day, bill from lease start to payment day (same month)
+    # If lease starts after payment day, bill from lease start to next payment day (next month)
+    
+    if lease_start_date.day <= rent_payment_day:
+        # Bill from lease start to payment day in same month
+        days_to_bill = rent_payment_day - lease_start_date.day + 1
+        next_payment_month = month + 1 if month < 12 else 1
+        next_payment_year = year if month < 12 else year + 1
+    else:
+        # Bill from lease start to next payment day
+        if month == 12:
+            next_payment_month = 1
+            next_payment_year = year + 1
+        else:
+            next_payment_month = month + 1
+            next_payment_year = year
+        
+        # Get days in next month for payment day calculation
+        _, days_in_next_month = monthrange(next_payment_year, next_payment_month)
+        actual_payment_day = min(rent_payment_day, days_in_next_month)
+        
+        # Days from lease start to end of current month
+        days_current_month = days_in_month - lease_start_date.day + 1
+        # Days from start of next month to payment day
+        days_next_month = actual_payment_day
+        
+        days_to_bill = days_current_month + days_next_month
+        
+        # Recalculate daily rate considering both months
+        _, days_in_next_month = monthrange(next_payment_year, next_payment_month)
+        avg_days_per_month = (days_in_month + days_in_next_month) / 2
+        daily_rate = Decimal(str(monthly_rent)) / Decimal(str(avg_days_per_month))
+    
+    # Calculate prorated amount
+    prorated_amount = daily_rate * Decimal(str(days_to_bill))
+    
+    # Calculate next full payment date
+    try:
+        _, days_in_next_month = monthrange(next_payment_year, next_payment_month)
+        actual_payment_day = min(rent_payment_day, days_in_next_month)
+        next_full_payment_date = date(next_payment_year, next_payment_month, actual_payment_day)
+    except ValueError:
+        # Fallback to first day of next month
+        next_full_payment_date = date(next_payment_year, next_payment_month, 1)
+    
+    return {
+        'prorated_amount': round(prorated_amount, 2),
+        'days_in_month': days_in_month,
+        'days_tenant_stays': days_to_bill,
+        'daily_rate': round(daily_rate, 2),
+        'next_full_payment_date': next_full_payment_date,
+        'calculation_note': f"Prorated for {days_to_bill} days at ${round(daily_rate, 2)}/day"
+    }